@@ -1,2056 +1,16 @@
-import os
-import sys
-import pandas as pd
-import unicodedata
-import re
-import requests
-import json
-import gspread
-import numpy as np
-import base64 
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-import warnings
-from urllib.parse import quote
-import hashlib
-from gspread_dataframe import set_with_dataframe
-import logging
-from typing import List, Dict
-
-# Adicionar Pipeline ao path para importar módulo compartilhado
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../Pipeline'))
-
-# Importar funções de normalização do módulo compartilhado
-from utils.normalizacao import (
-    normalizar_nome_coluna,
-    _clean_whitespace,
-    _canon_txt,
-    _canon_txt_preserve_case
-)
-
-# ----------------------------
-# Logging (arquivo + console)
-# ----------------------------
-logging.basicConfig(
-    level=logging.INFO, # Pode mudar para logging.DEBUG para mais detalhes durante a depuração.
-    format="%(asctime)s | %(levelname)s | %(message)s",
-    handlers=[
-        logging.FileHandler("pipeline_tratamento.log", encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
-
-# --------------------------------------------------------
-# Utilitário de banner de seção (para logs/prints)
-# --------------------------------------------------------
-def _BANNER(titulo):
-    print("\n" + "="*18 + f" {titulo} " + "="*18)
-    logging.info(titulo)
-
-def _SUB(titulo):
-    print("— " + titulo)
-    logging.info(titulo)
-
-# ========================================================
-# 1) CONFIGURAÇÃO GOOGLE DRIVE / SHEETS (REMOVIDA LIMPEZA AGRESSIVA)
-# ========================================================
-
-_BANNER("1) CONFIGURAÇÃO GOOGLE DRIVE/SHEETS")
-
-# ----------------------------
-# AUTENTICAÇÃO ÚNICA (usar apenas uma vez)
-# ----------------------------
-CAMINHO_CREDENCIAIS = ".github/workflows/credentials.json"
-SCOPES = [
-    "https://www.googleapis.com/auth/drive",
-    "https://www.googleapis.com/auth/spreadsheets"
-]
-
-try:
-    logging.info(f"Tentando ler string Base64 do arquivo: '{CAMINHO_CREDENCIAIS}'")
-    with open(CAMINHO_CREDENCIAIS, "r", encoding="utf-8") as file:
-        encoded_json_string = file.read().strip() # Lê e remove espaços/newlines
-
-    # Decodifica de Base64 para bytes, depois para string UTF-8
-    decoded_json_bytes = base64.b64decode(encoded_json_string)
-    decoded_json_str = decoded_json_bytes.decode('utf-8')
-    
-    # --- CORREÇÃO AQUI: A linha de limpeza agressiva 'clean_json_str = re.sub(...)' FOI REMOVIDA. ---
-    # Agora passamos a string JSON decodificada diretamente para json.loads.
-    service_account_info = json.loads(decoded_json_str)
-    
-    logging.info("✅ Arquivo de credenciais Base64 lido e JSON decodificado com sucesso (limpeza agressiva removida).")
-    
-    creds = Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
-    drive_service = build("drive", "v3", credentials=creds)
-    gc = gspread.authorize(creds)
-    client = gc
-    logging.info("✅ Autenticação Google OK")
-    print("✅ Autenticação Google OK.")
-except FileNotFoundError:
-    logging.critical(f"❌ Falha na autenticação Google: Arquivo de credenciais não encontrado em '{CAMINHO_CREDENCIAIS}'. Verifique o caminho e a criação do arquivo no workflow.", exc_info=True)
-    raise SystemExit("Erro crítico: Arquivo de credenciais não encontrado. O pipeline será encerrado.")
-except base64.binascii.Error as e:
-    logging.critical(f"❌ Falha na autenticação Google: Erro ao decodificar a string Base64. Conteúdo inválido no secret? Erro: {e}. O pipeline será encerrado.", exc_info=True)
-    raise SystemExit("Erro crítico: Conteúdo Base64 inválido no arquivo de credenciais.")
-except json.JSONDecodeError as e:
-    logging.critical(f"❌ Falha na autenticação Google: Erro ao decodificar JSON da string Base64 decodificada. Conteúdo inválido. Erro: {e}. O pipeline será encerrado.", exc_info=True)
-    # Se este erro ainda ocorrer, o problema está na string JSON decodificada antes de qualquer limpeza.
-    # O log do YML (com xxd -p) será crucial para ver o que o Base64 produziu.
-    raise SystemExit("Erro crítico: Conteúdo JSON inválido na string Base64 decodificada.")
-except Exception as e:
-    logging.critical(f"❌ Falha na autenticação Google. Erro inesperado: {e}. O pipeline será encerrado.", exc_info=True)
-    raise SystemExit("Erro crítico: Falha inesperada na autenticação Google. O pipeline será encerrado.")
-
-# ========================================================
-# 2) LEITURA DA PLANILHA BRUTA (GOOGLE DRIVE - DINÂMICO) - MANTIDO COM MELHORIAS DE TRY/EXCEPT
-# ========================================================
-_BANNER("2) LEITURA DA PLANILHA BRUTA (GOOGLE DRIVE - DINÂMICO)")
-
-# As importações de 'googleapiclient.discovery', 'google.oauth2.service_account',
-# 'gspread', 'pandas', 'logging' já estão no topo do arquivo.
-# Não precisam ser repetidas aqui.
-
-# --- Função helper para obter a última planilha da pasta bruta ---
-# Esta função já estava bem definida.
-def get_latest_spreadsheet_df(folder_id: str, gspread_client, drive_svc) -> (str, str, pd.DataFrame):
-    try:
-        res = drive_svc.files().list(
-            q=f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.spreadsheet' and trashed=false",
-            orderBy="modifiedTime desc",
-            pageSize=1,
-            fields="files(id, name, modifiedTime)"
-        ).execute()
-        files = res.get("files", [])
-        if not files:
-            logging.critical(f"❌ Nenhuma planilha bruta encontrada na pasta do Google Drive com ID: '{folder_id}'. O pipeline será encerrado.", exc_info=True)
-            raise SystemExit("Erro crítico: Nenhuma planilha bruta encontrada.")
-        latest = files[0]
-        fid, fname = latest["id"], latest["name"]
-        sh = gspread_client.open_by_key(fid)
-        aba = sh.sheet1
-        dfb = pd.DataFrame(aba.get_all_records())
-        return fid, fname, dfb
-    except Exception as e:
-        logging.critical(f"❌ Erro ao obter a última planilha da pasta bruta '{folder_id}': {e}. O pipeline será encerrado.", exc_info=True)
-        raise SystemExit("Erro crítico: Falha ao carregar planilha bruta.")
-
-
-# --- Uso ---
-FOLDER_ID_BRUTA = "1qXj9eGauvOREKVgRPOfKjRlLSKhefXI5" # Mantenha seu ID de pasta aqui
-try:
-    latest_file_id, latest_file_name, df_bruta = get_latest_spreadsheet_df(FOLDER_ID_BRUTA, gc, drive_service)
-    df = df_bruta.copy()
-
-    print(f"📂 Última planilha encontrada: {latest_file_name} ({latest_file_id})")
-    logging.info(f"Última planilha encontrada: {latest_file_name} ({latest_file_id})")
-    print(f"✅ Planilha bruta importada com sucesso: {df_bruta.shape}")
-    logging.info(f"Planilha bruta importada com sucesso: {df_bruta.shape}")
-except SystemExit: # Captura o SystemExit da função helper para não logar novamente
-    raise
-except Exception as e:
-    logging.critical(f"❌ Erro ao processar a planilha bruta principal. Verifique o FOLDER_ID_BRUTA e permissões. Erro: {e}. O pipeline será encerrado.", exc_info=True)
-    raise SystemExit("Erro crítico: Falha no processamento da planilha bruta.")
-
-# ========================================================
-# 3) NORMALIZAÇÃO DE NOMES DE COLUNA - MANTIDO COM MELHORIAS DE TRY/EXCEPT
-# ========================================================
-_BANNER("3) NORMALIZAÇÃO DE NOMES DE COLUNA")
-
-# Função normalizar_nome_coluna importada de Pipeline/utils/normalizacao (módulo compartilhado)
-
-try:
-    df.columns = [normalizar_nome_coluna(c) for c in df.columns]
-    print("✅ Cabeçalhos normalizados:", list(df.columns))
-    logging.info(f"Cabeçalhos normalizados: {list(df.columns)}")
-
-    # Padroniza a coluna 'protocolo' consistentemente (strip + upper)
-    def normalize_protocolo_col(df_local: pd.DataFrame, col: str = "protocolo") -> pd.DataFrame:
-        if col in df_local.columns:
-            df_local[col] = df_local[col].astype(str).str.strip().str.upper()
-        else:
-            logging.warning(f"⚠️ Coluna '{col}' não encontrada após normalização de protocolo!")
-        return df_local
-
-    df = normalize_protocolo_col(df, "protocolo")
-    logging.info("Coluna 'protocolo' padronizada.")
-except Exception as e:
-    logging.critical(f"❌ Erro na normalização de nomes de coluna ou padronização de protocolo. Erro: {e}. O pipeline será encerrado.", exc_info=True)
-    raise SystemExit("Erro crítico: Falha na normalização de dados.")
-
-# ========================================================
-# 4) FUNÇÕES AUXILIARES (codificação / datas / post em lotes) - MANTIDO
-# ========================================================
-_BANNER("4) AUXILIARES (codificação, datas, lotes)")
-
-# Funções _clean_whitespace, _canon_txt e _canon_txt_preserve_case 
-# importadas de Pipeline/utils/normalizacao (módulo compartilhado)
-
-def _to_proper_case_pt(text: str) -> str:
-    """
-    Converte uma string para o formato 'Title Case' apropriado para o português.
-    """
-    if not isinstance(text, str) or not text.strip(): return text
-    conectivos = ['de', 'da', 'do', 'dos', 'das', 'e', 'a', 'o', 'em']
-    palavras = text.lower().split()
-    palavras_capitalizadas = []
-    for i, palavra in enumerate(palavras):
-        if i == 0 or palavra not in conectivos:
-            palavras_capitalizadas.append(palavra.capitalize())
-        else:
-            palavras_capitalizadas.append(palavra)
-    return ' '.join(palavras_capitalizadas)
-
-def _to_ddmmaa_text(series: pd.Series) -> pd.Series:
-    EXCEL_BASE = pd.Timestamp("1899-12-30")
-    def _one(v):
-        if pd.isna(v): return None
-        if isinstance(v, (pd.Timestamp, np.datetime64)):
-            dt = pd.to_datetime(v, errors="coerce")
-            return dt.strftime("%d/%m/%Y") if pd.notna(dt) else None
-        s = str(v).strip()
-        if s == "": return None
-        s2 = s.replace("T", " ").replace("Z", "")
-        s2 = re.sub(r"([+-]\d{2}:?\d{2}|[+-]\d{2}| UTC)$", "", s2).strip()
-        if re.match(r"^\d{4}-\d{2}-\d{2}", s2):
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                dt = pd.to_datetime(s2, errors="coerce", dayfirst=False)
-            return dt.strftime("%d/%m/%Y") if pd.notna(dt) else s
-        if re.fullmatch(r"\d{5,6}(\.\d+)?", s2):
-            try: return (EXCEL_BASE + pd.to_timedelta(float(s2), "D")).strftime("%d/%m/%Y")
-            except: pass
-        if re.fullmatch(r"\d{13}", s2):
-            dt = pd.to_datetime(int(s2), unit="ms", errors="coerce")
-            return dt.strftime("%d/%m/%Y") if pd.notna(dt) else s
-        if re.fullmatch(r"\d{10}(\.\d+)?", s2):
-            dt = pd.to_datetime(float(s2), unit="s", errors="coerce")
-            return dt.strftime("%d/%m/%Y") if pd.notna(dt) else s
-        for fmt in ["%d/%m/%Y %H:%M:%S","%d/%m/%Y %H:%M","%d/%m/%Y", "%d/%m/%y %H:%M:%S","%d/%m/%y %H:%M","%d/%m/%y", "%Y-%m-%d %H:%M:%S","%Y-%m-%d %H:%M","%Y-%m-%d"]:
-            try: return pd.to_datetime(s2, format=fmt).strftime("%d/%m/%Y")
-            except: pass
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            dt = pd.to_datetime(s2, dayfirst=True, errors="coerce")
-        return dt.strftime("%d/%m/%Y") if pd.notna(dt) else s
-    return series.apply(_one).astype("object")
-
-def _conclusao_strict(series: pd.Series) -> pd.Series:
-    s = pd.Series(series, dtype="object").astype(str).str.strip()
-    s_cf = s.str.casefold()
-    invalid = {"não informado","na","n/a","n\\a","nan","null","none","","-","--", "outro","outros","nat","sem informação","sem informacao"}
-    out = s.copy()
-    mask_invalid = s_cf.isin(invalid)
-    out.loc[mask_invalid] = "Não concluído"
-    rest_idx = out.index[~mask_invalid]
-    if len(rest_idx) > 0:
-        s_rest = s.loc[rest_idx]
-        s_norm = s_rest.str.replace("T"," ").str.replace("Z","", regex=False)
-        s_norm = s_norm.str.replace(r"([+-]\d{2}:?\d{2}|[+-]\d{2}| UTC)$","", regex=True).str.strip()
-        iso_mask = s_norm.str.match(r"^\d{4}-\d{2}-\d{2}")
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            dt = pd.Series(pd.NaT, index=rest_idx, dtype="datetime64[ns]")
-            iso_idx = iso_mask[iso_mask].index
-            if len(iso_idx) > 0:
-                dt.loc[iso_idx] = pd.to_datetime(s_rest.loc[iso_idx], errors="coerce", dayfirst=False)
-            non_iso_idx = iso_mask[~iso_mask].index
-            if len(non_iso_idx) > 0:
-                dt.loc[non_iso_idx] = pd.to_datetime(s_rest.loc[non_iso_idx], errors="coerce", dayfirst=True)
-        good_idx = dt.index[dt.notna()]
-        if len(good_idx) > 0:
-            out.loc[good_idx] = dt.loc[good_idx].dt.strftime("%d/%m/%Y")
-    return out
-
-def _parse_dt_cmp(series: pd.Series) -> pd.Series:
-    EXCEL_BASE = pd.Timestamp("1899-12-30")
-    def _one(v):
-        if pd.isna(v): return pd.NaT
-        s = str(v).strip()
-        if s == "": return pd.NaT
-        s2 = s.replace("T"," ").replace("Z","")
-        s2 = re.sub(r"([+-]\d{2}:?\d{2}|[+-]\d{2}| UTC)$","",s2).strip()
-        if re.fullmatch(r"\d{5,6}(\.\d+)?", s2):
-            try: return EXCEL_BASE + pd.to_timedelta(float(s2), "D")
-            except: return pd.NaT
-        if re.fullmatch(r"\d{13}", s2):
-            return pd.to_datetime(int(s2), unit="ms", errors="coerce")
-        if re.fullmatch(r"\d{10}(\.\d+)?", s2):
-            return pd.to_datetime(float(s2), unit="s", errors="coerce")
-        for fmt in ["%d/%m/%Y %H:%M:%S","%d/%m/%Y %H:%M","%d/%m/%Y", "%d/%m/%y %H:%M:%S","%d/%m/%y %H:%M","%d/%m/%y", "%Y-%m-%d %H:%M:%S","%Y-%m-%d %H:%M","%Y-%m-%d"]:
-            try: return pd.to_datetime(s2, format=fmt)
-            except: pass
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            return pd.to_datetime(s2, dayfirst=True, errors="coerce")
-    return series.apply(_one)
-
-def _is_nao_ha_dados(v) -> bool:
-    if v is None: return False
-    s = str(v).strip()
-    if s == "": return False
-    s = unicodedata.normalize("NFD", s)
-    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
-    s = re.sub(r"\s+", " ", s).strip().casefold()
-    return s == "nao ha dados"
-
-def _is_concluida(v) -> bool:
-    if pd.isna(v): return False
-    s = str(v).strip()
-    if s == "": return False
-    s = "".join(ch for ch in unicodedata.normalize("NFD", s) if unicodedata.category(ch) != "Mn")
-    s = re.sub(r"[^A-Za-z]+", " ", s).strip().casefold()
-    return s == "concluida"
-
-def _looks_like_demanda_concluida(v) -> bool:
-    if pd.isna(v): return False
-    s = str(v).strip()
-    if s == "": return False
-    s = unicodedata.normalize("NFD", s)
-    s = s.replace("�", "i").replace("?", "i")
-    s = re.sub(r"i{2,}", "i", s, flags=re.IGNORECASE)
-    s = re.sub(r"[^A-Za-z]+", " ", s).strip().casefold()
-    return s == "demanda concluida"
-
-def _canon_prazo_restante(v):
-    if pd.isna(v): return v
-    if isinstance(v, (int, float)) and not pd.isna(v):
-        return v
-    s = _canon_txt(v)
-    if s == "": return s
-    s_clean = s.strip()
-    if _looks_like_demanda_concluida(s_clean):
-        return "Demanda Concluída"
-    return s_clean
-
-# --- LÓGICA DE MAPEAMENTO DE ÓRGÃOS MOVIDA PARA CÁ (ESCOPO GLOBAL) ---
-
-def _norm_tema(s):
-    if pd.isna(s): return ""
-    s = str(s).strip().lower()
-    s = unicodedata.normalize("NFD", s)
-    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
-    return re.sub(r"\s+", " ", s)
-
-def _div_temas(v, seps=(",", ";", "|", "/")):
-    if pd.isna(v): return []
-    t = str(v)
-    for s in seps: t = t.replace(s, ",")
-    partes = [p.strip() for p in t.split(",") if p.strip()]
-    return partes if partes else [str(v).strip()]
-
-MAP_TEMA_PARA_ORGAO = {
-    "Administração Pública":"Secretaria de Administração","Agricultura":"Secretaria de Obras e Agricultura",
-    "Assistência Social e Direitos Humanos":"Secretaria de Assistência Social e Direitos Humanos",
-    "Assuntos Jurídicos":"Procuradoria Geral","Comunicação Social":"Secretaria de Comunicação Social, Relações Públicas, Trabalho, Emprego e Renda",
-    "Controle Governamental":"Secretaria de Controle Interno","Criança, Adolescente e Idoso":"Secretaria de Assistência Social e Direitos Humanos",
-    "Cultura e Turismo":"Secretaria de Cultura e Turismo","Defesa Civil":"Secretaria de Defesa Civil",
-    "Direitos à Pessoa com Deficiência":"Secretaria de Assistência Social e Direitos Humanos",
-    "Direitos e Vantagens do Servidor":"Secretaria de Administração","Educação":"Secretaria de Educação",
-    "Empresas e Legalizações":"Secretaria de Fazenda","Esporte e Lazer":"Secretaria de Esporte e Lazer",
-    "Fiscalização e tributos":"Secretaria de Fazenda","Fiscalização Urbana, Regularização e Registro de Imóveis":"Secretaria de Urbanismo e Habitação",
-    "FUNDEC":"FUNDEC","Governança":"Secretaria de Governo","Governo Municipal e Enterro Gratuito":"Secretaria de Governo",
-    "Habitação":"Secretaria de Urbanismo e Habitação","Inclusão e Acessibilidade":"Secretaria de Gestão, Inclusão e Mulher",
-    "Meio Ambiente":"Secretaria de Meio Ambiente",
-    "Meio Ambiente (Poluição Sonora, Árvores, Licenças e Fiscalizações Ambientais e etc.)":"Secretaria de Meio Ambiente",
-    "Assédio":"Secretaria de Comunicação Social, Relações Públicas, Trabalho, Emprego e Renda","Obras Públicas":"Secretaria de Obras e Agricultura",
-    "Obras, Limpeza Urbana e Braço de Luz":"Secretaria de Obras e Agricultura","Proteção Animal":"Secretaria de Proteção Animal",
-    "Saúde":"Secretaria de Saúde","Segurança Pública":"Secretaria de Segurança Pública",
-    "Segurança, Sinalização e Multas":"Secretaria de Segurança Pública",
-    "Trabalho, Emprego e Renda":"Secretaria de Trabalho, Emprego e Renda",
-    "Transportes e Serviços Públicos":"Secretaria de Transportes e Serviços Públicos",
-    "Transportes, Serviços Públicos e Troca de Lâmpadas":"Secretaria de Transportes e Serviços Públicos",
-    "Urbanismo":"Secretaria de Urbanismo e Habitação",
-    "Vetores e Zoonoses (Combate à Dengue, Controle de Pragas, Criação Irregular de Animais e etc.)":"Secretaria de Saúde",
-    "Vigilância Sanitária":"Secretaria de Saúde",
-    "Obras":"Secretaria de Obras e Agricultura","Trabalho":"Secretaria de Trabalho, Emprego e Renda",
-    "Segurança":"Secretaria de Segurança Pública","Serviços Públicos e Troca de Lâmpadas":"Secretaria de Transportes e Serviços Públicos",
-    "Árvores":"Secretaria de Meio Ambiente","Controle de Pragas":"Secretaria de Saúde","Criação Irregular de Animais":"Secretaria de Saúde",
-    "Adolescente e Idoso":"Secretaria de Assistência Social e Direitos Humanos","Criança":"Secretaria de Assistência Social e Direitos Humanos",
-    "Emprego e Renda":"Secretaria de Trabalho, Emprego e Renda","Fiscalização Urbana":"Secretaria de Urbanismo e Habitação",
-    "Regularização e Registro de Imóveis":"Secretaria de Urbanismo e Habitação","Limpeza Urbana e Braço de Luz":"Secretaria de Obras e Agricultura",
-    "Meio Ambiente (Poluição Sonora)":"Secretaria de Meio Ambiente","Licenças e Fiscalizações Ambientais e etc.":"Secretaria de Meio Ambiente",
-    "Vetores e Zoonoses (Combate à Dengue)":"Secretaria de Saúde",
-    "Criação Irregular de Animais e etc.)":"Secretaria de Saúde","Licenças e Fiscalizações Ambientais e etc.)":"Secretaria de Meio Ambiente",
-    "Meio Ambiente (Poluição Sonora":"Secretaria de Meio Ambiente","Não se aplica":"Secretaria de Comunicação Social, Relações Públicas, Trabalho, Emprego e Renda",
-    "Sinalização e Multas":"Secretaria de Segurança Pública","Transportes":"Secretaria de Transportes e Serviços Públicos",
-    "Vetores e Zoonoses (Combate à Dengue":"Secretaria de Saúde",
-}
-MAP_EXACT_ORGAOS = { _norm_tema(k): v for k, v in MAP_TEMA_PARA_ORGAO.items() }
-
-def mapear_orgao_exato(celula_tema):
-    orgs = []
-    tema_as_str = str(celula_tema) if pd.notna(celula_tema) else ""
-    for t in _div_temas(tema_as_str):
-        t_norm = _norm_tema(t)
-        if t_norm and t_norm in MAP_EXACT_ORGAOS:
-            orgs.append(MAP_EXACT_ORGAOS[t_norm])
-    return " | ".join(dict.fromkeys(o.strip() for o in orgs if o and str(o).strip())) or None
-    
-# ============================================= 
-# 5) COLETA DE PROTOCOLOS EXISTENTES NA PLANILHA TRATADA - MANTIDO (com ajuste de logging)
-# =============================================
-_BANNER("5) COLETA DE PROTOCOLOS EXISTENTES NA PLANILHA TRATADA")
-
-try:
-    # ---------- CONSTANTES / IDs ----------
-    # Defina PLANILHA_TRATADA_ID no topo do arquivo ou altere aqui diretamente:
-    PLANILHA_TRATADA_ID = "1aF0I8pxABXhqyO2DmzBV9aoWHQN2h7LpTN-qdkGLc_g"  # <-- coloque aqui o ID CORRETO da planilha tratada fixa
-
-    # ---------- ABRE A PLANILHA TRATADA (única fonte) ----------
-    planilha_tratada_gs = gc.open_by_key(PLANILHA_TRATADA_ID) # Renomeado para evitar conflito com df_tratada
-    aba_tratada = planilha_tratada_gs.sheet1
-    logging.info(f"Planilha tratada '{PLANILHA_TRATADA_ID}' aberta.")
-
-    df_tratada = pd.DataFrame(aba_tratada.get_all_records())
-    df_tratada.columns = [normalizar_nome_coluna(c) for c in df_tratada.columns]
-
-    df_tratada = normalize_protocolo_col(df_tratada, "protocolo")
-    protocolos_existentes_set = set(df_tratada["protocolo"].astype(str).tolist())
-
-    # ---------- LÊ A ÚLTIMA PLANILHA BRUTA (reutiliza FOLDER_ID_BRUTA e helper) ----------
-    # IMPORTANTE: get_latest_spreadsheet_df deve existir (Item 2)
-    if 'FOLDER_ID_BRUTA' in globals():
-        folder_id = FOLDER_ID_BRUTA
-    else:
-        folder_id = "1qXj9eGauvOREKVgRPOfKjRlLSKhefXI5"  # fallback se não definido acima
-
-    latest_file_id, latest_file_name, df_bruta = get_latest_spreadsheet_df(folder_id, gc, drive_service)
-
-    # Normaliza colunas e protocolo da bruta
-    df_bruta.columns = [normalizar_nome_coluna(c) for c in df_bruta.columns]
-    df_bruta = normalize_protocolo_col(df_bruta, "protocolo")
-
-    # Marca novos protocolos (comparação com o conjunto da tratada)
-    df_bruta["eh_novo"] = ~df_bruta["protocolo"].isin(protocolos_existentes_set)
-    novos_protos = df_bruta.loc[df_bruta["eh_novo"], "protocolo"].tolist()
-
-    print(f"🔑 Protocolos já na planilha tratada: {len(protocolos_existentes_set)}")
-    print(f"🆕 Protocolos detectados como novos: {len(novos_protos)}")
-    logging.info(f"Protocolos já na planilha tratada: {len(protocolos_existentes_set)}")
-    logging.info(f"Protocolos detectados como novos: {novos_protos[:50]}")
-
-    # Log dos existentes que não serão enviados
-    nao_enviados = df_bruta.loc[~df_bruta["eh_novo"], "protocolo"].tolist()
-    print(f"⚠️ Protocolos existentes que não serão enviados (não novos): {len(nao_enviados)}")
-    logging.info(f"Protocolos existentes que não serão enviados: {nao_enviados[:50]}")
-
-    # Verificação final
-    if df_bruta.empty:
-        raise Exception("A planilha bruta mais recente está vazia ou não pôde ser lida.")
-
-    # Substitui df pelo df_bruta "oficial" para manter compatibilidade posterior
-    df = df_bruta.copy()
-
-except Exception as e:
-    print(f"⚠️ Erro ao carregar planilhas: {e}")
-    logging.warning(f"Erro ao carregar planilhas: {e}")
-    df_tratada = pd.DataFrame()
-    protocolos_existentes_set = set()
-    df = pd.DataFrame()
-    df["eh_novo"] = True
-    novos_protos = []
-    nao_enviados = []
-    
-# ========================================================
-# 6) LIMPEZA BÁSICA + RECORTE PARA NOVOS POR PROTOCOLO
-# ========================================================
-print("🧹 Limpando e identificando novos protocolos...")
-df_tratada_protocolos = df_tratada["protocolo"].astype(str).str.strip().tolist()
-df["protocolo"] = df["protocolo"].astype(str).str.strip()
-
-df["eh_novo"] = ~df["protocolo"].isin(df_tratada_protocolos)
-novos = df[df["eh_novo"] == True]
-existentes = df[df["eh_novo"] == False]
-
-print(f"🆕 Novos protocolos: {len(novos)}")
-print(f"🔄 Protocolos existentes: {len(existentes)}")
-logging.info(f"Novos protocolos: {len(novos)}, Existentes: {len(existentes)}")
-
-# ========================================================
-# 7) TRATAMENTOS E ATUALIZAÇÃO DE DADOS (somente NOVOS)
-# ========================================================
-_BANNER("7) TRATAMENTOS (somente NOVOS)")
-
-# Seleciona apenas os protocolos novos identificados no Item 5
-df_novos = df[df["eh_novo"] == True].copy()
-
-if df_novos.empty:
-    logging.info("Nenhum protocolo novo para tratamento.")
-else:
-    logging.info(f"Aplicando tratamentos em {len(df_novos)} protocolos novos. Shape inicial: {df_novos.shape}")
-
-def _tratar_full(df_in: pd.DataFrame) -> pd.DataFrame:
-    df_loc = df_in.copy()
-    logging.debug(f"Iniciando _tratar_full com DataFrame de shape: {df_loc.shape}")
-
-    # 7.1 Tema/Assunto — mantém 'não se aplica' → 'Assédio'
-    try:
-        if "tema" in df_loc.columns and "assunto" in df_loc.columns:
-            tema_tmp = df_loc["tema"].astype(str).str.strip().str.casefold()
-            assunto_tmp = df_loc["assunto"].astype(str).str.strip().str.casefold()
-            valores_assunto = ["outro", "outros", "na", "n/a", "n\\a", ""]
-            cond_42 = (tema_tmp == "não se aplica") & (assunto_tmp.isin(valores_assunto))
-            if int(cond_42.sum()):
-                df_loc.loc[cond_42, "assunto"] = "Assédio"
-                logging.info(f"Tratamento 7.1 (Assunto) aplicado a {int(cond_42.sum())} linhas.")
-            cond_41 = (tema_tmp == "não se aplica")
-            if int(cond_41.sum()):
-                df_loc.loc[cond_41, "tema"] = "Assédio"
-                logging.info(f"Tratamento 7.1 (Tema) aplicado a {int(cond_41.sum())} linhas.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.1 (Tema/Assunto): {e}", exc_info=True)
-
-    # 7.2 Data da conclusão → texto "DD/MM/AA" ou "Não concluído"
-    try:
-        if "data_da_conclusao" in df_loc.columns:
-            df_loc["data_da_conclusao"] = _conclusao_strict(df_loc["data_da_conclusao"])
-            df_loc["data_da_conclusao"] = df_loc["data_da_conclusao"].apply(
-                lambda x: x if pd.notna(x) and str(x).strip().lower() not in ["na", "nan", "n/a", ""] else "Não concluído"
-            )
-            logging.info("Tratamento 7.2 (Data da Conclusão) aplicado.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.2 (Data da Conclusão): {e}", exc_info=True)
-
-    # 7.3 Unidades de Cadastro e Saúde - LÓGICA CORRIGIDA
-    try:
-        # Trata a coluna 'unidade_cadastro'
-        if 'unidade_cadastro' in df_loc.columns:
-            # Aplica a limpeza de espaços e a capitalização inteligente
-            df_loc['unidade_cadastro'] = df_loc['unidade_cadastro'].astype(str).apply(_clean_whitespace).apply(_to_proper_case_pt)
-
-        # Trata colunas que contêm 'unidade_saude' (mantém a lógica original)
-        for col in [c for c in df_loc.columns if "unidade_saude" in c]:
-            df_loc[col] = (
-                df_loc[col].astype(str).str.strip().str.lower()
-                .replace("sem informação", "Não é uma Unidade de Saúde")
-                .str.capitalize()
-            )
-        logging.info("Tratamento 7.3 (Unidades de Cadastro e Saúde) aplicado.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.3: {e}", exc_info=True)
-
-    # 7.3.1 Tratamentos adicionais para unidade_cadastro
-    
-    try:
-        if "unidade_cadastro" in df_loc.columns:
-            # 1) Upas: Upa - Beira Mar -> UAC - UPA Beira Mar (robusto)
-            mask_upa_beira = df_loc["unidade_cadastro"].astype(str).str.replace(r"\s+", " ", regex=True).str.strip().str.lower().eq("upa - beira mar")
-            if mask_upa_beira.any():
-                df_loc.loc[mask_upa_beira, "unidade_cadastro"] = "UAC - UPA Beira Mar"
-                logging.info(f"Tratamento 7.3.1: Substituído 'Upa - Beira Mar' em {mask_upa_beira.sum()} linhas.")
-
-            # 2) Mapeamento de temas -> Ouvidoria responsável (para quando unidade_cadastro é 'Ouvidoria Setorial' genérico)
-            MAP_TEMA_PARA_OUVIDORIA = {
-                "administração pública": "Ouvidoria Geral",
-                "agricultura": "Ouvidoria Setorial de Obras",
-                "assistência social e direitos humanos": "",
-                "assuntos jurídicos": "Ouvidoria Geral",
-                "comunicação social": "Ouvidoria Geral",
-                "controle governamental": "Ouvidoria Geral",
-                "criança, adolescente e idoso": "Ouvidoria Setorial da Assistência Social",
-                "cultura e turismo": "Ouvidoria Geral",
-                "defesa civil": "Ouvidoria Geral",
-                "direitos à pessoa com deficiência": "Ouvidoria Setorial da Assistência Social",
-                "direitos e vantagens do servidor": "Ouvidoria Geral",
-                "educação": "Ouvidoria Setorial de Educação",
-                "empresas e legalizações": "Ouvidoria Setorial da Fazenda",
-                "esporte e lazer": "Ouvidoria Geral",
-                "fiscalização e tributos": "Ouvidoria Setorial da Fazenda",
-                "fiscalização urbana, regularização e registro de imóveis": "Ouvidoria Setorial de Urbanismo",
-                "fundec": "Ouvidoria Setorial da FUNDEC",
-                "governança": "Ouvidoria Geral",
-                "governo municipal e enterro gratuito": "Ouvidoria Geral",
-                "habitação": "Ouvidoria Setorial de Urbanismo",
-                "inclusão e acessibilidade": "Ouvidoria Geral",
-                "meio ambiente": "Ouvidoria Setorial de Meio Ambiente",
-                "meio ambiente (poluição sonora, árvores, licenças e fiscalizações ambientais e etc.)": "Ouvidoria Setorial de Meio Ambiente",
-                "assédio": "Ouvidoria Geral",
-                "obras públicas": "Ouvidoria Setorial de Obras",
-                "obras, limpeza urbana e braço de luz": "Ouvidoria Setorial de Obras",
-                "proteção animal": "Ouvidoria Geral",
-                "saúde": "Ouvidoria Setorial da Saúde",
-                "segurança pública": "Ouvidoria Geral de Segurança Pública",
-                "segurança, sinalização e multas": "Ouvidoria Geral de Segurança Pública",
-                "trabalho, emprego e renda": "Ouvidoria Geral",
-                "transportes e serviços públicos": "Ouvidoria Geral",
-                "transportes, serviços públicos e troca de lâmpadas": "Ouvidoria Geral",
-                "urbanismo": "Ouvidoria Setorial de Urbanismo",
-                "vetores e zoonoses (combate à dengue, controle de pragas, criação irregular de animais e etc.)": "Secretaria de Saúde",
-                "vigilância sanitária": "Ouvidoria Setorial da Saúde",
-                "obras": "Ouvidoria Setorial de Obras",
-                "trabalho": "Ouvidoria Geral",
-                "segurança": "Ouvidoria Setorial de Segurança Pública",
-                "serviços públicos e troca de lâmpadas": "Ouvidoria Geral",
-                "árvores": "Ouvidoria Setorial de Meio Ambiente",
-                "controle de pragas": "Ouvidoria Setorial da Saúde",
-                "criação irregular de animais": "Ouvidoria Setorial da Saúde",
-                "adolescente e idoso": "Ouvidoria Setorial da Assistência Social",
-                "criança": "Ouvidoria Setorial da Assistência Social",
-                "emprego e renda": "Ouvidoria Geral",
-                "fiscalização urbana": "Ouvidoria Setorial de Urbanismo",
-                "regularização e registro de imóveis": "Ouvidoria Setorial de Urbanismo",
-                "limpeza urbana e braço de luz": "Ouvidoria Setorial de Obras",
-                "meio ambiente (poluição sonora)": "Ouvidoria Setorial de Meio Ambiente",
-                "licenças e fiscalizações ambientais e etc.": "Ouvidoria Setorial de Meio Ambiente",
-                "vetores e zoonoses (combate à dengue)": "Ouvidoria Setorial da Saúde",
-                "sinalização e multas": "Ouvidoria Setorial de Segurança Pública",
-                "transportes": "Ouvidoria Geral",
-                # mantenha o dicionário estendido conforme necessário...
-            }
-            # normalizado (sem acento, lower, sem espaços extras)
-            MAP_TEMA_OUVID_NORM = { _norm_tema(k): v for k, v in MAP_TEMA_PARA_OUVIDORIA.items() }
-
-            def map_tema_para_ouvidoria(tema_val):
-                if pd.isna(tema_val) or str(tema_val).strip() == "":
-                    return "Ouvidoria Geral"
-                # pega a primeira correspondência possível considerando divisores
-                partes = _div_temas(tema_val)
-                for p in partes:
-                    pn = _norm_tema(p)
-                    if pn in MAP_TEMA_OUVID_NORM:
-                        return MAP_TEMA_OUVID_NORM[pn]
-                # fallback
-                return "Ouvidoria Geral"
-
-            # 2a) Detecta linhas onde unidade_cadastro é "Ouvidoria Setorial" genérico
-            mask_ouvidoria_setorial = df_loc["unidade_cadastro"].astype(str).str.match(r"(?i)^\s*ouvidoria\s+setorial\s*$", na=False)
-            n_mask = mask_ouvidoria_setorial.sum()
-            if n_mask:
-                # atribui a ouvidoria com base no tema
-                df_loc.loc[mask_ouvidoria_setorial, "unidade_cadastro"] = df_loc.loc[mask_ouvidoria_setorial, "tema"].apply(map_tema_para_ouvidoria)
-                logging.info(f"Tratamento 7.3.1: 'Ouvidoria Setorial' mapeada por tema em {n_mask} linhas.")
-
-            # 2b) Também trata variações contendo 'ouvidoria setorial' em texto (ex.: 'Ouvidoria Setorial de Saúde')
-            mask_ouvidoria_setorial_like = df_loc["unidade_cadastro"].astype(str).str.contains(r"(?i)\bouvidoria\s+setorial\b", na=False)
-            # para quem tem 'ouvidoria setorial' + mais detalhes, normalizamos para o termo mapeado por tema
-            mask_override = mask_ouvidoria_setorial_like & ~mask_ouvidoria_setorial
-            if mask_override.any():
-                df_loc.loc[mask_override, "unidade_cadastro"] = df_loc.loc[mask_override, "tema"].apply(map_tema_para_ouvidoria)
-                logging.info(f"Tratamento 7.3.1: Variantes contendo 'ouvidoria setorial' normalizadas por tema em {mask_override.sum()} linhas.")
-
-            # 3) Padronizar 'ouvidoria geral' (qualquer variante) -> 'Ouvidoria Geral'
-            mask_ouvidoria_geral = df_loc["unidade_cadastro"].astype(str).str.match(r"(?i)^\s*ouvidoria\s+geral\s*$", na=False)
-            if mask_ouvidoria_geral.any():
-                df_loc.loc[mask_ouvidoria_geral, "unidade_cadastro"] = "Ouvidoria Geral"
-                logging.info(f"Tratamento 7.3.1: Padronizado 'Ouvidoria Geral' em {mask_ouvidoria_geral.sum()} linhas.")
-
-            # 4) Limpeza final: aplica _clean_whitespace e formatação leve
-            df_loc["unidade_cadastro"] = df_loc["unidade_cadastro"].astype(str).apply(_clean_whitespace)
-            # Mantemos nomes de Ouvidoria em Title Case/Proper Case quando possível
-            df_loc["unidade_cadastro"] = df_loc["unidade_cadastro"].apply(lambda x: _to_proper_case_pt(x) if "ouvidoria" not in str(x).lower() and "uac - upa" not in str(x).lower() else x)
-
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.3.1 (unidade_cadastro extra): {e}", exc_info=True)
-        
-    # 7.4 Órgãos por tema — LÓGICA SIMPLIFICADA E CORRIGIDA
-    try:
-        # Passo A: Cria a coluna 'orgaos' chamando a função global
-        if "tema" in df_loc.columns:
-            df_loc["tema"] = df_loc["tema"].astype(str)
-            df_loc["orgaos"] = df_loc["tema"].apply(mapear_orgao_exato)
-        else:
-            df_loc["orgaos"] = None
-        
-        # Passo B: Aplica o fallback para valores nulos/vazios
-        fallback_value = "Secretaria de Comunicação, Relações Públicas, Trabalho, Emprego e Renda"
-        df_loc["orgaos"].fillna(fallback_value, inplace=True)
-        # Garante que strings que são apenas espaços em branco também recebam o fallback
-        df_loc.loc[df_loc["orgaos"].str.strip() == '', "orgaos"] = fallback_value
-        
-        # Passo C: Executa a sequência de limpeza e capitalização
-        df_loc["orgaos"] = df_loc["orgaos"].apply(_clean_whitespace).astype(str)
-        df_loc["orgaos"] = df_loc["orgaos"].apply(_to_proper_case_pt)
-        logging.info("Tratamento 7.4 (Limpeza e Capitalização com Acentos) aplicado a 'orgaos'.")
-
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.4 (Órgãos por tema): {e}", exc_info=True)
-
-    # 7.5 Padronização 'servidor' (dicionário completo)
-    try:
-        if "servidor" in df_loc.columns:
-            dicionario_servidor = {
-                "Camila do Lago Marins": "Camila Marins", "Camila Marins": "Camila Marins",
-                "Dhayane Cristina Pinho de Almeida": "Dhayane Cristina Pinho de Almeida", "Dhayane Pinho": "Dhayane Cristina Pinho de Almeida",
-                "Joana Darc Salles Ferreira": "Joana Darc Salles Ferreira", "Joana Salles": "Joana Darc Salles Ferreira",
-                "Lucia Helena Tinoco Pacehco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
-                "Lucia  Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lúcia  Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
-                "Lúcia Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helenba Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
-                "Lucia Helana Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
-                "Rafaella Marques Gomes Santos": "Rafaella Marques Gomes Santos",
-                "Roilene Pereira da Silva": "Rosilene Pereira da Silva", "Rosilene Pereira da Silva": "Rosilene Pereira da Silva",
-                "Stephanie dos Santos Silva": "Stephanie dos Santos Silva", "Stephanie Santos": "Stephanie dos Santos Silva",
-                "Stéphanie Santos": "Stephanie dos Santos Silva", "Stéphaniesantos": "Stephanie dos Santos Silva",
-                "Stpehanie Santos": "Stephanie dos Santos Silva",
-                "Anne Beatriz da Silva": "Anne Beatriz da Silva Rodrigues", "Bruna Maria ( Coordenadora)": "Cidadão",
-                "Isabel": "Cidadão", "Gabriela da Silva Rozi": "Cidadão", "Lana Carolina Mesquita de Andrade": "Cidadão",
-                "Lívia Cavalcante": "Lívia Kathleen Cavalcante Patriota Leite", "Lívia Kathleen Cavalcante Patriota Leite": "Lívia Kathleen Cavalcante Patriota Leite",
-                "Lucia Helena": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helena Tinoco": "Lúcia Helena Tinoco Pacheco Varella",
-                "Lucia Helena Tinoco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helen Tinoco Varella": "Lúcia Helena Tinoco Pacheco Varella",
-                "Lucia Helan Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helena  Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
-                "Lucia Helena Tinoco Pachewco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lúcia Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
-                "Talita Mrques Ferrari": "Talita Marques Ferrari", "Talita  Marques Ferrari": "Talita Marques Ferrari",
-                "Mery": "Cidadão", "Ouvidoria Geral (Adm)": "Cidadão", "Rafaella Marques": "Rafaella Marques Gomes Santos",
-                "Ronaldo de Oliveira Brandão": "Cidadão", "Séphanie Santos": "Stephanie dos Santos Silva",
-                "Shirley Santana": "Cidadão", "Stépanie Santos": "Stephanie dos Santos Silva",
-                "Stéphanie  Santos": "Stephanie dos Santos Silva", "Stéphanie Santos": "Stephanie dos Santos Silva",
-                "Stephanie dos Santos": "Stephanie dos Santos Silva", "Stéphanie Santoa": "Stephanie dos Santos Silva",
-                "Stephanie Santos": "Stephanie dos Santos Silva", "Stephanie dos Santos": "Stephanie dos Santos Silva",
-                "Stephanie Santos": "Stephanie dos Santos Silva", "Stéphanie dos Santos Silva": "Stephanie dos Santos Silva", "Thamires Manhães": "Cidadão",
-                "Alexsandra de Castro Freire": "Cidadão"
-            }
-            _orig = df_loc["servidor"].astype(str).str.strip()
-            df_loc["servidor"] = _orig.map(dicionario_servidor).fillna(_orig)
-            logging.info("Tratamento 7.5 (Padronização 'servidor') aplicado.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.5 (Padronização 'servidor'): {e}", exc_info=True)
-
-    # 7.6 Responsavel - LÓGICA CORRIGIDA E UNIFICADA
-    try:
-        if "responsavel" in df_loc.columns:
-            df_loc["responsavel"] = df_loc["responsavel"].astype(str).apply(_clean_whitespace)
-            df_loc["responsavel"] = df_loc["responsavel"].str.replace(r"^\s*ouvidoria\s+geral\s*$", "Ouvidoria Geral", regex=True, case=False)
-            df_loc["responsavel"] = df_loc["responsavel"].str.replace(r"^\s*ouvidoria\s+setorial\s+de\s+obras\s*$", "Ouvidoria Setorial de Obras", regex=True, case=False)
-            df_loc["responsavel"] = df_loc["responsavel"].str.replace(r"^\s*ouvidoria\s+setorial\s+da\s+sa(u|ú)de\s*$", "Ouvidoria Setorial da Saúde", regex=True, case=False)
-            df_loc["responsavel"] = df_loc["responsavel"].str.replace(r"^\s*cidadao\s*$", "Cidadão", regex=True, case=False)
-            df_loc["responsavel"] = df_loc["responsavel"].str.replace(r"^\s*(Sim|True)\s*$", "Cidadão", regex=True, case=False)
-            df_loc.loc[df_loc["responsavel"].str.strip() == '', "responsavel"] = "Não Informado"
-            logging.info("Tratamento 7.6 (Unificado para 'responsavel') aplicado.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.6 (Responsavel): {e}", exc_info=True)
-
-    # ------------------------------------------------------------
-    # 7.6.1 Mapeamento de 'responsavel' -> Ouvidoria (aplica somente em df_novos)
-    # ------------------------------------------------------------
-    try:
-        if "responsavel" in df_loc.columns:
-            map_responsavel_para_ouvidoria = {
-                "1ª Residência de Obras": "Ouvidoria Setorial de Obras",
-                "2ª Residência de Obras A": "Ouvidoria Setorial de Obras",
-                "2ª Residência de Obras B": "Ouvidoria Setorial de Obras",
-                "3ª Residência de Obras": "Ouvidoria Setorial de Obras",
-                "Aitana de Jesus Santos": "Ouvidoria Setorial de Obras",
-                "Amanda Fernandes de Oliveira": "Ouvidoria Setorial de Obras",
-                "Ana Paula Cassiano de Oliveira": "Ouvidoria Setorial de Obras",
-                "Brenda Rhaianny Machado Lima": "Ouvidoria Setorial de Urbanismo",
-                "Departamento de Fiscalização (Meio Ambiente)": "Ouvidoria Setorial de Meio Ambiente",
-                "GPE": "Ouvidoria Setorial de Obras",
-                "Guilherme Gomes": "Ouvidoria Setorial de Obras",
-                "Jessica Cristina Soares Trajano da Rocha": "Ouvidoria Setorial de Obras",
-                "Ouvidoria Geral (ADM)": "Ouvidoria Geral",
-                "Priscila Tavares Salcedo": "Ouvidoria Setorial de Obras",
-                "Secretaria Municipal de Obras": "Ouvidoria Setorial de Obras",
-                "Secretaria Municipal de Segurança Pública": "Ouvidoria Setorial de Segurança Pública",
-                "Secretaria Municipal de Transportes e Serviços Públicos": "Ouvidoria Geral",
-                "Superintendência de Limpeza Urbana": "Ouvidoria Setorial de Obras",
-                "Thayná Cristina Dias de Souza": "Ouvidoria Setorial de Obras",
-            }
-
-            # Normaliza chaves para lookup tolerante (remove acentos, lower, trim)
-            _map_resp_norm = { _canon_txt(k): v for k, v in map_responsavel_para_ouvidoria.items() }
-
-            def _map_responsavel_to_ouvidoria(valor):
-                if pd.isna(valor) or str(valor).strip() == "":
-                    return valor
-                key = _canon_txt(str(valor))
-                return _map_resp_norm.get(key, valor)  # mantém original caso não exista no dicionário
-
-            # Aplicação e logging de QA
-            before_vals = df_loc["responsavel"].astype(str).copy()
-            df_loc["responsavel"] = df_loc["responsavel"].astype(str).apply(_map_responsavel_to_ouvidoria)
-            changed_mask = before_vals != df_loc["responsavel"].astype(str)
-            changed_count = int(changed_mask.sum())
-            logging.info(f"Tratamento 7.6.1: Mapeamento de 'responsavel' aplicado. {changed_count} linhas alteradas.")
-    except Exception as e:
-        logging.error(f"Erro no mapeamento 7.6.1 da coluna 'responsavel': {e}", exc_info=True)
-
-    # 7.7 Datas e tipos
-    try:
-        if "data_da_criacao" in df_loc.columns:
-            df_loc["data_da_criacao"] = _parse_dt_cmp(df_loc["data_da_criacao"]) # <-- Retorna objeto de data
-            logging.info("Tratamento 7.7 (data_da_criacao para objeto datetime) aplicado.")
-        if "status_demanda" in df_loc.columns:
-            df_loc["status_demanda"] = df_loc["status_demanda"].astype(str)
-            logging.info("Tratamento 7.7 (status_demanda) tipo aplicado.")
-        if "data_da_conclusao" in df_loc.columns:
-            df_loc["data_da_conclusao"] = _conclusao_strict(df_loc["data_da_conclusao"])
-            logging.info("Tratamento 7.7 (data_da_conclusao) strict aplicado.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.7 (Datas e Tipos): {e}", exc_info=True)
-
-    # 7.8 Regra de ouro: se CONCLUÍDA => 'prazo_restante' = 'Demanda Concluída'
-    try:
-        if "status_demanda" in df_loc.columns and "prazo_restante" in df_loc.columns:
-            mask_conc = df_loc["status_demanda"].map(_is_concluida)
-            if mask_conc.any():
-                df_loc.loc[mask_conc, "prazo_restante"] = "Demanda Concluída"
-                logging.info(f"Tratamento 7.8 (prazo_restante p/ concluída) aplicado para {mask_conc.sum()} linhas.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.8 (Prazo Restante): {e}", exc_info=True)
-
-    # 7.9 Padronização da coluna 'canal'
-    try:
-        if "canal" in df_loc.columns:
-            df_loc["canal"] = df_loc["canal"].astype(str)
-            df_loc["canal"] = df_loc["canal"].str.replace(r"^\s*(Colab Gov|Portal Cidadão|Fala.BR|Online)\s*$", "Aplicativo Colab", regex=True, case=False)
-            logging.info("Tratamento 7.9 (Padronização de 'canal') aplicado.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento de 'canal': {e}", exc_info=True)
-
-    # =======================================================================
-    # 7.10 Limpeza de "Não há dados" para tempo_de_resolucao_em_dias (REFATORADO)
-    # =======================================================================
-    try:
-        if "tempo_de_resolucao_em_dias" in df_loc.columns:
-            raw = df_loc["tempo_de_resolucao_em_dias"]
-
-            # Converte para string temporariamente para detectar tokens inválidos
-            s = raw.astype(str).str.strip()
-
-            # Marca tokens que devem ser considerados como "sem dado"
-            invalid_tokens = {"nan", "none", "na", "não há dados", "n/a", ""}
-            mask_invalid = s.str.lower().isin(invalid_tokens)
-
-            # Substitui os inválidos por NA (pd.NA)
-            s = s.where(~mask_invalid, pd.NA)
-
-            # Em valores válidos, padroniza vírgula decimal para ponto
-            if s.notna().any():
-                s.loc[s.notna()] = s.loc[s.notna()].str.replace(",", ".", regex=False)
-
-            # Converte para numérico (erros -> NaN)
-            df_loc["tempo_de_resolucao_em_dias"] = pd.to_numeric(s, errors="coerce")
-
-            logging.info("Tratamento 7.10 (Limpeza e conversão numérica de 'tempo_de_resolucao_em_dias') aplicado.")
-    except Exception as e:
-        logging.error(f"Erro no tratamento 7.10 (tempo_de_resolucao_em_dias): {e}", exc_info=True)
-
-   # --- NORMALIZAÇÃO PADRÃO DAS UACs (aplica-se aos registros que estão sendo tratados em _tratar_full) ---
-    try:
-        if "unidade_cadastro" in df_loc.columns:
-            import unicodedata
-            # trim e normalização básica (preserva NaNs)
-            df_loc.loc[:, "unidade_cadastro"] = df_loc["unidade_cadastro"].astype(object).where(
-                pd.notna(df_loc["unidade_cadastro"]), None
-            )
-
-            def _norm_text_for_match(s):
-                if s is None:
-                    return ""
-                # normaliza acentos e reduz múltiplos espaços
-                s = str(s).strip()
-                s = unicodedata.normalize("NFKD", s)
-                s = "".join(ch for ch in s if not unicodedata.combining(ch))
-                s = re.sub(r"\s+", " ", s)
-                return s.lower().strip()
-
-            # mapa explícito (chaves em minúsculas, sem acentos) para exceções conhecidas
-            uac_mapa = {
-                "uac - cer iv": "UAC - CER IV",
-                "uac - cer iv ": "UAC - CER IV",
-                "uac - cer iv": "UAC - CER IV",
-
-                "uac - uph pilar": "UAC - UPH Pilar",
-                "uac - uph saracuruna": "UAC - UPH Saracuruna",
-                "uac - uph xerem": "UAC - UPH Xerém",
-
-                "uac - upa beira mar": "UAC - UPA Beira Mar",
-
-                "uac - hospital do olho": "UAC - Hospital do Olho",
-
-                # novas correções solicitadas
-                "uac - adao pereira nunes": "UAC - Adão Pereira Nunes",
-                "ouvidoria setorial da assistencia social": "Ouvidoria Setorial da Assistência Social",
-                "Ouvidoria Setorial de Assistência Social": "Ouvidoria Setorial da Assistência Social",
-
-                # redundâncias comuns
-                "uac - uac cer iv": "UAC - CER IV",
-                "uac - uac uph pilar": "UAC - UPH Pilar",
-                "uac - uac uph saracuruna": "UAC - UPH Saracuruna",
-                "uac - uac uph xerem": "UAC - UPH Xerém",
-
-                # Ouvidorias / cidadania
-                "ouvidoria geral": "Ouvidoria Geral",
-                "ouvidoria setorial da saude": "Ouvidoria Setorial da Saúde",
-                "cidadao": "Cidadão",
-                "cidadão": "Cidadão"
-            }
-
-            # palavras que devem ficar em minúsculas quando no meio do nome
-            small_words = {"do", "da", "de", "dos", "das", "e", "em", "na", "no", "para", "por", "com"}
-            # acrônimos que devem ficar em maiúsculas
-            acronyms = {"uac", "upa", "uph", "cer", "iv", "ubs", "cm", "psf"}
-
-            # cria coluna auxiliar para matching
-            tmp_raw = df_loc["unidade_cadastro"].astype(object).where(pd.notna(df_loc["unidade_cadastro"]), "")
-            tmp_norm = tmp_raw.map(_norm_text_for_match)
-
-            # aplica mapeamento explícito (prioritário)
-            mapped = tmp_norm.replace(uac_mapa)
-            is_mapped = mapped != tmp_norm
-
-            # regra genérica: se começar com "uac - " ou "upa - " etc, formata mantendo acrônimos
-            mask_uac = tmp_norm.str.match(r"^\s*(uac|upa|uph)\s*-\s*", na=False)
-
-            formatted = tmp_raw.copy()
-
-            # (1) entradas mapeadas
-            formatted[is_mapped] = mapped[is_mapped]
-
-            # (2) regras UAC/UPA/UPH não mapeadas
-            idx_to_fmt = mask_uac & (~is_mapped)
-            if idx_to_fmt.any():
-                def _pretty_after_prefix(s):
-                    if not isinstance(s, str) or s.strip() == "":
-                        return s
-                    m = re.match(r"^\s*(?P<prefix>(uac|upa|uph))\s*-\s*(?P<rest>.+)$", _norm_text_for_match(s), flags=0)
-                    if not m:
-                        return s.strip().title()
-                    prefix = m.group("prefix").upper()
-                    rest = m.group("rest")
-                    words = re.split(r"\s+", rest)
-                    out_words = []
-                    for w in words:
-                        w_clean = w.strip()
-                        if w_clean == "":
-                            continue
-                        if w_clean in acronyms:
-                            out_words.append(w_clean.upper())
-                        elif w_clean.lower() in small_words:
-                            out_words.append(w_clean.lower())
-                        else:
-                            out_words.append(w_clean.capitalize())
-                    return f"{prefix} - {' '.join(out_words)}"
-
-                for idx in tmp_raw[idx_to_fmt].index:
-                    formatted[idx] = _pretty_after_prefix(tmp_raw.at[idx])
-
-            # (3) capitalização inteligente (sem acentos)
-            idx_other = (~is_mapped) & (~idx_to_fmt) & (tmp_norm != "")
-            if idx_other.any():
-                def _smart_title(s):
-                    if not isinstance(s, str) or s.strip() == "":
-                        return s
-                    words = re.split(r"\s+", _norm_text_for_match(s))
-                    out = []
-                    for i, w in enumerate(words):
-                        if w in acronyms:
-                            out.append(w.upper())
-                        elif w.lower() in small_words and i != 0:
-                            out.append(w.lower())
-                        else:
-                            out.append(w.capitalize())
-                    return " ".join(out)
-                for idx in tmp_raw[idx_other].index:
-                    formatted[idx] = _smart_title(tmp_raw.at[idx])
-
-            formatted = formatted.replace("", None)
-            df_loc.loc[:, "unidade_cadastro"] = formatted.astype(object)
-
-            logging.info("Normalização UAC aplicada em _tratar_full para 'unidade_cadastro'.")
-    except Exception as e:
-        logging.warning(f"Falha ao normalizar UACs dentro de _tratar_full: {e}")
-
-    # ------------------------------------------------------------
-    # FINALIZAÇÃO: garante sempre retorno do DataFrame tratado
-    # ------------------------------------------------------------
-    try:
-        logging.debug(f"Finalizando _tratar_full. Shape final: {df_loc.shape}")
-    except Exception:
-        # em caso de problemas ao acessar shape, ainda retornamos o df_loc (defensivo)
-        pass
-
-    # Garantir retorno explícito em qualquer caminho de execução
-    return df_loc
-
-# Aplica o tratamento aos novos protocolos
-try:
-    if not df_novos.empty:
-        df_novos = _tratar_full(df_novos)
-        logging.info(f"Tratamento full aplicado a {len(df_novos)} protocolos novos.")
-    else:
-        logging.info("df_novos está vazio, pulando _tratar_full.")
-except Exception as e:
-    logging.critical(f"Erro CRÍTICO ao aplicar _tratar_full em df_novos: {e}", exc_info=True)
-    # Dependendo da severidade, você pode querer levantar a exceção ou parar o pipeline.
-    raise
-
-# QA pós _tratar_full global para df_novos
-if not df_novos.empty:
-    for col in ['orgaos', 'responsavel', 'status_demanda', 'data_da_conclusao']:
-        if col in df_novos.columns:
-            empty_count = df_novos[col].astype(str).str.strip().isin(['', 'nan', 'none', 'n/a', 'não informado']).sum()
-            if empty_count > 0:
-                logging.warning(
-                    f"QA Pós-Tratamento (df_novos): Coluna '{col}' contém {empty_count} valores vazios/inválidos/não informados. "
-                    f"Exemplos: {df_novos.loc[df_novos[col].astype(str).str.strip().isin(['', 'nan', 'none', 'n/a', 'não informado']), col].unique()[:5].tolist()}"
-                )
-
-            # Verificação de tipos para garantir que são strings
-            if not pd.api.types.is_string_dtype(df_novos[col]):
-                logging.error(
-                    f"QA Pós-Tratamento (df_novos): Coluna '{col}' não é do tipo string após tratamento. Tipo atual: {df_novos[col].dtype}. Convertendo para string."
-                )
-                df_novos[col] = df_novos[col].astype(str)
-                
-# ========================================================
-# 8) ATUALIZAÇÃO NA PLANILHA TRATADA — APENAS NOVOS
-# ========================================================
-_BANNER("8) ATUALIZAÇÃO NA PLANILHA TRATADA — APENAS NOVOS")
-
-# ----------------------------------------------------------
-# GARANTE QUE df_bruta EXISTE E TEM A COLUNA 'protocolo'
-# ----------------------------------------------------------
-try:
-    if 'df_bruta' not in globals() or df_bruta.empty:
-        raise SystemExit("❌ df_bruta não está definido ou está vazio. Carregue a base bruta antes do Item 8.")
-    logging.info(f"df_bruta presente e com shape: {df_bruta.shape}")
-
-    df_bruta.columns = [normalizar_nome_coluna(c) for c in df_bruta.columns] # Garante que está normalizado
-    df_bruta = normalize_protocolo_col(df_bruta, "protocolo") # Garante que protocolo está padronizado
-    logging.debug("Colunas e protocolos de df_bruta normalizados.")
-except Exception as e:
-    logging.critical(f"Erro na checagem inicial de df_bruta no Item 8: {e}", exc_info=True)
-    raise
-
-# ----------------------------------------------------------
-# CARREGA PLANILHA TRATADA E OBTÉM PROTOCOLOS EXISTENTES
-# ----------------------------------------------------------
-
-try:
-    if 'client' not in globals() or client is None:
-        raise SystemExit("❌ Cliente gspread não autenticado. Verifique Item 1.")
-
-    PLANILHA_TRATADA_ID = "1aF0I8pxABXhqyO2DmzBV9aoWHQN2h7LpTN-qdkGLc_g"
-    planilha_tratada_gs = client.open_by_key(PLANILHA_TRATADA_ID)
-    aba_tratada = planilha_tratada_gs.sheet1
-    logging.info(f"Planilha tratada '{PLANILHA_TRATADA_ID}' aberta.")
-except Exception as e:
-    logging.critical(f"Erro ao abrir a planilha tratada ou autenticar no Item 8: {e}", exc_info=True)
-    raise
-
-try:
-    df_tratada_existente = pd.DataFrame(aba_tratada.get_all_records())
-    df_tratada_existente.columns = [normalizar_nome_coluna(c) for c in df_tratada_existente.columns]
-    logging.info(f"df_tratada_existente carregado com shape: {df_tratada_existente.shape}")
-
-    protocolos_existentes_set_final = set()
-    if "protocolo" in df_tratada_existente.columns:
-        df_tratada_existente["protocolo"] = df_tratada_existente["protocolo"].astype(str).str.strip().str.upper()
-        protocolos_existentes_set_final = set(df_tratada_existente["protocolo"])
-        logging.debug(f"Set de protocolos existentes criado com {len(protocolos_existentes_set_final)} itens.")
-    else:
-        logging.warning("Coluna 'protocolo' não encontrada em df_tratada_existente. Não será possível identificar protocolos existentes.")
-
-    cols_alvo_tratada = list(df_tratada_existente.columns)
-    if df_tratada_existente.empty:
-        if 'df_novos' in globals() and not df_novos.empty:
-            cols_alvo_tratada = list(df_novos.columns)
-            logging.info("Planilha tratada vazia, usando colunas de df_novos como referência para o schema.")
-        elif not df_bruta.empty:
-            cols_alvo_tratada = list(df_bruta.columns)
-            logging.info("Planilha tratada vazia e df_novos vazio, usando colunas de df_bruta como referência para o schema.")
-        else:
-            logging.error("Não foi possível determinar o schema da planilha tratada. df_tratada_existente, df_novos e df_bruta estão vazios.")
-            raise ValueError("Não foi possível determinar o schema da planilha tratada.")
-    logging.debug(f"Colunas alvo da planilha tratada: {cols_alvo_tratada}")
-
-except Exception as e:
-    logging.critical(f"Erro ao processar df_tratada_existente ou definir schema alvo no Item 8: {e}", exc_info=True)
-    raise
-
-# ===========================
-# SYNC: sincronizar tempo_de_resolucao_em_dias (BRUTA -> TRATADA)
-# ===========================
-
-# --- PRÉ-TRATAMENTO SIMPLES: limpa "Não há dados" na bruta antes do sync ---
-try:
-    if "tempo_de_resolucao_em_dias" in df_bruta.columns:
-        df_bruta["tempo_de_resolucao_em_dias"] = (
-            df_bruta["tempo_de_resolucao_em_dias"]
-            .astype(str)
-            .replace(
-                to_replace=[r"(?i)^\s*(não\s*há\s*dados|nao\s*ha\s*dados|nan|none|n/a|na|n\.a\.)\s*$"],
-                value="",
-                regex=True
-            )
-            .replace("None", "")
-            .replace("NaN", "")
-        )
-        logging.info("Pré-tratamento: 'Não há dados' convertido para vazio na coluna tempo_de_resolucao_em_dias (bruta).")
-except Exception as e:
-    logging.warning(f"Falha ao normalizar 'Não há dados' antes do sync: {e}")
-    
-# Inserir IMEDIATAMENTE após carregar df_tratada_existente e df_bruta (Item 8)    
-def _convert_tempo_value_raw(v, convert_na_tokens=True):
-    """
-    Mantém o valor o mais 'bruto' possível:
-    - preserva ints/floats como números
-    - tenta converter strings numéricas para int/float
-    - converte tokens de 'Não há dados' para '' (vazio) se convert_na_tokens=True
-    """
-    na_tokens = {"nao ha dados", "não há dados", "não ha dados", "nan", "none", "n/a", "na", ""}
-    if pd.isna(v):
-        return ""
-    # se já for numérico, preserva
-    if isinstance(v, (int, np.integer)):
-        return int(v)
-    if isinstance(v, (float, np.floating)):
-        # se for inteiro em float, torna int
-        if float(v).is_integer():
-            return int(round(v))
-        return float(v)
-    s = str(v).strip()
-    if convert_na_tokens and s:
-        sval = unicodedata.normalize("NFKD", s).lower()
-        sval = re.sub(r"\s+", " ", sval).strip()
-        if sval in na_tokens:
-            return ""
-    # tenta interpretar números em strings (ex: "12", "12,0", "12,5")
-    s_num = s.replace(",", ".")
-    if re.fullmatch(r"-?\d+", s_num):
-        try:
-            return int(s_num)
-        except:
-            pass
-    if re.fullmatch(r"-?\d+\.\d+", s_num):
-        try:
-            f = float(s_num)
-            if f.is_integer():
-                return int(round(f))
-            return f
-        except:
-            pass
-    # fallback: preserva string original (não strip extra, já strip feito)
-    return s
-
-def sync_tempo_de_resolucao_bruta_para_tratada(df_bruta_local, df_tratada_local, sheet_obj, protocolo_col="protocolo", tempo_col="tempo_de_resolucao_em_dias", convert_na_tokens=True):
-    """
-    Sincroniza EXATAMENTE a coluna tempo_col da bruta para a tratada.
-    - df_bruta_local: DataFrame da base bruta (já normalizado)
-    - df_tratada_local: DataFrame carregado da planilha tratada (já normalizado)
-    - sheet_obj: objeto gspread worksheet (aba_tratada)
-    Retorna df_tratada_local atualizado (em memória) e faz update em massa no sheet_obj.
-    """
-    # checagens mínimas
-    if df_bruta_local is None or df_bruta_local.empty:
-        logging.info("df_bruta vazio — nada a sincronizar para tempo_de_resolucao_em_dias.")
-        return df_tratada_local
-    if df_tratada_local is None or df_tratada_local.empty:
-        logging.info("df_tratada vazio — nada a sincronizar (sheet pode estar vazio).")
-        return df_tratada_local
-
-    # Garante colunas de protocolo normalizadas e em uppercase para matching robusto
-    df_b = df_bruta_local.copy()
-    df_t = df_tratada_local.copy()
-    if protocolo_col not in df_b.columns or protocolo_col not in df_t.columns:
-        logging.warning(f"Coluna '{protocolo_col}' ausente em bruta ou tratada — abortando sync.")
-        return df_tratada_local
-
-    df_b[protocolo_col] = df_b[protocolo_col].astype(str).str.strip().str.upper()
-    df_t[protocolo_col] = df_t[protocolo_col].astype(str).str.strip().str.upper()
-
-    # Constroi mapa protocolo -> valor original bruto (mantendo ordem de leitura mais recente se houver duplicatas)
-    # Se desejar priorizar a última ocorrência na bruta, keep='last'
-    map_bruta = df_b.dropna(subset=[protocolo_col]).set_index(protocolo_col)[tempo_col].to_dict()
-
-    # Backup local da coluna antiga da tratada (CSV)
-    try:
-        backup_series = df_t.get(tempo_col, pd.Series([""] * len(df_t)))
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-        backup_fn = f"backup_tempo_de_resolucao_tratada_{timestamp}.csv"
-        backup_series.to_csv(backup_fn, index=False, header=[tempo_col], encoding="utf-8-sig")
-        logging.info(f"Backup da coluna '{tempo_col}' (tratada) salvo em: {backup_fn}")
-    except Exception as e:
-        logging.warning(f"Falha ao salvar backup local da coluna '{tempo_col}': {e}")
+"""
+Ponto de entrada do workflow agendado (rodar_pipeline.yml).
 
-    # Prepara nova coluna para escrita (preserva ordem das linhas da planilha tratada)
-    new_col_values = []
-    # Cria lista de protocolos da tratada conforme df_tratada_local (mesma ordem)
-    protocolos_tratada = df_t[protocolo_col].astype(str).tolist()
+Roda exatamente o mesmo código que Pipeline/main.py: o pacote
+Pipeline/tratamento e seu main(). Não há lógica de pipeline aqui.
+"""
 
-    for prot in protocolos_tratada:
-        prot_key = (prot or "").strip().upper()
-        if prot_key in map_bruta:
-            raw_val = map_bruta[prot_key]
-            out_val = _convert_tempo_value_raw(raw_val, convert_na_tokens=convert_na_tokens)
-        else:
-            # se não existe na bruta, mantém o valor atual da tratada (para evitar sobrescrever)
-            cur_val = df_t.loc[df_t[protocolo_col] == prot_key, tempo_col] if tempo_col in df_t.columns else pd.Series([""])
-            if isinstance(cur_val, pd.Series) and not cur_val.empty:
-                out_val = _convert_tempo_value_raw(cur_val.iloc[0], convert_na_tokens=convert_na_tokens)
-            else:
-                out_val = ""
-        new_col_values.append(out_val)
-
-    # Atualiza df_tratada_local em memória (mantendo tipos coerentes)
-    df_tratada_local[tempo_col] = new_col_values
-
-    # --- ESCRITA EM BLOCO NO GOOGLE SHEETS (aplica apenas a coluna) ---
-    try:
-        # recupera todos os valores atuais para obter nº de linhas verdadeiras
-        all_vals = sheet_obj.get_all_values()
-        if not all_vals:
-            logging.warning("Aba tratada sem valores (get_all_values retornou vazio). Não será possível atualizar a coluna via API.")
-            return df_tratada_local
-
-        n_rows = len(all_vals)
-        header = all_vals[0]
-        # encontra índice da coluna no sheet
-        try:
-            col_idx = header.index(tempo_col) + 1  # 1-based
-        except ValueError:
-            # tenta localizar coluna por nome similar (sem acento e lower)
-            header_norm = [normalizar_nome_coluna(h) for h in header]
-            try:
-                col_idx = header_norm.index(normalizar_nome_coluna(tempo_col)) + 1
-            except ValueError:
-                logging.warning(f"Coluna '{tempo_col}' não encontrada no header da sheet — abortando update em sheet.")
-                return df_tratada_local
-
-        # monta lista de valores para update: inclui header + as linhas (deve ter tamanho n_rows)
-        # Se df_tratada_local tem menos linhas que a sheet (possível), preenche com "" para linhas extras.
-        # Lembrando: get_all_records ignorou header, portanto df_tratada_local rows == n_rows-1 normalmente.
-        # Construímos valores para a faixa desde linha 2 até n_rows (preservando header na linha 1)
-        values_for_rows = []
-        # se sheet tem header na linha 1, começamos em linha 2
-        for i in range(1, n_rows):  # i indexes sheet data rows (0 is header)
-            # df_tratada_local is expected to align by index with sheet data rows, but se não, tentamos mapear por protocolo
-            try:
-                prot_sheet = all_vals[i][0].strip().upper() if len(all_vals[i]) > 0 else ""
-            except:
-                prot_sheet = ""
-            # preferimos usar new_col_values na mesma ordem se os protocolos baterem; caso contrário fallback
-            if i-1 < len(new_col_values):
-                candidate = new_col_values[i-1]
-            else:
-                candidate = ""
-            # Candidate pode ser numeric (int/float) ou string. gspread aceita números.
-            values_for_rows.append([candidate])
-
-        # Determina range A1 notation para a coluna (da linha 2 até n_rows)
-        import gspread.utils
-        start_a1 = gspread.utils.rowcol_to_a1(2, col_idx)
-        end_a1 = gspread.utils.rowcol_to_a1(n_rows, col_idx)
-        range_a1 = f"{start_a1}:{end_a1}"
-
-        # Executa o update em massa
-        sheet_obj.update(range_a1, values_for_rows)
-        logging.info(f"Coluna '{tempo_col}' sincronizada da bruta para tratada — range atualizado: {range_a1} ({len(values_for_rows)} linhas).")
-    except Exception as e:
-        logging.exception(f"Erro ao atualizar a coluna '{tempo_col}' na planilha tratada: {e}")
-
-    return df_tratada_local
-
-# === Invocação imediata (colocar aqui no Item 8, após carregar df_tratada_existente e df_bruta) ===
-try:
-    # aba_tratada já existe no seu escopo (gspread worksheet)
-    df_tratada_existente = sync_tempo_de_resolucao_bruta_para_tratada(
-        df_bruta_local = df_bruta, 
-        df_tratada_local = df_tratada_existente, 
-        sheet_obj = aba_tratada,
-        protocolo_col = "protocolo",
-        tempo_col = "tempo_de_resolucao_em_dias",
-        convert_na_tokens = True  # True converte "Não há dados" (e variantes) para vazio; ajuste se quiser manter o texto
-    )
-except Exception as e:
-    logging.error(f"Falha ao sincronizar coluna tempo_de_resolucao_em_dias: {e}", exc_info=True)
-
-# -----------------------
-# Sincroniza status_demanda (BRUTA -> TRATADA) para protocolos padrão C...
-# -----------------------
-def sync_status_demanda_bruta_para_tratada(
-    df_bruta_local,
-    df_tratada_local,
-    sheet_obj,
-    protocolo_col="protocolo",
-    status_col="status_demanda",
-    pattern_regex=r"^C\d+"
-):
-    """
-    Sincroniza EXATAMENTE os valores de status_col da bruta para a tratada, para protocolos que
-    batem com pattern_regex (por default '^C\\d+').
-    - Preserva valores atuais da tratada quando o protocolo não existir na bruta.
-    - Retorna df_tratada_local atualizado (em memória) e atualiza a planilha via gspread.
-    """
-    if df_bruta_local is None or df_bruta_local.empty:
-        logging.info("df_bruta vazio — nada a sincronizar para status_demanda.")
-        return df_tratada_local
-    if df_tratada_local is None or df_tratada_local.empty:
-        logging.info("df_tratada vazio — nada a sincronizar (sheet pode estar vazio).")
-        return df_tratada_local
-
-    # Normaliza colunas de protocolo
-    df_b = df_bruta_local.copy()
-    df_t = df_tratada_local.copy()
-    if protocolo_col not in df_b.columns or protocolo_col not in df_t.columns:
-        logging.warning(f"Coluna '{protocolo_col}' ausente em bruta ou tratada — abortando sync status_demanda.")
-        return df_tratada_local
-
-    df_b[protocolo_col] = df_b[protocolo_col].astype(str).str.strip().str.upper()
-    df_t[protocolo_col] = df_t[protocolo_col].astype(str).str.strip().str.upper()
-
-    # Mapa protocolo -> valor bruto exato (preserva texto tal qual na bruta)
-    # Se houver duplicatas na bruta, priorizamos a última ocorrência (keep='last')
-    map_bruta = df_b.dropna(subset=[protocolo_col]).set_index(protocolo_col)[status_col].to_dict()
-
-    # Backup local (opcional)
-    try:
-        backup_series = df_t.get(status_col, pd.Series([""] * len(df_t)))
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-        backup_fn = f"backup_status_demanda_tratada_{timestamp}.csv"
-        backup_series.to_csv(backup_fn, index=False, header=[status_col], encoding="utf-8-sig")
-        logging.info(f"Backup da coluna '{status_col}' (tratada) salvo em: {backup_fn}")
-    except Exception as e:
-        logging.warning(f"Falha ao salvar backup local da coluna '{status_col}': {e}")
-
-    # Prepara nova coluna respeitando a ordem da tratada
-    new_col_values = []
-    protocolos_tratada = df_t[protocolo_col].astype(str).tolist()
-
-    # Compila regex do padrão (case-insensitive sobre a forma normalizada já em uppercase)
-    import re as _re
-    pattern = _re.compile(pattern_regex, flags=_re.IGNORECASE)
-
-    for prot in protocolos_tratada:
-        prot_key = (prot or "").strip().upper()
-        if pattern.match(prot_key):
-            # se protocolo do tipo C...: tenta pegar na bruta; senão mantém o valor atual da tratada
-            if prot_key in map_bruta:
-                raw_val = map_bruta[prot_key]
-                out_val = raw_val if (raw_val is not None and str(raw_val).strip() != "") else ""
-            else:
-                # mantém valor atual da tratada
-                cur_val = df_t.loc[df_t[protocolo_col] == prot_key, status_col] if status_col in df_t.columns else pd.Series([""])
-                out_val = cur_val.iloc[0] if isinstance(cur_val, pd.Series) and not cur_val.empty else ""
-        else:
-            # protocolos que não batem com o padrão C...: manter o valor atual da tratada
-            cur_val = df_t.loc[df_t[protocolo_col] == prot_key, status_col] if status_col in df_t.columns else pd.Series([""])
-            out_val = cur_val.iloc[0] if isinstance(cur_val, pd.Series) and not cur_val.empty else ""
-        new_col_values.append(out_val)
-
-    # Atualiza df_tratada_local em memória
-    df_tratada_local[status_col] = new_col_values
-
-    # --- Escreve em bloco na sheet apenas a coluna ---
-    try:
-        all_vals = sheet_obj.get_all_values()
-        if not all_vals:
-            logging.warning("Aba tratada sem valores (get_all_values retornou vazio). Não será possível atualizar a coluna status_demanda via API.")
-            return df_tratada_local
-
-        n_rows = len(all_vals)
-        header = all_vals[0]
-        try:
-            col_idx = header.index(status_col) + 1
-        except ValueError:
-            # tenta localizar por nome normalizado
-            header_norm = [normalizar_nome_coluna(h) for h in header]
-            try:
-                col_idx = header_norm.index(normalizar_nome_coluna(status_col)) + 1
-            except ValueError:
-                logging.warning(f"Coluna '{status_col}' não encontrada no header da sheet — abortando update em sheet.")
-                return df_tratada_local
-
-        values_for_rows = []
-        for i in range(1, n_rows):
-            if i-1 < len(new_col_values):
-                candidate = new_col_values[i-1]
-            else:
-                candidate = ""
-            values_for_rows.append([candidate])
-
-        import gspread.utils
-        start_a1 = gspread.utils.rowcol_to_a1(2, col_idx)
-        end_a1 = gspread.utils.rowcol_to_a1(n_rows, col_idx)
-        range_a1 = f"{start_a1}:{end_a1}"
-
-        sheet_obj.update(range_a1, values_for_rows)
-        logging.info(f"Coluna '{status_col}' sincronizada da bruta para tratada — range atualizado: {range_a1} ({len(values_for_rows)} linhas).")
-    except Exception as e:
-        logging.exception(f"Erro ao atualizar a coluna '{status_col}' na planilha tratada: {e}")
-
-    return df_tratada_local
-
-
-# === Invocação imediata para sincronizar status_demanda (após sync do tempo_de_resolucao) ===
-try:
-    df_tratada_existente = sync_status_demanda_bruta_para_tratada(
-        df_bruta_local = df_bruta,
-        df_tratada_local = df_tratada_existente,
-        sheet_obj = aba_tratada,
-        protocolo_col = "protocolo",
-        status_col = "status_demanda",
-        pattern_regex = r"^C\d+"   # ajuste aqui se seu padrão for diferente (ex.: '^C\\d{18,}$')
-    )
-except Exception as e:
-    logging.error(f"Falha ao sincronizar coluna status_demanda: {e}", exc_info=True)
-
-# Após a execução acima, df_tratada_existente no escopo estará atualizada em memória e a planilha também.
-# Você pode prosseguir com o restante do pipeline (_tratar_full nos novos, montagem de df_send, etc.).
-# ----------------------------------------------------------
-# IDENTIFICA E PREPARA NOVOS PROTOCOLOS PARA ENVIO
-# ----------------------------------------------------------
-
-try:
-    novos_protocolos_a_enviar = set(df_bruta["protocolo"]) - protocolos_existentes_set_final
-    df_send_bruto = df_bruta[df_bruta["protocolo"].isin(novos_protocolos_a_enviar)].copy()
-
-    if df_send_bruto.empty:
-        logging.info("Nenhum protocolo novo detectado para envio. df_send será um DataFrame vazio.")
-        print("🧹 Nenhum protocolo novo para enviar.")
-        df_send = pd.DataFrame(columns=cols_alvo_tratada) # Define df_send vazio com colunas corretas
-    else:
-        logging.info(f"Detectados {len(df_send_bruto)} protocolos novos para processar e enviar. Shape inicial: {df_send_bruto.shape}")
-        print(f"🧹 Novos protocolos a enviar: {len(df_send_bruto)}")
-
-        # APLICA TODOS OS TRATAMENTOS DE _tratar_full AQUI!
-        df_send = _tratar_full(df_send_bruto.copy())
-        logging.info(f"Função _tratar_full aplicada a df_send_bruto. Shape após tratamento: {df_send.shape}")
-
-        # Remove colunas auxiliares que não devem ser escritas no Google Sheets
-        cols_to_drop = []
-        if "eh_novo" in df_send.columns:
-            cols_to_drop.append("eh_novo")
-        # Adicione aqui outras colunas auxiliares
-        # if "alguma_coluna_temp" in df_send.columns: cols_to_drop.append("alguma_coluna_temp")
-
-        if cols_to_drop:
-            df_send = df_send.drop(columns=cols_to_drop)
-            logging.info(f"Colunas auxiliares removidas de df_send: {cols_to_drop}. Novo shape: {df_send.shape}")
-
-        # Garante que o df_send tem as colunas corretas e na ordem certa
-        df_send_final = df_send.reindex(columns=cols_alvo_tratada, fill_value="")
-        logging.info(f"df_send reindexado para alinhar com colunas alvo. Shape final: {df_send_final.shape}")
-
-        # QA: Verifica se alguma coluna do df_send_final contém valores inesperados antes do envio
-        for col_qa in ['orgaos', 'responsavel', 'status_demanda', 'data_da_conclusao']:
-            if col_qa in df_send_final.columns:
-                unexpected_values = df_send_final[col_qa].astype(str).str.contains(r'(?i)^(sim|nao|true|false|\?{2,}|nan|none)$')
-                if unexpected_values.any():
-                    logging.error(f"QA Pré-Envio (df_send): Coluna '{col_qa}' contém valores inesperados em {unexpected_values.sum()} linhas. Exemplos: {df_send_final.loc[unexpected_values, col_qa].unique()[:5].tolist()}",
-                                  extra={'data': df_send_final.loc[unexpected_values, ['protocolo', col_qa]].to_dict(orient='records')[:5]})
-                    # Considerar um raise SystemExit aqui se a qualidade do dado for crítica
-       
-        df_send = df_send_final.copy()  # Atribui o DataFrame final preparado para df_send
-
-        # ----------------------------------------------------------
-        # CORREÇÃO DEFINITIVA: data_da_criacao — APENAS NOVOS (DD/MM/AAAA)
-        # ----------------------------------------------------------
-        EXCEL_BASE = pd.Timestamp("1899-12-30")
-
-        def fix_data_criacao(val):
-            if pd.isna(val) or str(val).strip() == "":
-                return ""
-            s = str(val).strip()
-
-            # Excel serial (5–6 dígitos)
-            if re.fullmatch(r"\d{5,6}(\.0+)?", s):
-                try:
-                    dt = EXCEL_BASE + pd.to_timedelta(float(s), "D")
-                    return dt.strftime("%d/%m/%Y")
-                except:
-                    pass
-
-            # Prioriza DD/MM/YYYY
-            try:
-                dt = pd.to_datetime(s, dayfirst=True, errors="coerce")
-                if pd.notna(dt):
-                    return dt.strftime("%d/%m/%Y")
-            except:
-                pass
-
-            # Fallback: tenta ISO ou parse genérico
-            try:
-                dt = pd.to_datetime(s, dayfirst=False, errors="coerce")
-                if pd.notna(dt):
-                    return dt.strftime("%d/%m/%Y")
-            except:
-                pass
-
-            # Último recurso: devolve string limpa
-            return s
-
-        # Máscara: aplicar somente nos novos
-        if 'novos_protocolos_a_enviar' in globals():
-            set_novos = {p.strip().upper() for p in novos_protocolos_a_enviar}
-            mask_novos = df_send['protocolo'].astype(str).str.strip().str.upper().isin(set_novos)
-        else:
-            mask_novos = pd.Series(True, index=df_send.index)
-
-        # Aplica a correção apenas nos novos
-        if "data_da_criacao" in df_send.columns and mask_novos.any():
-            df_send.loc[mask_novos, "data_da_criacao"] = (
-                df_send.loc[mask_novos, "data_da_criacao"].apply(fix_data_criacao)
-            )
-
-        # Garante dtype datetime64[ns] para data_da_criacao (dayfirst=True) — mantém NaT para inválidos
-        if "data_da_criacao" in df_send.columns:
-            # normaliza strings vazias para None antes do parse
-            series = df_send["data_da_criacao"].astype(object).where(lambda s: s.astype(str).str.strip() != "", None)
-            df_send["data_da_criacao"] = pd.to_datetime(series, dayfirst=True, errors="coerce")
-            # agora df_send["data_da_criacao"] é datetime64[ns] ou NaT; manter assim até o envio
-
-        # ----------------------------------------------------------
-        # PADRONIZAÇÃO FINAL SEGURA — NÃO REPARSAR O QUE JÁ ESTÁ OK
-        # ----------------------------------------------------------
-        def _is_ddmmyyyy(s):
-            return bool(re.fullmatch(r"\d{2}/\d{2}/\d{4}", str(s).strip()))
-
-        if "data_da_criacao" in df_send.columns:
-            mask_needs = ~df_send["data_da_criacao"].astype(str).fillna("").apply(_is_ddmmyyyy)
-
-            if mask_needs.any():
-                parsed = pd.to_datetime(
-                    df_send.loc[mask_needs, "data_da_criacao"].astype(str).str.strip(),
-                    dayfirst=True,
-                    errors="coerce"
-                )
-
-                df_send.loc[mask_needs, "data_da_criacao"] = (
-                    parsed.dt.strftime("%d/%m/%Y")
-                    .fillna(df_send.loc[mask_needs, "data_da_criacao"].astype(str).str.strip())
-                )
-
-            # manter como datetime (Timestamp) — envia DATA ao Sheets
-            df_send["data_da_criacao"] = pd.to_datetime(
-                df_send["data_da_criacao"],
-                dayfirst=True,
-                errors="coerce"
-            )
-
-        # ----------------------------------------------------------
-        # TRATAMENTO SEPARADO E SEGURO: data_da_conclusao
-        # ----------------------------------------------------------
-        if "data_da_conclusao" in df_send.columns:
-            try:
-                # Se existir função oficial do seu script, usa ela
-                if 'tratar_data_conclusao_item8' in globals():
-                    df_send["data_da_conclusao"] = df_send["data_da_conclusao"].apply(tratar_data_conclusao_item8)
-
-                # Caso não exista, fallback seguro:
-                else:
-                    def _tratar_conclusao_fallback(x):
-                        if pd.isna(x) or str(x).strip().lower() in ["", "nan", "none", "não concluído"]:
-                            return "Não concluído"
-                        dt = pd.to_datetime(str(x).strip(), dayfirst=True, errors="coerce")
-                        return dt.strftime("%d/%m/%Y") if pd.notna(dt) else "Não concluído"
-
-                    df_send["data_da_conclusao"] = df_send["data_da_conclusao"].apply(_tratar_conclusao_fallback)
-
-            except Exception as e:
-                logging.warning(f"Falha ao aplicar tratamento de data_da_conclusao: {e}")
-
-except Exception as e:
-    logging.critical(f"Erro na preparação final de df_send no Item 8: {e}", exc_info=True)
-    raise
-
-# ----------------------------------------------------------
-# TRATAMENTO CRÍTICO — DATA DA CONCLUSÃO (APÓS _tratar_full)
-# e PADRONIZA OUTRAS DATAS (AJUSTADO: data_da_criacao como DATETIME)
-# ----------------------------------------------------------
-def tratar_data_conclusao_item8(x):
-    if pd.isna(x) or str(x).strip().lower() in ["", "nan", "na", "n/a", "none", "não concluído"]:
-        return "Não concluído"
-    try:
-        dt = pd.to_datetime(x, errors="coerce", dayfirst=True)
-        if pd.notna(dt):
-            return dt.strftime("%d/%m/%Y")
-        else:
-            return "Não concluído"
-    except Exception:
-        return "Não concluído"
-
-# Reaplica somente o tratamento de apresentação para data_da_conclusao (string "DD/MM/YYYY" ou "Não concluído")
-if not df_send.empty and "data_da_conclusao" in df_send.columns:
-    df_send["data_da_conclusao"] = df_send["data_da_conclusao"].apply(tratar_data_conclusao_item8)
-    logging.debug("Re-aplicado tratamento de 'data_da_conclusao' para garantir formato DD/MM/YYYY.")
-
-# ----------------------------------------------------------
-# Ajuste crítico: data_da_criacao deve permanecer como TIMESTAMP
-# (para que o Google Sheets/Looker receba DATA, NÃO string)
-# ----------------------------------------------------------
-if not df_send.empty and "data_da_criacao" in df_send.columns:
-    # 1) Primeiro, tenta preservar Timestamps já válidos; coerciona strings inválidas para NaT
-    df_send["data_da_criacao"] = pd.to_datetime(df_send["data_da_criacao"], dayfirst=True, errors="coerce")
-
-    # 2) Se desejar garantir que células vazias fiquem como empty string ao enviar,
-    #    faça isso *apenas no momento de preparar o chunk para envio* (não aqui).
-    #    Aqui mantemos a coluna como datetime (dtype datetime64[ns]) para que o driver do Sheets
-    #    receba um valor de data reconhecível.
-    logging.debug("Data 'data_da_criacao' convertida para dtype datetime64[ns] (NaT em valores inválidos).")
-
-# ----------------------------------------------------------
-# CHECAGEM DE SANIDADE — UNIDADE_CADASTRO (em df_send já tratado)
-# ----------------------------------------------------------
-if not df_send.empty and "unidade_cadastro" in df_send.columns:
-    nulos_uc = int(df_send["unidade_cadastro"].astype(str).str.strip().isin(['', 'nan', 'none', 'n/a', 'não informado']).sum())
-    print(f"🧪 Checagem (NOVOS - PRONTOS PARA ENVIO): unidade_cadastro presente | vazios={nulos_uc}")
-    logging.info(f"Checagem (NOVOS - PRONTOS PARA ENVIO): unidade_cadastro presente | vazios={nulos_uc}")
-    if nulos_uc > 0:
-        logging.warning(f"QA Pré-Envio: 'unidade_cadastro' contém {nulos_uc} valores vazios/inválidos em df_send. Exemplos: {df_send.loc[df_send['unidade_cadastro'].astype(str).str.strip().isin(['', 'nan', 'none', 'n/a', 'não informado']), 'unidade_cadastro'].unique()[:5].tolist()}")
-else:
-    print("⚠️ Aviso: unidade_cadastro não está em df_send ou df_send está vazio.")
-    logging.warning("unidade_cadastro não está em df_send ou df_send está vazio. Verifique a consistência do schema.")
-
-# ----------------------------------------------------------
-# ENVIO EM LOTES
-# ----------------------------------------------------------
-if df_send.empty:
-    logging.info("Nenhum protocolo para enviar, pulando envio em lotes.")
-    print("📦 Nenhum protocolo para enviar.")
-else:
-    lote = 500
-    total_lotes = (len(df_send) + lote - 1) // lote
-    print(f"📦 Envio — APENAS NOVOS (FINAL): {len(df_send)} linhas | {total_lotes} lotes")
-    logging.info(f"Envio — APENAS NOVOS (FINAL): {len(df_send)} linhas | {total_lotes} lotes")
-
-    existing_values = aba_tratada.get_all_values()
-    sheet_is_empty = len(existing_values) == 0
-
-    for i in range(0, len(df_send), lote):
-        chunk = df_send.iloc[i:i+lote].copy()
-        first_idx = i + 1
-        last_idx = min(i + lote, len(df_send))
-        protos_preview = list(chunk.get("protocolo", []))[:3]
-        logging.debug(f"Processando lote {first_idx}-{last_idx}. Prévia protocolos: {protos_preview}")
-        print(f"   • Enviando {first_idx}-{last_idx} (prévia protocolos: {protos_preview})")
-
-        try:
-            # --- SANITIZAÇÃO ROBUSTA (preservando datetimes e tipos primitivos) ---
-            # converte infinities / nulos para None, preserva datetimes como strings DD/MM/YYYY apenas no envio
-            def _cell_for_sheets(v):
-                # nulos
-                if pd.isna(v):
-                    return None
-
-                # pandas Timestamp / numpy datetime64 -> string 'DD/MM/YYYY' (temporário para envio)
-                if isinstance(v, (pd.Timestamp, np.datetime64)):
-                    try:
-                        ts = pd.to_datetime(v, errors="coerce")
-                        if pd.isna(ts):
-                            return None
-                        return ts.strftime("%d/%m/%Y")
-                    except Exception:
-                        try:
-                            return pd.to_datetime(v, errors="coerce").strftime("%d/%m/%Y")
-                        except:
-                            return None
-
-                # python datetime/date -> string 'DD/MM/YYYY'
-                try:
-                    import datetime as _dt
-                    if isinstance(v, (_dt.datetime, _dt.date)):
-                        try:
-                            return v.strftime("%d/%m/%Y")
-                        except:
-                            return None
-                except Exception:
-                    pass
-
-                # numéricos finitos -> python primitives
-                if isinstance(v, (np.integer, int)):
-                    return int(v)
-                if isinstance(v, (np.floating, float)):
-                    if not np.isfinite(v):
-                        return None
-                    if float(v).is_integer():
-                        return int(round(v))
-                    return float(v)
-
-                # booleans
-                if isinstance(v, (bool, np.bool_)):
-                    return bool(v)
-
-                # strings vazias -> None
-                s = str(v).strip()
-                if s == "":
-                    return None
-
-                # fallback -> string
-                return s
-
-            # aplica conversor linha a linha (preserva ordem/colunas)
-            rows = []
-            # Não forcamos astype(object) — iterrows mantém tipos pandas/numpy
-            for _, r in chunk.iterrows():
-                rows.append([_cell_for_sheets(val) for val in r.tolist()])
-
-            # opcional: log do nº de células vazias após a conversão
-            n_empty_after = sum(1 for row in rows for cell in row if cell is None)
-            if n_empty_after > 0:
-                logging.debug(f"Lote {first_idx}-{last_idx}: {n_empty_after} células None após sanitização.")
-
-            # Envia com USER_ENTERED para que o Sheets interprete 'DD/MM/YYYY' como DATA
-            if sheet_is_empty:
-                header = chunk.columns.tolist()
-                aba_tratada.append_rows([header] + rows, value_input_option='USER_ENTERED')
-                logging.info(f"Lote {first_idx}-{last_idx} enviado com cabeçalho.")
-                sheet_is_empty = False
-            else:
-                aba_tratada.append_rows(rows, value_input_option='USER_ENTERED')
-                logging.info(f"Lote {first_idx}-{last_idx} enviado (sem cabeçalho).")
-        except Exception as e:
-            logging.exception(f"Erro CRÍTICO ao enviar lote {first_idx}-{last_idx}: {e}")
-            print(f"❌ Erro ao enviar lote {first_idx}-{last_idx}: {e}")
-            failed = chunk[["protocolo"]].copy()
-            timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-            failed.to_csv(f"failed_append_{first_idx}_{last_idx}_{timestamp}.csv", index=False, encoding="utf-8-sig")
-
-print("✅ Atualização da planilha tratada concluída com sucesso.")
-logging.info("✅ Atualização da planilha tratada concluída com sucesso.")
-
-# ========================================================
-# 9) PATCH / ATUALIZAÇÃO DE STATUS E DELTA HISTÓRICO (CORRIGIDO)
-# ========================================================
-_BANNER("9) PATCH / ATUALIZAÇÃO DE STATUS E DELTA HISTÓRICO (CORRIGIDO)")
-
-import time
-
-# --------------------------------------------------------
-# 🔧 Helper principal de padronização de status e datas
-# --------------------------------------------------------
-def _prepare_status(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
-
-    # 2️⃣ Padroniza prazo_restante
-    if "prazo_restante" in df.columns:
-        df["prazo_restante"] = df["prazo_restante"].apply(_canon_prazo_restante)
-
-    # 3️⃣ Padroniza data_da_conclusao — tratamento definitivo
-    if "data_da_conclusao" in df.columns:
-        def _tratar_data_conclusao(x):
-            """Converte datas válidas e substitui inválidas/vazias por 'Não concluído'"""
-            if pd.isna(x) or str(x).strip().lower() in ["", "nan", "na", "n/a", "none"]:
-                return "Não concluído"
-            try:
-                dt = pd.to_datetime(x, errors="coerce")
-                if pd.isna(dt):
-                    return "Não concluído"
-                return dt.strftime("%d/%m/%Y")
-            except Exception:
-                return "Não concluído"
-
-        df["data_da_conclusao"] = df["data_da_conclusao"].apply(_tratar_data_conclusao)
-        return df
-# --------------------------------------------------------
-# Fallback de envio de lotes (log)
-# --------------------------------------------------------
-def _post_lotes(df: pd.DataFrame, msg: str, cols: list):
-    logging.warning(f"Fallback acionado ({msg}) para {len(df)} linhas. Colunas: {cols}")
-
-# Antes de criar/usar os deltas, aplique o prepare em todo df (ou pelo menos nos deltas)
-df = _prepare_status(df)  # garante que coluna principal esteja padronizada
-
-# Em seguida crie os deltas com base no df já padronizado:
-delta_status = df[df["status_demanda"] != df.get("status_demanda_OLD", df["status_demanda"])]
-delta_conc   = df[df["data_da_conclusao"] != df.get("data_da_conclusao_OLD", df["data_da_conclusao"])]
-delta_tempo  = df[df["tempo_de_resolucao_em_dias"] != df.get("tempo_de_resolucao_em_dias_OLD", df["tempo_de_resolucao_em_dias"])]
-
-# --------------------------------------------------------
-# PATCH principal — atualização de células no Google Sheets
-# --------------------------------------------------------
-def _patch_grouped_force(df: pd.DataFrame, key_col: str, value_col: str, sheet=None):
-    if df.empty:
-        logging.info("Delta vazio. Nada a atualizar.")
-        return
-
-    batch_size = 50
-
-    # Aplica padronizações completas
-    df = _prepare_status(df)
-    df[key_col] = df[key_col].astype(str).str.strip()
-    df[value_col] = df[value_col].astype(str).str.strip()
-
-    # 🔒 Corrige 'data_da_conclusao' pós-stringificação
-    if value_col == "data_da_conclusao":
-        df[value_col] = df[value_col].apply(
-            lambda x: "Não concluído" if str(x).strip().lower() in ["", "nan", "na", "n/a", "none", "nat"] else x
-        )
-
-    if sheet is None:
-        _post_lotes(df, f"{value_col} (fallback)", [key_col, value_col])
-        return
-
-    # Tenta localizar colunas no Sheets
-    try:
-        key_list = sheet.col_values(1)
-    except Exception as e:
-        logging.error(f"Erro ao obter protocolos da planilha: {e}")
-        _post_lotes(df, f"{value_col} (fallback)", [key_col, value_col])
-        return
-
-    try:
-        col_idx = sheet.find(value_col).col
-    except Exception:
-        logging.warning(f"Coluna '{value_col}' não encontrada. Usando coluna 2 como fallback.")
-        col_idx = 2
-
-    # --- PREPARA LISTA DE ATUALIZAÇÃO ---
-    to_update = []
-    for _, row in df.iterrows():
-        key = row[key_col]
-        value = row.get(f"{value_col}_trat", row[value_col])
-        if key in key_list:
-            row_idx = key_list.index(key) + 1
-            to_update.append((row_idx, col_idx, value))
-        else:
-            logging.warning(f"Protocolo '{key}' não encontrado na planilha.")
-
-    # --- ATUALIZAÇÃO EM BATCH ---
-    total_updated = 0
-    for i in range(0, len(to_update), batch_size):
-        batch = to_update[i:i + batch_size]
-        if not batch:
-            continue
-
-        cleaned_batch = []
-        for r in batch:
-            value = r[2]
-            if pd.isna(value) or str(value).strip() == "":
-                value = "Não concluído" if value_col == "data_da_conclusao" else ""
-            value = str(value).strip()
-            cleaned_batch.append((r[0], r[1], value))
-
-        range_rows = [r[0] for r in cleaned_batch]
-        values = [[r[2]] for r in cleaned_batch]
-
-        try:
-            import gspread.utils
-            start_row = min(range_rows)
-            end_row = max(range_rows)
-            range_str = (
-                f"{gspread.utils.rowcol_to_a1(start_row, col_idx)}:"
-                f"{gspread.utils.rowcol_to_a1(end_row, col_idx)}"
-            )
-            sheet.update(range_str, values)
-            total_updated += len(cleaned_batch)
-        except Exception as e:
-            logging.error(f"Erro no batch update: {e}")
-            _post_lotes(
-                pd.DataFrame([(r[0], r[2]) for r in cleaned_batch], columns=[key_col, value_col]),
-                f"{value_col} (fallback)",
-                [key_col, value_col],
-            )
-
-    logging.info(f"✅ Status atualizado em batch: {total_updated}/{len(df)} linhas.")
-    if total_updated == 0:
-        logging.info("Nenhuma linha atualizada diretamente. Enviando via _post_lotes como fallback.")
-        _post_lotes(df, f"{value_col} (fallback)", [key_col, value_col])
-
-# ========================================================
-# 10) DELTAS HISTÓRICOS (status_demanda, data_da_conclusao, tempo_de_resolucao_em_dias)
-# ========================================================
-
-_BANNER("10) DELTAS HISTÓRICOS (ajustado para novos protocolos)")
-
-# --- Alinha colunas do df_send ao schema da tratada ---
-try:
-    cols_tratada = list(df_tratada.columns)
-    # df_send pode não existir (caso nenhum novo); garante variável
-    if 'df_send' not in globals():
-        df_send = pd.DataFrame(columns=cols_tratada)
-    df_send_aligned = df_send.reindex(columns=cols_tratada, fill_value="")
-    df_full = pd.concat([df_tratada, df_send_aligned], ignore_index=True, sort=False)
-except Exception as e:
-    logging.warning(f"Falha ao concatenar bases tratada + novos: {e}")
-    # fallback simples: tenta usar df_send como fonte
-    df_full = df_send.copy()
-
-# --- Garante existência das colunas *_OLD para comparações de histórico ---
-for col in ["status_demanda", "data_da_conclusao", "tempo_de_resolucao_em_dias"]:
-    old_col = f"{col}_OLD"
-    if old_col not in df_full.columns:
-        # copia o valor atual para coluna OLD (se não existir), normalizando nulos
-        df_full[old_col] = df_full.get(col, "").fillna("")
-
-# --- Função delta robusta (com fillna e casting a str) ---
-def _delta_df(df_full_local: pd.DataFrame, col: str) -> pd.DataFrame:
-    old_col = f"{col}_OLD"
-    if old_col in df_full_local.columns:
-        left = df_full_local.get(col, "").fillna("").astype(str)
-        right = df_full_local.get(old_col, "").fillna("").astype(str)
-        return df_full_local[left != right].copy()
-    else:
-        # se não há coluna OLD, considera apenas os recém marcados como 'eh_novo'
-        return df_full_local[df_full_local.get("eh_novo", False) == True].copy()
-
-# --- Calcula deltas específicos (apenas uma vez e sem sobrescritas) ---
-delta_status = _delta_df(df_full, "status_demanda")
-delta_conc   = _delta_df(df_full, "data_da_conclusao")
-delta_tempo  = _delta_df(df_full, "tempo_de_resolucao_em_dias")
-
-# --- Logs e verificações ---
-logging.info(f"Delta STATUS: {len(delta_status)} linhas alteradas/novas")
-logging.info(f"Delta DATA_CONCLUSAO: {len(delta_conc)} linhas alteradas/novas")
-logging.info(f"Delta TEMPO_DE_RESOLUCAO: {len(delta_tempo)} linhas alteradas/novas")
-
-print(f"📊 Deltas calculados com sucesso:")
-print(f"   • STATUS: {len(delta_status)}")
-print(f"   • DATA_CONCLUSAO: {len(delta_conc)}")
-print(f"   • TEMPO_DE_RESOLUCAO: {len(delta_tempo)}")
-
-# =========================================================
-# PATCH TEMPORÁRIO: ZERAR tempo_de_resolucao_em_dias EM 29 PROTOCOLOS EXTRAS
-# =========================================================
-import pandas as pd
-import gspread
-import logging
-
-logging.info("=== PATCH TEMPORÁRIO: ZERAR 29 PROTOCOLOS EXTRAS ===")
-
-# IDs e setup
-PLANILHA_TRATADA_ID = "1aF0I8pxABXhqyO2DmzBV9aoWHQN2h7LpTN-qdkGLc_g"
-SHEET_TRATADA = "Sheet1"  # ou sheet1 se for o nome padrão
-
-# lista fixa dos 29 protocolos extras
-PROTOCOLOS_AZERAR = [
-    "NUP.00719.2025.000034-38","NUP.00719.2025.000036-08","NUP.00719.2025.000044-00","NUP.00719.2025.000090-45",
-    "NUP.00719.2025.000091-26","NUP.00719.2025.000092-15","NUP.00719.2025.000093-98","NUP.00719.2025.000095-50",
-    "NUP.00719.2025.000096-31","NUP.00719.2025.000097-11","NUP.00719.2025.000098-01","NUP.00719.2025.000099-83",
-    "NUP.00719.2025.000100-51","NUP.00719.2025.000101-32","NUP.00719.2025.000102-13","NUP.00719.2025.000103-02",
-    "NUP.00719.2025.000106-47","NUP.00719.2025.000107-28","NUP.00719.2025.000108-09","NUP.00719.2025.000109-90",
-    "NUP.00719.2025.000111-04","NUP.00719.2025.000112-95","NUP.00719.2025.000113-76","NUP.00719.2025.000114-57",
-    "NUP.00719.2025.000115-38","NUP.00719.2025.000116-19","NUP.00719.2025.000117-08","NUP.00719.2025.000118-80",
-    "NUP.00719.2025.000119-61"
-]
-
-# abre a planilha e aba
-try:
-    planilha = gc.open_by_key(PLANILHA_TRATADA_ID)
-    aba = planilha.worksheet(SHEET_TRATADA)
-    df_tratada = pd.DataFrame(aba.get_all_records())
-    df_tratada.columns = [c.strip().lower().replace(" ", "_") for c in df_tratada.columns]
-
-    logging.info(f"Planilha tratada carregada ({df_tratada.shape})")
-except Exception as e:
-    logging.error(f"Erro ao abrir planilha tratada: {e}")
-    raise
-
-# backup local
-try:
-    df_tratada.to_csv("backup_tratada_antes_patch.csv", index=False, encoding="utf-8-sig")
-    logging.info("Backup salvo: backup_tratada_antes_patch.csv")
-except Exception as e:
-    logging.warning(f"Falha ao salvar backup local: {e}")
-
-# normaliza protocolo
-df_tratada["protocolo"] = df_tratada["protocolo"].astype(str).str.strip().str.upper()
-
-# aplica o zero nos protocolos alvo
-mask = df_tratada["protocolo"].isin([p.upper() for p in PROTOCOLOS_AZERAR])
-df_tratada.loc[mask, "tempo_de_resolucao_em_dias"] = 0
-
-# mostra resumo
-print(f"✅ Protocolos zerados: {mask.sum()} (de {len(PROTOCOLOS_AZERAR)} esperados)")
-logging.info(f"Protocolos zerados: {mask.sum()}")
-
-# envia de volta ao sheet
-try:
-    import gspread.utils
-    colnames = aba.row_values(1)
-    col_norm = [c.strip().lower().replace(" ", "_") for c in colnames]
-    col_idx = col_norm.index("tempo_de_resolucao_em_dias") + 1
-    prot_idx = col_norm.index("protocolo") + 1
-
-    # obtém todos os protocolos da aba
-    prot_sheet = [str(x).strip().upper() for x in aba.col_values(prot_idx)]
-    # prepara valores novos
-    updates = []
-    for p in PROTOCOLOS_AZERAR:
-        if p.upper() in prot_sheet:
-            row_idx = prot_sheet.index(p.upper()) + 1
-            updates.append((row_idx, col_idx, 0))
-
-    # aplica no sheet (em batch)
-    for row_idx, col_idx, val in updates:
-        aba.update_cell(row_idx, col_idx, val)
-    print(f"✅ {len(updates)} células atualizadas com valor 0 na coluna tempo_de_resolucao_em_dias.")
-    logging.info(f"Patch: {len(updates)} linhas atualizadas com valor 0.")
-except Exception as e:
-    logging.error(f"Erro ao atualizar sheet: {e}")
-    raise
-
-print("🚀 PATCH TEMPORÁRIO CONCLUÍDO: tempo_de_resolucao_em_dias zerado para os 29 protocolos extras.")
-logging.info("🚀 PATCH TEMPORÁRIO CONCLUÍDO.")
-
-# ========================================================
-# 11) QA & SUMÁRIO FINAL
-# ========================================================
-_BANNER("11) QA & SUMÁRIO FINAL")
-
-# --- Protocolos novos / existentes ---
-if "eh_novo" in df.columns:
-    novos_protos = df.loc[df["eh_novo"] == True, "protocolo"].astype(str).str.strip()
-    print(f"🔹 Protocolos novos: {len(novos_protos)}")
-    logging.info(f"Protocolos novos: {len(novos_protos)}")
-else:
-    novos_protos = pd.Series([], dtype=str)
-    logging.info("Coluna 'eh_novo' ausente — nenhum protocolo novo identificado.")
-
-# --- QA de colunas críticas ---
-qa_cols = ["status_demanda", "data_da_conclusao", "tempo_de_resolucao_em_dias"]
-for col in qa_cols:
-    if col in df.columns:
-        nulos = df[col].isna().sum()
-        print(f"🔹 {col} vazio: {nulos} linhas")
-        logging.info(f"QA: {col} vazio: {nulos} linhas")
-    else:
-        logging.info(f"Coluna '{col}' ausente.")
-
-# --- Sumário final ---
-print("✅ QA concluído. Sumário final:")
-logging.info("QA concluído. Sumário final:")
-print(f"  • Protocolos totais na planilha: {len(df)}")
-print(f"  • Protocolos novos identificados: {len(novos_protos)}")
-for col in qa_cols:
-    nulos = df[col].isna().sum() if col in df.columns else 0
-    print(f"  • {col} vazio: {nulos}")
-
-# ========================================================
-# 12) FINALIZAÇÃO
-# ========================================================
-
-# --- Sanity checks finais (colocar antes do _BANNER("12) PIPELINE FINALIZADO")) ---
-try:
-    bruta_rows = len(df_bruta) if 'df_bruta' in globals() and isinstance(df_bruta, pd.DataFrame) else 0
-    bruta_cols = list(df_bruta.columns)[:20] if 'df_bruta' in globals() and isinstance(df_bruta, pd.DataFrame) and not df_bruta.empty else []
-except Exception:
-    bruta_rows, bruta_cols = 0, []
-
-try:
-    tratada_rows = len(df_tratada) if 'df_tratada' in globals() and isinstance(df_tratada, pd.DataFrame) else 0
-    tratada_cols = list(df_tratada.columns)[:20] if 'df_tratada' in globals() and isinstance(df_tratada, pd.DataFrame) and not df_tratada.empty else []
-except Exception:
-    tratada_rows, tratada_cols = 0, []
-
-novos_cnt = int(df_bruta['eh_novo'].sum()) if 'df_bruta' in globals() and 'eh_novo' in df_bruta.columns else 0
-df_send_cnt = len(df_send) if 'df_send' in globals() and isinstance(df_send, pd.DataFrame) else 0
-
-logging.info(f"Sanity: df_bruta rows={bruta_rows} cols={bruta_cols}")
-logging.info(f"Sanity: df_tratada rows={tratada_rows} cols={tratada_cols}")
-logging.info(f"Sanity: novos detectados={novos_cnt} | df_send (preparados para envio)={df_send_cnt}")
-print(f"Sanity checks — bruta:{bruta_rows} rows, tratada:{tratada_rows} rows, novos:{novos_cnt}, to_send:{df_send_cnt}")
-
-# opcional: numero real de linhas na sheet (pode ser custoso em tempo)
-try:
-    if 'aba_tratada' in globals():
-        total_sheet_rows = len(aba_tratada.get_all_values())
-        logging.info(f"Sanity: aba_tratada (sheet) rows={total_sheet_rows}")
-except Exception as e:
-    logging.warning(f"Não foi possível obter aba_tratada.get_all_values(): {e}")
-
-_BANNER("12) PIPELINE FINALIZADO")
+import os
+import sys
 
-print("🎯 Pipeline executado com sucesso!")
-logging.info("Pipeline executado com sucesso")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Pipeline"))
 
-print("Fluxo: GoogleSheets (bruto) → Python (tratamento) → GoogleSheets (tratado) → LookerStudio")
+from tratamento import main  # noqa: E402
 
-# --- Resumo de atualizações completas ---
-for col in qa_cols:
-    if col in df.columns:
-        atualizadas = len(df[df[col].notna()])
-        print(f"  • {col} atualizadas: {atualizadas} linhas")
-        logging.info(f"{col} atualizadas: {atualizadas} linhas")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# os módulos do pipeline são importados como no main.py (tratamento.*, utils.*), a partir de Pipeline/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,92 @@
+"""CapitalizadorPT contra as funções de proper case que ele substituiu."""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from tratamento.transform import (
+    CAPITALIZADOR_PT,
+    CAPITALIZADOR_PT_EXCETO_OUVIDORIAS,
+    CAPITALIZADOR_UAC,
+    UAC_ACRONIMOS,
+    UAC_PALAVRAS_MINUSCULAS,
+)
+from utils.capitalizacao import CapitalizadorPT
+from utils.normalizacao import remover_acentos
+
+TEXTOS = [
+    "secretaria DE saúde", "  ouvidoria geral ", "UAC - upa beira mar", "de olho na cidade", "a  e  o",
+    "ÁGUA e esgoto", "hospital do olho", "uac - cer iv", "upa-norte da cidade", "UPH  -  xerém do pilar",
+    "uac -", "uac", "ubs da vila", "cm de duque", "psf  são bento", "Ⅳ cer", "x", "sem-teto d'água",
+]
+NAO_TEXTO = [None, np.nan, "", "   ", 5, 2.5]
+
+
+def _to_proper_case_pt(text):
+    if not isinstance(text, str) or not text.strip():
+        return text
+    conectivos = ["de", "da", "do", "dos", "das", "e", "a", "o", "em"]
+    palavras = text.lower().split()
+    return " ".join(p.capitalize() if i == 0 or p not in conectivos else p for i, p in enumerate(palavras))
+
+
+def _proper_case_exceto_ouvidorias(x):
+    return _to_proper_case_pt(x) if "ouvidoria" not in str(x).lower() and "uac - upa" not in str(x).lower() else x
+
+
+def _norm_text_for_match(s):
+    s = remover_acentos(str(s).strip(), compat=True)
+    return re.sub(r"\s+", " ", s).lower().strip()
+
+
+def _pretty_after_prefix(s):
+    m = re.match(r"^\s*(?P<prefix>(uac|upa|uph))\s*-\s*(?P<rest>.+)$", _norm_text_for_match(s))
+    if not m:
+        return s.strip().title()
+    palavras = [w.upper() if w in UAC_ACRONIMOS else w if w in UAC_PALAVRAS_MINUSCULAS else w.capitalize()
+                for w in m.group("rest").split()]
+    return f"{m.group('prefix').upper()} - {' '.join(palavras)}"
+
+
+def _smart_title(s):
+    palavras = _norm_text_for_match(s).split(" ")
+    return " ".join(w.upper() if w in UAC_ACRONIMOS else w if w in UAC_PALAVRAS_MINUSCULAS and i != 0
+                    else w.capitalize() for i, w in enumerate(palavras))
+
+
+def _uac_ref(s):
+    if not isinstance(s, str) or not s.strip():
+        return s
+    if re.match(r"^\s*(uac|upa|uph)\s*-\s*", _norm_text_for_match(s)):
+        return _pretty_after_prefix(s)
+    return _smart_title(s)
+
+
+def _tipado(valores):
+    return [(type(v), v) if not (isinstance(v, float) and np.isnan(v)) else "nan" for v in valores]
+
+
+def test_capitalizadores_iguais_as_funcoes_antigas():
+    s = pd.Series(TEXTOS + NAO_TEXTO, dtype=object)
+    casos = [(CAPITALIZADOR_PT, _to_proper_case_pt),
+             (CAPITALIZADOR_PT_EXCETO_OUVIDORIAS, _proper_case_exceto_ouvidorias)]
+    for capitalizador, antiga in casos:
+        assert _tipado(capitalizador.aplicar(s)) == _tipado([antiga(v) for v in s])
+
+
+def test_capitalizador_uac_igual_funcoes_antigas():
+    s = pd.Series([t for t in TEXTOS if t != "uac -"] + NAO_TEXTO, dtype=object)
+    assert _tipado(CAPITALIZADOR_UAC.aplicar(s)) == _tipado([_uac_ref(v) for v in s])
+    # prefixo sem nome: a única saída que mudou ("Uac -" antes)
+    assert CAPITALIZADOR_UAC.formatar("uac -") == "UAC -"
+
+
+def test_formatar_igual_aplicar_e_cache_limitado():
+    cap = CapitalizadorPT(acronimos=("cer",), prefixos=("uac",), limite_cache=4)
+    s = pd.Series(TEXTOS * 2, dtype=object, index=range(100, 100 + 2 * len(TEXTOS)))
+    out = cap.aplicar(s)
+    assert out.index.equals(s.index) and out.dtype == object
+    cap.limpar_cache()
+    assert [cap.formatar(t) for t in s] == out.tolist()
+    assert len(cap._cache) <= 4
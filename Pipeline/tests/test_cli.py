@@ -0,0 +1,25 @@
+"""Linha de comando: o padrão sem subcomando roda a execução completa."""
+
+from tratamento import cli, execucao
+
+
+def _registrar_executar(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(cli, "configurar_logging", lambda *a, **k: None)
+    monkeypatch.setattr(execucao, "executar", lambda **kw: chamadas.append(kw))
+    return chamadas
+
+
+def test_sem_subcomando_chama_executar(monkeypatch):
+    chamadas = _registrar_executar(monkeypatch)
+    assert cli.main([]) == 0
+    assert len(chamadas) == 1
+    assert chamadas[0]["streaming"] is None
+    assert chamadas[0]["bloco"] is None
+
+
+def test_run_repassa_streaming(monkeypatch):
+    chamadas = _registrar_executar(monkeypatch)
+    assert cli.main(["run", "--streaming", "--bloco", "500"]) == 0
+    assert chamadas[0]["streaming"] is True
+    assert chamadas[0]["bloco"] == 500
@@ -0,0 +1,127 @@
+"""Motor de datas: mesmo resultado das antigas funções célula a célula (_parse_dt_cmp/_to_ddmmaa_text)."""
+
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from utils.datas import formatar_datas, parse_datas
+
+EXCEL_BASE = pd.Timestamp("1899-12-30")
+FORMATOS = ["%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y", "%d/%m/%y %H:%M:%S", "%d/%m/%y %H:%M",
+            "%d/%m/%y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"]
+
+VALORES = [
+    "01/02/2024", "1/2/2024", "01/02/2024 13:45", "01/02/2024 13:45:10", "01/02/24", "31/12/99 08:00",
+    "2024-02-01", "2024-02-01 10:00:00", "2024-02-01T10:00:00Z", "2024-02-01T10:00:00-03:00",
+    "2025-02-05", "45000", "45000.5", "130000", "120000.25", "999999", "1706745600000",
+    "1706745600", "1706745600.5", "32/13/2024", "texto", "  01/02/2024  ", "", "   ", None, np.nan,
+    "Feb 1 2024",
+]
+
+
+def _sem_fuso(s: str) -> str:
+    s2 = s.replace("T", " ").replace("Z", "")
+    # única diferença documentada: o sufixo de fuso só sai quando há hora
+    if re.search(r"\d:\d{2}", s2):
+        s2 = re.sub(r"([+-]\d{2}:?\d{2}|[+-]\d{2}| UTC)$", "", s2)
+    return s2.strip()
+
+
+def _ns(dt):
+    # o antigo rodava com datetime64[ns]: fora desse intervalo não havia data (NaT)
+    if pd.isna(dt) or not (pd.Timestamp.min <= dt <= pd.Timestamp.max):
+        return pd.NaT
+    return dt
+
+
+def _parse_dt_cmp(v):
+    return _ns(_parse_dt_cmp_bruto(v))
+
+
+def _parse_dt_cmp_bruto(v):
+    if pd.isna(v):
+        return pd.NaT
+    s = str(v).strip()
+    if s == "":
+        return pd.NaT
+    s2 = _sem_fuso(s)
+    if re.fullmatch(r"\d{5,6}(\.\d+)?", s2):
+        try:
+            return EXCEL_BASE + pd.to_timedelta(float(s2), "D")
+        except Exception:
+            return pd.NaT
+    if re.fullmatch(r"\d{13}", s2):
+        return pd.to_datetime(int(s2), unit="ms", errors="coerce")
+    if re.fullmatch(r"\d{10}(\.\d+)?", s2):
+        return pd.to_datetime(float(s2), unit="s", errors="coerce")
+    for fmt in FORMATOS:
+        try:
+            return pd.to_datetime(s2, format=fmt)
+        except Exception:
+            pass
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return pd.to_datetime(s2, dayfirst=True, errors="coerce")
+
+
+def _strftime(dt, s):
+    dt = _ns(dt)
+    return dt.strftime("%d/%m/%Y") if pd.notna(dt) else s
+
+
+def _to_ddmmaa_text(v):
+    if pd.isna(v):
+        return None
+    s = str(v).strip()
+    if s == "":
+        return None
+    s2 = _sem_fuso(s)
+    if re.match(r"^\d{4}-\d{2}-\d{2}", s2):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            dt = pd.to_datetime(s2, errors="coerce", dayfirst=False)
+        return _strftime(dt, s)
+    if re.fullmatch(r"\d{5,6}(\.\d+)?", s2):
+        try:
+            dt = _ns(EXCEL_BASE + pd.to_timedelta(float(s2), "D"))
+            if pd.notna(dt):
+                return dt.strftime("%d/%m/%Y")
+        except Exception:
+            pass
+    if re.fullmatch(r"\d{13}", s2):
+        dt = pd.to_datetime(int(s2), unit="ms", errors="coerce")
+        return _strftime(dt, s)
+    if re.fullmatch(r"\d{10}(\.\d+)?", s2):
+        dt = pd.to_datetime(float(s2), unit="s", errors="coerce")
+        return _strftime(dt, s)
+    for fmt in FORMATOS:
+        try:
+            return _strftime(pd.to_datetime(s2, format=fmt), s)
+        except Exception:
+            pass
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        dt = pd.to_datetime(s2, dayfirst=True, errors="coerce")
+    return _strftime(dt, s)
+
+
+def test_parse_datas_equivale_ao_antigo():
+    obtido = parse_datas(pd.Series(VALORES, dtype=object))
+    for v, o in zip(VALORES, obtido):
+        esperado = _parse_dt_cmp(v)
+        assert (pd.isna(o) and pd.isna(esperado)) or o == esperado, (v, o, esperado)
+
+
+def test_formatar_datas_equivale_ao_antigo():
+    obtido = formatar_datas(pd.Series(VALORES, dtype=object))
+    assert obtido.tolist() == [_to_ddmmaa_text(v) for v in VALORES]
+
+
+def test_serial_fracionario_fora_do_timedelta_vira_nat():
+    # regressão: um serial como "120000.25" derrubava a coluna inteira (OutOfBoundsDatetime)
+    s = pd.Series(["01/02/2024", "120000.25", "130000", "45000.5"])
+    assert parse_datas(s).tolist() == [pd.Timestamp("2024-02-01"), pd.NaT,
+                                       pd.Timestamp("2255-12-04"), pd.Timestamp("2023-03-15 12:00")]
+    assert formatar_datas(s).tolist() == ["01/02/2024", "120000.25", "04/12/2255", "15/03/2023"]
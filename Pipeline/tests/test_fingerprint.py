@@ -0,0 +1,86 @@
+"""Fingerprint por protocolo, registro em disco e classificação novo/alterado/inalterado."""
+
+import numpy as np
+import pandas as pd
+
+from utils.fingerprint import (
+    ALTERADO,
+    INALTERADO,
+    NOVO,
+    RegistroFingerprints,
+    assinatura_esquema,
+    classificar_protocolos,
+    fingerprint_linhas,
+    fingerprint_por_protocolo,
+)
+
+
+def _bruta():
+    return pd.DataFrame({
+        "protocolo": ["c1", "C2 ", "C3", "C4", "C2"],
+        "tema": ["Saúde", "Obras", None, "x", "Obras"],
+        "prazo": [1, 2, 3, 4, 5],
+    })
+
+
+def _classificar_ref(atual, anterior):
+    if anterior is None or anterior.empty:
+        return {p: NOVO for p in atual.index}
+    antes = dict(zip(anterior.index, anterior.to_numpy()))
+    return {p: NOVO if p not in antes else (INALTERADO if antes[p] == h else ALTERADO)
+            for p, h in zip(atual.index, atual.to_numpy())}
+
+
+def test_fingerprint_compara_texto_aparado():
+    a = pd.DataFrame({"protocolo": ["C1", "C2"], "v": [12, 7], "w": pd.Series(["a", None], dtype=object)})
+    b = pd.DataFrame({"protocolo": [" C1", "C2"], "v": ["12 ", "7"], "w": ["a", ""]})
+    assert (fingerprint_linhas(a).to_numpy() == fingerprint_linhas(b).to_numpy()).all()
+    c = pd.DataFrame({"protocolo": ["C1", "C2"], "v": ["13", "7"], "w": ["a", ""]})
+    assert (fingerprint_linhas(a).to_numpy() == fingerprint_linhas(c).to_numpy()).tolist() == [False, True]
+
+
+def test_fingerprint_por_protocolo_ultima_ocorrencia():
+    fp = fingerprint_por_protocolo(_bruta())
+    assert fp.index.tolist() == ["C1", "C3", "C4", "C2"]
+    assert fp["C2"] == fingerprint_linhas(_bruta()).iloc[4]
+
+
+def test_classificar_igual_referencia():
+    atual = fingerprint_por_protocolo(_bruta())
+    alterada = _bruta()
+    alterada.loc[2, "tema"] = "novo tema"
+    anterior = fingerprint_por_protocolo(alterada.iloc[1:])  # sem C1, C3 alterado
+    classe = classificar_protocolos(atual, anterior)
+    assert classe.to_dict() == _classificar_ref(atual, anterior)
+    assert classe.to_dict() == {"C1": NOVO, "C3": ALTERADO, "C4": INALTERADO, "C2": INALTERADO}
+    assert (classificar_protocolos(atual, None) == NOVO).all()
+
+
+def test_classificar_preserva_os_64_bits():
+    # hashes que diferem só no bit menos significativo (perdido se passassem por float)
+    base = np.uint64(2**64 - 2)
+    atual = pd.Series(np.array([base, base + np.uint64(1)], dtype="uint64"), index=["A", "B"])
+    anterior = pd.Series(np.array([base + np.uint64(1), base + np.uint64(1)], dtype="uint64"), index=["A", "B"])
+    assert classificar_protocolos(atual, anterior).tolist() == [ALTERADO, INALTERADO]
+
+
+def test_registro_ida_e_volta(tmp_path, monkeypatch):
+    monkeypatch.delenv("PIPELINE_INCREMENTAL", raising=False)
+    fp = fingerprint_por_protocolo(_bruta())
+    esquema = assinatura_esquema(_bruta().columns)
+    reg = RegistroFingerprints("teste", diretorio=str(tmp_path))
+    assert reg.carregar(esquema) is None
+    reg.salvar(fp, esquema)
+    lido = RegistroFingerprints("teste", diretorio=str(tmp_path)).carregar(esquema)
+    assert lido.index.tolist() == fp.index.tolist()
+    assert lido.to_numpy(dtype="uint64").tolist() == fp.to_numpy(dtype="uint64").tolist()
+    # esquema diferente (coluna nova): registro descartado
+    assert reg.carregar(assinatura_esquema([*_bruta().columns, "canal"])) is None
+
+
+def test_registro_desabilitado_por_variavel(tmp_path, monkeypatch):
+    monkeypatch.setenv("PIPELINE_INCREMENTAL", "0")
+    reg = RegistroFingerprints("teste", diretorio=str(tmp_path))
+    reg.salvar(fingerprint_por_protocolo(_bruta()), "x")
+    assert reg.carregar("x") is None
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,65 @@
+"""Journal: acréscimos reaplicados por protocolo, sem duplicar nem deixar linhas vazias."""
+
+import pandas as pd
+
+from utils.backend_falso import BackendFalso
+from utils.envio import enviar_em_lotes
+from utils.journal import JournalEscritas
+
+
+def _execucao_com_lote_falho(tmp_path):
+    backend = BackendFalso()
+    backend.criar_planilha("T", [["protocolo", "x"], ["P0", "a"]])
+    _, gc = backend.autenticar()
+    aba = backend.aba("T")
+    journal = JournalEscritas(diretorio=str(tmp_path))
+    aba_journal = journal.envolver(aba)
+
+    update = aba.update
+
+    def update_falho(values=None, range_name=None, **kwargs):
+        if range_name == "A5":
+            raise RuntimeError("429")
+        return update(values=values, range_name=range_name, **kwargs)
+
+    aba.update = update_falho
+    df = pd.DataFrame({"protocolo": [f"P{i}" for i in range(1, 8)], "x": list("bcdefgh")})
+    enviar_em_lotes(aba_journal, df, lambda c: c.values.tolist(), linha_inicial=3, lote=2, max_concorrencia=1)
+    aba.update = update
+    return backend, gc, journal, aba_journal
+
+
+def _protocolos(backend):
+    return [r[0] for r in backend.valores("T")[1:]]
+
+
+def test_reaplica_lote_falho_na_faixa_original(tmp_path):
+    backend, gc, journal, _ = _execucao_com_lote_falho(tmp_path)
+    assert _protocolos(backend) == ["P0", "P1", "P2", "", "", "P5", "P6", "P7"]
+
+    journal.reaplicar(gc)
+    assert _protocolos(backend) == ["P0", "P1", "P2", "P3", "P4", "P5", "P6", "P7"]
+    assert journal.pendentes() == []
+
+
+def test_protocolos_ja_reenviados_nao_duplicam(tmp_path):
+    backend, gc, journal, aba_journal = _execucao_com_lote_falho(tmp_path)
+    # execução seguinte (reaplicação falhou antes): P3 e P4 reenviados no fim
+    aba_journal.acrescentar_linhas(len(backend.valores("T")) + 1, [["P3", "d"], ["P4", "e"]], "RAW")
+
+    resultado = journal.reaplicar(gc)
+    assert _protocolos(backend) == ["P0", "P1", "P2", "P5", "P6", "P7", "P3", "P4"]
+    assert resultado["lacunas_removidas"] == 2
+
+
+def test_acrescimo_expirado_nao_deixa_lacuna(tmp_path):
+    backend, gc, journal, _ = _execucao_com_lote_falho(tmp_path)
+    entradas = journal.pendentes()
+    for reg in entradas:
+        reg["ts"] -= (journal.max_horas + 1) * 3600
+    journal.compactar(entradas)
+
+    resultado = journal.reaplicar(gc)
+    assert resultado["descartadas"] == 1
+    assert _protocolos(backend) == ["P0", "P1", "P2", "P5", "P6", "P7"]
+    assert journal.pendentes() == []
@@ -0,0 +1,84 @@
+"""MapeadorTemas contra o mapeamento antigo por célula (_div_temas + _norm_tema + dicionário)."""
+
+import numpy as np
+import pandas as pd
+
+from tratamento.transform import MAP_TEMA_PARA_ORGAO, MAP_TEMA_PARA_OUVIDORIA
+from utils.mapeamento import MapeadorTemas
+from utils.normalizacao import _canon_txt
+
+
+def _norm_tema(s):
+    return "" if pd.isna(s) else _canon_txt(s)
+
+
+def _div_temas(v, seps=(",", ";", "|", "/")):
+    if pd.isna(v):
+        return []
+    t = str(v)
+    for s in seps:
+        t = t.replace(s, ",")
+    partes = [p.strip() for p in t.split(",") if p.strip()]
+    return partes if partes else [str(v).strip()]
+
+
+MAP_EXACT_ORGAOS = {_norm_tema(k): v for k, v in MAP_TEMA_PARA_ORGAO.items()}
+MAP_TEMA_OUVID_NORM = {_norm_tema(k): v for k, v in MAP_TEMA_PARA_OUVIDORIA.items()}
+
+
+def mapear_orgao_exato(celula_tema):
+    orgs = []
+    tema_as_str = str(celula_tema) if pd.notna(celula_tema) else ""
+    for t in _div_temas(tema_as_str):
+        t_norm = _norm_tema(t)
+        if t_norm and t_norm in MAP_EXACT_ORGAOS:
+            orgs.append(MAP_EXACT_ORGAOS[t_norm])
+    return " | ".join(dict.fromkeys(o.strip() for o in orgs if o and str(o).strip())) or None
+
+
+def map_tema_para_ouvidoria(tema_val):
+    if pd.isna(tema_val) or str(tema_val).strip() == "":
+        return "Ouvidoria Geral"
+    for p in _div_temas(tema_val):
+        pn = _norm_tema(p)
+        if pn in MAP_TEMA_OUVID_NORM:
+            return MAP_TEMA_OUVID_NORM[pn]
+    return "Ouvidoria Geral"
+
+
+def _temas(seed=3, n=400):
+    rng = np.random.default_rng(seed)
+    chaves = list(MAP_TEMA_PARA_ORGAO) + list(MAP_TEMA_PARA_OUVIDORIA)
+    variantes = [str.upper, str.lower, lambda t: f"  {t} ", lambda t: t.replace(" ", "  "), lambda t: t]
+    out = [None, np.nan, "", "   ", ",", " ; | ", "Tema Inexistente", 42, "Saúde/Saude", "saude,,SAÚDE"]
+    while len(out) < n:
+        k = rng.integers(1, 4)
+        partes = [variantes[rng.integers(len(variantes))](chaves[rng.integers(len(chaves))]) for _ in range(k)]
+        if rng.random() < 0.2:
+            partes.append("tema inexistente")
+        sep = [",", ";", " | ", "/", ", "][rng.integers(5)]
+        out.append(sep.join(partes))
+    return out
+
+
+def test_orgaos_igual_mapeamento_antigo():
+    temas = _temas()
+    mapeador = MapeadorTemas(MAP_TEMA_PARA_ORGAO, modo="todos")
+    assert mapeador.mapear(pd.Series(temas, dtype=object)).tolist() == [mapear_orgao_exato(t) for t in temas]
+
+
+def test_ouvidorias_igual_mapeamento_antigo():
+    temas = _temas(seed=5)
+    mapeador = MapeadorTemas(MAP_TEMA_PARA_OUVIDORIA, modo="primeiro", padrao="Ouvidoria Geral")
+    assert mapeador.mapear(pd.Series(temas, dtype=object)).tolist() == [map_tema_para_ouvidoria(t) for t in temas]
+    assert [mapeador.mapear_valor(t) for t in temas[:30]] == [map_tema_para_ouvidoria(t) for t in temas[:30]]
+
+
+def test_cache_esvaziado_nao_altera_resultado():
+    temas = _temas(seed=7, n=200)
+    mapeador = MapeadorTemas(MAP_TEMA_PARA_ORGAO, limite_cache=5)
+    esperado = [mapear_orgao_exato(t) for t in temas]
+    for inicio in range(0, len(temas), 17):  # lotes que passam do limite e repetem temas já vistos
+        lote = temas[inicio:inicio + 40]
+        assert mapeador.mapear(pd.Series(lote, dtype=object)).tolist() == esperado[inicio:inicio + 40]
+        assert len(mapeador._cache) <= max(5, len(set(map(str, lote))))
@@ -0,0 +1,69 @@
+"""Remoção de acentos por tabela de tradução contra a decomposição unicodedata."""
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.normalizacao import (
+    _canon_txt,
+    _canon_txt_preserve_case,
+    canon_series,
+    normalizar_nome_coluna,
+    remover_acentos,
+    remover_acentos_series,
+)
+
+# todo o intervalo das tabelas, mais casos fora dele (grego, símbolos, emoji, ligaduras)
+TEXTOS = [
+    "", "abc", "  Não   há dados ", "AÇÃO Çà ü", "Nº 1ª 2º", "x² y", "ß æ ø đ ł",
+    "áẽ", "Ω ω ά", "ﬁm ™ ①", "café ☕ 🙂", "Saúde\tMental",
+    "".join(chr(cp) for cp in range(0x20, 0x370)),
+]
+
+
+def _sem_marcas_nfd(s):
+    return "".join(ch for ch in unicodedata.normalize("NFD", s) if unicodedata.category(ch) != "Mn")
+
+
+def _sem_marcas_nfkd(s):
+    return "".join(ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch))
+
+
+def _nome_coluna_antigo(col):
+    col = unicodedata.normalize("NFKD", str(col)).encode("ASCII", "ignore").decode("utf-8")
+    col = re.sub(r"[^a-z0-9]+", "_", col.lower())
+    return re.sub(r"_+", "_", col).strip("_")
+
+
+@pytest.mark.parametrize("texto", TEXTOS)
+def test_remover_acentos_igual_unicodedata(texto):
+    assert remover_acentos(texto) == _sem_marcas_nfd(texto)
+    assert remover_acentos(texto, compat=True) == _sem_marcas_nfkd(texto)
+
+
+def test_remover_acentos_caractere_a_caractere():
+    for cp in range(0x80, 0x370):
+        ch = chr(cp)
+        assert remover_acentos(ch) == _sem_marcas_nfd(ch), hex(cp)
+        assert remover_acentos(ch, compat=True) == _sem_marcas_nfkd(ch), hex(cp)
+
+
+def test_remover_acentos_series_igual_escalar():
+    s = pd.Series(TEXTOS, dtype=object)
+    for compat in (False, True):
+        assert remover_acentos_series(s, compat=compat).tolist() == [remover_acentos(t, compat) for t in TEXTOS]
+
+
+def test_canon_series_igual_canon_txt():
+    valores = TEXTOS + [None, np.nan, 12, 3.5, "   "]
+    s = pd.Series(valores, dtype=object)
+    assert canon_series(s).tolist() == [_canon_txt(v) for v in valores]
+    assert canon_series(s, preservar_case=True).tolist() == [_canon_txt_preserve_case(v) for v in valores]
+
+
+@pytest.mark.parametrize("col", ["Nº Protocolo", "Data da Conclusão", " Órgãos / Unidade ", "Tempo de Resolução (dias)"])
+def test_normalizar_nome_coluna(col):
+    assert normalizar_nome_coluna(col) == _nome_coluna_antigo(col)
@@ -0,0 +1,63 @@
+"""Motor de regras (utils/regras.py) e _tratar_full contra a saída fixada do tratamento antigo."""
+
+import io
+from pathlib import Path
+
+import pandas as pd
+
+from tratamento.transform import REGRAS_TRATAR_FULL, _regras_unidade_saude, _tratar_full
+from utils.regras import Regra, executar_regras, planejar
+
+DADOS = Path(__file__).parent / "dados"
+
+
+def _ler(caminho):
+    return pd.read_csv(caminho, dtype=str, keep_default_na=False)
+
+
+def test_tratar_full_igual_ao_tratamento_antigo():
+    # tratada_tratar_full.csv: saída do _tratar_full linha a linha (antes do motor de regras)
+    bruta = _ler(DADOS / "bruta_tratar_full.csv")
+    esperado = _ler(DADOS / "tratada_tratar_full.csv")
+    buf = io.StringIO()
+    _tratar_full(bruta).to_csv(buf, index=False)
+    buf.seek(0)
+    obtido = _ler(buf)
+    assert list(obtido.columns) == list(esperado.columns)
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_plano_igual_a_regras_uma_a_uma():
+    bruta = _ler(DADOS / "bruta_tratar_full.csv")
+    regras = REGRAS_TRATAR_FULL + _regras_unidade_saude(bruta.columns)
+    junto, _ = executar_regras(bruta.copy(), regras)
+    separado = bruta.copy()
+    for r in sorted(regras, key=lambda r: r.ordem):  # sorted é estável: empate mantém a ordem da lista
+        separado, _ = executar_regras(separado, [r])
+    pd.testing.assert_frame_equal(junto, separado)
+
+
+def test_planejar_funde_escalares_e_respeita_dependencias():
+    a = Regra("a", "x", escalar=str.strip)
+    b = Regra("b", "x", escalar=str.upper)
+    c = Regra("c", "y", lambda s, ctx: ctx.coluna("x") + "!", usa=("x",), requer=("x",))
+    d = Regra("d", "x", escalar=str.lower)  # depois de c, que lê x: nova passada
+    plano = planejar([a, b, c, d])
+    assert [(col, [[r.nome for r in g] for g in grupos]) for col, grupos in plano] == [
+        ("x", [["a", "b"]]), ("y", [["c"]]), ("x", [["d"]])]
+
+    df, relatorio = executar_regras(pd.DataFrame({"x": [" Ab "]}), [a, b, c, d])
+    assert df.loc[0, "x"] == "ab" and df.loc[0, "y"] == "AB!"
+    assert [r["regra"] for r in relatorio] == ["a", "b", "c", "d"]
+
+
+def test_regra_com_erro_fica_no_relatorio_e_nao_altera_a_coluna():
+    def falha(s, ctx):
+        raise ValueError("boom")
+
+    regras = [Regra("falha", "x", falha), Regra("sem_coluna", "x", escalar=str.lower, requer=("z",)),
+              Regra("sobe", "x", escalar=str.upper)]
+    df, relatorio = executar_regras(pd.DataFrame({"x": ["a"]}), regras)
+    assert df["x"].tolist() == ["A"]
+    assert relatorio[0]["regra"] == "falha" and "ValueError" in relatorio[0]["erro"]
+    assert [r["regra"] for r in relatorio] == ["falha", "sobe"]
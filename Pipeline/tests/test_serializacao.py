@@ -0,0 +1,75 @@
+"""Serialização coluna a coluna contra o antigo _serializar_lote (iterrows + _cell_for_sheets)."""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from utils.serializacao import celula_para_sheets, serializar_para_sheets
+
+
+def _cell_for_sheets(v):
+    if pd.isna(v):
+        return None
+    if isinstance(v, (pd.Timestamp, np.datetime64)):
+        ts = pd.to_datetime(v, errors="coerce")
+        return None if pd.isna(ts) else ts.strftime("%d/%m/%Y")
+    if isinstance(v, (dt.datetime, dt.date)):
+        return v.strftime("%d/%m/%Y")
+    if isinstance(v, (np.integer, int)):
+        return int(v)
+    if isinstance(v, (np.floating, float)):
+        if not np.isfinite(v):
+            return None
+        if float(v).is_integer():
+            return int(round(v))
+        return float(v)
+    if isinstance(v, (bool, np.bool_)):
+        return bool(v)
+    s = str(v).strip()
+    return s if s != "" else None
+
+
+def _serializar_lote(chunk):
+    return [[_cell_for_sheets(val) for val in r.tolist()] for _, r in chunk.iterrows()]
+
+
+def _tipado(linhas):
+    # 1, 1.0 e True são iguais para ==; o payload precisa do mesmo tipo
+    return [[(type(v), v) for v in linha] for linha in linhas]
+
+
+def _df_misto():
+    n = 6
+    return pd.DataFrame({
+        "texto": [" a ", "", None, "b", "  ", "Saúde"],
+        "objeto": pd.Series(["x", 3, 2.5, np.nan, dt.date(2024, 2, 1), pd.Timestamp("2024-03-05 10:00")], dtype=object),
+        "inteiro": np.arange(n, dtype="int64") * 10**12,
+        "flutuante": [1.0, 2.5, np.nan, np.inf, -0.0, 1e20],
+        "booleano": [True, False] * 3,
+        "data": pd.to_datetime(["2024-01-31", None, "1999-12-31 23:59", "2024-01-31", None, "2030-06-01"], format="ISO8601"),
+        "data_tz": pd.to_datetime(["2024-01-31 23:30"] * n).tz_localize("America/Sao_Paulo"),
+        "nullable": pd.array([1, None, 3, 4, None, 6], dtype="Int64"),
+    })
+
+
+def test_serializar_igual_iterrows_misto():
+    df = _df_misto()
+    assert _tipado(serializar_para_sheets(df)) == _tipado(_serializar_lote(df))
+
+
+def test_serializar_igual_iterrows_numerico():
+    # só números: iterrows sobe a linha para float, o resultado continua o mesmo
+    df = pd.DataFrame({"i": [1, -2, 3], "f": [0.5, 2.0, np.nan], "b": [True, False, True]})
+    assert _tipado(serializar_para_sheets(df)) == _tipado(_serializar_lote(df))
+
+
+def test_celula_para_sheets_igual_conversor_antigo():
+    for v in [None, np.nan, pd.NaT, "", " x ", 0, np.int32(7), 2.0, 2.5, np.float32(0.5), -np.inf,
+              True, np.bool_(False), dt.datetime(2024, 5, 6, 7), pd.Timestamp("2024-05-06")]:
+        assert (type(celula_para_sheets(v)), celula_para_sheets(v)) == (type(_cell_for_sheets(v)), _cell_for_sheets(v)), v
+
+
+def test_serializar_formas_vazias():
+    assert serializar_para_sheets(pd.DataFrame({"a": []})) == []
+    assert serializar_para_sheets(pd.DataFrame(index=range(2))) == [[], []]
@@ -0,0 +1,32 @@
+"""Modo streaming: leitura em faixas sem parar em linhas vazias no meio da aba."""
+
+from tratamento.streaming import ler_faixas
+from utils.backend_falso import BackendFalso
+
+
+def _aba(linhas, row_count=None):
+    backend = BackendFalso()
+    backend.criar_planilha("B", linhas, linhas=row_count)
+    return backend.aba("B")
+
+
+def _dados():
+    # cabeçalho + linhas 2..16, com as linhas 10-11 vazias (lote que falhou)
+    linhas = [["protocolo", "x"]]
+    for r in range(2, 17):
+        linhas.append(["", ""] if r in (10, 11) else [f"P{r}", str(r)])
+    return linhas
+
+
+def _lidas(faixas):
+    return {linha + i: row for linha, rows in faixas for i, row in enumerate(rows)}
+
+
+def test_linhas_vazias_no_fim_do_bloco_nao_encerram_a_leitura():
+    lidas = _lidas(ler_faixas(_aba(_dados()), 2, bloco=5, ultima_linha=16))
+    assert [lidas[r][0] for r in range(12, 17)] == ["P12", "P13", "P14", "P15", "P16"]
+
+
+def test_sem_ultima_linha_le_ate_o_row_count():
+    lidas = _lidas(ler_faixas(_aba(_dados(), row_count=40), 2, bloco=5))
+    assert sorted(r for r, row in lidas.items() if row[0]) == [r for r in range(2, 17) if r not in (10, 11)]
@@ -0,0 +1,137 @@
+"""Sync bruta -> tratada, escrita esparsa dos deltas e _prepare_status."""
+
+import pandas as pd
+
+from tratamento.sync import _patch_grouped_force, aplicar_deltas, calcular_deltas
+from tratamento.transform import _prepare_status, normalizar_nome_coluna
+from utils.backend_falso import BackendFalso
+from utils.snapshot import SheetSnapshot
+
+
+def _tratada(n=3000):
+    backend = BackendFalso()
+    linhas = [["protocolo", "status_demanda", "data_da_conclusao"]]
+    linhas += [[f"C{i}", "Em andamento", "Não concluído"] for i in range(n)]
+    backend.criar_planilha("T", linhas, linhas=n + 10)
+    aba = backend.aba("T")
+    snap = SheetSnapshot.carregar(aba, nome="tratada", normalizador=normalizar_nome_coluna)
+    return backend, aba, snap
+
+
+def test_prepare_status_sem_data_da_conclusao():
+    df = pd.DataFrame({"protocolo": ["C1"], "status_demanda": ["Concluída"]})
+    assert _prepare_status(df) is df
+
+
+def test_prepare_status_data_da_conclusao_dia_primeiro():
+    df = pd.DataFrame({"data_da_conclusao": ["01/02/2024", "2024-02-01", "", "nan"]})
+    assert _prepare_status(df)["data_da_conclusao"].tolist() == [
+        "01/02/2024", "01/02/2024", "Não concluído", "Não concluído"]
+
+
+def test_patch_esparso_em_uma_requisicao():
+    backend, aba, snap = _tratada()
+    # 2000 mudanças de status, não contíguas, + 1 protocolo ausente + 1 já igual
+    delta = pd.DataFrame({"protocolo": [f"C{i}" for i in range(0, 4000, 2)] + ["X9", "C1"],
+                          "status_demanda": ["Concluída"] * 2000 + ["Concluída", "Em andamento"]})
+    antes = backend.contadores["batch_update"]
+    aplicados, ausentes = _patch_grouped_force(delta, "protocolo", "status_demanda", sheet=aba, snapshot=snap)
+    assert (aplicados, ausentes) == (1500, 501)
+    assert backend.contadores["batch_update"] - antes == 1
+    valores = backend.valores("T")
+    assert valores[1][1] == "Concluída" and valores[2][1] == "Em andamento" and valores[3][1] == "Concluída"
+    assert snap.values[1][1] == "Concluída"
+
+
+def test_deltas_escritos_na_etapa_10():
+    backend, aba, snap = _tratada(10)
+    df_tratada = snap.df.copy()
+    df_tratada["status_demanda_OLD"] = df_tratada["status_demanda"]
+    df_tratada.loc[[2, 5], "status_demanda"] = "Concluída"
+    deltas = calcular_deltas(df_tratada, None)
+    resultado = aplicar_deltas(deltas, aba, snap)
+    assert resultado["status_demanda"] == (2, 0)
+    assert [r[1] for r in backend.valores("T")[1:]].count("Concluída") == 2
+
+
+def test_numeros_formatados_no_locale_nao_sao_reescritos():
+    from utils.escrita import celulas_alteradas
+
+    atuais = ["5,5", "1.234,5", "7", "0,3333333333", "5,5", "abc", ""]
+    novos = [5.5, 1234.5, 7, 1 / 3, 6.5, "abc", 2]
+    assert celulas_alteradas(atuais, novos, col_idx=4) == [(6, 4, 6.5), (8, 4, 2)]
+
+
+def test_sync_de_coluna_fracionaria_idempotente(tmp_path, monkeypatch):
+    from tratamento.sync import sincronizar_colunas, SINCRONIZACOES
+
+    monkeypatch.chdir(tmp_path)  # backup CSV da coluna antiga
+
+    backend = BackendFalso()
+    backend.criar_planilha("T", [["protocolo", "tempo_de_resolucao_em_dias"], ["C1", "5,5"], ["C2", "3"]])
+    aba = backend.aba("T")
+    snap = SheetSnapshot.carregar(aba, nome="tratada", normalizador=normalizar_nome_coluna)
+    bruta = pd.DataFrame({"protocolo": ["C1", "C2"], "tempo_de_resolucao_em_dias": ["5.5", "4"]})
+    antes = backend.contadores["batch_update"]
+    sincronizar_colunas(bruta, snap.df.copy(), aba, snap, sincronizacoes=SINCRONIZACOES[:1])
+    assert backend.contadores["batch_update"] - antes == 1
+    assert backend.valores("T")[1:] == [["C1", "5,5"], ["C2", "4"]]
+
+
+def _calcular_coluna_ref(df_b, df_t, spec, alvo=None):
+    """Laço linha a linha dos antigos sync_* (referência do motor de utils/sync.py)."""
+    import re
+
+    mapa = {}
+    for p, v in zip(df_b["protocolo"], df_b[spec.coluna]):
+        p = str(p).strip().upper()
+        if alvo is None or p in alvo:
+            mapa[p] = v
+    primeiro = {}
+    for p, v in zip(df_t["protocolo"], df_t.get(spec.coluna, [""] * len(df_t))):
+        primeiro.setdefault(str(p).strip().upper(), v)
+    conv = spec.conversor or (lambda v: v)
+    out = []
+    for p in df_t["protocolo"]:
+        p = str(p).strip().upper()
+        if p in mapa and (spec.padrao_protocolo is None or re.match(spec.padrao_protocolo, p, re.IGNORECASE)):
+            out.append(conv(mapa[p]))
+        else:
+            out.append(conv(primeiro[p]) if spec.converter_mantidos else primeiro[p])
+    return out
+
+
+def test_calcular_coluna_igual_laco_por_linha():
+    from utils.sync import ColunaSincronizada, calcular_coluna
+
+    df_b = pd.DataFrame({"protocolo": ["c1", "C2", "X3", "C2 ", "C5"],
+                         "status_demanda": ["a", "b", "c", "d", "e"]})
+    df_t = pd.DataFrame({"protocolo": ["C1", "C2", "X3", "C4", "C4", "C2"],
+                         "status_demanda": ["t1", "t2", "t3", "t4", "t5", "t6"]})
+    specs = [
+        ColunaSincronizada("status_demanda"),
+        ColunaSincronizada("status_demanda", conversor=str.upper, padrao_protocolo=r"^C"),
+        ColunaSincronizada("status_demanda", conversor=lambda v: v + "!", converter_mantidos=True),
+    ]
+    for spec in specs:
+        for alvo in (None, {"C2"}):
+            assert calcular_coluna(df_b, df_t, spec, protocolos_alvo=alvo) == \
+                _calcular_coluna_ref(df_b, df_t, spec, alvo), (spec, alvo)
+
+
+def test_sincronizar_coluna_escreve_so_as_celulas_alteradas():
+    from utils.sync import ColunaSincronizada, sincronizar_coluna
+
+    backend, aba, snap = _tratada(50)
+    bruta = pd.DataFrame({"protocolo": ["C3", "C7", "C9"],
+                          "status_demanda": ["Concluída", "Em andamento", "Concluída"]})
+    antes = backend.contadores["batch_update"]
+    df = sincronizar_coluna(bruta, snap.df.copy(), ColunaSincronizada("status_demanda"), aba, snap)
+    assert backend.contadores["batch_update"] - antes == 1
+    assert df["status_demanda"].tolist().count("Concluída") == 2
+    assert [r[1] for r in backend.valores("T")[1:]] == df["status_demanda"].tolist()
+    assert snap.values == backend.valores("T")[:len(snap.values)]
+
+    # segunda execução: nada muda, nada é enviado
+    sincronizar_coluna(bruta, df, ColunaSincronizada("status_demanda"), aba, snap)
+    assert backend.contadores["batch_update"] - antes == 1
@@ -0,0 +1,37 @@
+"""normalizar_unidades (UACs por valor distinto) contra a regra aplicada célula a célula."""
+
+import numpy as np
+import pandas as pd
+
+from tratamento.transform import CAPITALIZADOR_UAC, UAC_MAPA, normalizar_unidades
+from utils.normalizacao import _canon_txt, remover_acentos
+
+VALORES = [None, np.nan, "", "  ", "nan", 5, "UAC - cer iv", "uac-uph  xerém", "UPA - beira mar",
+           " upa -  UPA Norte do rio ", "Ouvidoria Setorial da Saúde", "ouvidoria geral", "cidadao",
+           "hospital   MUNICIPAL de duque", "UBS  da  vila", "Ouvidoria Setorial de Assistência Social",
+           "uac", "Ⅳ cer", *UAC_MAPA, *UAC_MAPA.values()]
+
+
+def _normalizar_ref(v):
+    texto = "" if v is None or (isinstance(v, float) and np.isnan(v)) else v
+    norm = _canon_txt(remover_acentos(str(texto), compat=True)).strip()
+    mapeado = UAC_MAPA.get(norm)
+    if mapeado is not None and mapeado != norm:
+        return mapeado
+    if norm != "":
+        return CAPITALIZADOR_UAC.formatar(texto)
+    return None if texto == "" else texto
+
+
+def test_normalizar_unidades_igual_por_celula():
+    s = pd.Series(VALORES * 3, dtype=object, name="unidade_cadastro")
+    s.index = s.index * 3 + 7
+    out = normalizar_unidades(s)
+    assert out.index.equals(s.index) and out.name == "unidade_cadastro" and out.dtype == object
+    assert out.tolist() == [_normalizar_ref(v) for v in s]
+
+
+def test_normalizar_unidades_exemplos():
+    s = pd.Series(["uac - uac uph xerem", "Cidadão", "uac-uph  xerém", "UBS  da  vila", "", None], dtype=object)
+    assert normalizar_unidades(s).tolist() == [
+        "UAC - UPH Xerém", "Cidadão", "UAC - UPH Xerem", "UBS da Vila", None, None]
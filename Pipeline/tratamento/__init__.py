@@ -0,0 +1,26 @@
+"""
+Pacote do pipeline de tratamento da Ouvidoria (antigo Pipeline/main.py).
+
+Módulos:
+- config: logging e banners
+- auth: autenticação Google (bibliotecas importadas sob demanda)
+- io: leitura das planilhas bruta/tratada e coleta de protocolos
+- transform: normalizações e _tratar_full (sem dependência do Google)
+- sync: sincronização bruta -> tratada, deltas e overrides
+- upload: preparação e envio dos protocolos novos
+- qa: checagens de qualidade e sanity checks
+- execucao: encadeamento dos itens 1 a 12
+- streaming: execução em blocos de linhas, com memória limitada
+- cli: main() e subcomandos
+- sintetico: gerador de planilhas brutas sintéticas (offline)
+- benchmark: vazão e pico de memória por etapa em bases sintéticas
+
+Importar o pacote não executa nada nem carrega gspread/googleapiclient.
+"""
+
+__all__ = ["main"]
+
+
+def main(argv=None) -> int:
+    from .cli import main as _main
+    return _main(argv)
@@ -0,0 +1,74 @@
+"""
+1) Autenticação Google Drive / Sheets.
+
+As bibliotecas do Google (google.oauth2, googleapiclient, gspread) só são
+importadas dentro de autenticar(): comandos offline (transform, benchmark)
+não pagam esse custo.
+"""
+
+import base64
+import binascii
+import json
+import logging
+
+CAMINHO_CREDENCIAIS = ".github/workflows/credentials.json"
+SCOPES = [
+    "https://www.googleapis.com/auth/drive",
+    "https://www.googleapis.com/auth/spreadsheets"
+]
+
+
+def ler_credenciais(caminho: str = CAMINHO_CREDENCIAIS) -> dict:
+    """Lê o arquivo de credenciais (JSON da service account em Base64)."""
+    logging.info(f"Tentando ler string Base64 do arquivo: '{caminho}'")
+    with open(caminho, "r", encoding="utf-8") as file:
+        encoded_json_string = file.read().strip()  # Lê e remove espaços/newlines
+
+    # Decodifica de Base64 para bytes, depois para string UTF-8
+    decoded_json_str = base64.b64decode(encoded_json_string).decode("utf-8")
+
+    # A string JSON decodificada vai direto para json.loads (sem limpeza agressiva).
+    service_account_info = json.loads(decoded_json_str)
+    logging.info("✅ Arquivo de credenciais Base64 lido e JSON decodificado com sucesso (limpeza agressiva removida).")
+    return service_account_info
+
+
+def autenticar(caminho: str = CAMINHO_CREDENCIAIS, agendador=None):
+    """
+    Autentica uma única vez e devolve (drive_service, gc).
+    Com agendador (utils.agendador.AgendadorAPI), todo o tráfego Drive/Sheets
+    passa por ele (cotas por minuto + backoff em 429/5xx).
+    Falhas encerram o pipeline com SystemExit.
+    """
+    try:
+        service_account_info = ler_credenciais(caminho)
+
+        import gspread
+        from google.oauth2.service_account import Credentials
+        from googleapiclient.discovery import build
+
+        creds = Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
+        if agendador is not None:
+            from utils.agendador import cliente_http_agendado, request_builder_agendado
+            drive_service = build("drive", "v3", credentials=creds, requestBuilder=request_builder_agendado(agendador))
+            gc = gspread.authorize(creds, http_client=cliente_http_agendado(agendador))
+        else:
+            drive_service = build("drive", "v3", credentials=creds)
+            gc = gspread.authorize(creds)
+        logging.info("✅ Autenticação Google OK")
+        print("✅ Autenticação Google OK.")
+        return drive_service, gc
+    except FileNotFoundError:
+        logging.critical(f"❌ Falha na autenticação Google: Arquivo de credenciais não encontrado em '{caminho}'. Verifique o caminho e a criação do arquivo no workflow.", exc_info=True)
+        raise SystemExit("Erro crítico: Arquivo de credenciais não encontrado. O pipeline será encerrado.")
+    except binascii.Error as e:
+        logging.critical(f"❌ Falha na autenticação Google: Erro ao decodificar a string Base64. Conteúdo inválido no secret? Erro: {e}. O pipeline será encerrado.", exc_info=True)
+        raise SystemExit("Erro crítico: Conteúdo Base64 inválido no arquivo de credenciais.")
+    except json.JSONDecodeError as e:
+        logging.critical(f"❌ Falha na autenticação Google: Erro ao decodificar JSON da string Base64 decodificada. Conteúdo inválido. Erro: {e}. O pipeline será encerrado.", exc_info=True)
+        # Se este erro ainda ocorrer, o problema está na string JSON decodificada antes de qualquer limpeza.
+        # O log do YML (com xxd -p) será crucial para ver o que o Base64 produziu.
+        raise SystemExit("Erro crítico: Conteúdo JSON inválido na string Base64 decodificada.")
+    except Exception as e:
+        logging.critical(f"❌ Falha na autenticação Google. Erro inesperado: {e}. O pipeline será encerrado.", exc_info=True)
+        raise SystemExit("Erro crítico: Falha inesperada na autenticação Google. O pipeline será encerrado.")
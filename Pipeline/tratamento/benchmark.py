@@ -0,0 +1,245 @@
+"""
+Benchmark offline das etapas de tratamento (sem credenciais, sem rede).
+
+Gera bases sintéticas (tratamento/sintetico.py) em alguns tamanhos e mede, por
+etapa, o melhor tempo de N repetições, a vazão (linhas/s) e o pico de memória
+alocada (tracemalloc, numa passada separada para não distorcer o tempo):
+
+    python Pipeline/main.py benchmark --linhas 10000 100000 1000000
+    python Pipeline/main.py benchmark --etapas datas mapear_orgao --json bench.json
+
+Cada etapa recebe uma cópia da base, então a ordem e as repetições não
+interferem umas nas outras. Para acompanhar uma otimização, rode antes e
+depois com o mesmo --seed e compare os JSONs.
+
+simular_execucao() roda o pipeline completo (itens 1 a 12) contra o backend
+falso em memória (utils/backend_falso.py), com latência e 429 configuráveis:
+
+    python Pipeline/main.py simular --linhas 100000 --latencia-ms 80 --rajada-429 20:6
+"""
+
+import gc
+import json
+import logging
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from utils.backend_falso import BackendFalso, PlanoFalhas
+from utils.datas import formatar_datas, parse_datas
+from utils.fingerprint import fingerprint_por_protocolo
+from utils.mapeamento import MapeadorTemas
+from utils.serializacao import serializar_para_sheets
+from utils.sync import calcular_coluna
+
+from .io import FOLDER_ID_BRUTA, PLANILHA_TRATADA_ID
+from .sintetico import gerar_bruta, gerar_tratada
+from .sync import SINCRONIZACOES, pre_tratar_tempo_bruta
+from .transform import (
+    MAP_TEMA_PARA_ORGAO, _conclusao_strict, _prepare_status, _tratar_full, normalize_protocolo_col,
+    normalizar_unidades,
+)
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+_MB = 1024 * 1024
+
+
+class CasoBenchmark:
+    """
+    Uma etapa medida.
+    - preparar(bruta, tratada) devolve a função sem argumentos que será cronometrada
+      (o que estiver fora dela — cópias, recortes — não entra no tempo)
+    - base: "bruta" ou "tratada" — de qual base saem as linhas da vazão
+    """
+
+    def __init__(self, nome: str, preparar: Callable[[pd.DataFrame, pd.DataFrame], Callable[[], object]],
+                 base: str = "bruta"):
+        self.nome = nome
+        self.preparar = preparar
+        self.base = base
+
+
+def _caso_sync(spec):
+    def preparar(bruta, tratada):
+        bruta_pre = pre_tratar_tempo_bruta(bruta.copy())
+        return lambda: calcular_coluna(bruta_pre, tratada, spec)
+    return CasoBenchmark(f"sync:{spec.coluna}", preparar, base="tratada")
+
+
+def _caso_uac(bruta, tratada):
+    # Normalização de unidade_cadastro (proper case + UACs) isolada: _tratar_full
+    # sobre o recorte só com as colunas de que ela depende.
+    recorte = bruta[["protocolo", "tema", "unidade_cadastro"]]
+    return lambda: _tratar_full(recorte.copy())
+
+
+CASOS: List[CasoBenchmark] = [
+    CasoBenchmark("normalize_protocolo", lambda b, t: lambda: normalize_protocolo_col(b.copy(), "protocolo")),
+    CasoBenchmark("datas:parse_datas", lambda b, t: lambda: parse_datas(b["data_da_criacao"])),
+    CasoBenchmark("datas:formatar_datas", lambda b, t: lambda: formatar_datas(b["data_da_criacao"])),
+    CasoBenchmark("datas:conclusao_strict", lambda b, t: lambda: _conclusao_strict(b["data_da_conclusao"])),
+    # mapeador novo a cada chamada: mede a compilação + resolução a frio (sem o cache por tema)
+    CasoBenchmark("mapear_orgao_exato", lambda b, t: lambda: MapeadorTemas(MAP_TEMA_PARA_ORGAO).mapear(b["tema"])),
+    CasoBenchmark("uac_unidade_cadastro", _caso_uac),
+    CasoBenchmark("uac:normalizar_unidades", lambda b, t: lambda: normalizar_unidades(b["unidade_cadastro"])),
+    CasoBenchmark("_tratar_full", lambda b, t: lambda: _tratar_full(b.copy())),
+    CasoBenchmark("sync:pre_tratar_tempo", lambda b, t: lambda: pre_tratar_tempo_bruta(b.copy())),
+    *[_caso_sync(spec) for spec in SINCRONIZACOES],
+    CasoBenchmark("_prepare_status", lambda b, t: lambda: _prepare_status(t.copy()), base="tratada"),
+    CasoBenchmark("fingerprint_por_protocolo", lambda b, t: lambda: fingerprint_por_protocolo(t, "protocolo"), base="tratada"),
+    CasoBenchmark("serializar_para_sheets", lambda b, t: lambda: serializar_para_sheets(t), base="tratada"),
+]
+
+
+def _cronometrar(func: Callable[[], object], repeticoes: int) -> float:
+    melhor = float("inf")
+    for _ in range(max(1, repeticoes)):
+        gc.collect()
+        t0 = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor
+
+
+def _pico_memoria_mb(func: Callable[[], object]) -> float:
+    """Pico de memória alocada (Python/numpy) durante uma chamada, acima do que já existia."""
+    gc.collect()
+    ja_ativo = tracemalloc.is_tracing()
+    if not ja_ativo:
+        tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        resultado = func()
+        pico = tracemalloc.get_traced_memory()[1]
+        del resultado
+    finally:
+        if not ja_ativo:
+            tracemalloc.stop()
+    return max(0, pico - base) / _MB
+
+
+def executar_benchmark(tamanhos: Iterable[int] = TAMANHOS_PADRAO, repeticoes: int = 3,
+                       etapas: Optional[Iterable[str]] = None, medir_memoria: bool = True,
+                       seed: int = 0) -> dict:
+    """
+    Roda os casos em cada tamanho e devolve o relatório (dict serializável em JSON).
+    - etapas: filtra casos pelo nome (prefixo, ex.: "datas" ou "sync")
+    """
+    filtros = list(etapas or [])
+    casos = [c for c in CASOS if not filtros or any(c.nome.startswith(f) for f in filtros)]
+    if not casos:
+        raise ValueError(f"Nenhuma etapa corresponde a {filtros}. Disponíveis: {[c.nome for c in CASOS]}")
+
+    resultados: List[Dict[str, object]] = []
+    for n in tamanhos:
+        t0 = time.perf_counter()
+        bruta = normalize_protocolo_col(gerar_bruta(n, seed=seed), "protocolo")
+        tratada = gerar_tratada(bruta, seed=seed + 1)
+        logging.info(f"Benchmark: base sintética de {n} linhas gerada em {time.perf_counter() - t0:.2f}s")
+        print(f"📊 {n} linhas ({len(tratada)} na tratada sintética)")
+
+        for caso in casos:
+            func = caso.preparar(bruta, tratada)
+            segundos = _cronometrar(func, repeticoes)
+            pico = _pico_memoria_mb(func) if medir_memoria else None
+            linhas = len(tratada) if caso.base == "tratada" else len(bruta)
+            r = {
+                "linhas": linhas,
+                "etapa": caso.nome,
+                "segundos": round(segundos, 4),
+                "linhas_por_s": round(linhas / segundos, 1) if segundos > 0 else None,
+                "pico_mb": None if pico is None else round(pico, 1),
+            }
+            resultados.append(r)
+            print(_linha(r))
+            logging.info(f"Benchmark {caso.nome} @ {linhas}: {segundos:.4f}s | pico {r['pico_mb']}MB")
+        del bruta, tratada
+        gc.collect()
+
+    return {
+        "inicio": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "seed": seed,
+        "repeticoes": repeticoes,
+        "resultados": resultados,
+    }
+
+
+def _linha(r: dict) -> str:
+    vazao = f"{r['linhas_por_s']:>14,.0f}" if r["linhas_por_s"] else f"{'-':>14}"
+    pico = f"{r['pico_mb']:>9.1f}" if r["pico_mb"] is not None else f"{'-':>9}"
+    return f"   {r['etapa']:<34} {r['linhas']:>9} {r['segundos']:>10.4f}s {vazao} linhas/s {pico} MB"
+
+
+def salvar_relatorio(relatorio: dict, caminho: str) -> str:
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    logging.info(f"Resultado gravado em '{caminho}'.")
+    return caminho
+
+
+# ----------------------------------------------------------------------
+# Execução completa contra o backend falso
+# ----------------------------------------------------------------------
+# Sem cache local, journal nem fingerprints: cada simulação parte do zero e
+# não toca no estado da execução real.
+_AMBIENTE_SIMULACAO = {"PIPELINE_CACHE": "0", "PIPELINE_JOURNAL": "0", "PIPELINE_INCREMENTAL": "0"}
+
+
+def _como_valores(df: pd.DataFrame) -> List[List[str]]:
+    return [list(df.columns)] + df.astype(str).to_numpy().tolist()
+
+
+def montar_backend(n_linhas: int, latencia_s=0.0, falhas: Optional[List[PlanoFalhas]] = None,
+                   seed: int = 0, fracao_tratada: float = 0.9) -> BackendFalso:
+    """Backend falso com a bruta sintética na pasta do Drive e a tratada "anterior" (fracao_tratada)."""
+    bruta = gerar_bruta(n_linhas, seed=seed)
+    tratada = gerar_tratada(bruta, fracao=fracao_tratada, seed=seed + 1)
+    backend = BackendFalso(latencia_s=latencia_s, falhas=falhas)
+    backend.criar_planilha("bruta_sintetica", _como_valores(bruta), titulo=f"bruta_sintetica_{n_linhas}",
+                           pasta=FOLDER_ID_BRUTA, linhas=n_linhas + 1)
+    backend.criar_planilha(PLANILHA_TRATADA_ID, _como_valores(tratada), titulo="tratada_sintetica",
+                           linhas=len(tratada) + 1)
+    return backend
+
+
+def simular_execucao(n_linhas: int, latencia_s=0.0, falhas: Optional[List[PlanoFalhas]] = None,
+                     seed: int = 0, arquivo_relatorio: Optional[str] = None, agendador=None,
+                     streaming: bool = False, bloco: Optional[int] = None) -> dict:
+    """
+    Roda tratamento.execucao.executar() contra o backend falso e devolve
+    duração, uso de cota do agendador e chamadas/erros por tipo do backend.
+    """
+    from .execucao import executar
+
+    backend = montar_backend(n_linhas, latencia_s=latencia_s, falhas=falhas, seed=seed)
+    anterior = {k: os.environ.get(k) for k in _AMBIENTE_SIMULACAO}
+    os.environ.update(_AMBIENTE_SIMULACAO)
+    t0 = time.perf_counter()
+    try:
+        api = executar(arquivo_relatorio=arquivo_relatorio, backend=backend, agendador=agendador,
+                       streaming=streaming, bloco=bloco)
+    finally:
+        for k, v in anterior.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+    duracao = time.perf_counter() - t0
+    resultado = {
+        "linhas_bruta": n_linhas,
+        "streaming": streaming,
+        "linhas_tratada_final": max(0, len(backend.valores(PLANILHA_TRATADA_ID)) - 1),
+        "duracao_s": round(duracao, 3),
+        "api": api,
+        "backend": backend.relatorio(),
+    }
+    logging.info(f"Simulação: {n_linhas} linhas em {duracao:.2f}s | backend {resultado['backend']}")
+    return resultado
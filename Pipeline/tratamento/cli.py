@@ -0,0 +1,167 @@
+"""
+Linha de comando do pipeline.
+
+    python Pipeline/main.py                  # execução completa (padrão)
+    python Pipeline/main.py run
+    python Pipeline/main.py run --streaming --bloco 20000   # memória limitada (tratamento/streaming.py)
+    python Pipeline/main.py transform --entrada bruta.csv --saida tratada.csv
+    python Pipeline/main.py gerar --linhas 100000 --saida bruta_sintetica.csv
+    python Pipeline/main.py benchmark --linhas 10000 100000 --json bench.json
+    python Pipeline/main.py simular --linhas 100000 --latencia-ms 80 --rajada-429 20:6
+
+Os subcomandos `transform`, `gerar`, `benchmark` e `simular` rodam offline,
+sem credenciais e sem importar as bibliotecas do Google (`simular` roda a
+execução completa contra o backend falso em memória).
+"""
+
+import argparse
+import logging
+import time
+
+from .config import ARQUIVO_LOG, configurar_logging
+
+
+def _cmd_run(args) -> int:
+    configurar_logging(args.log)
+    from utils.instrumentacao import caminho_relatorio
+    from .execucao import executar  # importa utils.* e, dentro de autenticar(), as bibliotecas do Google
+    executar(arquivo_relatorio=caminho_relatorio(args.log), streaming=args.streaming or None, bloco=args.bloco)
+    return 0
+
+
+def _cmd_transform(args) -> int:
+    configurar_logging(args.log)
+    import pandas as pd
+    from utils.instrumentacao import Instrumentacao, ativar, caminho_relatorio
+    from .transform import normalizar_nome_coluna, normalize_protocolo_col, _tratar_full
+
+    # Tudo como texto, como vem do get_all_values
+    df = pd.read_csv(args.entrada, dtype=str, keep_default_na=False, encoding=args.encoding)
+    df.columns = [normalizar_nome_coluna(c) for c in df.columns]
+    df = normalize_protocolo_col(df, "protocolo")
+
+    instr = Instrumentacao()  # relatório de tempo/memória ao lado do log
+    ativar(instr)
+    t0 = time.perf_counter()
+    out = _tratar_full(df)
+    dt = time.perf_counter() - t0
+    ativar(None)
+    instr.salvar(caminho_relatorio(args.log))
+
+    out.to_csv(args.saida, index=False, encoding=args.encoding)
+    print(f"✅ {len(out)} linhas tratadas em {dt:.2f}s → {args.saida}")
+    logging.info(f"transform: {len(out)} linhas em {dt:.2f}s ({args.entrada} → {args.saida})")
+    return 0
+
+
+def _cmd_gerar(args) -> int:
+    configurar_logging(args.log)
+    from .sintetico import gerar_bruta
+
+    t0 = time.perf_counter()
+    df = gerar_bruta(args.linhas, seed=args.seed)
+    df.to_csv(args.saida, index=False, encoding=args.encoding)
+    print(f"✅ {len(df)} linhas sintéticas em {time.perf_counter() - t0:.2f}s → {args.saida}")
+    return 0
+
+
+def _cmd_benchmark(args) -> int:
+    configurar_logging(args.log, logging.WARNING)  # sem os logs de cada tratamento a cada repetição
+    from .benchmark import executar_benchmark, salvar_relatorio
+
+    rel = executar_benchmark(args.linhas, repeticoes=args.repeticoes, etapas=args.etapas,
+                             medir_memoria=not args.sem_memoria, seed=args.seed)
+    if args.json:
+        salvar_relatorio(rel, args.json)
+        print(f"📄 Resultado gravado em {args.json}")
+    return 0
+
+
+def _rajada(texto: str):
+    inicio, _, qtd = texto.partition(":")
+    return int(inicio), int(qtd or 1)
+
+
+def _cmd_simular(args) -> int:
+    configurar_logging(args.log)
+    from utils.backend_falso import PlanoFalhas
+    from utils.instrumentacao import caminho_relatorio
+    from .benchmark import salvar_relatorio, simular_execucao
+
+    falhas = []
+    if args.rajada_429 or args.taxa_429 or args.a_cada_429:
+        falhas.append(PlanoFalhas(429, a_cada=args.a_cada_429, rajadas=args.rajada_429 or (),
+                                  taxa=args.taxa_429, seed=args.seed, retry_after=args.retry_after))
+    res = simular_execucao(args.linhas, latencia_s=args.latencia_ms / 1000.0, falhas=falhas,
+                           seed=args.seed, arquivo_relatorio=caminho_relatorio(args.log),
+                           streaming=args.streaming, bloco=args.bloco)
+    b = res["backend"]
+    print(f"🧪 Simulação: {res['linhas_bruta']} linhas em {res['duracao_s']:.2f}s | "
+          f"{b['total_chamadas']} chamadas ao backend | erros {b['erros'] or '-'}")
+    for nome, n in sorted(b["chamadas"].items()):
+        print(f"   - {nome}: {n}")
+    if args.json:
+        salvar_relatorio(res, args.json)
+    return 0
+
+
+def _args_streaming(p) -> None:
+    p.add_argument("--streaming", action="store_true",
+                   help="lê e processa as planilhas em blocos, com memória limitada (padrão: PIPELINE_STREAMING)")
+    p.add_argument("--bloco", type=int, help="linhas por bloco no modo streaming (padrão: PIPELINE_BLOCO ou 20000)")
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pipeline", description="Pipeline de tratamento da Ouvidoria")
+    parser.add_argument("--log", default=ARQUIVO_LOG, help=f"arquivo de log (padrão: {ARQUIVO_LOG})")
+    sub = parser.add_subparsers(dest="comando")
+
+    p_run = sub.add_parser("run", help="execução completa: bruta (Drive) → tratada (Sheets)")
+    _args_streaming(p_run)
+    p_run.set_defaults(func=_cmd_run)
+
+    p_tr = sub.add_parser("transform", help="aplica o tratamento a um CSV local (offline)")
+    p_tr.add_argument("--entrada", required=True, help="CSV com as colunas da planilha bruta")
+    p_tr.add_argument("--saida", required=True, help="CSV de saída tratado")
+    p_tr.add_argument("--encoding", default="utf-8-sig")
+    p_tr.set_defaults(func=_cmd_transform)
+
+    p_ge = sub.add_parser("gerar", help="gera uma planilha bruta sintética em CSV")
+    p_ge.add_argument("--linhas", type=int, default=100_000)
+    p_ge.add_argument("--saida", required=True)
+    p_ge.add_argument("--seed", type=int, default=0)
+    p_ge.add_argument("--encoding", default="utf-8-sig")
+    p_ge.set_defaults(func=_cmd_gerar)
+
+    p_be = sub.add_parser("benchmark", help="mede as etapas de tratamento em bases sintéticas (offline)")
+    p_be.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000],
+                      help="tamanhos das bases (padrão: 10000 100000; inclua 1000000 para a escala real)")
+    p_be.add_argument("--repeticoes", type=int, default=3, help="vale o melhor tempo (padrão: 3)")
+    p_be.add_argument("--etapas", nargs="*", help="prefixos dos nomes das etapas (padrão: todas)")
+    p_be.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória (mais rápido)")
+    p_be.add_argument("--seed", type=int, default=0)
+    p_be.add_argument("--json", help="grava o resultado neste arquivo JSON")
+    p_be.set_defaults(func=_cmd_benchmark)
+
+    p_si = sub.add_parser("simular", help="execução completa contra o backend Sheets/Drive falso (offline)")
+    p_si.add_argument("--linhas", type=int, default=10_000, help="linhas da bruta sintética")
+    p_si.add_argument("--latencia-ms", type=float, default=0.0, help="latência por chamada")
+    p_si.add_argument("--rajada-429", type=_rajada, action="append",
+                      help="INICIO:QTD — chamadas INICIO..INICIO+QTD-1 recebem 429 (repetível)")
+    p_si.add_argument("--a-cada-429", type=int, help="429 a cada N chamadas")
+    p_si.add_argument("--taxa-429", type=float, default=0.0, help="probabilidade de 429 por chamada (sorteio com --seed)")
+    p_si.add_argument("--retry-after", type=float, help="cabeçalho Retry-After dos 429 (s)")
+    p_si.add_argument("--seed", type=int, default=0)
+    p_si.add_argument("--json", help="grava o resultado neste arquivo JSON")
+    _args_streaming(p_si)
+    p_si.set_defaults(func=_cmd_simular)
+
+    # sem subcomando: mesmos padrões do `run` (os argumentos dele não existem no parser raiz)
+    parser.set_defaults(func=_cmd_run, streaming=False, bloco=None)
+    return parser
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada: sem subcomando, roda o pipeline completo."""
+    args = _parser().parse_args(argv)
+    return args.func(args)
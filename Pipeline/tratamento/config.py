@@ -0,0 +1,32 @@
+"""
+Configuração comum do pipeline: logging (arquivo + console) e banners de seção.
+"""
+
+import logging
+
+ARQUIVO_LOG = "pipeline_tratamento.log"
+
+
+def configurar_logging(arquivo: str = ARQUIVO_LOG, nivel: int = logging.INFO) -> None:
+    """Logging em arquivo + console (chamado por main(), nunca na importação)."""
+    logging.basicConfig(
+        level=nivel,  # Pode mudar para logging.DEBUG para mais detalhes durante a depuração.
+        format="%(asctime)s | %(levelname)s | %(message)s",
+        handlers=[
+            logging.FileHandler(arquivo, encoding="utf-8"),
+            logging.StreamHandler()
+        ]
+    )
+
+
+# --------------------------------------------------------
+# Utilitário de banner de seção (para logs/prints)
+# --------------------------------------------------------
+def _BANNER(titulo):
+    print("\n" + "="*18 + f" {titulo} " + "="*18)
+    logging.info(titulo)
+
+
+def _SUB(titulo):
+    print("— " + titulo)
+    logging.info(titulo)
@@ -0,0 +1,293 @@
+"""
+Execução completa do pipeline (itens 1 a 12), na mesma ordem do antigo script.
+
+Bruta (Google Drive) → tratamento → tratada (Google Sheets) → Looker Studio.
+Cada item delega para o módulo correspondente (auth, io, transform, sync,
+upload, qa); aqui só fica o encadeamento e o estado que passa entre eles.
+"""
+
+import logging
+
+import pandas as pd
+
+from utils.snapshot import SheetSnapshot
+from utils.cache_local import CacheLocal
+from utils.journal import JournalEscritas
+from utils.agendador import AgendadorAPI
+from utils.instrumentacao import Instrumentacao, ativar, etapa
+
+from .config import _BANNER
+from .auth import autenticar
+from .io import (
+    PLANILHA_TRATADA_ID,
+    carregar_bruta,
+    normalizar_colunas_bruta,
+    abrir_tratada,
+    coletar_protocolos,
+)
+from .transform import normalizar_nome_coluna, normalize_protocolo_col, _tratar_full, _prepare_status
+from .sync import pre_tratar_tempo_bruta, sincronizar_colunas, calcular_deltas, aplicar_deltas, aplicar_overrides_manuais
+from .upload import colunas_alvo_tratada, preparar_envio, enviar_novos
+from .streaming import BLOCO_PADRAO, executar_streaming, streaming_ativo
+from .qa import qa_pos_tratamento, checar_unidade_cadastro, sumario_qa, sanity_checks, resumo_atualizacoes
+
+
+def executar(arquivo_relatorio: str = None, backend=None, agendador: AgendadorAPI = None,
+             streaming: bool = None, bloco: int = None) -> dict:
+    """
+    Roda o pipeline completo; devolve o relatório de cotas das APIs.
+    Cada item é medido (utils/instrumentacao.py); o relatório JSON vai para
+    arquivo_relatorio mesmo se a execução falhar.
+    - backend: objeto com autenticar(agendador) -> (drive_service, gc), ex.: utils.backend_falso.BackendFalso
+      (execução completa offline); None = APIs Google reais
+    - streaming: lê e processa as planilhas em blocos de `bloco` linhas (tratamento/streaming.py);
+      None = PIPELINE_STREAMING
+    """
+    if streaming is None:
+        streaming = streaming_ativo()
+    # Todo o tráfego Drive/Sheets passa pelo agendador (cotas por minuto + backoff em 429/5xx)
+    agendador = agendador or AgendadorAPI()
+    instr = Instrumentacao(agendador)
+    anterior = ativar(instr)
+    try:
+        if streaming:
+            return executar_streaming(agendador, backend, bloco=bloco or BLOCO_PADRAO)
+        return _executar(agendador, backend)
+    finally:
+        ativar(anterior)
+        instr.registrar_resumo()
+        if arquivo_relatorio:
+            try:
+                instr.salvar(arquivo_relatorio)
+            except OSError as e:
+                logging.warning(f"Não foi possível gravar o relatório de execução em '{arquivo_relatorio}': {e}")
+
+
+def _executar(agendador: AgendadorAPI, backend=None) -> dict:
+    # ========================================================
+    # 1) CONFIGURAÇÃO GOOGLE DRIVE / SHEETS
+    # ========================================================
+    with etapa("1) autenticacao"):
+        _BANNER("1) CONFIGURAÇÃO GOOGLE DRIVE/SHEETS")
+        if backend is not None:
+            drive_service, gc = backend.autenticar(agendador)
+        else:
+            drive_service, gc = autenticar(agendador=agendador)
+
+        # JOURNAL DE ESCRITAS: reaplica o que ficou pendente da execução anterior
+        journal = JournalEscritas()
+        try:
+            journal.reaplicar(gc)
+        except Exception as e:
+            logging.error(f"Falha ao reaplicar o journal de escritas: {e}. As entradas continuam pendentes.", exc_info=True)
+
+    # ========================================================
+    # 2) LEITURA DA PLANILHA BRUTA + 3) NORMALIZAÇÃO DE NOMES DE COLUNA
+    # ========================================================
+    with etapa("2) leitura_bruta") as reg:
+        _BANNER("2) LEITURA DA PLANILHA BRUTA (GOOGLE DRIVE - DINÂMICO)")
+        # Cache local (Parquet) das planilhas, chaveado por file_id + modifiedTime do Drive
+        cache = CacheLocal()
+        snap_bruta = carregar_bruta(gc, drive_service, cache)
+        df = snap_bruta.df.copy()
+        reg.linhas_saida = len(df)
+
+    with etapa("3) normalizacao_colunas") as reg:
+        _BANNER("3) NORMALIZAÇÃO DE NOMES DE COLUNA")
+        df = normalizar_colunas_bruta(df)
+        reg.linhas_entrada = reg.linhas_saida = len(df)
+
+    _BANNER("4) AUXILIARES (codificação, datas, lotes)")
+
+    # ========================================================
+    # 5) COLETA DE PROTOCOLOS EXISTENTES NA PLANILHA TRATADA
+    # ========================================================
+    with etapa("5) coleta_protocolos") as reg:
+        _BANNER("5) COLETA DE PROTOCOLOS EXISTENTES NA PLANILHA TRATADA")
+        aba_tratada, snap_tratada = None, None
+        try:
+            aba_tratada, snap_tratada = abrir_tratada(gc, drive_service, cache, journal=journal)
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar planilhas: {e}")
+            logging.warning(f"Erro ao carregar planilhas: {e}")
+        coleta = coletar_protocolos(snap_tratada, snap_bruta)
+        df_tratada, df_bruta, df = coleta.df_tratada, coleta.df_bruta, coleta.df
+        reg.linhas_entrada, reg.linhas_saida = len(df_bruta), len(df_tratada)
+        if coleta.protocolos_alvo is not None:
+            reg.extras["protocolos_alvo"] = len(coleta.protocolos_alvo)
+
+    # ========================================================
+    # 6) LIMPEZA BÁSICA + RECORTE PARA NOVOS POR PROTOCOLO
+    # ========================================================
+    with etapa("6) recorte_novos") as reg:
+        print("🧹 Limpando e identificando novos protocolos...")
+        df_tratada_protocolos = df_tratada["protocolo"].astype(str).str.strip().tolist() if "protocolo" in df_tratada.columns else []
+        if "protocolo" in df.columns:
+            df["protocolo"] = df["protocolo"].astype(str).str.strip()
+            df["eh_novo"] = ~df["protocolo"].isin(df_tratada_protocolos)
+        novos = df[df["eh_novo"] == True]
+        existentes = df[df["eh_novo"] == False]
+
+        print(f"🆕 Novos protocolos: {len(novos)}")
+        print(f"🔄 Protocolos existentes: {len(existentes)}")
+        logging.info(f"Novos protocolos: {len(novos)}, Existentes: {len(existentes)}")
+        reg.linhas_entrada, reg.linhas_saida = len(df), len(novos)
+
+    # ========================================================
+    # 7) TRATAMENTOS E ATUALIZAÇÃO DE DADOS (somente NOVOS)
+    # ========================================================
+    with etapa("7) tratamento_novos") as reg:
+        _BANNER("7) TRATAMENTOS (somente NOVOS)")
+
+        # Seleciona apenas os protocolos novos identificados no Item 5
+        df_novos = df[df["eh_novo"] == True].copy()
+        reg.linhas_entrada = len(df_novos)
+
+        if df_novos.empty:
+            logging.info("Nenhum protocolo novo para tratamento.")
+        else:
+            logging.info(f"Aplicando tratamentos em {len(df_novos)} protocolos novos. Shape inicial: {df_novos.shape}")
+
+        # Aplica o tratamento aos novos protocolos
+        try:
+            if not df_novos.empty:
+                df_novos = _tratar_full(df_novos)
+                logging.info(f"Tratamento full aplicado a {len(df_novos)} protocolos novos.")
+            else:
+                logging.info("df_novos está vazio, pulando _tratar_full.")
+        except Exception as e:
+            logging.critical(f"Erro CRÍTICO ao aplicar _tratar_full em df_novos: {e}", exc_info=True)
+            raise
+
+        df_novos = qa_pos_tratamento(df_novos)
+        reg.linhas_saida = len(df_novos)
+
+    # ========================================================
+    # 8) ATUALIZAÇÃO NA PLANILHA TRATADA — APENAS NOVOS
+    # ========================================================
+    with etapa("8) preparo_tratada"):
+        _BANNER("8) ATUALIZAÇÃO NA PLANILHA TRATADA — APENAS NOVOS")
+
+        # GARANTE QUE df_bruta EXISTE E TEM A COLUNA 'protocolo'
+        try:
+            if df_bruta.empty:
+                raise SystemExit("❌ df_bruta não está definido ou está vazio. Carregue a base bruta antes do Item 8.")
+            logging.info(f"df_bruta presente e com shape: {df_bruta.shape}")
+
+            df_bruta.columns = [normalizar_nome_coluna(c) for c in df_bruta.columns] # Garante que está normalizado
+            df_bruta = normalize_protocolo_col(df_bruta, "protocolo") # Garante que protocolo está padronizado
+            logging.debug("Colunas e protocolos de df_bruta normalizados.")
+        except Exception as e:
+            logging.critical(f"Erro na checagem inicial de df_bruta no Item 8: {e}", exc_info=True)
+            raise
+
+        # REUTILIZA (OU REABRE) A PLANILHA TRATADA
+        try:
+            if snap_tratada is not None and aba_tratada is not None:
+                logging.info("Reutilizando snapshot da planilha tratada (Item 5).")
+            else:
+                aba_tratada = journal.envolver(gc.open_by_key(PLANILHA_TRATADA_ID).sheet1)
+                snap_tratada = SheetSnapshot.carregar(aba_tratada, nome="tratada", normalizador=normalizar_nome_coluna)
+                logging.info(f"Planilha tratada '{PLANILHA_TRATADA_ID}' aberta.")
+        except Exception as e:
+            logging.critical(f"Erro ao abrir a planilha tratada ou autenticar no Item 8: {e}", exc_info=True)
+            raise
+
+        try:
+            df_tratada_existente = snap_tratada.df.copy()
+            logging.info(f"df_tratada_existente carregado com shape: {df_tratada_existente.shape}")
+
+            protocolos_existentes_set_final = set()
+            if "protocolo" in df_tratada_existente.columns:
+                df_tratada_existente["protocolo"] = df_tratada_existente["protocolo"].astype(str).str.strip().str.upper()
+                protocolos_existentes_set_final = set(df_tratada_existente["protocolo"])
+                logging.debug(f"Set de protocolos existentes criado com {len(protocolos_existentes_set_final)} itens.")
+            else:
+                logging.warning("Coluna 'protocolo' não encontrada em df_tratada_existente. Não será possível identificar protocolos existentes.")
+
+            cols_alvo_tratada = colunas_alvo_tratada(df_tratada_existente, df_novos, df_bruta)
+        except Exception as e:
+            logging.critical(f"Erro ao processar df_tratada_existente ou definir schema alvo no Item 8: {e}", exc_info=True)
+            raise
+
+    # SYNC BRUTA -> TRATADA (tempo_de_resolucao_em_dias, status_demanda), na ordem declarada
+    with etapa("8) sync_bruta_tratada") as reg:
+        df_bruta = pre_tratar_tempo_bruta(df_bruta)
+        falhas_sync = []  # colunas cujo sync não foi aplicado: impede gravar os fingerprints deste run
+        df_tratada_existente = sincronizar_colunas(
+            df_bruta, df_tratada_existente, aba_tratada, snap_tratada,
+            protocolos_alvo=coleta.protocolos_alvo, falhas=falhas_sync
+        )
+        reg.linhas_entrada, reg.linhas_saida = len(df_bruta), len(df_tratada_existente)
+
+    with etapa("8) preparo_envio") as reg:
+        df_send = preparar_envio(df_bruta, protocolos_existentes_set_final, cols_alvo_tratada)
+        checar_unidade_cadastro(df_send)
+        reg.linhas_entrada, reg.linhas_saida = len(df_bruta), len(df_send)
+
+    with etapa("8) envio_novos", linhas_entrada=len(df_send)) as reg:
+        enviar_novos(aba_tratada, df_send, snap_tratada)
+        reg.linhas_saida = len(df_send)
+
+    print("✅ Atualização da planilha tratada concluída com sucesso.")
+    logging.info("✅ Atualização da planilha tratada concluída com sucesso.")
+
+    # ========================================================
+    # 9) PATCH / ATUALIZAÇÃO DE STATUS E DELTA HISTÓRICO
+    # ========================================================
+    with etapa("9) prepare_status"):
+        _BANNER("9) PATCH / ATUALIZAÇÃO DE STATUS E DELTA HISTÓRICO (CORRIGIDO)")
+        # Antes de criar/usar os deltas, aplique o prepare em todo df
+        df = _prepare_status(df)  # garante que coluna principal esteja padronizada
+
+    # ========================================================
+    # 10) DELTAS HISTÓRICOS
+    # ========================================================
+    with etapa("10) deltas_overrides"):
+        _BANNER("10) DELTAS HISTÓRICOS (ajustado para novos protocolos)")
+        deltas = calcular_deltas(df_tratada, df_send, coleta.protocolos_alvo)
+        # escrita esparsa dos deltas (só células com valor diferente do snapshot)
+        if aba_tratada is not None:
+            aplicar_deltas(deltas, aba_tratada, snap_tratada)
+
+        # OVERRIDES MANUAIS (sobre o snapshot da tratada, sem novo download)
+        df_tratada_override = aplicar_overrides_manuais(snap_tratada, aba_tratada)
+        if df_tratada_override is not None:
+            df_tratada = df_tratada_override
+
+    # ========================================================
+    # 11) QA & SUMÁRIO FINAL
+    # ========================================================
+    with etapa("11) qa"):
+        _BANNER("11) QA & SUMÁRIO FINAL")
+        sumario_qa(df)
+
+    # ========================================================
+    # 12) FINALIZAÇÃO
+    # ========================================================
+    with etapa("12) finalizacao"):
+        sanity_checks(df_bruta, df_tratada, df_send, snap_tratada)
+
+        # --- Fingerprints: só gravados se todos os syncs deste run foram aplicados ---
+        if coleta.fp_bruta is not None:
+            if falhas_sync:
+                logging.warning(f"Fingerprints não gravados: falha no sync de {sorted(set(falhas_sync))}. O próximo run reprocessa os alterados.")
+            else:
+                coleta.registro_fp.salvar(coleta.fp_bruta, coleta.esquema_fp)
+
+        # --- Journal: remove as entradas já confirmadas (as pendentes ficam para a próxima execução) ---
+        journal.compactar()
+
+    # --- Uso de cota das APIs (requisições, retentativas, 429, esperas) ---
+    relatorio_cotas = agendador.registrar_relatorio()
+
+    _BANNER("12) PIPELINE FINALIZADO")
+
+    print("🎯 Pipeline executado com sucesso!")
+    logging.info("Pipeline executado com sucesso")
+
+    print("Fluxo: GoogleSheets (bruto) → Python (tratamento) → GoogleSheets (tratado) → LookerStudio")
+
+    # --- Resumo de atualizações completas ---
+    resumo_atualizacoes(df)
+    return relatorio_cotas
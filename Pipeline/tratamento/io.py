@@ -0,0 +1,212 @@
+"""
+2) e 5) Leitura das planilhas: bruta (última da pasta do Drive) e tratada.
+
+Cada planilha é baixada uma única vez por execução (SheetSnapshot); se o
+arquivo não mudou desde a última execução (mesmo modifiedTime), vem do cache
+local. Os clientes (gc, drive_service) são recebidos prontos de auth.py.
+"""
+
+import logging
+
+import pandas as pd
+
+from utils.snapshot import SheetSnapshot
+from utils.cache_local import CacheLocal, carregar_snapshot, obter_modified_time
+from utils.fingerprint import (
+    RegistroFingerprints,
+    assinatura_esquema,
+    fingerprint_por_protocolo,
+    classificar_protocolos,
+    NOVO, ALTERADO, INALTERADO
+)
+
+from .transform import normalizar_nome_coluna, normalize_protocolo_col
+
+FOLDER_ID_BRUTA = "1qXj9eGauvOREKVgRPOfKjRlLSKhefXI5"  # Mantenha seu ID de pasta aqui
+PLANILHA_TRATADA_ID = "1aF0I8pxABXhqyO2DmzBV9aoWHQN2h7LpTN-qdkGLc_g"  # ID da planilha tratada fixa
+
+
+# --- Função helper para obter a última planilha da pasta bruta ---
+# Baixa a planilha UMA vez e devolve o snapshot (header + valores + DataFrame normalizado).
+# Se o arquivo não mudou desde a última execução (mesmo modifiedTime), lê do cache local.
+def get_latest_spreadsheet_snapshot(folder_id: str, gspread_client, drive_svc,
+                                    cache: CacheLocal = None) -> (str, str, SheetSnapshot):
+    try:
+        res = drive_svc.files().list(
+            q=f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.spreadsheet' and trashed=false",
+            orderBy="modifiedTime desc",
+            pageSize=1,
+            fields="files(id, name, modifiedTime)"
+        ).execute()
+        files = res.get("files", [])
+        if not files:
+            logging.critical(f"❌ Nenhuma planilha bruta encontrada na pasta do Google Drive com ID: '{folder_id}'. O pipeline será encerrado.", exc_info=True)
+            raise SystemExit("Erro crítico: Nenhuma planilha bruta encontrada.")
+        latest = files[0]
+        fid, fname = latest["id"], latest["name"]
+        snap = carregar_snapshot(
+            fid, latest.get("modifiedTime"),
+            abrir=lambda: gspread_client.open_by_key(fid).sheet1,
+            cache=cache, nome=f"bruta:{fname}"
+        )
+        return fid, fname, snap
+    except SystemExit:
+        raise
+    except Exception as e:
+        logging.critical(f"❌ Erro ao obter a última planilha da pasta bruta '{folder_id}': {e}. O pipeline será encerrado.", exc_info=True)
+        raise SystemExit("Erro crítico: Falha ao carregar planilha bruta.")
+
+
+def get_latest_spreadsheet_df(folder_id: str, gspread_client, drive_svc,
+                              cache: CacheLocal = None) -> (str, str, pd.DataFrame):
+    fid, fname, snap = get_latest_spreadsheet_snapshot(folder_id, gspread_client, drive_svc, cache)
+    return fid, fname, snap.df.copy()
+
+
+def carregar_bruta(gc, drive_service, cache: CacheLocal, folder_id: str = FOLDER_ID_BRUTA) -> SheetSnapshot:
+    """Item 2: snapshot da planilha bruta mais recente (SystemExit em caso de falha)."""
+    try:
+        latest_file_id, latest_file_name, snap_bruta = get_latest_spreadsheet_snapshot(folder_id, gc, drive_service, cache)
+        print(f"📂 Última planilha encontrada: {latest_file_name} ({latest_file_id})")
+        logging.info(f"Última planilha encontrada: {latest_file_name} ({latest_file_id})")
+        print(f"✅ Planilha bruta importada com sucesso: {snap_bruta.df.shape}")
+        logging.info(f"Planilha bruta importada com sucesso: {snap_bruta.df.shape}")
+        return snap_bruta
+    except SystemExit:  # Captura o SystemExit da função helper para não logar novamente
+        raise
+    except Exception as e:
+        logging.critical(f"❌ Erro ao processar a planilha bruta principal. Verifique o FOLDER_ID_BRUTA e permissões. Erro: {e}. O pipeline será encerrado.", exc_info=True)
+        raise SystemExit("Erro crítico: Falha no processamento da planilha bruta.")
+
+
+def normalizar_colunas_bruta(df: pd.DataFrame) -> pd.DataFrame:
+    """Item 3: normaliza cabeçalhos e a coluna 'protocolo' (SystemExit em caso de falha)."""
+    try:
+        df.columns = [normalizar_nome_coluna(c) for c in df.columns]
+        print("✅ Cabeçalhos normalizados:", list(df.columns))
+        logging.info(f"Cabeçalhos normalizados: {list(df.columns)}")
+        df = normalize_protocolo_col(df, "protocolo")
+        logging.info("Coluna 'protocolo' padronizada.")
+        return df
+    except Exception as e:
+        logging.critical(f"❌ Erro na normalização de nomes de coluna ou padronização de protocolo. Erro: {e}. O pipeline será encerrado.", exc_info=True)
+        raise SystemExit("Erro crítico: Falha na normalização de dados.")
+
+
+def abrir_tratada(gc, drive_service, cache: CacheLocal, journal=None,
+                  planilha_id: str = PLANILHA_TRATADA_ID):
+    """
+    Abre a planilha tratada (única fonte) e monta seu snapshot.
+    Com journal, as escritas na aba passam pelo journal de escritas.
+    Retorna (aba_tratada, snap_tratada).
+    """
+    planilha_tratada_gs = gc.open_by_key(planilha_id)
+    aba_tratada = planilha_tratada_gs.sheet1
+    if journal is not None:
+        aba_tratada = journal.envolver(aba_tratada)
+    logging.info(f"Planilha tratada '{planilha_id}' aberta.")
+
+    # Snapshot único da tratada: todas as etapas seguintes leem daqui (sem novo download).
+    # Se a tratada não mudou desde a última execução (mesmo modifiedTime), vem do cache local.
+    snap_tratada = carregar_snapshot(
+        planilha_id, obter_modified_time(drive_service, planilha_id),
+        worksheet=aba_tratada, cache=cache, nome="tratada", normalizador=normalizar_nome_coluna
+    )
+    return aba_tratada, snap_tratada
+
+
+class ColetaProtocolos:
+    """
+    Resultado do Item 5: bases normalizadas, fingerprints e conjuntos de protocolos.
+
+    - df_tratada / df_bruta / df: DataFrames normalizados (df é a cópia "oficial" da bruta)
+    - protocolos_existentes_set / novos_protos / nao_enviados
+    - fp_bruta, registro_fp, esquema_fp: fingerprints (None sem execução incremental)
+    - protocolos_alvo: novos/alterados desde a última execução (None = processamento completo)
+    """
+
+    def __init__(self):
+        self.df_tratada = pd.DataFrame()
+        self.df_bruta = pd.DataFrame()
+        self.df = pd.DataFrame()
+        self.df["eh_novo"] = True
+        self.protocolos_existentes_set = set()
+        self.novos_protos = []
+        self.nao_enviados = []
+        self.fp_bruta = None
+        self.registro_fp = None
+        self.esquema_fp = None
+        self.protocolos_alvo = None  # sem fingerprint: processamento completo
+
+
+def coletar_protocolos(snap_tratada: SheetSnapshot, snap_bruta: SheetSnapshot) -> ColetaProtocolos:
+    """
+    Item 5: protocolos já na tratada, novos na bruta e alvo incremental (fingerprints).
+    Em caso de erro devolve bases vazias (como antes), sem interromper o pipeline.
+    """
+    coleta = ColetaProtocolos()
+    try:
+        df_tratada = snap_tratada.df.copy()
+        df_tratada = normalize_protocolo_col(df_tratada, "protocolo")
+        protocolos_existentes_set = set(df_tratada["protocolo"].astype(str).tolist())
+
+        # ---------- REUTILIZA O SNAPSHOT DA PLANILHA BRUTA (Item 2) ----------
+        # A bruta já foi baixada no Item 2; não há novo download aqui.
+        df_bruta = snap_bruta.df.copy()
+
+        # Normaliza colunas e protocolo da bruta
+        df_bruta.columns = [normalizar_nome_coluna(c) for c in df_bruta.columns]
+        df_bruta = normalize_protocolo_col(df_bruta, "protocolo")
+
+        # ---------- FINGERPRINT POR PROTOCOLO (execução incremental) ----------
+        # Hash de 64 bits de cada linha da bruta comparado com o da última execução bem-sucedida.
+        # Syncs e deltas só processam protocolos novos/alterados (PIPELINE_INCREMENTAL=0 desliga).
+        registro_fp = RegistroFingerprints("bruta")
+        esquema_fp = assinatura_esquema(df_bruta.columns)
+        fp_bruta = fingerprint_por_protocolo(df_bruta, "protocolo")
+        classe_fp = classificar_protocolos(fp_bruta, registro_fp.carregar(esquema_fp))
+        contagem_fp = classe_fp.value_counts()
+        print(f"🧬 Fingerprints: novos={contagem_fp.get(NOVO, 0)} | alterados={contagem_fp.get(ALTERADO, 0)} | inalterados={contagem_fp.get(INALTERADO, 0)}")
+        logging.info(f"Fingerprints da bruta: {contagem_fp.to_dict()}")
+
+        # Marca novos protocolos (comparação com o conjunto da tratada)
+        df_bruta["eh_novo"] = ~df_bruta["protocolo"].isin(protocolos_existentes_set)
+        novos_protos = df_bruta.loc[df_bruta["eh_novo"], "protocolo"].tolist()
+
+        # Alvo incremental: alterados/novos desde a última execução + ausentes da tratada
+        protocolos_alvo = set(classe_fp.index[classe_fp != INALTERADO]) | set(novos_protos)
+        logging.info(f"Protocolos alvo (novos/alterados): {len(protocolos_alvo)} de {len(classe_fp)}")
+
+        print(f"🔑 Protocolos já na planilha tratada: {len(protocolos_existentes_set)}")
+        print(f"🆕 Protocolos detectados como novos: {len(novos_protos)}")
+        logging.info(f"Protocolos já na planilha tratada: {len(protocolos_existentes_set)}")
+        logging.info(f"Protocolos detectados como novos: {novos_protos[:50]}")
+
+        # Log dos existentes que não serão enviados
+        nao_enviados = df_bruta.loc[~df_bruta["eh_novo"], "protocolo"].tolist()
+        print(f"⚠️ Protocolos existentes que não serão enviados (não novos): {len(nao_enviados)}")
+        logging.info(f"Protocolos existentes que não serão enviados: {nao_enviados[:50]}")
+
+        # Verificação final
+        if df_bruta.empty:
+            raise Exception("A planilha bruta mais recente está vazia ou não pôde ser lida.")
+
+        coleta.df_tratada = df_tratada
+        coleta.df_bruta = df_bruta
+        # df é a cópia "oficial" da bruta, mantida para compatibilidade com as etapas seguintes
+        coleta.df = df_bruta.copy()
+        coleta.protocolos_existentes_set = protocolos_existentes_set
+        coleta.novos_protos = novos_protos
+        coleta.nao_enviados = nao_enviados
+        coleta.fp_bruta = fp_bruta
+        coleta.registro_fp = registro_fp
+        coleta.esquema_fp = esquema_fp
+        coleta.protocolos_alvo = protocolos_alvo
+    except Exception as e:
+        print(f"⚠️ Erro ao carregar planilhas: {e}")
+        logging.warning(f"Erro ao carregar planilhas: {e}")
+        coleta = ColetaProtocolos()
+        # a bruta do Item 2 continua disponível para o Item 8 (que a normaliza de novo)
+        if snap_bruta is not None:
+            coleta.df_bruta = snap_bruta.df.copy()
+    return coleta
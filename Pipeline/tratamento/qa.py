@@ -0,0 +1,120 @@
+"""
+Checagens de qualidade (QA) e sanity checks do pipeline.
+
+Nenhuma função aqui interrompe a execução: os problemas vão para o log.
+"""
+
+import logging
+
+import pandas as pd
+
+from utils.visoes import visoes_de
+
+QA_COLS = ["status_demanda", "data_da_conclusao", "tempo_de_resolucao_em_dias"]
+
+
+def qa_pos_tratamento(df_novos: pd.DataFrame) -> pd.DataFrame:
+    """QA pós _tratar_full em df_novos: vazios/inválidos e dtype string nas colunas críticas."""
+    if not df_novos.empty:
+        v = visoes_de(df_novos)  # máscara de vazios calculada uma vez por coluna (contagem e exemplos)
+        for col in ['orgaos', 'responsavel', 'status_demanda', 'data_da_conclusao']:
+            if col in df_novos.columns:
+                vazios = v.vazio(col)
+                empty_count = vazios.sum()
+                if empty_count > 0:
+                    logging.warning(
+                        f"QA Pós-Tratamento (df_novos): Coluna '{col}' contém {empty_count} valores vazios/inválidos/não informados. "
+                        f"Exemplos: {df_novos.loc[vazios, col].unique()[:5].tolist()}"
+                    )
+
+                # Verificação de tipos para garantir que são strings
+                if not pd.api.types.is_string_dtype(df_novos[col]):
+                    logging.error(
+                        f"QA Pós-Tratamento (df_novos): Coluna '{col}' não é do tipo string após tratamento. Tipo atual: {df_novos[col].dtype}. Convertendo para string."
+                    )
+                    df_novos[col] = df_novos[col].astype(str)
+    return df_novos
+
+
+def checar_unidade_cadastro(df_send: pd.DataFrame) -> None:
+    """CHECAGEM DE SANIDADE — UNIDADE_CADASTRO (em df_send já tratado)."""
+    if not df_send.empty and "unidade_cadastro" in df_send.columns:
+        vazios = visoes_de(df_send).vazio("unidade_cadastro")
+        nulos_uc = int(vazios.sum())
+        print(f"🧪 Checagem (NOVOS - PRONTOS PARA ENVIO): unidade_cadastro presente | vazios={nulos_uc}")
+        logging.info(f"Checagem (NOVOS - PRONTOS PARA ENVIO): unidade_cadastro presente | vazios={nulos_uc}")
+        if nulos_uc > 0:
+            logging.warning(f"QA Pré-Envio: 'unidade_cadastro' contém {nulos_uc} valores vazios/inválidos em df_send. Exemplos: {df_send.loc[vazios, 'unidade_cadastro'].unique()[:5].tolist()}")
+    else:
+        print("⚠️ Aviso: unidade_cadastro não está em df_send ou df_send está vazio.")
+        logging.warning("unidade_cadastro não está em df_send ou df_send está vazio. Verifique a consistência do schema.")
+
+
+def sumario_qa(df: pd.DataFrame) -> None:
+    """Item 11: protocolos novos e vazios nas colunas críticas."""
+    # --- Protocolos novos / existentes ---
+    if "eh_novo" in df.columns:
+        novos_protos = df.loc[df["eh_novo"] == True, "protocolo"].astype(str).str.strip()
+        print(f"🔹 Protocolos novos: {len(novos_protos)}")
+        logging.info(f"Protocolos novos: {len(novos_protos)}")
+    else:
+        novos_protos = pd.Series([], dtype=str)
+        logging.info("Coluna 'eh_novo' ausente — nenhum protocolo novo identificado.")
+
+    # --- QA de colunas críticas ---
+    for col in QA_COLS:
+        if col in df.columns:
+            nulos = df[col].isna().sum()
+            print(f"🔹 {col} vazio: {nulos} linhas")
+            logging.info(f"QA: {col} vazio: {nulos} linhas")
+        else:
+            logging.info(f"Coluna '{col}' ausente.")
+
+    # --- Sumário final ---
+    print("✅ QA concluído. Sumário final:")
+    logging.info("QA concluído. Sumário final:")
+    print(f"  • Protocolos totais na planilha: {len(df)}")
+    print(f"  • Protocolos novos identificados: {len(novos_protos)}")
+    for col in QA_COLS:
+        nulos = df[col].isna().sum() if col in df.columns else 0
+        print(f"  • {col} vazio: {nulos}")
+
+
+def sanity_checks(df_bruta, df_tratada, df_send, snap_tratada=None) -> None:
+    """Contagens finais de bruta/tratada/novos/enviados (e linhas da aba segundo o snapshot)."""
+    try:
+        bruta_rows = len(df_bruta) if isinstance(df_bruta, pd.DataFrame) else 0
+        bruta_cols = list(df_bruta.columns)[:20] if isinstance(df_bruta, pd.DataFrame) and not df_bruta.empty else []
+    except Exception:
+        bruta_rows, bruta_cols = 0, []
+
+    try:
+        tratada_rows = len(df_tratada) if isinstance(df_tratada, pd.DataFrame) else 0
+        tratada_cols = list(df_tratada.columns)[:20] if isinstance(df_tratada, pd.DataFrame) and not df_tratada.empty else []
+    except Exception:
+        tratada_rows, tratada_cols = 0, []
+
+    novos_cnt = int(df_bruta['eh_novo'].sum()) if isinstance(df_bruta, pd.DataFrame) and 'eh_novo' in df_bruta.columns else 0
+    df_send_cnt = len(df_send) if isinstance(df_send, pd.DataFrame) else 0
+
+    logging.info(f"Sanity: df_bruta rows={bruta_rows} cols={bruta_cols}")
+    logging.info(f"Sanity: df_tratada rows={tratada_rows} cols={tratada_cols}")
+    logging.info(f"Sanity: novos detectados={novos_cnt} | df_send (preparados para envio)={df_send_cnt}")
+    print(f"Sanity checks — bruta:{bruta_rows} rows, tratada:{tratada_rows} rows, novos:{novos_cnt}, to_send:{df_send_cnt}")
+
+    # numero de linhas na sheet segundo o snapshot (atualizado em memória a cada escrita)
+    try:
+        if snap_tratada is not None:
+            total_sheet_rows = snap_tratada.n_linhas
+            logging.info(f"Sanity: aba_tratada (sheet) rows={total_sheet_rows}")
+    except Exception as e:
+        logging.warning(f"Não foi possível obter o nº de linhas do snapshot da tratada: {e}")
+
+
+def resumo_atualizacoes(df: pd.DataFrame) -> None:
+    """Resumo de atualizações completas (após o banner final)."""
+    for col in QA_COLS:
+        if col in df.columns:
+            atualizadas = len(df[df[col].notna()])
+            print(f"  • {col} atualizadas: {atualizadas} linhas")
+            logging.info(f"{col} atualizadas: {atualizadas} linhas")
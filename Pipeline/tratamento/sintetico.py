@@ -0,0 +1,156 @@
+"""
+Gerador de exportações sintéticas da planilha bruta (para benchmarks e testes offline).
+
+As colunas têm os nomes reais (já normalizados) e a sujeira encontrada na
+planilha: datas em vários formatos (DD/MM/AAAA, ISO, ISO com hora/Z, serial do
+Excel, epoch, "Não há dados"), acentos e variações de caixa/espaços, tokens
+vazios ("nan", "N/A", "") e UACs/ouvidorias escritas de formas diferentes.
+
+Tudo é sorteado em bloco com numpy (1M linhas em poucos segundos), com
+cardinalidade parecida com a real: poucos valores distintos por coluna de
+texto e ~3 anos de datas. Tudo vem como texto, como no get_all_values.
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUNAS = [
+    "protocolo", "tema", "assunto", "unidade_cadastro", "unidade_saude", "responsavel",
+    "orgaos", "data_da_criacao", "data_da_conclusao", "tempo_de_resolucao_em_dias",
+    "status_demanda", "prazo_restante", "canal", "servidor",
+]
+
+TEMAS = [
+    "Saúde", "saude", "SAÚDE ", "Educação", "educacao", "Obras, Limpeza Urbana e Braço de Luz",
+    "Meio Ambiente (Poluição Sonora, Árvores, Licenças e Fiscalizações Ambientais e etc.)",
+    "Transportes, Serviços Públicos e Troca de Lâmpadas", "Transportes/Urbanismo", "FUNDEC; Habitação",
+    "Fiscalização e Tributos", "Segurança, Sinalização e Multas", "Criança, Adolescente e Idoso",
+    "Vetores e Zoonoses (Combate à Dengue, Controle de Pragas, Criação Irregular de Animais e etc.)",
+    "Assistência Social e Direitos Humanos", "Proteção Animal", "Não se aplica", "Urbanismo | Obras",
+    "Tema inexistente", "",
+]
+ASSUNTOS = ["Buraco na via", "Iluminação pública", "Atendimento", "Outros", "outro", "na", "N/A", "", "Poda de árvore", "Consulta médica"]
+UNIDADES = [
+    "Ouvidoria Setorial", "ouvidoria  setorial", "Ouvidoria Setorial de Saúde", "ouvidoria geral", "OUVIDORIA GERAL",
+    "UAC - CER IV", "uac - cer iv ", "UAC - UAC CER IV", "uac - uph xerem", "UAC - UPH Xerém", "uac - uph pilar",
+    "Upa - Beira Mar", "UAC - UPA Beira Mar", "uac - hospital do olho", "UAC - Adão Pereira Nunes",
+    "UAC - hospital da mulher", "upa - parque lafaiete", "UPH - pilar de cima", "secretaria de saude",
+    "ubs  do centro", "Ouvidoria Setorial da Assistencia Social", "cidadão", "", "nan",
+]
+UNIDADES_SAUDE = ["sem informação", "Sem Informação", "UBS Centro", "hospital municipal", ""]
+RESPONSAVEIS = [
+    "Ouvidoria Geral", "ouvidoria  geral", "Ouvidoria Setorial de Obras", "ouvidoria setorial da saude", "cidadao",
+    "Sim", "True", "GPE", "Guilherme Gomes", "Secretaria Municipal de Obras", "1ª Residência de Obras",
+    "Superintendência de Limpeza Urbana", "Fulano de Tal", "", " ",
+]
+STATUS = ["Concluída", "concluida ", "CONCLUÍDA", "Concluída?", "Em andamento", "Em análise", "Aguardando resposta", ""]
+PRAZOS = ["5", "12", "-3", "Demanda Conclu?da", "Demanda Concluída", "Não há dados", ""]
+CANAIS = ["Colab Gov", "colab gov", "Portal Cidadão", "Fala.BR", " online ", "Telefone", "Presencial", "E-mail"]
+SERVIDORES = [
+    "Stephanie Santos", "Stéphanie Santos", "Camila do Lago Marins", "Lucia Helena Tinoco Pacehco Varella",
+    "Isabel", "Rafaella Marques", "Talita Mrques Ferrari", "Outro Servidor", "",
+]
+TOKENS_VAZIOS = ["Não há dados", "nao ha dados", "", "nan", "N/A", "None"]
+
+# formatos de data e seu peso relativo
+_FORMATOS_DATA = [
+    ("%d/%m/%Y", 0.55),
+    ("%Y-%m-%d", 0.10),
+    ("%Y-%m-%dT%H:%M:%SZ", 0.08),
+    ("%d/%m/%y %H:%M", 0.07),
+    ("excel", 0.05),
+    ("epoch", 0.03),
+    ("vazio", 0.12),
+]
+
+
+def _escolher(rng: np.random.Generator, pool: list, n: int) -> np.ndarray:
+    return np.asarray(pool, dtype=object)[rng.integers(0, len(pool), n)]
+
+
+def _datas_baguncadas(rng: np.random.Generator, base: pd.DatetimeIndex) -> np.ndarray:
+    """Formata cada data em um formato sorteado (strftime em bloco por formato)."""
+    n = len(base)
+    nomes = [f for f, _ in _FORMATOS_DATA]
+    pesos = np.array([p for _, p in _FORMATOS_DATA])
+    escolha = rng.choice(len(nomes), size=n, p=pesos / pesos.sum())
+    out = np.empty(n, dtype=object)
+    for i, fmt in enumerate(nomes):
+        sel = escolha == i
+        if not sel.any():
+            continue
+        dts = base[sel]
+        if fmt == "excel":
+            out[sel] = ((dts - pd.Timestamp("1899-12-30")).days).astype(str)
+        elif fmt == "epoch":
+            out[sel] = (dts.asi8 // 10**9).astype(str)
+        elif fmt == "vazio":
+            out[sel] = _escolher(rng, TOKENS_VAZIOS, int(sel.sum()))
+        else:
+            out[sel] = dts.strftime(fmt)
+    return out
+
+
+def gerar_bruta(n_linhas: int, seed: int = 0, inicio: str = "2023-01-01", dias: int = 1100) -> pd.DataFrame:
+    """
+    Exportação bruta sintética com n_linhas protocolos únicos.
+    Mesmo seed -> mesmo DataFrame (benchmarks comparáveis entre execuções).
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_linhas)
+
+    seq = pd.Series(np.arange(n), dtype="int64").astype(str).str.zfill(9)
+    nup = rng.random(n) < 0.05  # ~5% no padrão antigo, fora de '^C\d+'
+    protocolo = np.where(nup, "NUP." + seq.to_numpy(dtype=object), "C2023" + seq.to_numpy(dtype=object))
+    minusculo = rng.random(n) < 0.02
+    protocolo = np.where(minusculo, pd.Series(protocolo).str.lower().to_numpy(dtype=object), protocolo)
+
+    segundos = rng.integers(0, dias * 86400, n)
+    criacao = pd.DatetimeIndex(pd.Timestamp(inicio) + pd.to_timedelta(segundos, unit="s"))
+    duracao = rng.integers(0, 120, n)
+    conclusao = criacao + pd.to_timedelta(duracao, unit="D")
+
+    status = _escolher(rng, STATUS, n)
+    concluida = pd.Series(status).str.lower().str.startswith("conclu").to_numpy()
+
+    data_conclusao = _datas_baguncadas(rng, conclusao)
+    data_conclusao = np.where(concluida, data_conclusao, _escolher(rng, ["", "Não concluído", "nan", "N/A"], n))
+
+    tempo = duracao.astype(str).astype(object)
+    tempo_decimal = rng.random(n) < 0.1
+    tempo = np.where(tempo_decimal, (duracao + 0.5).astype(str).astype(object), tempo)
+    tempo = np.where(tempo_decimal & (rng.random(n) < 0.5), pd.Series(tempo).str.replace(".", ",", regex=False).to_numpy(dtype=object), tempo)
+    tempo = np.where(concluida, tempo, _escolher(rng, TOKENS_VAZIOS, n))
+
+    df = pd.DataFrame({
+        "protocolo": protocolo,
+        "tema": _escolher(rng, TEMAS, n),
+        "assunto": _escolher(rng, ASSUNTOS, n),
+        "unidade_cadastro": _escolher(rng, UNIDADES, n),
+        "unidade_saude": _escolher(rng, UNIDADES_SAUDE, n),
+        "responsavel": _escolher(rng, RESPONSAVEIS, n),
+        "orgaos": "",
+        "data_da_criacao": _datas_baguncadas(rng, criacao),
+        "data_da_conclusao": data_conclusao,
+        "tempo_de_resolucao_em_dias": tempo,
+        "status_demanda": status,
+        "prazo_restante": np.where(concluida, _escolher(rng, PRAZOS, n), rng.integers(-10, 30, n).astype(str).astype(object)),
+        "canal": _escolher(rng, CANAIS, n),
+        "servidor": _escolher(rng, SERVIDORES, n),
+    }, columns=COLUNAS)
+    return df.astype(object)
+
+
+def gerar_tratada(df_bruta: pd.DataFrame, fracao: float = 0.9, seed: int = 1) -> pd.DataFrame:
+    """
+    Tratada "anterior" sintética: os primeiros `fracao` protocolos da bruta, com
+    parte de status/tempo desatualizada (o que os syncs precisam corrigir).
+    """
+    rng = np.random.default_rng(seed)
+    n = int(len(df_bruta) * fracao)
+    df = df_bruta.iloc[:n].copy()
+    df["protocolo"] = df["protocolo"].astype(str).str.strip().str.upper()
+    velho = rng.random(n) < 0.2
+    df.loc[velho, "status_demanda"] = "Em andamento"
+    df.loc[velho, "tempo_de_resolucao_em_dias"] = ""
+    return df.reset_index(drop=True)
@@ -0,0 +1,286 @@
+"""
+Modo streaming do pipeline: memória limitada pelo tamanho do bloco, não da exportação.
+
+Em vez de baixar a bruta inteira (get_all_values -> snapshot -> DataFrame ->
+cópias), as planilhas são lidas em faixas de linhas (worksheet.get_values
+"A2:N20001", ...) e cada bloco atravessa um pipeline de geradores:
+
+    ler_faixas -> blocos_dataframe -> preparar_envio (tratamento) -> enviar_em_lotes
+
+O que fica em memória durante toda a execução é só o que precisa ser global:
+o conjunto de protocolos da tratada e, da bruta, a chave + as colunas
+sincronizadas (valores compartilhados por valor distinto). Todo o resto é
+descartado bloco a bloco — backfills de vários anos cabem no runner pequeno.
+
+Ordem:
+1. tratada: cabeçalho + coluna de protocolos (protocolos existentes, última linha)
+2. bruta em blocos: guarda as colunas sincronizadas; protocolos novos são
+   tratados, serializados e escritos após a última linha da tratada
+3. tratada em blocos (só as linhas que já existiam): sync das colunas
+   declaradas em sync.SINCRONIZACOES e overrides manuais, célula a célula
+
+Diferenças em relação à execução completa: sem cache local nem fingerprints
+(tudo é reprocessado), sem deltas/QA agregados sobre a bruta inteira, e o
+envio começa após a última linha com protocolo na tratada.
+
+Ativação: python Pipeline/main.py run --streaming [--bloco 20000]
+ou PIPELINE_STREAMING=1 (PIPELINE_BLOCO define o tamanho do bloco).
+"""
+
+import logging
+import os
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.envio import CONCORRENCIA_PADRAO, enviar_em_lotes
+from utils.escrita import _texto, celulas_alteradas, escrever_celulas, rowcol_to_a1
+from utils.instrumentacao import etapa
+from utils.journal import JournalEscritas
+from utils.overrides import OVERRIDES_PADRAO, carregar_overrides
+from utils.serializacao import serializar_para_sheets
+from utils.snapshot import SheetSnapshot
+from utils.sync import calcular_coluna
+
+from .auth import autenticar
+from .config import _BANNER
+from .io import FOLDER_ID_BRUTA, PLANILHA_TRATADA_ID
+from .sync import SINCRONIZACOES, pre_tratar_tempo_bruta
+from .transform import normalizar_nome_coluna, normalize_protocolo_col
+from .upload import _lote_falhou, colunas_alvo_tratada, preparar_envio
+
+BLOCO_PADRAO = max(1, int(os.environ.get("PIPELINE_BLOCO", "20000")))
+
+
+def streaming_ativo() -> bool:
+    return os.environ.get("PIPELINE_STREAMING", "0") == "1"
+
+
+# ----------------------------------------------------------------------
+# Geradores
+# ----------------------------------------------------------------------
+def ler_faixas(aba, largura: int, bloco: int = BLOCO_PADRAO, linha_inicial: int = 2,
+               ultima_linha: Optional[int] = None) -> Iterator[Tuple[int, List[List[str]]]]:
+    """
+    Lê a aba em faixas de `bloco` linhas; produz (linha do primeiro registro, linhas).
+
+    Linhas vazias no fim de uma faixa não vêm na resposta, então uma resposta
+    curta não indica o fim da aba (um lote que falhou deixa linhas vazias no
+    meio). A leitura vai até ultima_linha; sem ela, até o row_count da aba e,
+    se nem isso for conhecido, até a primeira faixa inteiramente vazia.
+    """
+    coluna_final = rowcol_to_a1(1, max(1, largura)).rstrip("0123456789")
+    if ultima_linha is None:
+        ultima_linha = getattr(aba, "row_count", None)
+    linha = linha_inicial
+    while ultima_linha is None or linha <= ultima_linha:
+        fim = linha + bloco - 1 if ultima_linha is None else min(linha + bloco - 1, ultima_linha)
+        linhas = aba.get_values(f"A{linha}:{coluna_final}{fim}")
+        if linhas:
+            yield linha, linhas
+        elif ultima_linha is None:
+            return
+        linha = fim + 1
+
+
+def blocos_dataframe(faixas: Iterator[Tuple[int, List[List[str]]]], header: List[str]
+                     ) -> Iterator[Tuple[int, SheetSnapshot]]:
+    """Cada faixa vira um snapshot (mesma conversão de células do get_all_records)."""
+    for linha, linhas in faixas:
+        yield linha, SheetSnapshot(None, [header] + linhas, nome=f"bloco:{linha}",
+                                   normalizador=normalizar_nome_coluna)
+
+
+def _compactar(serie: pd.Series) -> np.ndarray:
+    """Valores repetidos passam a apontar para o mesmo objeto (8 bytes por linha)."""
+    codigos, uniq = pd.factorize(serie.astype(object), use_na_sentinel=False)
+    return np.asarray(uniq, dtype=object)[codigos]
+
+
+# ----------------------------------------------------------------------
+# Execução
+# ----------------------------------------------------------------------
+def _localizar_bruta(drive_service, folder_id: str = FOLDER_ID_BRUTA) -> Tuple[str, str]:
+    res = drive_service.files().list(
+        q=f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.spreadsheet' and trashed=false",
+        orderBy="modifiedTime desc",
+        pageSize=1,
+        fields="files(id, name, modifiedTime)"
+    ).execute()
+    files = res.get("files", [])
+    if not files:
+        logging.critical(f"❌ Nenhuma planilha bruta encontrada na pasta do Google Drive com ID: '{folder_id}'. O pipeline será encerrado.")
+        raise SystemExit("Erro crítico: Nenhuma planilha bruta encontrada.")
+    return files[0]["id"], files[0]["name"]
+
+
+def _ler_protocolos_tratada(aba_tratada) -> Tuple[List[str], set, int]:
+    """Cabeçalho, protocolos existentes (strip + upper) e última linha com protocolo."""
+    header = aba_tratada.row_values(1)
+    if not header:
+        return [], set(), 0
+    colunas = [normalizar_nome_coluna(h) for h in header]
+    if "protocolo" not in colunas:
+        logging.warning("Coluna 'protocolo' não encontrada na tratada. Não será possível identificar protocolos existentes.")
+        return header, set(), len(aba_tratada.col_values(1))
+    col_protocolos = aba_tratada.col_values(colunas.index("protocolo") + 1)
+    existentes = {str(p).strip().upper() for p in col_protocolos[1:]}
+    existentes.discard("")
+    return header, existentes, len(col_protocolos)
+
+
+def _sync_e_overrides_bloco(snap: SheetSnapshot, linha: int, bruta_sync: pd.DataFrame, idx_bruta: pd.Index,
+                            overrides: pd.DataFrame, aba_tratada, falhas: list, backups: dict) -> Tuple[int, int]:
+    """Sync das colunas declaradas + overrides em um bloco da tratada. Retorna (células sync, células override)."""
+    df_t = snap.df
+    if "protocolo" not in df_t.columns:
+        return 0, 0
+    chaves = df_t["protocolo"].astype(str).str.strip().str.upper()
+    pos = idx_bruta.get_indexer(chaves.to_numpy())
+    sub = bruta_sync.iloc[pos[pos >= 0]]
+
+    alteracoes = []
+    for spec in SINCRONIZACOES:
+        col_idx = snap.indice_coluna(spec.coluna)
+        if col_idx is None or (spec.da_bruta and spec.coluna not in bruta_sync.columns):
+            if spec.coluna not in falhas:
+                logging.warning(f"Coluna '{spec.coluna}' ausente na bruta ou na tratada — sync não aplicado.")
+                falhas.append(spec.coluna)
+            continue
+        if spec.backup_prefixo:
+            # backup da coluna antiga, acrescentado bloco a bloco
+            caminho = backups.setdefault(spec.coluna, f"{spec.backup_prefixo}_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv")
+            df_t[spec.coluna].to_csv(caminho, index=False, header=linha == 2, mode="w" if linha == 2 else "a",
+                                     encoding="utf-8-sig" if linha == 2 else "utf-8")
+        try:
+            novos = calcular_coluna(sub, df_t, spec)
+        except Exception as e:
+            logging.error(f"Falha ao sincronizar coluna {spec.coluna} no bloco {linha}: {e}", exc_info=True)
+            falhas.append(spec.coluna)
+            continue
+        alteracoes += celulas_alteradas(snap.valores_coluna(col_idx)[1:], novos, col_idx, linha_inicial=linha)
+    n_sync = len(alteracoes)
+
+    # overrides cujo protocolo está neste bloco
+    n_over = 0
+    if overrides is not None and not overrides.empty:
+        indice = {k: linha + i for i, k in enumerate(chaves) if k}
+        for prot, coluna, valor in overrides[overrides["protocolo"].isin(indice)].itertuples(index=False, name=None):
+            col_idx = snap.indice_coluna(coluna)
+            if col_idx is None:
+                continue
+            row = snap.rows[indice[prot] - linha]
+            if _texto(row[col_idx - 1] if col_idx - 1 < len(row) else "") != valor:
+                alteracoes.append((indice[prot], col_idx, valor))
+                n_over += 1
+
+    if alteracoes:
+        try:
+            escrever_celulas(aba_tratada, alteracoes)
+        except Exception as e:
+            logging.exception(f"Erro ao atualizar o bloco {linha} da planilha tratada: {e}")
+            falhas.extend(spec.coluna for spec in SINCRONIZACOES)
+    return n_sync, n_over
+
+
+def executar_streaming(agendador, backend=None, bloco: int = BLOCO_PADRAO,
+                       max_concorrencia: int = CONCORRENCIA_PADRAO) -> dict:
+    """Pipeline completo em blocos de `bloco` linhas. Devolve o relatório de cotas."""
+    with etapa("1) autenticacao"):
+        _BANNER("1) CONFIGURAÇÃO GOOGLE DRIVE/SHEETS (MODO STREAMING)")
+        if backend is not None:
+            drive_service, gc = backend.autenticar(agendador)
+        else:
+            drive_service, gc = autenticar(agendador=agendador)
+        journal = JournalEscritas()
+        try:
+            journal.reaplicar(gc)
+        except Exception as e:
+            logging.error(f"Falha ao reaplicar o journal de escritas: {e}. As entradas continuam pendentes.", exc_info=True)
+
+    # 1) Tratada: só cabeçalho e protocolos
+    with etapa("5) coleta_protocolos") as reg:
+        _BANNER("5) PROTOCOLOS EXISTENTES NA PLANILHA TRATADA")
+        aba_tratada = journal.envolver(gc.open_by_key(PLANILHA_TRATADA_ID).sheet1)
+        header_tratada, existentes, ultima_tratada = _ler_protocolos_tratada(aba_tratada)
+        cols_alvo = [normalizar_nome_coluna(h) for h in header_tratada]
+        reg.linhas_saida = max(0, ultima_tratada - 1)
+        print(f"🔑 Protocolos já na planilha tratada: {len(existentes)} (última linha {ultima_tratada})")
+        logging.info(f"Streaming: {len(existentes)} protocolos na tratada; última linha {ultima_tratada}; bloco={bloco}")
+
+    # 2) Bruta em blocos: colunas sincronizadas + envio dos novos
+    with etapa("8) bruta_em_blocos") as reg:
+        _BANNER("2-8) BRUTA EM BLOCOS: TRATAMENTO E ENVIO DOS NOVOS")
+        fid, fname = _localizar_bruta(drive_service)
+        aba_bruta = gc.open_by_key(fid).sheet1
+        header_bruta = aba_bruta.row_values(1)
+        print(f"📂 Última planilha encontrada: {fname} ({fid}) — leitura em blocos de {bloco} linhas")
+        logging.info(f"Última planilha encontrada: {fname} ({fid})")
+
+        cols_sync = [s.coluna for s in SINCRONIZACOES if s.da_bruta]
+        partes_sync = []
+        proxima_linha = ultima_tratada + 1
+        lidas = enviadas = 0
+        for linha, snap in blocos_dataframe(ler_faixas(aba_bruta, len(header_bruta), bloco), header_bruta):
+            with etapa(f"bloco_bruta:{linha}", linhas_entrada=len(snap.rows)) as reg_bloco:
+                df_b = normalize_protocolo_col(snap.df.copy(), "protocolo")
+                df_b = pre_tratar_tempo_bruta(df_b)
+                lidas += len(df_b)
+
+                presentes = [c for c in cols_sync if c in df_b.columns]
+                partes_sync.append(pd.DataFrame(
+                    {c: _compactar(df_b[c]) for c in presentes},
+                    index=pd.Index(df_b["protocolo"].astype(str).str.strip().str.upper().to_numpy(), name="protocolo"),
+                ))
+
+                if not cols_alvo:  # tratada vazia: schema vem do primeiro bloco tratado
+                    cols_alvo = colunas_alvo_tratada(pd.DataFrame(), None, df_b)
+                df_send = preparar_envio(df_b, existentes, cols_alvo)
+                del df_b, snap
+                if not df_send.empty:
+                    resultado = enviar_em_lotes(
+                        aba_tratada, df_send, serializar_para_sheets,
+                        linha_inicial=proxima_linha, max_concorrencia=max_concorrencia,
+                        cabecalho=df_send.columns.tolist() if proxima_linha == 1 else None,
+                        ao_falhar=_lote_falhou, value_input_option="USER_ENTERED",
+                    )
+                    proxima_linha += len(df_send) + (1 if proxima_linha == 1 else 0)
+                    enviadas += resultado["enviadas"]
+                reg_bloco.linhas_saida = len(df_send)
+        reg.linhas_entrada, reg.linhas_saida = lidas, enviadas
+        print(f"📦 Bruta: {lidas} linhas lidas em blocos | {enviadas} novas enviadas")
+        logging.info(f"Streaming: {lidas} linhas da bruta; {enviadas} novas enviadas.")
+
+        bruta_sync = pd.concat(partes_sync) if partes_sync else pd.DataFrame(columns=cols_sync)
+        del partes_sync
+        bruta_sync = bruta_sync[~bruta_sync.index.duplicated(keep="last")]  # última ocorrência vence
+        idx_bruta = bruta_sync.index
+        bruta_sync = bruta_sync.reset_index()
+
+    # 3) Tratada em blocos: sync + overrides nas linhas que já existiam
+    with etapa("8) sync_tratada_em_blocos") as reg:
+        _BANNER("8-10) SYNC BRUTA -> TRATADA E OVERRIDES (EM BLOCOS)")
+        falhas_sync, backups = [], {}
+        overrides = carregar_overrides(OVERRIDES_PADRAO)
+        total_sync = total_over = 0
+        if ultima_tratada >= 2 and not bruta_sync.empty:
+            faixas = ler_faixas(aba_tratada, len(header_tratada), bloco, ultima_linha=ultima_tratada)
+            for linha, snap in blocos_dataframe(faixas, header_tratada):
+                n_sync, n_over = _sync_e_overrides_bloco(snap, linha, bruta_sync, idx_bruta, overrides,
+                                                         aba_tratada, falhas_sync, backups)
+                total_sync += n_sync
+                total_over += n_over
+        reg.linhas_entrada = max(0, ultima_tratada - 1)
+        reg.extras.update({"celulas_sync": total_sync, "celulas_overrides": total_over})
+        print(f"🔄 Sync: {total_sync} células alteradas | ✅ Overrides: {total_over} células escritas")
+        logging.info(f"Streaming: sync {total_sync} células; overrides {total_over}; falhas {sorted(set(falhas_sync))}")
+
+    with etapa("12) finalizacao"):
+        journal.compactar()
+
+    relatorio_cotas = agendador.registrar_relatorio()
+    _BANNER("12) PIPELINE FINALIZADO (MODO STREAMING)")
+    print("🎯 Pipeline executado com sucesso!")
+    logging.info("Pipeline executado com sucesso (modo streaming)")
+    return relatorio_cotas
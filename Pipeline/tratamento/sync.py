@@ -0,0 +1,375 @@
+"""
+8) a 10) Sincronização BRUTA -> TRATADA, patch esparso, deltas e overrides.
+
+Toda escrita vai em batchUpdate sobre a aba tratada e é refletida no
+snapshot em memória (utils/sync.py, utils/escrita.py, utils/overrides.py).
+"""
+
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.normalizacao import remover_acentos
+from utils.sync import ColunaSincronizada, sincronizar_coluna
+from utils.escrita import _texto, indice_por_chave, escrever_por_chave
+from utils.overrides import OVERRIDES_PADRAO, carregar_overrides, aplicar_overrides
+from utils.instrumentacao import etapa
+
+from .transform import normalizar_nome_coluna, normalizar_unidades, _prepare_status
+
+
+# --- PRÉ-TRATAMENTO SIMPLES: limpa "Não há dados" na bruta antes do sync ---
+def pre_tratar_tempo_bruta(df_bruta: pd.DataFrame) -> pd.DataFrame:
+    try:
+        if "tempo_de_resolucao_em_dias" in df_bruta.columns:
+            df_bruta["tempo_de_resolucao_em_dias"] = (
+                df_bruta["tempo_de_resolucao_em_dias"]
+                .astype(str)
+                .replace(
+                    to_replace=[r"(?i)^\s*(não\s*há\s*dados|nao\s*ha\s*dados|nan|none|n/a|na|n\.a\.)\s*$"],
+                    value="",
+                    regex=True
+                )
+                .replace("None", "")
+                .replace("NaN", "")
+            )
+            logging.info("Pré-tratamento: 'Não há dados' convertido para vazio na coluna tempo_de_resolucao_em_dias (bruta).")
+    except Exception as e:
+        logging.warning(f"Falha ao normalizar 'Não há dados' antes do sync: {e}")
+    return df_bruta
+
+
+def _convert_tempo_value_raw(v, convert_na_tokens=True):
+    """
+    Mantém o valor o mais 'bruto' possível:
+    - preserva ints/floats como números
+    - tenta converter strings numéricas para int/float
+    - converte tokens de 'Não há dados' para '' (vazio) se convert_na_tokens=True
+    """
+    na_tokens = {"nao ha dados", "não há dados", "não ha dados", "nan", "none", "n/a", "na", ""}
+    if pd.isna(v):
+        return ""
+    # se já for numérico, preserva
+    if isinstance(v, (int, np.integer)):
+        return int(v)
+    if isinstance(v, (float, np.floating)):
+        # se for inteiro em float, torna int
+        if float(v).is_integer():
+            return int(round(v))
+        return float(v)
+    s = str(v).strip()
+    if convert_na_tokens and s:
+        sval = remover_acentos(s, compat=True).lower()
+        sval = re.sub(r"\s+", " ", sval).strip()
+        if sval in na_tokens:
+            return ""
+    # tenta interpretar números em strings (ex: "12", "12,0", "12,5")
+    s_num = s.replace(",", ".")
+    if re.fullmatch(r"-?\d+", s_num):
+        try:
+            return int(s_num)
+        except:
+            pass
+    if re.fullmatch(r"-?\d+\.\d+", s_num):
+        try:
+            f = float(s_num)
+            if f.is_integer():
+                return int(round(f))
+            return f
+        except:
+            pass
+    # fallback: preserva string original (não strip extra, já strip feito)
+    return s
+
+def _valor_bruto_ou_vazio(raw):
+    """Valor exato da bruta (texto tal qual); vazio/None vira ''."""
+    return raw if (raw is not None and str(raw).strip() != "") else ""
+
+# ---------------------------------------------------------------------------
+# Colunas sincronizadas BRUTA -> TRATADA (motor em utils/sync.py).
+# Para sincronizar uma nova coluna, basta acrescentar uma declaração aqui.
+# ---------------------------------------------------------------------------
+def _spec_tempo_de_resolucao(tempo_col="tempo_de_resolucao_em_dias", convert_na_tokens=True):
+    return ColunaSincronizada(
+        tempo_col,
+        conversor=lambda v: _convert_tempo_value_raw(v, convert_na_tokens=convert_na_tokens),
+        converter_mantidos=True,  # valores mantidos da tratada também passam pelo conversor
+        backup_prefixo="backup_tempo_de_resolucao_tratada",
+    )
+
+def _spec_status_demanda(status_col="status_demanda", pattern_regex=r"^C\d+"):
+    return ColunaSincronizada(
+        status_col,
+        conversor=_valor_bruto_ou_vazio,
+        padrao_protocolo=pattern_regex,  # ajuste aqui se seu padrão for diferente (ex.: '^C\\d{18,}$')
+        backup_prefixo="backup_status_demanda_tratada",
+    )
+
+def _spec_unidade_cadastro(col="unidade_cadastro"):
+    # não vem da bruta: reaplica a normalização das UACs às linhas que já estão na tratada
+    return ColunaSincronizada(
+        col,
+        conversor_coluna=lambda s: normalizar_unidades(s).fillna(""),
+        da_bruta=False,
+    )
+
+SINCRONIZACOES = [
+    _spec_tempo_de_resolucao(convert_na_tokens=True),  # True converte "Não há dados" (e variantes) para vazio
+    _spec_status_demanda(pattern_regex=r"^C\d+"),
+]
+# PIPELINE_NORMALIZAR_UNIDADES=1: normaliza unidade_cadastro das linhas existentes (sem reprocessar)
+if os.environ.get("PIPELINE_NORMALIZAR_UNIDADES", "0") == "1":
+    SINCRONIZACOES.append(_spec_unidade_cadastro())
+
+def sync_tempo_de_resolucao_bruta_para_tratada(df_bruta_local, df_tratada_local, sheet_obj, protocolo_col="protocolo", tempo_col="tempo_de_resolucao_em_dias", convert_na_tokens=True, snapshot=None, protocolos_alvo=None, falhas=None):
+    """
+    Sincroniza EXATAMENTE a coluna tempo_col da bruta para a tratada (ver utils/sync.py).
+    - snapshot: SheetSnapshot da tratada (evita novo get_all_values e recebe o update em memória)
+    - protocolos_alvo: se informado, só esses protocolos (novos/alterados) recebem o valor da bruta
+    """
+    return sincronizar_coluna(
+        df_bruta_local, df_tratada_local, _spec_tempo_de_resolucao(tempo_col, convert_na_tokens),
+        sheet_obj=sheet_obj, snapshot=snapshot, protocolo_col=protocolo_col,
+        protocolos_alvo=protocolos_alvo, normalizador=normalizar_nome_coluna, falhas=falhas
+    )
+
+def sync_status_demanda_bruta_para_tratada(df_bruta_local, df_tratada_local, sheet_obj, protocolo_col="protocolo", status_col="status_demanda", pattern_regex=r"^C\d+", snapshot=None, protocolos_alvo=None, falhas=None):
+    """
+    Sincroniza EXATAMENTE os valores de status_col da bruta para a tratada, para protocolos que
+    batem com pattern_regex (por default '^C\\d+'); os demais mantêm o valor atual da tratada.
+    """
+    return sincronizar_coluna(
+        df_bruta_local, df_tratada_local, _spec_status_demanda(status_col, pattern_regex),
+        sheet_obj=sheet_obj, snapshot=snapshot, protocolo_col=protocolo_col,
+        protocolos_alvo=protocolos_alvo, normalizador=normalizar_nome_coluna, falhas=falhas
+    )
+
+
+def sincronizar_colunas(df_bruta: pd.DataFrame, df_tratada_existente: pd.DataFrame, aba_tratada,
+                        snap_tratada, protocolos_alvo=None, falhas=None,
+                        sincronizacoes=SINCRONIZACOES) -> pd.DataFrame:
+    """
+    Executa as sincronizações declaradas, na ordem. Colunas cujo sync falhou são
+    acrescentadas a `falhas` (se houver alguma, os fingerprints não são gravados).
+    """
+    falhas = falhas if falhas is not None else []
+    for _spec in sincronizacoes:
+        try:
+            with etapa(f"sync:{_spec.coluna}", linhas_entrada=len(df_bruta)):
+                df_tratada_existente = sincronizar_coluna(
+                    df_bruta, df_tratada_existente, _spec,
+                    sheet_obj = aba_tratada,
+                    snapshot = snap_tratada,
+                    protocolo_col = "protocolo",
+                    protocolos_alvo = protocolos_alvo,
+                    normalizador = normalizar_nome_coluna,
+                    falhas = falhas
+                )
+        except Exception as e:
+            logging.error(f"Falha ao sincronizar coluna {_spec.coluna}: {e}", exc_info=True)
+            falhas.append(_spec.coluna)
+    return df_tratada_existente
+
+
+# --------------------------------------------------------
+# Fallback de envio de lotes (log)
+# --------------------------------------------------------
+def _post_lotes(df: pd.DataFrame, msg: str, cols: list):
+    logging.warning(f"Fallback acionado ({msg}) para {len(df)} linhas. Colunas: {cols}")
+
+
+# --------------------------------------------------------
+# PATCH principal — atualização de células no Google Sheets
+# --------------------------------------------------------
+def _patch_grouped_force(df: pd.DataFrame, key_col: str, value_col: str, sheet=None, snapshot=None,
+                         value_input_option: str = "USER_ENTERED"):
+    """
+    Escreve value_col no Sheets para cada protocolo de df (escrita esparsa).
+    - Índice protocolo -> linha construído uma vez (snapshot, ou col_values da coluna de chave)
+    - Com snapshot, células que já têm o valor não são reenviadas
+    - Linhas contíguas agrupadas em faixas; todas enviadas em um único batchUpdate
+    - USER_ENTERED, como no envio dos novos (datas continuam datas no Sheets)
+    Retorna (aplicados, ausentes).
+    """
+    if df.empty:
+        logging.info("Delta vazio. Nada a atualizar.")
+        return 0, 0
+
+    # Aplica padronizações completas
+    df = _prepare_status(df)
+    df[key_col] = df[key_col].astype(str).str.strip()
+    df[value_col] = df[value_col].astype(str).str.strip()
+
+    # 🔒 Corrige 'data_da_conclusao' pós-stringificação
+    if value_col == "data_da_conclusao":
+        df[value_col] = df[value_col].where(
+            ~df[value_col].str.lower().isin(["", "nan", "na", "n/a", "none", "nat"]), "Não concluído"
+        )
+
+    if sheet is None:
+        _post_lotes(df, f"{value_col} (fallback)", [key_col, value_col])
+        return 0, len(df)
+
+    # Localiza colunas (snapshot em memória; sem snapshot, uma leitura do cabeçalho e da coluna de chave)
+    try:
+        if snapshot is not None:
+            key_idx = snapshot.indice_coluna(key_col) or 1
+            col_idx = snapshot.indice_coluna(value_col)
+            key_list = snapshot.valores_coluna(key_idx)
+        else:
+            header = sheet.row_values(1)
+            key_idx = header.index(key_col) + 1 if key_col in header else 1
+            col_idx = header.index(value_col) + 1 if value_col in header else None
+            key_list = sheet.col_values(key_idx)
+    except Exception as e:
+        logging.error(f"Erro ao obter protocolos da planilha: {e}")
+        _post_lotes(df, f"{value_col} (fallback)", [key_col, value_col])
+        return 0, len(df)
+
+    if col_idx is None:
+        logging.error(f"Coluna '{value_col}' não encontrada no cabeçalho da planilha. Nada foi escrito.")
+        _post_lotes(df, f"{value_col} (fallback)", [key_col, value_col])
+        return 0, len(df)
+
+    indice = indice_por_chave(key_list)
+
+    # --- VALORES FINAIS (coluna *_trat tem prioridade, como antes) ---
+    valores = df[f"{value_col}_trat"] if f"{value_col}_trat" in df.columns else df[value_col]
+    vazio = valores.isna() | (valores.astype(str).str.strip() == "")
+    valores = valores.astype(str).str.strip().where(
+        ~vazio, "Não concluído" if value_col == "data_da_conclusao" else ""
+    )
+
+    pares = list(zip(df[key_col], valores))
+    if snapshot is not None:
+        atuais = snapshot.valores_coluna(col_idx)
+        pares = [(k, v) for k, v in pares
+                 if not (indice.get(k) is not None and indice[k] <= len(atuais) and _texto(atuais[indice[k] - 1]) == v)]
+        if not pares:
+            logging.info(f"{value_col}: delta já refletido na planilha. Nada a escrever.")
+            return 0, 0
+
+    # --- ESCRITA ESPARSA EM UM ÚNICO BATCH ---
+    try:
+        aplicados, ausentes = escrever_por_chave(sheet, indice, col_idx, pares,
+                                                 value_input_option=value_input_option)
+    except Exception as e:
+        logging.error(f"Erro no batch update: {e}")
+        _post_lotes(df, f"{value_col} (fallback)", [key_col, value_col])
+        return 0, len(df)
+
+    if snapshot is not None:
+        snapshot.atualizar_celulas(aplicados)
+    if ausentes:
+        logging.warning(f"{len(ausentes)} protocolo(s) não encontrado(s) na planilha. Exemplos: {ausentes[:20]}")
+
+    logging.info(f"✅ {value_col} atualizado em batch: {len(aplicados)}/{len(pares)} linhas ({len(ausentes)} ausentes).")
+    if not aplicados:
+        logging.info("Nenhuma linha atualizada diretamente. Enviando via _post_lotes como fallback.")
+        _post_lotes(df, f"{value_col} (fallback)", [key_col, value_col])
+    return len(aplicados), len(ausentes)
+
+
+# ========================================================
+# 10) DELTAS HISTÓRICOS (status_demanda, data_da_conclusao, tempo_de_resolucao_em_dias)
+# ========================================================
+# --- Função delta robusta (com fillna e casting a str) ---
+def _delta_df(df_full_local: pd.DataFrame, col: str) -> pd.DataFrame:
+    old_col = f"{col}_OLD"
+    if col not in df_full_local.columns:
+        return df_full_local.iloc[:0].copy()
+    if old_col in df_full_local.columns:
+        left = df_full_local.get(col, "").fillna("").astype(str)
+        right = df_full_local.get(old_col, "").fillna("").astype(str)
+        return df_full_local[left != right].copy()
+    else:
+        # se não há coluna OLD, considera apenas os recém marcados como 'eh_novo'
+        return df_full_local[df_full_local.get("eh_novo", False) == True].copy()
+
+
+def calcular_deltas(df_tratada: pd.DataFrame, df_send: pd.DataFrame, protocolos_alvo=None) -> dict:
+    """Deltas de status/conclusão/tempo entre tratada + novos e as colunas *_OLD."""
+    # --- Alinha colunas do df_send ao schema da tratada ---
+    try:
+        cols_tratada = list(df_tratada.columns)
+        # df_send pode não existir (caso nenhum novo); garante variável
+        if df_send is None:
+            df_send = pd.DataFrame(columns=cols_tratada)
+        df_send_aligned = df_send.reindex(columns=cols_tratada, fill_value="")
+        df_full = pd.concat([df_tratada, df_send_aligned], ignore_index=True, sort=False)
+    except Exception as e:
+        logging.warning(f"Falha ao concatenar bases tratada + novos: {e}")
+        # fallback simples: tenta usar df_send como fonte
+        df_full = df_send.copy()
+
+    # --- Garante existência das colunas *_OLD para comparações de histórico ---
+    for col in ["status_demanda", "data_da_conclusao", "tempo_de_resolucao_em_dias"]:
+        old_col = f"{col}_OLD"
+        if old_col not in df_full.columns:
+            # copia o valor atual para coluna OLD (se não existir), normalizando nulos
+            df_full[old_col] = df_full[col].fillna("") if col in df_full.columns else ""
+
+    # --- Execução incremental: protocolos inalterados desde o último run não geram delta ---
+    if protocolos_alvo is not None and "protocolo" in df_full.columns:
+        df_full = df_full[df_full["protocolo"].astype(str).str.strip().str.upper().isin(protocolos_alvo)]
+        logging.info(f"Deltas restritos a {len(df_full)} linhas de protocolos novos/alterados.")
+
+    # --- Calcula deltas específicos (apenas uma vez e sem sobrescritas) ---
+    deltas = {
+        "status_demanda": _delta_df(df_full, "status_demanda"),
+        "data_da_conclusao": _delta_df(df_full, "data_da_conclusao"),
+        "tempo_de_resolucao_em_dias": _delta_df(df_full, "tempo_de_resolucao_em_dias"),
+    }
+
+    # --- Logs e verificações ---
+    logging.info(f"Delta STATUS: {len(deltas['status_demanda'])} linhas alteradas/novas")
+    logging.info(f"Delta DATA_CONCLUSAO: {len(deltas['data_da_conclusao'])} linhas alteradas/novas")
+    logging.info(f"Delta TEMPO_DE_RESOLUCAO: {len(deltas['tempo_de_resolucao_em_dias'])} linhas alteradas/novas")
+
+    print(f"📊 Deltas calculados com sucesso:")
+    print(f"   • STATUS: {len(deltas['status_demanda'])}")
+    print(f"   • DATA_CONCLUSAO: {len(deltas['data_da_conclusao'])}")
+    print(f"   • TEMPO_DE_RESOLUCAO: {len(deltas['tempo_de_resolucao_em_dias'])}")
+    return deltas
+
+
+def aplicar_deltas(deltas: dict, aba_tratada, snap_tratada) -> dict:
+    """Escreve cada delta na tratada com _patch_grouped_force (um batchUpdate por coluna)."""
+    resultado = {}
+    for col, delta in deltas.items():
+        if delta.empty or "protocolo" not in delta.columns or col not in delta.columns:
+            continue
+        with etapa(f"delta:{col}", linhas_entrada=len(delta)) as reg:
+            aplicados, ausentes = _patch_grouped_force(delta[["protocolo", col]], "protocolo", col,
+                                                       sheet=aba_tratada, snapshot=snap_tratada)
+            reg.linhas_saida = aplicados
+        resultado[col] = (aplicados, ausentes)
+        print(f"   • {col}: {aplicados} célula(s) escrita(s) | {ausentes} protocolo(s) ausente(s)")
+    return resultado
+
+
+# =========================================================
+# OVERRIDES MANUAIS (Pipeline/overrides.csv: protocolo, coluna, valor)
+# Aplicados sobre o snapshot da tratada (sem novo download) em um único batchUpdate
+# =========================================================
+def aplicar_overrides_manuais(snap_tratada, aba_tratada, caminho: str = OVERRIDES_PADRAO):
+    """Aplica o arquivo de overrides; devolve o df da tratada atualizado (ou None se nada mudou)."""
+    logging.info("=== OVERRIDES MANUAIS ===")
+    try:
+        overrides = carregar_overrides(caminho)
+        if overrides.empty:
+            logging.info(f"Nenhum override em '{caminho}'.")
+        elif snap_tratada is None:
+            logging.warning("Snapshot da tratada indisponível — overrides não aplicados neste run.")
+        else:
+            escritos, ja_corretos, ausentes = aplicar_overrides(snap_tratada, overrides, sheet_obj=aba_tratada)
+            print(f"✅ Overrides: {escritos} células escritas | {ja_corretos} já corretas | {ausentes} não encontradas (de {len(overrides)})")
+            logging.info(f"Overrides: escritos={escritos} já_corretos={ja_corretos} ausentes={ausentes} total={len(overrides)}")
+            return snap_tratada.df.copy()
+    except Exception as e:
+        logging.error(f"Erro ao aplicar overrides manuais: {e}")
+        raise
+    return None
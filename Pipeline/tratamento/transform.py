@@ -0,0 +1,572 @@
+"""
+Tratamentos puros (sem rede): normalização de colunas, helpers de texto/datas,
+mapeamento tema -> órgão e o tratamento completo _tratar_full.
+
+Importar este módulo não autentica, não baixa nada e não carrega as
+bibliotecas do Google — pode ser usado em benchmarks e testes offline.
+"""
+
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.normalizacao import (
+    normalizar_nome_coluna,
+    _clean_whitespace,
+    _canon_txt,
+    remover_acentos,
+    canon_series
+)
+from utils.datas import parse_datas, formatar_datas
+from utils.vetorizacao import aplicar_em_unicos, compor, fatorar
+from utils.instrumentacao import anotar_etapa, medir_etapa
+from utils.regras import Regra, executar_regras
+from utils.mapeamento import MapeadorTemas
+from utils.capitalizacao import CapitalizadorPT
+
+
+# Padroniza a coluna 'protocolo' consistentemente (strip + upper)
+def normalize_protocolo_col(df_local: pd.DataFrame, col: str = "protocolo") -> pd.DataFrame:
+    if col in df_local.columns:
+        df_local[col] = df_local[col].astype(str).str.strip().str.upper()
+    else:
+        logging.warning(f"⚠️ Coluna '{col}' não encontrada após normalização de protocolo!")
+    return df_local
+
+
+# ========================================================
+# 4) FUNÇÕES AUXILIARES (codificação / datas)
+# ========================================================
+# Funções _clean_whitespace, _canon_txt e _canon_txt_preserve_case 
+# importadas de utils.normalizacao (módulo compartilhado)
+
+# Capitalização (utils/capitalizacao.py): um motor em coluna, com cache por valor distinto
+CAPITALIZADOR_PT = CapitalizadorPT()
+# 7.3.1: nomes de Ouvidoria e "UAC - UPA ..." ficam como estão
+CAPITALIZADOR_PT_EXCETO_OUVIDORIAS = CapitalizadorPT(preservar=("ouvidoria", "uac - upa"))
+
+def _to_proper_case_pt(text: str) -> str:
+    """
+    Converte uma string para o formato 'Title Case' apropriado para o português.
+    (por valor; em coluna use CAPITALIZADOR_PT.aplicar)
+    """
+    return CAPITALIZADOR_PT.formatar(text)
+
+def _to_ddmmaa_text(series: pd.Series) -> pd.Series:
+    # Motor vetorizado (utils/datas.py): classifica a coluna por padrão e converte cada classe em bloco
+    return formatar_datas(series)
+
+def _conclusao_strict(series: pd.Series) -> pd.Series:
+    s = pd.Series(series, dtype="object").astype(str).str.strip()
+    s_cf = s.str.casefold()
+    invalid = {"não informado","na","n/a","n\\a","nan","null","none","","-","--", "outro","outros","nat","sem informação","sem informacao"}
+    out = s.copy()
+    mask_invalid = s_cf.isin(invalid)
+    out.loc[mask_invalid] = "Não concluído"
+    rest_idx = out.index[~mask_invalid]
+    if len(rest_idx) > 0:
+        # datas reconhecidas -> "DD/MM/AAAA"; texto não reconhecido é mantido
+        out.loc[rest_idx] = formatar_datas(s.loc[rest_idx])
+    return out
+
+def _parse_dt_cmp(series: pd.Series) -> pd.Series:
+    # Motor vetorizado (utils/datas.py): mesmo resultado do antigo parse célula-a-célula
+    return parse_datas(series)
+
+def _is_nao_ha_dados(v) -> bool:
+    if v is None: return False
+    s = str(v).strip()
+    if s == "": return False
+    s = re.sub(r"\s+", " ", remover_acentos(s)).strip().casefold()
+    return s == "nao ha dados"
+
+def _is_concluida(v) -> bool:
+    if pd.isna(v): return False
+    s = str(v).strip()
+    if s == "": return False
+    s = re.sub(r"[^A-Za-z]+", " ", remover_acentos(s)).strip().casefold()
+    return s == "concluida"
+
+def _looks_like_demanda_concluida(v) -> bool:
+    if pd.isna(v): return False
+    s = str(v).strip()
+    if s == "": return False
+    s = remover_acentos(s)
+    s = s.replace("�", "i").replace("?", "i")
+    s = re.sub(r"i{2,}", "i", s, flags=re.IGNORECASE)
+    s = re.sub(r"[^A-Za-z]+", " ", s).strip().casefold()
+    return s == "demanda concluida"
+
+def _canon_prazo_restante(v):
+    if pd.isna(v): return v
+    if isinstance(v, (int, float)) and not pd.isna(v):
+        return v
+    s = _canon_txt(v)
+    if s == "": return s
+    s_clean = s.strip()
+    if _looks_like_demanda_concluida(s_clean):
+        return "Demanda Concluída"
+    return s_clean
+
+# --- LÓGICA DE MAPEAMENTO DE ÓRGÃOS MOVIDA PARA CÁ (ESCOPO GLOBAL) ---
+# Os dicionários abaixo são a única fonte dos mapeamentos: os MapeadorTemas
+# compilam deles as chaves canônicas (divisão em temas + _canon_txt).
+
+MAP_TEMA_PARA_ORGAO = {
+    "Administração Pública":"Secretaria de Administração","Agricultura":"Secretaria de Obras e Agricultura",
+    "Assistência Social e Direitos Humanos":"Secretaria de Assistência Social e Direitos Humanos",
+    "Assuntos Jurídicos":"Procuradoria Geral","Comunicação Social":"Secretaria de Comunicação Social, Relações Públicas, Trabalho, Emprego e Renda",
+    "Controle Governamental":"Secretaria de Controle Interno","Criança, Adolescente e Idoso":"Secretaria de Assistência Social e Direitos Humanos",
+    "Cultura e Turismo":"Secretaria de Cultura e Turismo","Defesa Civil":"Secretaria de Defesa Civil",
+    "Direitos à Pessoa com Deficiência":"Secretaria de Assistência Social e Direitos Humanos",
+    "Direitos e Vantagens do Servidor":"Secretaria de Administração","Educação":"Secretaria de Educação",
+    "Empresas e Legalizações":"Secretaria de Fazenda","Esporte e Lazer":"Secretaria de Esporte e Lazer",
+    "Fiscalização e tributos":"Secretaria de Fazenda","Fiscalização Urbana, Regularização e Registro de Imóveis":"Secretaria de Urbanismo e Habitação",
+    "FUNDEC":"FUNDEC","Governança":"Secretaria de Governo","Governo Municipal e Enterro Gratuito":"Secretaria de Governo",
+    "Habitação":"Secretaria de Urbanismo e Habitação","Inclusão e Acessibilidade":"Secretaria de Gestão, Inclusão e Mulher",
+    "Meio Ambiente":"Secretaria de Meio Ambiente",
+    "Meio Ambiente (Poluição Sonora, Árvores, Licenças e Fiscalizações Ambientais e etc.)":"Secretaria de Meio Ambiente",
+    "Assédio":"Secretaria de Comunicação Social, Relações Públicas, Trabalho, Emprego e Renda","Obras Públicas":"Secretaria de Obras e Agricultura",
+    "Obras, Limpeza Urbana e Braço de Luz":"Secretaria de Obras e Agricultura","Proteção Animal":"Secretaria de Proteção Animal",
+    "Saúde":"Secretaria de Saúde","Segurança Pública":"Secretaria de Segurança Pública",
+    "Segurança, Sinalização e Multas":"Secretaria de Segurança Pública",
+    "Trabalho, Emprego e Renda":"Secretaria de Trabalho, Emprego e Renda",
+    "Transportes e Serviços Públicos":"Secretaria de Transportes e Serviços Públicos",
+    "Transportes, Serviços Públicos e Troca de Lâmpadas":"Secretaria de Transportes e Serviços Públicos",
+    "Urbanismo":"Secretaria de Urbanismo e Habitação",
+    "Vetores e Zoonoses (Combate à Dengue, Controle de Pragas, Criação Irregular de Animais e etc.)":"Secretaria de Saúde",
+    "Vigilância Sanitária":"Secretaria de Saúde",
+    "Obras":"Secretaria de Obras e Agricultura","Trabalho":"Secretaria de Trabalho, Emprego e Renda",
+    "Segurança":"Secretaria de Segurança Pública","Serviços Públicos e Troca de Lâmpadas":"Secretaria de Transportes e Serviços Públicos",
+    "Árvores":"Secretaria de Meio Ambiente","Controle de Pragas":"Secretaria de Saúde","Criação Irregular de Animais":"Secretaria de Saúde",
+    "Adolescente e Idoso":"Secretaria de Assistência Social e Direitos Humanos","Criança":"Secretaria de Assistência Social e Direitos Humanos",
+    "Emprego e Renda":"Secretaria de Trabalho, Emprego e Renda","Fiscalização Urbana":"Secretaria de Urbanismo e Habitação",
+    "Regularização e Registro de Imóveis":"Secretaria de Urbanismo e Habitação","Limpeza Urbana e Braço de Luz":"Secretaria de Obras e Agricultura",
+    "Meio Ambiente (Poluição Sonora)":"Secretaria de Meio Ambiente","Licenças e Fiscalizações Ambientais e etc.":"Secretaria de Meio Ambiente",
+    "Vetores e Zoonoses (Combate à Dengue)":"Secretaria de Saúde",
+    "Criação Irregular de Animais e etc.)":"Secretaria de Saúde","Licenças e Fiscalizações Ambientais e etc.)":"Secretaria de Meio Ambiente",
+    "Meio Ambiente (Poluição Sonora":"Secretaria de Meio Ambiente","Não se aplica":"Secretaria de Comunicação Social, Relações Públicas, Trabalho, Emprego e Renda",
+    "Sinalização e Multas":"Secretaria de Segurança Pública","Transportes":"Secretaria de Transportes e Serviços Públicos",
+    "Vetores e Zoonoses (Combate à Dengue":"Secretaria de Saúde",
+}
+# Mapeador compilado (utils/mapeamento.py): split/merge em bloco, cache por tema distinto
+MAPEADOR_ORGAOS = MapeadorTemas(MAP_TEMA_PARA_ORGAO, modo="todos")
+
+def mapear_orgao_exato(celula_tema):
+    # órgãos de todos os temas da célula, sem repetição, unidos por " | " (None se nenhum)
+    return MAPEADOR_ORGAOS.mapear_valor(celula_tema)
+
+
+# ========================================================
+# 7) TRATAMENTO COMPLETO (aplicado aos protocolos novos)
+# ========================================================
+# Cada tratamento é uma Regra (utils/regras.py): o planejador agrupa as regras
+# por coluna e roda cada coluna numa passada só, com as visões derivadas
+# (astype(str)/strip/casefold) compartilhadas entre as regras.
+
+# 7.3.1 Mapeamento de temas -> Ouvidoria responsável (para quando unidade_cadastro é 'Ouvidoria Setorial' genérico)
+MAP_TEMA_PARA_OUVIDORIA = {
+    "administração pública": "Ouvidoria Geral",
+    "agricultura": "Ouvidoria Setorial de Obras",
+    "assistência social e direitos humanos": "",
+    "assuntos jurídicos": "Ouvidoria Geral",
+    "comunicação social": "Ouvidoria Geral",
+    "controle governamental": "Ouvidoria Geral",
+    "criança, adolescente e idoso": "Ouvidoria Setorial da Assistência Social",
+    "cultura e turismo": "Ouvidoria Geral",
+    "defesa civil": "Ouvidoria Geral",
+    "direitos à pessoa com deficiência": "Ouvidoria Setorial da Assistência Social",
+    "direitos e vantagens do servidor": "Ouvidoria Geral",
+    "educação": "Ouvidoria Setorial de Educação",
+    "empresas e legalizações": "Ouvidoria Setorial da Fazenda",
+    "esporte e lazer": "Ouvidoria Geral",
+    "fiscalização e tributos": "Ouvidoria Setorial da Fazenda",
+    "fiscalização urbana, regularização e registro de imóveis": "Ouvidoria Setorial de Urbanismo",
+    "fundec": "Ouvidoria Setorial da FUNDEC",
+    "governança": "Ouvidoria Geral",
+    "governo municipal e enterro gratuito": "Ouvidoria Geral",
+    "habitação": "Ouvidoria Setorial de Urbanismo",
+    "inclusão e acessibilidade": "Ouvidoria Geral",
+    "meio ambiente": "Ouvidoria Setorial de Meio Ambiente",
+    "meio ambiente (poluição sonora, árvores, licenças e fiscalizações ambientais e etc.)": "Ouvidoria Setorial de Meio Ambiente",
+    "assédio": "Ouvidoria Geral",
+    "obras públicas": "Ouvidoria Setorial de Obras",
+    "obras, limpeza urbana e braço de luz": "Ouvidoria Setorial de Obras",
+    "proteção animal": "Ouvidoria Geral",
+    "saúde": "Ouvidoria Setorial da Saúde",
+    "segurança pública": "Ouvidoria Geral de Segurança Pública",
+    "segurança, sinalização e multas": "Ouvidoria Geral de Segurança Pública",
+    "trabalho, emprego e renda": "Ouvidoria Geral",
+    "transportes e serviços públicos": "Ouvidoria Geral",
+    "transportes, serviços públicos e troca de lâmpadas": "Ouvidoria Geral",
+    "urbanismo": "Ouvidoria Setorial de Urbanismo",
+    "vetores e zoonoses (combate à dengue, controle de pragas, criação irregular de animais e etc.)": "Secretaria de Saúde",
+    "vigilância sanitária": "Ouvidoria Setorial da Saúde",
+    "obras": "Ouvidoria Setorial de Obras",
+    "trabalho": "Ouvidoria Geral",
+    "segurança": "Ouvidoria Setorial de Segurança Pública",
+    "serviços públicos e troca de lâmpadas": "Ouvidoria Geral",
+    "árvores": "Ouvidoria Setorial de Meio Ambiente",
+    "controle de pragas": "Ouvidoria Setorial da Saúde",
+    "criação irregular de animais": "Ouvidoria Setorial da Saúde",
+    "adolescente e idoso": "Ouvidoria Setorial da Assistência Social",
+    "criança": "Ouvidoria Setorial da Assistência Social",
+    "emprego e renda": "Ouvidoria Geral",
+    "fiscalização urbana": "Ouvidoria Setorial de Urbanismo",
+    "regularização e registro de imóveis": "Ouvidoria Setorial de Urbanismo",
+    "limpeza urbana e braço de luz": "Ouvidoria Setorial de Obras",
+    "meio ambiente (poluição sonora)": "Ouvidoria Setorial de Meio Ambiente",
+    "licenças e fiscalizações ambientais e etc.": "Ouvidoria Setorial de Meio Ambiente",
+    "vetores e zoonoses (combate à dengue)": "Ouvidoria Setorial da Saúde",
+    "sinalização e multas": "Ouvidoria Setorial de Segurança Pública",
+    "transportes": "Ouvidoria Geral",
+    # mantenha o dicionário estendido conforme necessário...
+}
+# primeira correspondência considerando divisores; vazio/sem correspondência -> Ouvidoria Geral
+MAPEADOR_OUVIDORIAS = MapeadorTemas(MAP_TEMA_PARA_OUVIDORIA, modo="primeiro", padrao="Ouvidoria Geral")
+
+def map_tema_para_ouvidoria(tema_val):
+    return MAPEADOR_OUVIDORIAS.mapear_valor(tema_val)
+
+# 7.4 Fallback de órgão para temas sem mapeamento
+ORGAO_PADRAO = "Secretaria de Comunicação, Relações Públicas, Trabalho, Emprego e Renda"
+
+# 7.5 Padronização 'servidor' (dicionário completo)
+DICIONARIO_SERVIDOR = {
+    "Camila do Lago Marins": "Camila Marins", "Camila Marins": "Camila Marins",
+    "Dhayane Cristina Pinho de Almeida": "Dhayane Cristina Pinho de Almeida", "Dhayane Pinho": "Dhayane Cristina Pinho de Almeida",
+    "Joana Darc Salles Ferreira": "Joana Darc Salles Ferreira", "Joana Salles": "Joana Darc Salles Ferreira",
+    "Lucia Helena Tinoco Pacehco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
+    "Lucia  Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lúcia  Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
+    "Lúcia Helena Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helenba Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
+    "Lucia Helana Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
+    "Rafaella Marques Gomes Santos": "Rafaella Marques Gomes Santos",
+    "Roilene Pereira da Silva": "Rosilene Pereira da Silva", "Rosilene Pereira da Silva": "Rosilene Pereira da Silva",
+    "Stephanie dos Santos Silva": "Stephanie dos Santos Silva",
+    "Stéphaniesantos": "Stephanie dos Santos Silva",
+    "Stpehanie Santos": "Stephanie dos Santos Silva",
+    "Anne Beatriz da Silva": "Anne Beatriz da Silva Rodrigues", "Bruna Maria ( Coordenadora)": "Cidadão",
+    "Isabel": "Cidadão", "Gabriela da Silva Rozi": "Cidadão", "Lana Carolina Mesquita de Andrade": "Cidadão",
+    "Lívia Cavalcante": "Lívia Kathleen Cavalcante Patriota Leite", "Lívia Kathleen Cavalcante Patriota Leite": "Lívia Kathleen Cavalcante Patriota Leite",
+    "Lucia Helena": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helena Tinoco": "Lúcia Helena Tinoco Pacheco Varella",
+    "Lucia Helena Tinoco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helen Tinoco Varella": "Lúcia Helena Tinoco Pacheco Varella",
+    "Lucia Helan Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella", "Lucia Helena  Tinoco Pacheco Varella": "Lúcia Helena Tinoco Pacheco Varella",
+    "Lucia Helena Tinoco Pachewco Varella": "Lúcia Helena Tinoco Pacheco Varella",
+    "Talita Mrques Ferrari": "Talita Marques Ferrari", "Talita  Marques Ferrari": "Talita Marques Ferrari",
+    "Mery": "Cidadão", "Ouvidoria Geral (Adm)": "Cidadão", "Rafaella Marques": "Rafaella Marques Gomes Santos",
+    "Ronaldo de Oliveira Brandão": "Cidadão", "Séphanie Santos": "Stephanie dos Santos Silva",
+    "Shirley Santana": "Cidadão", "Stépanie Santos": "Stephanie dos Santos Silva",
+    "Stéphanie  Santos": "Stephanie dos Santos Silva", "Stéphanie Santos": "Stephanie dos Santos Silva",
+    "Stéphanie Santoa": "Stephanie dos Santos Silva",
+    "Stephanie Santos": "Stephanie dos Santos Silva", "Stephanie dos Santos": "Stephanie dos Santos Silva",
+    "Stéphanie dos Santos Silva": "Stephanie dos Santos Silva", "Thamires Manhães": "Cidadão",
+    "Alexsandra de Castro Freire": "Cidadão"
+}
+
+# 7.6 Responsavel: variantes (texto inteiro, sem diferenciar caixa) -> forma padrão
+PADROES_RESPONSAVEL = [
+    (re.compile(r"^\s*ouvidoria\s+geral\s*$", re.IGNORECASE), "Ouvidoria Geral"),
+    (re.compile(r"^\s*ouvidoria\s+setorial\s+de\s+obras\s*$", re.IGNORECASE), "Ouvidoria Setorial de Obras"),
+    (re.compile(r"^\s*ouvidoria\s+setorial\s+da\s+sa(u|ú)de\s*$", re.IGNORECASE), "Ouvidoria Setorial da Saúde"),
+    (re.compile(r"^\s*cidadao\s*$", re.IGNORECASE), "Cidadão"),
+    (re.compile(r"^\s*(Sim|True)\s*$", re.IGNORECASE), "Cidadão"),
+]
+
+# 7.6.1 Mapeamento de 'responsavel' -> Ouvidoria
+MAP_RESPONSAVEL_PARA_OUVIDORIA = {
+    "1ª Residência de Obras": "Ouvidoria Setorial de Obras",
+    "2ª Residência de Obras A": "Ouvidoria Setorial de Obras",
+    "2ª Residência de Obras B": "Ouvidoria Setorial de Obras",
+    "3ª Residência de Obras": "Ouvidoria Setorial de Obras",
+    "Aitana de Jesus Santos": "Ouvidoria Setorial de Obras",
+    "Amanda Fernandes de Oliveira": "Ouvidoria Setorial de Obras",
+    "Ana Paula Cassiano de Oliveira": "Ouvidoria Setorial de Obras",
+    "Brenda Rhaianny Machado Lima": "Ouvidoria Setorial de Urbanismo",
+    "Departamento de Fiscalização (Meio Ambiente)": "Ouvidoria Setorial de Meio Ambiente",
+    "GPE": "Ouvidoria Setorial de Obras",
+    "Guilherme Gomes": "Ouvidoria Setorial de Obras",
+    "Jessica Cristina Soares Trajano da Rocha": "Ouvidoria Setorial de Obras",
+    "Ouvidoria Geral (ADM)": "Ouvidoria Geral",
+    "Priscila Tavares Salcedo": "Ouvidoria Setorial de Obras",
+    "Secretaria Municipal de Obras": "Ouvidoria Setorial de Obras",
+    "Secretaria Municipal de Segurança Pública": "Ouvidoria Setorial de Segurança Pública",
+    "Secretaria Municipal de Transportes e Serviços Públicos": "Ouvidoria Geral",
+    "Superintendência de Limpeza Urbana": "Ouvidoria Setorial de Obras",
+    "Thayná Cristina Dias de Souza": "Ouvidoria Setorial de Obras",
+}
+# Normaliza chaves para lookup tolerante (remove acentos, lower, trim)
+_MAP_RESP_NORM = { _canon_txt(k): v for k, v in MAP_RESPONSAVEL_PARA_OUVIDORIA.items() }
+
+# Normalização das UACs: mapa explícito (chaves em minúsculas, sem acentos) para exceções conhecidas
+UAC_MAPA = {
+    "uac - cer iv": "UAC - CER IV",
+    "uac - cer iv ": "UAC - CER IV",
+
+    "uac - uph pilar": "UAC - UPH Pilar",
+    "uac - uph saracuruna": "UAC - UPH Saracuruna",
+    "uac - uph xerem": "UAC - UPH Xerém",
+
+    "uac - upa beira mar": "UAC - UPA Beira Mar",
+
+    "uac - hospital do olho": "UAC - Hospital do Olho",
+
+    # novas correções solicitadas
+    "uac - adao pereira nunes": "UAC - Adão Pereira Nunes",
+    "ouvidoria setorial da assistencia social": "Ouvidoria Setorial da Assistência Social",
+    "Ouvidoria Setorial de Assistência Social": "Ouvidoria Setorial da Assistência Social",
+
+    # redundâncias comuns
+    "uac - uac cer iv": "UAC - CER IV",
+    "uac - uac uph pilar": "UAC - UPH Pilar",
+    "uac - uac uph saracuruna": "UAC - UPH Saracuruna",
+    "uac - uac uph xerem": "UAC - UPH Xerém",
+
+    # Ouvidorias / cidadania
+    "ouvidoria geral": "Ouvidoria Geral",
+    "ouvidoria setorial da saude": "Ouvidoria Setorial da Saúde",
+    "cidadao": "Cidadão",
+    "cidadão": "Cidadão"
+}
+# palavras que devem ficar em minúsculas quando no meio do nome
+UAC_PALAVRAS_MINUSCULAS = {"do", "da", "de", "dos", "das", "e", "em", "na", "no", "para", "por", "com"}
+# acrônimos que devem ficar em maiúsculas
+UAC_ACRONIMOS = {"uac", "upa", "uph", "cer", "iv", "ubs", "cm", "psf"}
+
+
+# UACs: sem acentos, acrônimos em maiúsculas e prefixo "UAC/UPA/UPH - Nome"
+CAPITALIZADOR_UAC = CapitalizadorPT(conectivos=UAC_PALAVRAS_MINUSCULAS, acronimos=UAC_ACRONIMOS,
+                                    prefixos=("uac", "upa", "uph"), sem_acentos=True)
+
+# UAC_MAPA como tabela para o merge (chave já no formato de comparação)
+_UAC_TABELA = pd.DataFrame({"chave": list(UAC_MAPA.keys()), "valor": list(UAC_MAPA.values())})
+
+def normalizar_unidades(series: pd.Series) -> pd.Series:
+    """
+    NORMALIZAÇÃO PADRÃO DAS UACs em coluna (último passo de unidade_cadastro).
+    A coluna é fatorada e tudo roda sobre os valores distintos:
+    - canonização (sem acentos, minúsculas, espaços) uma vez por distinto;
+    - UAC_MAPA aplicado por merge (prioritário);
+    - não mapeados e não vazios -> CAPITALIZADOR_UAC (prefixo "UAC - ...", acrônimos, conectivos);
+    - nulos e "" -> None.
+    Também usada pelo sync (tratamento/sync.py) para normalizar linhas já existentes na tratada.
+    """
+    s = pd.Series(series)
+    codigos, unicos = fatorar(s)
+    texto = pd.Series(unicos, dtype=object)
+    texto = texto.where(texto.notna(), "")
+    norm = canon_series(texto, compat=True).str.strip()
+
+    # (1) mapa explícito (um valor que mapeia para si mesmo não conta como mapeado)
+    mapeados = pd.DataFrame({"chave": norm}).merge(_UAC_TABELA, on="chave", how="left")["valor"]
+    eh_mapeado = (mapeados.notna() & (mapeados != norm)).to_numpy(dtype=bool)
+    # (2) demais não vazios: capitalização das UACs (sem acentos)
+    formatar = ~eh_mapeado & (norm != "").to_numpy(dtype=bool)
+
+    res = texto.to_numpy(dtype=object).copy()
+    res[eh_mapeado] = mapeados.to_numpy(dtype=object)[eh_mapeado]
+    res[formatar] = CAPITALIZADOR_UAC.aplicar(texto[formatar]).to_numpy(dtype=object)
+    for k in np.flatnonzero(np.equal(res, "")):
+        res[k] = None
+    return pd.Series(res[codigos], index=s.index, name=s.name, dtype=object)
+
+
+# --- transformações das regras (serie = coluna atual; ctx = utils.regras.ContextoRegras) ---
+
+def _conclusao_ou_nao_concluido(serie, ctx):
+    # 7.2 Data da conclusão → texto "DD/MM/AA" ou "Não concluído"
+    conc = _conclusao_strict(serie)
+    invalida = conc.isna() | conc.astype(str).str.strip().str.lower().isin(["na", "nan", "n/a", ""])
+    return conc.where(~invalida, "Não concluído")
+
+def _eh_upa_beira_mar(v):
+    return re.sub(r"\s+", " ", v).strip().lower() == "upa - beira mar" if isinstance(v, str) else False
+
+def _upa_beira_mar(v):
+    # Upas: Upa - Beira Mar -> UAC - UPA Beira Mar (robusto)
+    return "UAC - UPA Beira Mar" if _eh_upa_beira_mar(v) else v
+
+def _eh_ouvidoria_setorial(serie, ctx):
+    # 'Ouvidoria Setorial' genérico e variantes com mais detalhes ('Ouvidoria Setorial de Saúde')
+    return ctx.visao("unidade_cadastro", "texto").str.contains(r"(?i)\bouvidoria\s+setorial\b", na=False)
+
+def _ouvidoria_por_tema(serie, ctx):
+    return MAPEADOR_OUVIDORIAS.mapear(ctx.coluna("tema")[ctx.mascara])
+
+def _ouvidoria_geral(v):
+    # Padronizar 'ouvidoria geral' (qualquer variante) -> 'Ouvidoria Geral'
+    return "Ouvidoria Geral" if isinstance(v, str) and re.match(r"(?i)^\s*ouvidoria\s+geral\s*$", v) else v
+
+def _orgaos_por_tema(serie, ctx):
+    # Cria a coluna 'orgaos' a partir do tema (ignora o que houver nela)
+    if not ctx.tem("tema"):
+        return pd.Series(None, index=serie.index, dtype=object)
+    return MAPEADOR_ORGAOS.mapear(ctx.coluna("tema"))
+
+def _orgao_ou_padrao(v):
+    # nulos e strings só com espaços recebem o fallback
+    return v if isinstance(v, str) and v.strip() != "" else ORGAO_PADRAO
+
+def _padronizar_responsavel(v):
+    for padrao, forma in PADROES_RESPONSAVEL:
+        v = padrao.sub(forma, v)
+    return v
+
+def _responsavel_ou_nao_informado(v):
+    return "Não Informado" if v.strip() == "" else v
+
+def _map_responsavel_to_ouvidoria(valor):
+    if pd.isna(valor) or str(valor).strip() == "":
+        return valor
+    key = _canon_txt(str(valor))
+    return _MAP_RESP_NORM.get(key, valor)  # mantém original caso não exista no dicionário
+
+def _tempo_numerico(serie, ctx):
+    # 7.10 Limpeza de "Não há dados" e conversão numérica
+    s = ctx.visao("tempo_de_resolucao_em_dias", "aparado")
+    # Marca tokens que devem ser considerados como "sem dado"
+    invalid_tokens = {"nan", "none", "na", "não há dados", "n/a", ""}
+    mask_invalid = ctx.visao("tempo_de_resolucao_em_dias", "minusculo").isin(invalid_tokens)
+    # Substitui os inválidos por NA (pd.NA)
+    s = s.where(~mask_invalid, pd.NA)
+    # Em valores válidos, padroniza vírgula decimal para ponto
+    if s.notna().any():
+        s.loc[s.notna()] = s.loc[s.notna()].str.replace(",", ".", regex=False)
+    # Converte para numérico (erros -> NaN)
+    return pd.to_numeric(s, errors="coerce")
+
+
+_ASSUNTOS_GENERICOS = ["outro", "outros", "na", "n/a", "n\\a", ""]
+
+REGRAS_TRATAR_FULL = [
+    # 7.1 Tema/Assunto — mantém 'não se aplica' → 'Assédio' (assunto antes do tema, que ele lê)
+    Regra("7.1 assunto", "assunto", usa=["tema"], ordem=10,
+          predicado=lambda s, ctx: (ctx.visao("tema", "casefold") == "não se aplica")
+                                   & ctx.visao("assunto", "casefold").isin(_ASSUNTOS_GENERICOS),
+          transformar=lambda s, ctx: "Assédio"),
+    Regra("7.1 tema", "tema", requer=["tema", "assunto"], ordem=11,
+          predicado=lambda s, ctx: ctx.visao("tema", "casefold") == "não se aplica",
+          transformar=lambda s, ctx: "Assédio"),
+    # tema como texto (7.4) — quem lê o tema depois já recebe a coluna convertida
+    Regra("7.4 tema como texto", "tema", ordem=12, transformar=lambda s, ctx: ctx.visao("tema", "texto")),
+
+    Regra("7.2 data_da_conclusao", "data_da_conclusao", ordem=20, transformar=_conclusao_ou_nao_concluido),
+
+    # 7.3 Unidades de Cadastro (proper case) — 7.3 unidade_saude é montada por coluna em _tratar_full
+    Regra("7.3 unidade_cadastro espaços", "unidade_cadastro", ordem=30, como_texto=True, escalar=_clean_whitespace),
+    Regra("7.3 unidade_cadastro proper case", "unidade_cadastro", ordem=30,
+          escalar=CAPITALIZADOR_PT.aplicar, em_lote=True),
+    # 7.3.1 Tratamentos adicionais para unidade_cadastro
+    Regra("7.3.1 upa beira mar", "unidade_cadastro", ordem=32, como_texto=True, escalar=_upa_beira_mar),
+    Regra("7.3.1 ouvidoria setorial por tema", "unidade_cadastro", usa=["tema"], ordem=33,
+          predicado=_eh_ouvidoria_setorial, transformar=_ouvidoria_por_tema),
+    Regra("7.3.1 ouvidoria geral", "unidade_cadastro", ordem=34, como_texto=True, escalar=_ouvidoria_geral),
+    Regra("7.3.1 limpeza final", "unidade_cadastro", ordem=35, como_texto=True, escalar=_clean_whitespace),
+    # Mantemos nomes de Ouvidoria em Title Case/Proper Case quando possível
+    Regra("7.3.1 proper case exceto ouvidorias", "unidade_cadastro", ordem=35,
+          escalar=CAPITALIZADOR_PT_EXCETO_OUVIDORIAS.aplicar, em_lote=True),
+
+    # 7.4 Órgãos por tema: mapeamento exato, fallback e limpeza/capitalização
+    Regra("7.4 orgaos por tema", "orgaos", usa=["tema"], requer=[], ordem=40, transformar=_orgaos_por_tema),
+    Regra("7.4 orgaos fallback", "orgaos", ordem=41, escalar=_orgao_ou_padrao),
+    Regra("7.4 orgaos espaços", "orgaos", ordem=42, escalar=compor(_clean_whitespace, str)),
+    Regra("7.4 orgaos proper case", "orgaos", ordem=42, escalar=CAPITALIZADOR_PT.aplicar, em_lote=True),
+
+    Regra("7.5 servidor", "servidor", ordem=50,
+          transformar=lambda s, ctx: ctx.visao("servidor", "aparado").map(DICIONARIO_SERVIDOR)
+                                     .fillna(ctx.visao("servidor", "aparado"))),
+
+    # 7.6 Responsavel (espaços, variantes, vazio) e 7.6.1 responsavel -> Ouvidoria
+    Regra("7.6 responsavel espaços", "responsavel", ordem=60, como_texto=True, escalar=_clean_whitespace),
+    Regra("7.6 responsavel variantes", "responsavel", ordem=61, escalar=_padronizar_responsavel),
+    Regra("7.6 responsavel vazio", "responsavel", ordem=62, escalar=_responsavel_ou_nao_informado),
+    Regra("7.6.1 responsavel -> ouvidoria", "responsavel", ordem=63, como_texto=True,
+          escalar=_map_responsavel_to_ouvidoria),
+
+    # 7.7 Datas e tipos
+    Regra("7.7 data_da_criacao", "data_da_criacao", ordem=70,
+          transformar=lambda s, ctx: _parse_dt_cmp(s)),  # <-- Retorna objeto de data
+    Regra("7.7 status_demanda como texto", "status_demanda", ordem=71,
+          transformar=lambda s, ctx: ctx.visao("status_demanda", "texto")),
+    Regra("7.7 data_da_conclusao strict", "data_da_conclusao", ordem=72,
+          transformar=lambda s, ctx: _conclusao_strict(s)),
+
+    # 7.8 Regra de ouro: se CONCLUÍDA => 'prazo_restante' = 'Demanda Concluída'
+    Regra("7.8 prazo_restante concluída", "prazo_restante", usa=["status_demanda"], ordem=80,
+          predicado=lambda s, ctx: aplicar_em_unicos(ctx.coluna("status_demanda"), _is_concluida, dtype=bool),
+          transformar=lambda s, ctx: "Demanda Concluída"),
+
+    # 7.9 Padronização da coluna 'canal'
+    Regra("7.9 canal", "canal", ordem=90,
+          transformar=lambda s, ctx: ctx.visao("canal", "texto").str.replace(
+              r"^\s*(Colab Gov|Portal Cidadão|Fala.BR|Online)\s*$", "Aplicativo Colab", regex=True, case=False)),
+
+    Regra("7.10 tempo_de_resolucao_em_dias", "tempo_de_resolucao_em_dias", ordem=100, transformar=_tempo_numerico),
+
+    # NORMALIZAÇÃO PADRÃO DAS UACs (por último, sobre o resultado de 7.3/7.3.1)
+    Regra("normalização UAC", "unidade_cadastro", ordem=110, transformar=lambda s, ctx: normalizar_unidades(s)),
+]
+
+
+def _regras_unidade_saude(colunas) -> list:
+    # Trata colunas que contêm 'unidade_saude' (mantém a lógica original)
+    return [
+        Regra(f"7.3 {col}", col, ordem=31,
+              transformar=lambda s, ctx, col=col: (
+                  ctx.visao(col, "minusculo").replace("sem informação", "Não é uma Unidade de Saúde").str.capitalize()
+              ))
+        for col in colunas if "unidade_saude" in col
+    ]
+
+
+@medir_etapa("_tratar_full")
+def _tratar_full(df_in: pd.DataFrame) -> pd.DataFrame:
+    df_loc = df_in.copy()
+    logging.debug(f"Iniciando _tratar_full com DataFrame de shape: {df_loc.shape}")
+
+    df_loc, relatorio = executar_regras(df_loc, REGRAS_TRATAR_FULL + _regras_unidade_saude(df_loc.columns))
+    anotar_etapa("regras", relatorio)  # tempo e linhas alteradas por regra no relatório da execução
+
+    logging.debug(f"Finalizando _tratar_full. Shape final: {df_loc.shape}")
+    return df_loc
+
+
+# ----------------------------------------------------------
+# TRATAMENTO CRÍTICO — DATA DA CONCLUSÃO (APÓS _tratar_full)
+# Texto "DD/MM/AAAA" ou "Não concluído", em bloco via motor vetorizado de datas
+# ----------------------------------------------------------
+def tratar_data_conclusao_item8(series: pd.Series) -> pd.Series:
+    series = pd.Series(series, dtype="object")
+    invalida = series.isna() | series.astype(str).str.strip().str.lower().isin(["", "nan", "na", "n/a", "none", "não concluído"])
+    dt = parse_datas(series.where(~invalida, None))
+    out = dt.dt.strftime("%d/%m/%Y").astype(object)
+    return out.where(dt.notna(), "Não concluído")
+
+
+# ----------------------------------------------------------
+# CORREÇÃO DEFINITIVA: data_da_criacao — APENAS NOVOS (DD/MM/AAAA)
+# ----------------------------------------------------------
+def fix_data_criacao(series: pd.Series) -> pd.Series:
+    """Texto 'DD/MM/AAAA' via motor vetorizado; vazio -> '' e não reconhecido -> texto original."""
+    return formatar_datas(series).fillna("")
+
+
+# --------------------------------------------------------
+# 🔧 Helper principal de padronização de status e datas
+# --------------------------------------------------------
+def _prepare_status(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+
+    # 2️⃣ Padroniza prazo_restante
+    if "prazo_restante" in df.columns:
+        df["prazo_restante"] = aplicar_em_unicos(df["prazo_restante"], _canon_prazo_restante)
+
+    # 3️⃣ Padroniza data_da_conclusao — tratamento definitivo
+    # Datas válidas -> 'DD/MM/AAAA' (motor de datas: dd/mm antes de mm/dd); inválidas/vazias -> 'Não concluído'
+    if "data_da_conclusao" in df.columns:
+        datas = parse_datas(df["data_da_conclusao"])
+        df["data_da_conclusao"] = datas.dt.strftime("%d/%m/%Y").where(datas.notna(), "Não concluído").astype(object)
+
+    return df
@@ -0,0 +1,172 @@
+"""
+8) Preparação e envio dos protocolos NOVOS para a planilha tratada.
+
+Os lotes são escritos em paralelo em faixas de linha explícitas
+(utils/envio.py), serializados coluna a coluna (utils/serializacao.py).
+"""
+
+import logging
+
+import pandas as pd
+
+from utils.datas import parse_datas
+from utils.envio import CONCORRENCIA_PADRAO, enviar_em_lotes
+from utils.serializacao import serializar_para_sheets
+from utils.visoes import visoes_de
+
+from .transform import _tratar_full, tratar_data_conclusao_item8, fix_data_criacao
+
+
+def colunas_alvo_tratada(df_tratada_existente: pd.DataFrame, df_novos: pd.DataFrame,
+                         df_bruta: pd.DataFrame) -> list:
+    """Schema da tratada; se ela estiver vazia, usa df_novos ou, em último caso, df_bruta."""
+    cols_alvo_tratada = list(df_tratada_existente.columns)
+    if df_tratada_existente.empty:
+        if df_novos is not None and not df_novos.empty:
+            cols_alvo_tratada = list(df_novos.columns)
+            logging.info("Planilha tratada vazia, usando colunas de df_novos como referência para o schema.")
+        elif not df_bruta.empty:
+            cols_alvo_tratada = list(df_bruta.columns)
+            logging.info("Planilha tratada vazia e df_novos vazio, usando colunas de df_bruta como referência para o schema.")
+        else:
+            logging.error("Não foi possível determinar o schema da planilha tratada. df_tratada_existente, df_novos e df_bruta estão vazios.")
+            raise ValueError("Não foi possível determinar o schema da planilha tratada.")
+    logging.debug(f"Colunas alvo da planilha tratada: {cols_alvo_tratada}")
+    return cols_alvo_tratada
+
+
+# ----------------------------------------------------------
+# IDENTIFICA E PREPARA NOVOS PROTOCOLOS PARA ENVIO
+# ----------------------------------------------------------
+def preparar_envio(df_bruta: pd.DataFrame, protocolos_existentes: set, cols_alvo_tratada: list) -> pd.DataFrame:
+    """
+    Recorta da bruta os protocolos ausentes da tratada, aplica _tratar_full e alinha ao schema.
+    data_da_criacao sai como datetime64 (NaT em inválidos); data_da_conclusao como texto
+    'DD/MM/AAAA' ou 'Não concluído'.
+    """
+    try:
+        novos_protocolos_a_enviar = set(df_bruta["protocolo"]) - protocolos_existentes
+        df_send_bruto = df_bruta[df_bruta["protocolo"].isin(novos_protocolos_a_enviar)].copy()
+
+        if df_send_bruto.empty:
+            logging.info("Nenhum protocolo novo detectado para envio. df_send será um DataFrame vazio.")
+            print("🧹 Nenhum protocolo novo para enviar.")
+            df_send = pd.DataFrame(columns=cols_alvo_tratada) # Define df_send vazio com colunas corretas
+        else:
+            logging.info(f"Detectados {len(df_send_bruto)} protocolos novos para processar e enviar. Shape inicial: {df_send_bruto.shape}")
+            print(f"🧹 Novos protocolos a enviar: {len(df_send_bruto)}")
+
+            # APLICA TODOS OS TRATAMENTOS DE _tratar_full AQUI!
+            df_send = _tratar_full(df_send_bruto.copy())
+            logging.info(f"Função _tratar_full aplicada a df_send_bruto. Shape após tratamento: {df_send.shape}")
+
+            # Remove colunas auxiliares que não devem ser escritas no Google Sheets
+            cols_to_drop = []
+            if "eh_novo" in df_send.columns:
+                cols_to_drop.append("eh_novo")
+
+            if cols_to_drop:
+                df_send = df_send.drop(columns=cols_to_drop)
+                logging.info(f"Colunas auxiliares removidas de df_send: {cols_to_drop}. Novo shape: {df_send.shape}")
+
+            # Garante que o df_send tem as colunas corretas e na ordem certa
+            df_send_final = df_send.reindex(columns=cols_alvo_tratada, fill_value="")
+            logging.info(f"df_send reindexado para alinhar com colunas alvo. Shape final: {df_send_final.shape}")
+
+            # QA: Verifica se alguma coluna do df_send_final contém valores inesperados antes do envio
+            # (o reindex compartilha as colunas com df_send: visões já calculadas nele continuam valendo)
+            v = visoes_de(df_send_final).herdar(visoes_de(df_send))
+            for col_qa in ['orgaos', 'responsavel', 'status_demanda', 'data_da_conclusao']:
+                if col_qa in df_send_final.columns:
+                    unexpected_values = v.texto(col_qa).str.contains(r'(?i)^(sim|nao|true|false|\?{2,}|nan|none)$')
+                    if unexpected_values.any():
+                        logging.error(f"QA Pré-Envio (df_send): Coluna '{col_qa}' contém valores inesperados em {unexpected_values.sum()} linhas. Exemplos: {df_send_final.loc[unexpected_values, col_qa].unique()[:5].tolist()}",
+                                      extra={'data': df_send_final.loc[unexpected_values, ['protocolo', col_qa]].to_dict(orient='records')[:5]})
+
+            df_send = df_send_final.copy()  # Atribui o DataFrame final preparado para df_send
+
+            # ----------------------------------------------------------
+            # CORREÇÃO DEFINITIVA: data_da_criacao — APENAS NOVOS (DD/MM/AAAA)
+            # ----------------------------------------------------------
+            set_novos = {p.strip().upper() for p in novos_protocolos_a_enviar}
+            mask_novos = df_send['protocolo'].astype(str).str.strip().str.upper().isin(set_novos)
+
+            # Aplica a correção apenas nos novos e garante dtype datetime64[ns] (NaT para inválidos).
+            # parse_datas reconhece 'DD/MM/AAAA' (dayfirst) em bloco — não há reparse célula a célula.
+            if "data_da_criacao" in df_send.columns:
+                col_criacao = df_send["data_da_criacao"].astype(object)
+                if mask_novos.any():
+                    col_criacao.loc[mask_novos] = fix_data_criacao(col_criacao.loc[mask_novos])
+                df_send["data_da_criacao"] = parse_datas(col_criacao)
+
+            # ----------------------------------------------------------
+            # TRATAMENTO SEPARADO E SEGURO: data_da_conclusao
+            # ----------------------------------------------------------
+            if "data_da_conclusao" in df_send.columns:
+                try:
+                    df_send["data_da_conclusao"] = tratar_data_conclusao_item8(df_send["data_da_conclusao"])
+                except Exception as e:
+                    logging.warning(f"Falha ao aplicar tratamento de data_da_conclusao: {e}")
+
+    except Exception as e:
+        logging.critical(f"Erro na preparação final de df_send no Item 8: {e}", exc_info=True)
+        raise
+
+    # Reaplica somente o tratamento de apresentação para data_da_conclusao (string "DD/MM/YYYY" ou "Não concluído")
+    if not df_send.empty and "data_da_conclusao" in df_send.columns:
+        df_send["data_da_conclusao"] = tratar_data_conclusao_item8(df_send["data_da_conclusao"])
+        logging.debug("Re-aplicado tratamento de 'data_da_conclusao' para garantir formato DD/MM/YYYY.")
+
+    # ----------------------------------------------------------
+    # Ajuste crítico: data_da_criacao deve permanecer como TIMESTAMP
+    # (para que o Google Sheets/Looker receba DATA, NÃO string)
+    # ----------------------------------------------------------
+    if not df_send.empty and "data_da_criacao" in df_send.columns:
+        df_send["data_da_criacao"] = pd.to_datetime(df_send["data_da_criacao"], dayfirst=True, errors="coerce")
+        logging.debug("Data 'data_da_criacao' convertida para dtype datetime64[ns] (NaT em valores inválidos).")
+
+    return df_send
+
+
+# ----------------------------------------------------------
+# ENVIO EM LOTES (concorrente, com deslocamento de linha explícito)
+# ----------------------------------------------------------
+# Serialização coluna a coluna (utils.serializacao): datas -> 'DD/MM/YYYY',
+# números inteiros -> int, nulos/inf/vazios -> None, texto sem espaços nas pontas
+
+def _lote_falhou(chunk, erro, first_idx, last_idx):
+    print(f"❌ Erro ao enviar lote {first_idx}-{last_idx}: {erro}")
+    failed = chunk[["protocolo"]].copy()
+    timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+    failed.to_csv(f"failed_append_{first_idx}_{last_idx}_{timestamp}.csv", index=False, encoding="utf-8-sig")
+    logging.warning(f"Lote {first_idx}-{last_idx} fica pendente no journal e será reaplicado na próxima execução.")
+
+
+def enviar_novos(aba_tratada, df_send: pd.DataFrame, snap_tratada, lote: int = 500,
+                 max_concorrencia: int = CONCORRENCIA_PADRAO):
+    """Acrescenta df_send após a última linha do snapshot (cabeçalho incluso se a aba estiver vazia)."""
+    if df_send.empty:
+        logging.info("Nenhum protocolo para enviar, pulando envio em lotes.")
+        print("📦 Nenhum protocolo para enviar.")
+        return None
+
+    total_lotes = (len(df_send) + lote - 1) // lote
+    print(f"📦 Envio — APENAS NOVOS (FINAL): {len(df_send)} linhas | {total_lotes} lotes | até {max_concorrencia} em paralelo")
+    logging.info(f"Envio — APENAS NOVOS (FINAL): {len(df_send)} linhas | {total_lotes} lotes | concorrência={max_concorrencia}")
+
+    # Estado atual vem do snapshot (sem novo get_all_values): os lotes começam logo após a última linha
+    sheet_is_empty = snap_tratada.n_linhas == 0
+
+    # Envia com USER_ENTERED para que o Sheets interprete 'DD/MM/YYYY' como DATA
+    resultado_envio = enviar_em_lotes(
+        aba_tratada, df_send, serializar_para_sheets,
+        linha_inicial=snap_tratada.n_linhas + 1,
+        lote=lote,
+        max_concorrencia=max_concorrencia,
+        cabecalho=df_send.columns.tolist() if sheet_is_empty else None,
+        snapshot=snap_tratada,
+        ao_falhar=_lote_falhou,
+        value_input_option="USER_ENTERED",
+    )
+    logging.info(f"Envio concluído: {resultado_envio}")
+    return resultado_envio
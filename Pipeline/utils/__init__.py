@@ -6,13 +6,125 @@ from .normalizacao import (
     normalizar_nome_coluna,
     _clean_whitespace,
     _canon_txt,
-    _canon_txt_preserve_case
+    _canon_txt_preserve_case,
+    remover_acentos,
+    remover_acentos_series,
+    canon_series
 )
+from .snapshot import SheetSnapshot
+from .cache_local import CacheLocal, carregar_snapshot, obter_modified_time
+from .datas import parse_datas, formatar_datas
+from .vetorizacao import fatorar, aplicar_em_unicos, compor
+from .escrita import (
+    rowcol_to_a1,
+    celulas_alteradas,
+    mesmo_valor,
+    agrupar_faixas,
+    escrever_celulas,
+    indice_por_chave,
+    escrever_por_chave
+)
+from .overrides import carregar_overrides, aplicar_overrides
+from .envio import enviar_em_lotes, garantir_linhas
+from .journal import JournalEscritas, WorksheetComJournal
+from .agendador import (
+    AgendadorAPI,
+    BaldeTokens,
+    status_http,
+    cliente_http_agendado,
+    request_builder_agendado
+)
+from .instrumentacao import (
+    Instrumentacao,
+    RegistroEtapa,
+    ativar,
+    instrumentacao_ativa,
+    etapa,
+    medir_etapa,
+    anotar_etapa,
+    caminho_relatorio
+)
+from .serializacao import celula_para_sheets, serializar_coluna, serializar_para_sheets
+from .sync import ColunaSincronizada, calcular_coluna, sincronizar_coluna
+from .fingerprint import (
+    RegistroFingerprints,
+    assinatura_esquema,
+    fingerprint_linhas,
+    fingerprint_por_protocolo,
+    classificar_protocolos
+)
+from .backend_falso import BackendFalso, PlanoFalhas, ErroAPIFalso
+from .visoes import VisoesDataFrame, visoes_de, VAZIOS
+from .regras import Regra, ContextoRegras, planejar, executar_regras
+from .mapeamento import MapeadorTemas
+from .capitalizacao import CapitalizadorPT, CONECTIVOS_PT
 
 __all__ = [
     'normalizar_nome_coluna',
     '_clean_whitespace',
     '_canon_txt',
-    '_canon_txt_preserve_case'
+    '_canon_txt_preserve_case',
+    'remover_acentos',
+    'remover_acentos_series',
+    'canon_series',
+    'SheetSnapshot',
+    'CacheLocal',
+    'carregar_snapshot',
+    'obter_modified_time',
+    'parse_datas',
+    'formatar_datas',
+    'fatorar',
+    'aplicar_em_unicos',
+    'compor',
+    'rowcol_to_a1',
+    'celulas_alteradas',
+    'mesmo_valor',
+    'agrupar_faixas',
+    'escrever_celulas',
+    'indice_por_chave',
+    'escrever_por_chave',
+    'carregar_overrides',
+    'aplicar_overrides',
+    'enviar_em_lotes',
+    'garantir_linhas',
+    'JournalEscritas',
+    'WorksheetComJournal',
+    'AgendadorAPI',
+    'BaldeTokens',
+    'status_http',
+    'cliente_http_agendado',
+    'request_builder_agendado',
+    'Instrumentacao',
+    'RegistroEtapa',
+    'ativar',
+    'instrumentacao_ativa',
+    'etapa',
+    'medir_etapa',
+    'anotar_etapa',
+    'caminho_relatorio',
+    'celula_para_sheets',
+    'serializar_coluna',
+    'serializar_para_sheets',
+    'ColunaSincronizada',
+    'calcular_coluna',
+    'sincronizar_coluna',
+    'RegistroFingerprints',
+    'assinatura_esquema',
+    'fingerprint_linhas',
+    'fingerprint_por_protocolo',
+    'classificar_protocolos',
+    'BackendFalso',
+    'PlanoFalhas',
+    'ErroAPIFalso',
+    'VisoesDataFrame',
+    'visoes_de',
+    'VAZIOS',
+    'Regra',
+    'ContextoRegras',
+    'planejar',
+    'executar_regras',
+    'MapeadorTemas',
+    'CapitalizadorPT',
+    'CONECTIVOS_PT'
 ]
 
@@ -0,0 +1,336 @@
+"""
+Módulo Agendador de Requisições (cotas das APIs Google Sheets/Drive)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Todo o tráfego com as APIs passa por um único AgendadorAPI:
+
+- Balde de tokens por tipo de requisição, dimensionado pelas cotas por minuto
+  (Sheets: leitura/escrita; Drive: à parte). Sem token, a chamada espera em
+  vez de estourar a cota.
+- Backoff exponencial com jitter em 429/5xx (e nos 403 de "rate limit" do
+  Drive), respeitando Retry-After. Um 429 esvazia o balde: as outras threads
+  também desaceleram.
+- Leituras idênticas (mesmo método/URL/parâmetros) em voo ao mesmo tempo são
+  coalescidas em uma única requisição.
+- Relatório por execução: requisições, retentativas, 429, tempo de espera e
+  bytes recebidos/enviados, por tipo e por planilha (totais() alimenta a
+  instrumentação por etapa).
+
+O encaixe é feito sem mudar as chamadas do pipeline: o gspread recebe um
+HTTPClient agendado (gspread.authorize(..., http_client=...)) e o Drive um
+requestBuilder agendado (build(..., requestBuilder=...)).
+
+Cotas configuráveis por ambiente:
+- PIPELINE_COTA_LEITURA (padrão 60/min), PIPELINE_COTA_ESCRITA (padrão 60/min)
+- PIPELINE_COTA_DRIVE (padrão 600/min)
+- PIPELINE_MAX_TENTATIVAS (padrão 6)
+
+Classes/Funções:
+- BaldeTokens - Balde de tokens thread-safe (cota por minuto)
+- AgendadorAPI - Cotas, backoff, coalescência e relatório
+- status_http() - Código HTTP de uma exceção do gspread/googleapiclient
+- cliente_http_agendado() - Classe HTTPClient do gspread ligada ao agendador
+- request_builder_agendado() - Classe HttpRequest do googleapiclient ligada ao agendador
+"""
+
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+LEITURA = "leitura"
+ESCRITA = "escrita"
+DRIVE = "drive"
+
+STATUS_RETENTAVEIS = {408, 429, 500, 502, 503, 504}
+_MOTIVOS_COTA_DRIVE = ("rateLimitExceeded", "userRateLimitExceeded", "usageLimits")
+_RE_PLANILHA = re.compile(r"/spreadsheets/([^/:?]+)")
+
+
+def _cota_env(nome: str, padrao: int) -> int:
+    return max(1, int(os.environ.get(nome, str(padrao))))
+
+
+class BaldeTokens:
+    """
+    Balde de tokens thread-safe: `capacidade` requisições por `periodo` segundos,
+    reabastecido continuamente. adquirir() bloqueia até haver token.
+    """
+
+    def __init__(self, capacidade: int, periodo: float = 60.0):
+        self.capacidade = float(capacidade)
+        self.taxa = self.capacidade / float(periodo)
+        self._tokens = self.capacidade
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reabastecer(self) -> None:
+        agora = time.monotonic()
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+        self._ultimo = agora
+
+    def adquirir(self) -> float:
+        """Consome um token, esperando se preciso. Retorna o tempo esperado (s)."""
+        esperado = 0.0
+        while True:
+            with self._lock:
+                self._reabastecer()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return esperado
+                falta = (1.0 - self._tokens) / self.taxa
+            time.sleep(falta)
+            esperado += falta
+
+    def esvaziar(self) -> None:
+        """Zera o balde (após um 429): todas as threads passam a esperar reabastecer."""
+        with self._lock:
+            self._reabastecer()
+            self._tokens = 0.0
+
+
+def status_http(erro: BaseException) -> Optional[int]:
+    """Código HTTP de uma exceção do gspread (APIError) ou googleapiclient (HttpError)."""
+    resposta = getattr(erro, "response", None)
+    codigo = getattr(resposta, "status_code", None)
+    if codigo is None:
+        resp = getattr(erro, "resp", None)
+        codigo = getattr(resp, "status", None)
+    try:
+        return int(codigo) if codigo is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(erro: BaseException) -> Optional[float]:
+    # requests.Response é "falsy" em erro: compara com None em vez de usar `or`
+    resposta = getattr(erro, "response", None)
+    if resposta is None:
+        resposta = getattr(erro, "resp", None)  # httplib2.Response (dict de cabeçalhos)
+    if resposta is None:
+        return None
+    cabecalhos = getattr(resposta, "headers", resposta)
+    try:
+        valor = cabecalhos.get("Retry-After") or cabecalhos.get("retry-after")
+        return float(valor) if valor is not None else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _erro_de_cota(erro: BaseException) -> bool:
+    codigo = status_http(erro)
+    return codigo == 429 or (codigo == 403 and any(m in str(erro) for m in _MOTIVOS_COTA_DRIVE))
+
+
+class AgendadorAPI:
+    """
+    Agendador central das requisições às APIs Google.
+
+    executar(func, tipo=..., chave=...) consome um token do balde do tipo,
+    chama func() e, em erros retentáveis, espera com backoff exponencial +
+    jitter e tenta de novo (até max_tentativas). Exceções não retentáveis,
+    ou após esgotar as tentativas, são propagadas ao chamador.
+    """
+
+    def __init__(self, leituras_por_minuto: Optional[int] = None,
+                 escritas_por_minuto: Optional[int] = None,
+                 drive_por_minuto: Optional[int] = None,
+                 max_tentativas: Optional[int] = None,
+                 backoff_base: float = 1.0, backoff_teto: float = 64.0,
+                 dormir: Callable[[float], None] = time.sleep):
+        self.baldes: Dict[str, BaldeTokens] = {
+            LEITURA: BaldeTokens(leituras_por_minuto or _cota_env("PIPELINE_COTA_LEITURA", 60)),
+            ESCRITA: BaldeTokens(escritas_por_minuto or _cota_env("PIPELINE_COTA_ESCRITA", 60)),
+            DRIVE: BaldeTokens(drive_por_minuto or _cota_env("PIPELINE_COTA_DRIVE", 600)),
+        }
+        self.max_tentativas = max_tentativas or _cota_env("PIPELINE_MAX_TENTATIVAS", 6)
+        self.backoff_base = backoff_base
+        self.backoff_teto = backoff_teto
+        self._dormir = dormir
+        self._lock = threading.Lock()
+        self._em_voo: Dict[tuple, Future] = {}
+        self._inicio = time.monotonic()
+        self._contagem = defaultdict(lambda: defaultdict(float))
+        self._por_planilha = defaultdict(int)
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+    def _contar(self, tipo: str, campo: str, valor: float = 1) -> None:
+        with self._lock:
+            self._contagem[tipo][campo] += valor
+
+    def _retentavel(self, erro: BaseException, idempotente: bool) -> bool:
+        codigo = status_http(erro)
+        if codigo is None:
+            # falhas de rede (requests/socket herdam de OSError)
+            return idempotente and isinstance(erro, OSError)
+        if _erro_de_cota(erro):
+            return True
+        # 5xx em escrita não idempotente (append) pode já ter sido aplicada
+        return idempotente and codigo in STATUS_RETENTAVEIS
+
+    def _espera_backoff(self, tentativa: int, erro: BaseException) -> float:
+        sugerido = _retry_after(erro)
+        espera = min(self.backoff_teto, self.backoff_base * (2 ** tentativa))
+        espera += random.uniform(0, self.backoff_base)
+        return max(espera, sugerido or 0.0)
+
+    def executar(self, func: Callable, tipo: str = LEITURA, chave: Optional[tuple] = None,
+                 planilha: Optional[str] = None, idempotente: bool = True):
+        """
+        Executa func() respeitando a cota de `tipo`, com backoff em erros retentáveis.
+        - chave: se informada, chamadas idênticas em voo são coalescidas (só leituras)
+        - planilha: id da planilha, para o relatório
+        """
+        if chave is not None:
+            with self._lock:
+                existente = self._em_voo.get(chave)
+                if existente is None:
+                    futuro = Future()
+                    self._em_voo[chave] = futuro
+            if existente is not None:
+                self._contar(tipo, "coalescidas")
+                return existente.result()
+            try:
+                resultado = self._executar(func, tipo, planilha, idempotente)
+            except BaseException as e:
+                futuro.set_exception(e)
+                raise
+            else:
+                futuro.set_result(resultado)
+                return resultado
+            finally:
+                with self._lock:
+                    self._em_voo.pop(chave, None)
+        return self._executar(func, tipo, planilha, idempotente)
+
+    def _executar(self, func: Callable, tipo: str, planilha: Optional[str], idempotente: bool):
+        balde = self.baldes.get(tipo, self.baldes[LEITURA])
+        tentativa = 0
+        while True:
+            self._contar(tipo, "espera_cota_s", balde.adquirir())
+            self._contar(tipo, "requisicoes")
+            if planilha:
+                with self._lock:
+                    self._por_planilha[planilha] += 1
+            try:
+                return func()
+            except Exception as e:
+                codigo = status_http(e)
+                if _erro_de_cota(e):
+                    self._contar(tipo, "erros_429" if codigo == 429 else "erros_403_cota")
+                    balde.esvaziar()
+                if tentativa + 1 >= self.max_tentativas or not self._retentavel(e, idempotente):
+                    self._contar(tipo, "falhas")
+                    raise
+                espera = self._espera_backoff(tentativa, e)
+                tentativa += 1
+                self._contar(tipo, "retentativas")
+                self._contar(tipo, "espera_backoff_s", espera)
+                logging.warning(f"⏳ API {tipo}: erro {codigo or type(e).__name__} — nova tentativa {tentativa}/{self.max_tentativas - 1} em {espera:.1f}s.")
+                self._dormir(espera)
+
+    def registrar_bytes(self, tipo: str, n_bytes: int, campo: str = "bytes_recebidos") -> None:
+        self._contar(tipo, campo, n_bytes)
+
+    def totais(self) -> Dict[str, Dict[str, float]]:
+        """Cópia dos contadores por tipo (para medir o que uma etapa consumiu)."""
+        with self._lock:
+            return {t: dict(campos) for t, campos in self._contagem.items()}
+
+    # ------------------------------------------------------------------
+    # Relatório
+    # ------------------------------------------------------------------
+    def relatorio(self) -> dict:
+        """Uso de cota desta execução, por tipo e por planilha."""
+        with self._lock:
+            por_tipo = {t: {k: (round(v, 3) if isinstance(v, float) and not v.is_integer() else int(v))
+                            for k, v in campos.items()}
+                        for t, campos in self._contagem.items()}
+            return {
+                "duracao_s": round(time.monotonic() - self._inicio, 3),
+                "cotas_por_minuto": {t: int(b.capacidade) for t, b in self.baldes.items()},
+                "por_tipo": por_tipo,
+                "por_planilha": dict(self._por_planilha),
+            }
+
+    def registrar_relatorio(self) -> dict:
+        """Loga (e imprime) o resumo de uso de cota da execução."""
+        rel = self.relatorio()
+        print("📊 Uso de cota das APIs Google nesta execução:")
+        logging.info(f"Uso de cota das APIs Google: {rel}")
+        for tipo, campos in sorted(rel["por_tipo"].items()):
+            cota = rel["cotas_por_minuto"].get(tipo, "?")
+            linha = (f"   - {tipo}: {campos.get('requisicoes', 0)} requisições (cota {cota}/min) | "
+                     f"retentativas={campos.get('retentativas', 0)} | 429={campos.get('erros_429', 0)} | "
+                     f"coalescidas={campos.get('coalescidas', 0)} | falhas={campos.get('falhas', 0)} | "
+                     f"espera cota={campos.get('espera_cota_s', 0)}s | backoff={campos.get('espera_backoff_s', 0)}s")
+            print(linha)
+        return rel
+
+
+def _tipo_sheets(metodo: str) -> str:
+    return LEITURA if metodo.upper() == "GET" else ESCRITA
+
+
+def cliente_http_agendado(agendador: AgendadorAPI):
+    """
+    Classe HTTPClient do gspread cujas requisições passam pelo agendador.
+    Uso: gspread.authorize(creds, http_client=cliente_http_agendado(agendador)).
+    """
+    from gspread.http_client import HTTPClient
+
+    class HTTPClientAgendado(HTTPClient):
+        def request(self, method, endpoint, params=None, data=None, json=None, files=None, headers=None):
+            tipo = _tipo_sheets(method)
+            m = _RE_PLANILHA.search(endpoint or "")
+            chave = None
+            if tipo == LEITURA and data is None and json is None and files is None:
+                chave = (method.upper(), endpoint, tuple(sorted((params or {}).items(), key=str)))
+            resposta = agendador.executar(
+                lambda: HTTPClient.request(self, method, endpoint, params=params, data=data,
+                                           json=json, files=files, headers=headers),
+                tipo=tipo, chave=chave, planilha=m.group(1) if m else None,
+                idempotente=not str(endpoint).endswith(":append"),
+            )
+            agendador.registrar_bytes(tipo, len(resposta.content or b""))
+            corpo = getattr(getattr(resposta, "request", None), "body", None)
+            if isinstance(corpo, (bytes, str)):
+                agendador.registrar_bytes(tipo, len(corpo), "bytes_enviados")
+            return resposta
+
+    return HTTPClientAgendado
+
+
+def request_builder_agendado(agendador: AgendadorAPI):
+    """
+    Classe HttpRequest do googleapiclient cujo execute() passa pelo agendador.
+    Uso: build("drive", "v3", credentials=creds, requestBuilder=request_builder_agendado(agendador)).
+    """
+    from googleapiclient.http import HttpRequest
+
+    class HttpRequestAgendado(HttpRequest):
+        def execute(self, http=None, num_retries=0):
+            chave = (self.method, self.uri) if self.method == "GET" else None
+            if isinstance(self.body, (bytes, str)):
+                agendador.registrar_bytes(DRIVE, len(self.body), "bytes_enviados")
+            if not hasattr(self, "_postproc_original"):
+                self._postproc_original = self.postproc
+
+                def _contar_bytes(resp, content):
+                    agendador.registrar_bytes(DRIVE, len(content or b""))
+                    return self._postproc_original(resp, content)
+
+                self.postproc = _contar_bytes
+            return agendador.executar(
+                lambda: HttpRequest.execute(self, http=http, num_retries=num_retries),
+                tipo=DRIVE, chave=chave,
+            )
+
+    return HttpRequestAgendado
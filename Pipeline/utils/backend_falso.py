@@ -0,0 +1,581 @@
+"""
+Módulo Backend Falso do Google Sheets/Drive (em memória)
+Utilizado por Pipeline/main.py e .github/workflows/main.py (subcomando simular)
+
+Implementa o subconjunto das APIs que o pipeline usa, para rodar execuções
+completas sem rede nem credenciais:
+
+- Drive: files().list(q="'<pasta>' in parents ...").execute(), files().get(fileId=...).execute()
+- gspread: open_by_key, sheet1, worksheet, get_worksheet_by_id
+- worksheet: get_all_records, get_all_values, get_values (faixa A1), col_values,
+  row_values, find, update, batch_update, update_cell, append_rows, add_rows, delete_rows, row_count
+
+As abas guardam texto (como o get_all_values devolve). Como na API real,
+None em update/batch_update deixa a célula como está, "" limpa, e escrever
+além da grade (row_count) é erro 400 — append_rows amplia a grade sozinho.
+
+Cada chamada:
+1. passa pelo AgendadorAPI, se houver (cotas, backoff e relatório reais);
+2. é contada por tipo (contadores["get_all_values"], ...);
+3. espera a latência configurada;
+4. pode falhar conforme o PlanoFalhas (429 em rajadas, a cada N, ou com
+   taxa sorteada por seed), sempre igual para a mesma sequência de chamadas.
+
+As exceções levam .response.status_code/.headers como as do gspread, então
+status_http() e o Retry-After do agendador funcionam sem mudança.
+
+Classes/Funções:
+- BackendFalso - Planilhas, pasta do Drive, latência, falhas e contadores
+- PlanoFalhas - Quando e com que código as chamadas falham
+- ErroAPIFalso - Exceção com status HTTP (como gspread.exceptions.APIError)
+- PlanilhaFalsa / AbaFalsa - Spreadsheet e Worksheet em memória
+"""
+
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .agendador import DRIVE, ESCRITA, LEITURA
+
+_RE_A1 = re.compile(r"^\$?([A-Za-z]+)\$?(\d+)$")
+_RE_PASTA = re.compile(r"'([^']+)'\s+in\s+parents")
+
+# tipo de cada chamada, para as cotas do agendador e o PlanoFalhas
+TIPOS_CHAMADA = {
+    "files.list": DRIVE, "files.get": DRIVE,
+    "open_by_key": LEITURA, "sheet1": LEITURA, "worksheet": LEITURA, "get_worksheet_by_id": LEITURA,
+    "get_all_records": LEITURA, "get_all_values": LEITURA, "get_values": LEITURA, "col_values": LEITURA,
+    "row_values": LEITURA, "find": LEITURA,
+    "update": ESCRITA, "batch_update": ESCRITA, "update_cell": ESCRITA,
+    "append_rows": ESCRITA, "add_rows": ESCRITA, "delete_rows": ESCRITA,
+}
+
+
+class RespostaFalsa:
+    def __init__(self, status_code: int, headers: Optional[dict] = None, text: str = ""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+
+class ErroAPIFalso(Exception):
+    """Erro HTTP simulado; .response imita o requests.Response do gspread."""
+
+    def __init__(self, status: int, mensagem: str, retry_after: Optional[float] = None):
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        self.response = RespostaFalsa(status, headers, mensagem)
+        self.code = status
+        super().__init__(f"APIError: [{status}]: {mensagem}")
+
+
+class PlanoFalhas:
+    """
+    Quando as chamadas falham. A contagem é por chamada que casa com `chamadas`/`tipos`
+    (tentativas do agendador contam de novo), então a mesma execução falha sempre nos
+    mesmos pontos.
+    - status: código devolvido (429 = cota; 500/503 = erro do servidor)
+    - a_cada: falha a cada N chamadas (N, 2N, ...)
+    - rajadas: [(inicio, quantidade)] — falham as chamadas inicio..inicio+quantidade-1 (1-based)
+    - taxa: probabilidade de falha por chamada, sorteada com `seed`
+    - tipos / chamadas: restringe a "leitura"/"escrita"/"drive" ou a nomes ("update", ...)
+    - retry_after: valor do cabeçalho Retry-After (s)
+    """
+
+    def __init__(self, status: int = 429, a_cada: Optional[int] = None,
+                 rajadas: Iterable[Tuple[int, int]] = (), taxa: float = 0.0, seed: int = 0,
+                 tipos: Optional[Iterable[str]] = None, chamadas: Optional[Iterable[str]] = None,
+                 retry_after: Optional[float] = None):
+        self.status = status
+        self.a_cada = a_cada
+        self.rajadas = [(int(i), int(q)) for i, q in rajadas]
+        self.taxa = taxa
+        self.tipos = set(tipos) if tipos else None
+        self.chamadas = set(chamadas) if chamadas else None
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._n = 0
+        self._lock = threading.Lock()
+
+    def _casa(self, nome: str, tipo: str) -> bool:
+        return (self.tipos is None or tipo in self.tipos) and (self.chamadas is None or nome in self.chamadas)
+
+    def verificar(self, nome: str, tipo: str) -> None:
+        """Levanta ErroAPIFalso se esta chamada deve falhar."""
+        if not self._casa(nome, tipo):
+            return
+        with self._lock:
+            self._n += 1
+            n = self._n
+            sorteio = self._rng.random() if self.taxa else 1.0
+        falha = (
+            (self.a_cada and n % self.a_cada == 0)
+            or any(inicio <= n < inicio + qtd for inicio, qtd in self.rajadas)
+            or sorteio < self.taxa
+        )
+        if falha:
+            motivo = "Quota exceeded (simulado)" if self.status == 429 else "Erro simulado"
+            raise ErroAPIFalso(self.status, f"{motivo} em {nome} (chamada {n})", self.retry_after)
+
+
+class CelulaFalsa:
+    """Como gspread.cell.Cell: row, col (1-based) e value."""
+
+    def __init__(self, row: int, col: int, value: str):
+        self.row = row
+        self.col = col
+        self.value = value
+
+    def __repr__(self):
+        return f"<CelulaFalsa R{self.row}C{self.col} {self.value!r}>"
+
+
+def _a1_para_rowcol(a1: str) -> Tuple[int, int]:
+    m = _RE_A1.match(a1.strip())
+    if not m:
+        raise ErroAPIFalso(400, f"Intervalo inválido: {a1!r}")
+    col = 0
+    for ch in m.group(1).upper():
+        col = col * 26 + ord(ch) - 64
+    return int(m.group(2)), col
+
+
+def _inicio_faixa(range_name: Optional[str]) -> Tuple[int, int]:
+    if not range_name:
+        return 1, 1
+    faixa = range_name.split("!")[-1]
+    return _a1_para_rowcol(faixa.split(":")[0])
+
+
+def _faixa(range_name: str) -> Tuple[int, int, Optional[int], Optional[int]]:
+    """'A2:N5001' -> (2, 1, 5001, 14); fim aberto ('A2:N') -> linha final None."""
+    faixa = range_name.split("!")[-1]
+    ini, _, fim = faixa.partition(":")
+    r1, c1 = _a1_para_rowcol(ini)
+    if not fim:
+        return r1, c1, r1, c1
+    m = re.match(r"^\$?([A-Za-z]+)\$?(\d*)$", fim.strip())
+    if not m:
+        raise ErroAPIFalso(400, f"Intervalo inválido: {range_name!r}")
+    c2 = 0
+    for ch in m.group(1).upper():
+        c2 = c2 * 26 + ord(ch) - 64
+    return r1, c1, (int(m.group(2)) if m.group(2) else None), c2
+
+
+def _texto_celula(valor) -> str:
+    """Como a célula volta no get_all_values depois de escrita com USER_ENTERED."""
+    if isinstance(valor, bool):
+        return "TRUE" if valor else "FALSE"
+    if isinstance(valor, float):
+        if valor != valor:  # NaN
+            return ""
+        if valor.is_integer():
+            return str(int(valor))
+    return str(valor)
+
+
+def _numericizar(valor: str, vazio=""):
+    """Como gspread.utils.numericise (padrão do get_all_records)."""
+    if valor == "":
+        return vazio
+    if "_" in valor:
+        return valor
+    try:
+        return int(valor)
+    except ValueError:
+        try:
+            return float(valor)
+        except ValueError:
+            return valor
+
+
+class AbaFalsa:
+    """Worksheet em memória (linhas como listas de texto)."""
+
+    def __init__(self, backend: "BackendFalso", planilha: "PlanilhaFalsa", id_aba: int, titulo: str,
+                 valores: Sequence[Sequence] = (), linhas: Optional[int] = None, colunas: Optional[int] = None):
+        self._backend = backend
+        self.spreadsheet = planilha
+        self.id = id_aba
+        self.title = titulo
+        self._linhas: List[List[str]] = [[_texto_celula(v) for v in row] for row in valores]
+        self.row_count = max(linhas or 1000, len(self._linhas))
+        self.col_count = max(colunas or 26, max((len(r) for r in self._linhas), default=0))
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<AbaFalsa {self.title!r} id:{self.id} planilha:{self.spreadsheet.id}>"
+
+    # ------------------------------------------------------------------
+    # Estado interno (sem contar chamadas)
+    # ------------------------------------------------------------------
+    def _retangulo(self) -> List[List[str]]:
+        """Valores até a última linha/coluna não vazia, preenchidos com '' (como o gspread)."""
+        ultima_linha = 0
+        largura = 0
+        for i, row in enumerate(self._linhas, start=1):
+            n = len(row)
+            while n and row[n - 1] == "":
+                n -= 1
+            if n:
+                ultima_linha = i
+                largura = max(largura, n)
+        return [list(r[:largura]) + [""] * (largura - len(r[:largura])) for r in self._linhas[:ultima_linha]]
+
+    def _escrever(self, linha: int, coluna: int, matriz: Sequence[Sequence]) -> None:
+        ultima = linha + len(matriz) - 1
+        if ultima > self.row_count:
+            raise ErroAPIFalso(400, f"Range exceeds grid limits. Max rows: {self.row_count}, tried: {ultima}")
+        for i, row in enumerate(matriz):
+            r = linha + i
+            while len(self._linhas) < r:
+                self._linhas.append([])
+            alvo = self._linhas[r - 1]
+            for j, v in enumerate(row):
+                if v is None:  # null na API: célula inalterada
+                    continue
+                c = coluna + j
+                if len(alvo) < c:
+                    alvo.extend([""] * (c - len(alvo)))
+                alvo[c - 1] = _texto_celula(v)
+            self.col_count = max(self.col_count, coluna + len(row) - 1)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def get_all_values(self, **kwargs) -> List[List[str]]:
+        return self._backend._chamar("get_all_values", self._retangulo, self)
+
+    def get_all_records(self, head: int = 1, default_blank="", numericise_ignore=None, **kwargs) -> List[dict]:
+        def ler():
+            valores = self._retangulo()
+            if len(valores) < head:
+                return []
+            cab = valores[head - 1]
+            ignorar = set(numericise_ignore or [])
+            todos = "all" in ignorar
+            registros = []
+            for row in valores[head:]:
+                registros.append({
+                    k: (v if todos or (j + 1) in ignorar else _numericizar(v, default_blank))
+                    for j, (k, v) in enumerate(zip(cab, row))
+                })
+            return registros
+        return self._backend._chamar("get_all_records", ler, self)
+
+    def get_values(self, range_name: Optional[str] = None, **kwargs) -> List[List[str]]:
+        """Como Worksheet.get_values: a faixa, sem linhas vazias no fim, preenchida com ''."""
+        if range_name is None:
+            return self.get_all_values()
+
+        def ler():
+            r1, c1, r2, c2 = _faixa(range_name)
+            r2 = len(self._linhas) if r2 is None else min(r2, len(self._linhas))
+            out = [list(self._linhas[i - 1][c1 - 1:c2]) for i in range(r1, r2 + 1)]
+            for row in out:
+                while row and row[-1] == "":
+                    row.pop()
+            while out and not out[-1]:
+                out.pop()
+            largura = max((len(r) for r in out), default=0)
+            return [r + [""] * (largura - len(r)) for r in out]
+        return self._backend._chamar("get_values", ler, self)
+
+    def row_values(self, row: int, **kwargs) -> List[str]:
+        def ler():
+            if row > len(self._linhas):
+                return []
+            r = list(self._linhas[row - 1])
+            while r and r[-1] == "":
+                r.pop()
+            return r
+        return self._backend._chamar("row_values", ler, self)
+
+    def col_values(self, col: int, **kwargs) -> List[str]:
+        def ler():
+            out = [r[col - 1] if col - 1 < len(r) else "" for r in self._linhas]
+            while out and out[-1] == "":
+                out.pop()
+            return out
+        return self._backend._chamar("col_values", ler, self)
+
+    def find(self, query, in_row: Optional[int] = None, in_column: Optional[int] = None,
+             case_sensitive: bool = True) -> Optional[CelulaFalsa]:
+        def buscar():
+            if isinstance(query, re.Pattern):
+                casa = lambda v: query.search(v) is not None
+            elif case_sensitive:
+                casa = lambda v: v == query
+            else:
+                alvo = str(query).lower()
+                casa = lambda v: v.lower() == alvo
+            for i, row in enumerate(self._linhas, start=1):
+                if in_row is not None and i != in_row:
+                    continue
+                for j, v in enumerate(row, start=1):
+                    if in_column is not None and j != in_column:
+                        continue
+                    if casa(v):
+                        return CelulaFalsa(i, j, v)
+            return None
+        return self._backend._chamar("find", buscar, self)
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def update(self, values=None, range_name=None, value_input_option=None, **kwargs):
+        if isinstance(values, str) and not isinstance(range_name, str):
+            values, range_name = range_name, values  # assinatura antiga update(range, values)
+
+        def escrever():
+            linha, coluna = _inicio_faixa(range_name)
+            matriz = values if values and isinstance(values[0], (list, tuple)) else [values or []]
+            with self._lock:
+                self._escrever(linha, coluna, matriz)
+            return {"updatedRange": range_name, "updatedRows": len(matriz)}
+        return self._backend._chamar("update", escrever, self)
+
+    def batch_update(self, data: List[dict], value_input_option=None, **kwargs):
+        def escrever():
+            with self._lock:
+                for faixa in data:
+                    linha, coluna = _inicio_faixa(faixa["range"])
+                    self._escrever(linha, coluna, faixa["values"])
+            return {"totalUpdatedRanges": len(data)}
+        return self._backend._chamar("batch_update", escrever, self)
+
+    def update_cell(self, row: int, col: int, value):
+        def escrever():
+            with self._lock:
+                self._escrever(row, col, [[value]])
+            return {"updatedCells": 1}
+        return self._backend._chamar("update_cell", escrever, self)
+
+    def append_rows(self, values: Sequence[Sequence], value_input_option=None, **kwargs):
+        def escrever():
+            with self._lock:
+                inicio = len(self._retangulo()) + 1
+                self.row_count = max(self.row_count, inicio + len(values) - 1)
+                self._escrever(inicio, 1, values)
+            return {"updates": {"updatedRows": len(values)}}
+        return self._backend._chamar("append_rows", escrever, self)
+
+    def add_rows(self, rows: int):
+        def ampliar():
+            with self._lock:
+                self.row_count += int(rows)
+        return self._backend._chamar("add_rows", ampliar, self)
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None):
+        def remover():
+            fim = start_index if end_index is None else end_index
+            with self._lock:
+                del self._linhas[start_index - 1:fim]
+                self.row_count -= fim - start_index + 1
+        return self._backend._chamar("delete_rows", remover, self)
+
+
+class PlanilhaFalsa:
+    """Spreadsheet em memória (uma ou mais abas)."""
+
+    def __init__(self, backend: "BackendFalso", id_planilha: str, titulo: str):
+        self._backend = backend
+        self.id = id_planilha
+        self.title = titulo
+        self._abas: List[AbaFalsa] = []
+
+    def __repr__(self):
+        return f"<PlanilhaFalsa {self.title!r} id:{self.id}>"
+
+    def _nova_aba(self, titulo: str, valores=(), **kwargs) -> AbaFalsa:
+        aba = AbaFalsa(self._backend, self, len(self._abas), titulo, valores, **kwargs)
+        self._abas.append(aba)
+        return aba
+
+    @property
+    def sheet1(self) -> AbaFalsa:
+        return self._backend._chamar("sheet1", lambda: self._abas[0], self)
+
+    def worksheet(self, title: str) -> AbaFalsa:
+        def buscar():
+            for aba in self._abas:
+                if aba.title == title:
+                    return aba
+            raise ErroAPIFalso(404, f"WorksheetNotFound: {title}")
+        return self._backend._chamar("worksheet", buscar, self)
+
+    def get_worksheet_by_id(self, id_aba: int) -> AbaFalsa:
+        def buscar():
+            for aba in self._abas:
+                if aba.id == int(id_aba):
+                    return aba
+            raise ErroAPIFalso(404, f"WorksheetNotFound: id {id_aba}")
+        return self._backend._chamar("get_worksheet_by_id", buscar, self)
+
+    def worksheets(self) -> List[AbaFalsa]:
+        return list(self._abas)
+
+
+class _ExecucaoFalsa:
+    def __init__(self, backend: "BackendFalso", nome: str, func: Callable):
+        self._backend = backend
+        self._nome = nome
+        self._func = func
+
+    def execute(self, **kwargs):
+        return self._backend._chamar(self._nome, self._func)
+
+
+class _ArquivosFalsos:
+    def __init__(self, backend: "BackendFalso"):
+        self._backend = backend
+
+    def list(self, q: str = "", orderBy: str = "", pageSize: int = 100, fields: str = "", **kwargs):
+        def listar():
+            m = _RE_PASTA.search(q or "")
+            arquivos = [a for a in self._backend._arquivos.values() if m is None or m.group(1) in a["parents"]]
+            if "modifiedTime desc" in (orderBy or ""):
+                arquivos.sort(key=lambda a: a["modifiedTime"], reverse=True)
+            return {"files": [{k: a[k] for k in ("id", "name", "modifiedTime")} for a in arquivos[:pageSize]]}
+        return _ExecucaoFalsa(self._backend, "files.list", listar)
+
+    def get(self, fileId: str, fields: str = "", **kwargs):
+        def obter():
+            a = self._backend._arquivos.get(fileId)
+            if a is None:
+                raise ErroAPIFalso(404, f"File not found: {fileId}")
+            return {k: a[k] for k in ("id", "name", "modifiedTime")}
+        return _ExecucaoFalsa(self._backend, "files.get", obter)
+
+
+class _DriveFalso:
+    def __init__(self, backend: "BackendFalso"):
+        self._backend = backend
+
+    def files(self) -> _ArquivosFalsos:
+        return _ArquivosFalsos(self._backend)
+
+
+class _ClienteGspreadFalso:
+    def __init__(self, backend: "BackendFalso"):
+        self._backend = backend
+
+    def open_by_key(self, key: str) -> PlanilhaFalsa:
+        def abrir():
+            planilha = self._backend.planilhas.get(key)
+            if planilha is None:
+                raise ErroAPIFalso(404, f"SpreadsheetNotFound: {key}")
+            return planilha
+        return self._backend._chamar("open_by_key", abrir)
+
+
+class BackendFalso:
+    """
+    Sheets + Drive em memória.
+    - latencia_s: segundos por chamada (número, ou dict por nome/tipo de chamada)
+    - falhas: PlanoFalhas (ou lista deles) aplicado a cada chamada
+    - dormir: função de espera (time.sleep; troque para simular sem esperar)
+
+    Uso:
+        backend = BackendFalso(latencia_s=0.05, falhas=PlanoFalhas(429, rajadas=[(10, 5)]))
+        backend.criar_planilha("id_bruta", valores, pasta="id_pasta")
+        drive, gc = backend.autenticar(agendador)
+    """
+
+    def __init__(self, latencia_s: Union[float, Dict[str, float]] = 0.0,
+                 falhas: Union[None, PlanoFalhas, List[PlanoFalhas]] = None,
+                 dormir: Callable[[float], None] = time.sleep):
+        self.latencia_s = latencia_s
+        self.falhas: List[PlanoFalhas] = [falhas] if isinstance(falhas, PlanoFalhas) else list(falhas or [])
+        self._dormir = dormir
+        self.planilhas: Dict[str, PlanilhaFalsa] = {}
+        self._arquivos: Dict[str, dict] = {}
+        self.agendador = None
+        self.contadores: Counter = Counter()
+        self.erros: Counter = Counter()
+        self.latencia_total_s = 0.0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Montagem do cenário
+    # ------------------------------------------------------------------
+    def criar_planilha(self, id_planilha: str, valores: Sequence[Sequence] = (), titulo: Optional[str] = None,
+                       aba: str = "Página1", pasta: Optional[str] = None,
+                       modified_time: str = "2025-01-01T00:00:00.000Z", **kwargs) -> PlanilhaFalsa:
+        """Cria a planilha com uma aba (cabeçalho + linhas) e, se `pasta`, a lista no Drive."""
+        planilha = PlanilhaFalsa(self, id_planilha, titulo or id_planilha)
+        planilha._nova_aba(aba, valores, **kwargs)
+        self.planilhas[id_planilha] = planilha
+        self._arquivos[id_planilha] = {
+            "id": id_planilha, "name": planilha.title, "modifiedTime": modified_time,
+            "parents": [pasta] if pasta else [],
+        }
+        return planilha
+
+    def aba(self, id_planilha: str, indice: int = 0) -> AbaFalsa:
+        """Acesso direto (sem contar chamadas), para conferir o estado final."""
+        return self.planilhas[id_planilha]._abas[indice]
+
+    def valores(self, id_planilha: str, indice: int = 0) -> List[List[str]]:
+        return self.aba(id_planilha, indice)._retangulo()
+
+    def autenticar(self, agendador=None):
+        """Devolve (drive_service, gc) como tratamento.auth.autenticar()."""
+        self.agendador = agendador
+        return _DriveFalso(self), _ClienteGspreadFalso(self)
+
+    # ------------------------------------------------------------------
+    # Chamadas
+    # ------------------------------------------------------------------
+    def _latencia(self, nome: str, tipo: str) -> float:
+        if isinstance(self.latencia_s, dict):
+            return float(self.latencia_s.get(nome, self.latencia_s.get(tipo, 0.0)))
+        return float(self.latencia_s)
+
+    def _tentar(self, nome: str, tipo: str, func: Callable):
+        with self._lock:
+            self.contadores[nome] += 1
+        espera = self._latencia(nome, tipo)
+        if espera > 0:
+            self._dormir(espera)
+            with self._lock:
+                self.latencia_total_s += espera
+        try:
+            for plano in self.falhas:
+                plano.verificar(nome, tipo)
+            return func()
+        except ErroAPIFalso:
+            with self._lock:
+                self.erros[nome] += 1
+            raise
+
+    def _chamar(self, nome: str, func: Callable, alvo=None):
+        tipo = TIPOS_CHAMADA.get(nome, LEITURA)
+        if self.agendador is None:
+            return self._tentar(nome, tipo, func)
+        planilha = getattr(getattr(alvo, "spreadsheet", alvo), "id", None)
+        return self.agendador.executar(
+            lambda: self._tentar(nome, tipo, func),
+            tipo=tipo, planilha=planilha, idempotente=nome != "append_rows",
+        )
+
+    # ------------------------------------------------------------------
+    # Relatório
+    # ------------------------------------------------------------------
+    def relatorio(self) -> dict:
+        with self._lock:
+            return {
+                "chamadas": dict(self.contadores),
+                "erros": dict(self.erros),
+                "total_chamadas": sum(self.contadores.values()),
+                "latencia_total_s": round(self.latencia_total_s, 3),
+            }
+
+    def zerar_contadores(self) -> None:
+        with self._lock:
+            self.contadores.clear()
+            self.erros.clear()
+            self.latencia_total_s = 0.0
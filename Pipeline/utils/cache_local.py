@@ -0,0 +1,152 @@
+"""
+Módulo de Cache Local (colunar) das planilhas
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Guarda em disco os valores de cada planilha (cabeçalho + linhas), chaveados
+pelo ID do arquivo no Drive e pelo seu modifiedTime. Se o arquivo não mudou
+desde a última execução, o snapshot é montado a partir do disco e o download
+via get_all_values é evitado.
+
+Formato: Parquet (pyarrow/fastparquet) quando disponível; caso contrário
+pickle do pandas. Metadados (modifiedTime, cabeçalho) ficam em um JSON ao lado.
+
+Classes/Funções:
+- CacheLocal - Leitura/escrita do cache por (file_id, modifiedTime)
+- carregar_snapshot() - Monta o SheetSnapshot do cache ou baixa e grava
+- obter_modified_time() - Consulta o modifiedTime de um arquivo no Drive
+"""
+
+import json
+import logging
+import os
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from .snapshot import SheetSnapshot
+
+CACHE_DIR_PADRAO = os.environ.get(
+    "PIPELINE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+
+
+def _parquet_disponivel() -> bool:
+    for mod in ("pyarrow", "fastparquet"):
+        try:
+            __import__(mod)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+class CacheLocal:
+    """Cache em disco de planilhas, uma entrada por file_id."""
+
+    def __init__(self, diretorio: str = CACHE_DIR_PADRAO, habilitado: bool = True):
+        self.diretorio = diretorio
+        self.habilitado = habilitado and os.environ.get("PIPELINE_CACHE", "1") != "0"
+        self.formato = "parquet" if _parquet_disponivel() else "pickle"
+        self.hits = 0
+        self.misses = 0
+
+    def _caminhos(self, file_id: str):
+        base = os.path.join(self.diretorio, file_id)
+        ext = ".parquet" if self.formato == "parquet" else ".pkl"
+        return base + ext, base + ".meta.json"
+
+    def carregar(self, file_id: str, modified_time: Optional[str]) -> Optional[List[List]]:
+        """Devolve os valores (cabeçalho + linhas) se o cache bater com modified_time."""
+        if not self.habilitado or not file_id or not modified_time:
+            return None
+        arq_dados, arq_meta = self._caminhos(file_id)
+        try:
+            with open(arq_meta, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        if meta.get("modifiedTime") != modified_time or meta.get("formato") != self.formato:
+            self.misses += 1
+            return None
+        try:
+            if self.formato == "parquet":
+                df = pd.read_parquet(arq_dados)
+            else:
+                df = pd.read_pickle(arq_dados)
+        except Exception as e:
+            logging.warning(f"Cache local ilegível para '{file_id}': {e}. Será feito novo download.")
+            self.misses += 1
+            return None
+        self.hits += 1
+        header = list(meta.get("header", []))
+        return [header] + df.to_numpy(dtype=object).tolist()
+
+    def salvar(self, file_id: str, modified_time: Optional[str], values: List[List]) -> None:
+        """Grava os valores da planilha associados ao modified_time informado."""
+        if not self.habilitado or not file_id or not modified_time or not values:
+            return
+        header = ["" if h is None else str(h) for h in values[0]]
+        colunas = [f"c{i}" for i in range(len(header))]
+        df = pd.DataFrame(
+            [["" if v is None else str(v) for v in r] for r in values[1:]],
+            columns=colunas,
+            dtype=object,
+        )
+        arq_dados, arq_meta = self._caminhos(file_id)
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            tmp = arq_dados + ".tmp"
+            if self.formato == "parquet":
+                df.astype(str).to_parquet(tmp, index=False)
+            else:
+                df.to_pickle(tmp)
+            os.replace(tmp, arq_dados)
+            meta = {
+                "file_id": file_id,
+                "modifiedTime": modified_time,
+                "formato": self.formato,
+                "header": header,
+                "linhas": len(df),
+            }
+            with open(arq_meta + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(arq_meta + ".tmp", arq_meta)
+            logging.info(f"Cache local atualizado: '{file_id}' ({len(df)} linhas, {self.formato}).")
+        except Exception as e:
+            logging.warning(f"Falha ao gravar cache local de '{file_id}': {e}")
+
+
+def obter_modified_time(drive_svc, file_id: str) -> Optional[str]:
+    """Consulta o modifiedTime de um arquivo no Drive (None em caso de erro)."""
+    try:
+        meta = drive_svc.files().get(fileId=file_id, fields="modifiedTime").execute()
+        return meta.get("modifiedTime")
+    except Exception as e:
+        logging.warning(f"Não foi possível obter modifiedTime de '{file_id}': {e}")
+        return None
+
+
+def carregar_snapshot(file_id: str, modified_time: Optional[str], worksheet=None,
+                      abrir: Optional[Callable] = None, cache: Optional[CacheLocal] = None,
+                      nome: str = "", **kwargs) -> SheetSnapshot:
+    """
+    Monta o SheetSnapshot a partir do cache local quando o arquivo não mudou;
+    caso contrário baixa a worksheet (abrindo-a via `abrir()` se necessário) e grava no cache.
+    """
+    cache = cache or CacheLocal()
+    values = cache.carregar(file_id, modified_time)
+    if values is not None:
+        snap = SheetSnapshot(worksheet, values, nome=nome, **kwargs)
+        snap.modified_time = modified_time
+        logging.info(f"Snapshot '{snap.nome}' carregado do cache local ({len(snap.rows)} linhas, modifiedTime={modified_time}).")
+        return snap
+    if worksheet is None:
+        if abrir is None:
+            raise ValueError("carregar_snapshot: informe worksheet ou abrir().")
+        worksheet = abrir()
+    snap = SheetSnapshot.carregar(worksheet, nome=nome, **kwargs)
+    snap.modified_time = modified_time
+    cache.salvar(file_id, modified_time, snap.values)
+    return snap
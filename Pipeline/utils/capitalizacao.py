@@ -0,0 +1,140 @@
+"""
+Módulo de Capitalização de Nomes em Português (proper case em coluna)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Um único motor de "Title Case" para unidade_cadastro, orgaos e as UACs,
+configurável por:
+- conectivos: palavras mantidas em minúsculas fora do início ("de", "da", ...)
+- acronimos: palavras sempre em maiúsculas ("UAC", "UPA", "CER", "IV", ...)
+- prefixos: siglas de prefixo no formato "UAC - Nome" (o resto é formatado
+  como continuação: conectivos em minúsculas mesmo logo após o prefixo)
+- preservar: trechos que, se presentes (sem diferenciar caixa), mantêm o
+  valor como está (ex.: "ouvidoria", "uac - upa")
+- sem_acentos: remove acentos (NFKD) e normaliza espaços antes de formatar
+
+A coluna é fatorada; só os valores distintos ainda não vistos são
+formatados, em bloco: .str.lower/.str.split, .str.extract para os prefixos e
+.str.capitalize/.str.upper uma vez por palavra distinta. O resultado fica em
+cache no formatador.
+Valores que não são texto ou são só espaços voltam inalterados.
+
+Classes/Funções:
+- CapitalizadorPT - Motor de proper case (aplicar() em coluna, formatar() por valor)
+- CONECTIVOS_PT - Conectivos padrão
+"""
+
+import re
+from itertools import chain
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .normalizacao import remover_acentos_series
+from .vetorizacao import fatorar
+
+CONECTIVOS_PT = ("de", "da", "do", "dos", "das", "e", "a", "o", "em")
+
+_FALTA = object()
+
+
+class CapitalizadorPT:
+    """
+    Proper case em português, configurável (ver o módulo).
+
+    - aplicar(series): coluna formatada (dtype object, mesmo índice)
+    - formatar(valor): um valor (mesmo cache de aplicar)
+    - limite_cache: quantos valores distintos guardar (o cache é esvaziado ao passar disso)
+    """
+
+    def __init__(self, conectivos: Iterable[str] = CONECTIVOS_PT, acronimos: Iterable[str] = (),
+                 prefixos: Iterable[str] = (), preservar: Iterable[str] = (), sem_acentos: bool = False,
+                 limite_cache: int = 100_000):
+        self.conectivos = frozenset(c.lower() for c in conectivos)
+        self.acronimos = frozenset(a.lower() for a in acronimos)
+        self.sem_acentos = sem_acentos
+        self.limite_cache = limite_cache
+        prefixos = [re.escape(p.lower()) for p in prefixos]
+        self._re_prefixo = (re.compile(r"^\s*(" + "|".join(prefixos) + r")\s*-\s*(.+)$")
+                            if prefixos else None)
+        preservar = [re.escape(p.lower()) for p in preservar]
+        self._re_preservar = re.compile("|".join(preservar)) if preservar else None
+        self._cache: Dict[str, str] = {}
+
+    def limpar_cache(self) -> None:
+        self._cache.clear()
+
+    def _formatar_lote(self, textos: pd.Series) -> np.ndarray:
+        """Formata textos não vazios (índice 0..n-1) em bloco."""
+        n = len(textos)
+        if self.sem_acentos:
+            t = remover_acentos_series(textos.str.strip(), compat=True)
+            t = t.str.replace(r"\s+", " ", regex=True).str.lower().str.strip()
+        else:
+            t = textos.str.lower()
+
+        com_prefixo = np.zeros(n, dtype=bool)
+        if self._re_prefixo is not None:
+            partes = t.str.extract(self._re_prefixo)
+            com_prefixo = partes[0].notna().to_numpy(dtype=bool)
+            t = t.where(~com_prefixo, partes[1])
+
+        # palavras de todos os textos numa série só (ordem preservada) + tamanho de cada texto
+        listas = t.str.split()
+        tamanhos = listas.str.len().to_numpy(dtype=np.intp)
+        # cada palavra distinta é formatada uma vez; as ocorrências só escolhem a forma
+        codigos, vocab = pd.factorize(np.fromiter(chain.from_iterable(listas), dtype=object, count=tamanhos.sum()))
+        vocab = pd.Series(vocab, dtype=object)
+        formas = np.stack([
+            vocab.str.capitalize().to_numpy(dtype=object),  # 0: capitalizada
+            vocab.to_numpy(dtype=object),                   # 1: conectivo (minúsculas)
+            vocab.str.upper().to_numpy(dtype=object),       # 2: acrônimo
+        ])
+        eh_conectivo = vocab.isin(list(self.conectivos)).to_numpy()[codigos]
+        eh_acronimo = vocab.isin(list(self.acronimos)).to_numpy()[codigos]
+        fins = np.cumsum(tamanhos)
+        posicao = np.arange(len(codigos)) - np.repeat(fins - tamanhos, tamanhos)
+        # a primeira palavra só escapa dos conectivos quando não há prefixo antes dela
+        inicio = (posicao == 0) & np.repeat(~com_prefixo, tamanhos)
+        forma = np.where(eh_acronimo, 2, np.where(eh_conectivo & ~inicio, 1, 0))
+        saida = formas[forma, codigos].tolist()
+
+        resultado = np.empty(n, dtype=object)
+        for k, (fim, tam) in enumerate(zip(fins.tolist(), tamanhos.tolist())):
+            resultado[k] = " ".join(saida[fim - tam:fim])
+        for k in np.flatnonzero(com_prefixo):
+            resultado[k] = f"{partes.iat[k, 0].upper()} - {resultado[k]}"
+
+        if self._re_preservar is not None:
+            preservados = textos.str.lower().str.contains(self._re_preservar).to_numpy(dtype=bool)
+            resultado[preservados] = textos.to_numpy(dtype=object)[preservados]
+        return resultado
+
+    def aplicar(self, series: pd.Series) -> pd.Series:
+        s = pd.Series(series)
+        codigos, unicos = fatorar(s)
+        res = unicos.copy()
+        pendentes = []
+        for k, u in enumerate(unicos):
+            if isinstance(u, str) and u.strip():
+                r = self._cache.get(u, _FALTA)
+                if r is _FALTA:
+                    pendentes.append(k)
+                else:
+                    res[k] = r
+        if pendentes:
+            textos = unicos[pendentes]
+            novos = self._formatar_lote(pd.Series(textos, dtype=object))
+            if len(self._cache) + len(pendentes) > self.limite_cache:
+                self._cache.clear()
+            self._cache.update(zip(textos, novos))
+            res[pendentes] = novos
+        return pd.Series(res[codigos], index=s.index, name=s.name, dtype=object)
+
+    def formatar(self, valor):
+        if not isinstance(valor, str) or not valor.strip():
+            return valor
+        r = self._cache.get(valor, _FALTA)
+        if r is _FALTA:
+            r = self.aplicar(pd.Series([valor], dtype=object)).iat[0]
+        return r
@@ -0,0 +1,213 @@
+"""
+Módulo de Datas - motor vetorizado de parsing multi-formato
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+A coluna inteira é classificada por padrão em uma única passada vetorizada
+(sobre os valores distintos) e cada classe é convertida em bloco:
+ISO, serial do Excel, epoch em ms/s, dd/mm/aaaa e dd/mm/aa (com/sem hora),
+aaaa-mm-dd e, por último, o parse genérico dayfirst (por valor distinto).
+
+Os resultados reproduzem as antigas funções célula-a-célula
+(_parse_dt_cmp e _to_ddmmaa_text do Pipeline/main.py), exceto pela remoção
+do sufixo de fuso, que agora só ocorre quando há hora (antes "2025-02-05"
+perdia o "-05" e virava 01/02/2025).
+
+Funções:
+- parse_datas() - Converte para Timestamp (datetime64[ns], NaT se inválido)
+- formatar_datas() - Converte para texto 'DD/MM/AAAA' (mantém o original se inválido)
+"""
+
+import datetime as _dt
+import warnings
+
+import numpy as np
+import pandas as pd
+
+EXCEL_BASE = pd.Timestamp("1899-12-30")
+# maior serial do Excel representável em datetime64[ns]
+_TS_MAX = pd.Timestamp.max
+_EXCEL_MAX_DIAS = (_dt.date(_TS_MAX.year, _TS_MAX.month, _TS_MAX.day) - _dt.date(1899, 12, 30)).days - 1
+# serial com fração de dia vira Timedelta em ns, que só vai até ~106751 dias (como no antigo, o resto é NaT)
+_EXCEL_MAX_DIAS_FRACAO = pd.Timedelta.max / pd.Timedelta(days=1)
+
+FORMATOS_EXPLICITOS = [
+    "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y",
+    "%d/%m/%y %H:%M:%S", "%d/%m/%y %H:%M", "%d/%m/%y",
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d",
+]
+
+_RE_SUFIXO_TZ = r"([+-]\d{2}:?\d{2}|[+-]\d{2}| UTC)$"
+_RE_ISO = r"^\d{4}-\d{2}-\d{2}"
+_RE_EXCEL = r"\d{5,6}(\.\d+)?"
+_RE_EPOCH_MS = r"\d{13}"
+_RE_EPOCH_S = r"\d{10}(\.\d+)?"
+
+
+def _para_ns(dt: pd.Series) -> pd.Series:
+    """Remove fuso e converte para datetime64[ns] (fora do intervalo -> NaT)."""
+    if getattr(dt.dt, "tz", None) is not None:
+        dt = dt.dt.tz_localize(None)
+    if dt.dtype != "datetime64[ns]":
+        fora = (dt < pd.Timestamp.min) | (dt > pd.Timestamp.max)
+        if fora.any():
+            dt = dt.where(~fora)
+        dt = dt.astype("datetime64[ns]")
+    return dt
+
+
+def _to_datetime_ns(valores, **kwargs) -> pd.Series:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        out = pd.to_datetime(valores, errors="coerce", **kwargs)
+    if not isinstance(out, pd.Series):
+        out = pd.Series(out, index=getattr(valores, "index", None))
+    return _para_ns(out)
+
+
+def _escalar(s: str, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            dt = pd.to_datetime(s, errors="coerce", **kwargs)
+        except Exception:
+            return pd.NaT
+    if pd.isna(dt):
+        return pd.NaT
+    if getattr(dt, "tzinfo", None) is not None:
+        dt = dt.tz_localize(None)
+    if dt < pd.Timestamp.min or dt > pd.Timestamp.max:
+        return pd.NaT
+    return dt
+
+
+def _motor(uniq: pd.Series, modo: str):
+    """
+    Recebe valores distintos (object) e devolve (datas, finais):
+    - datas: datetime64[ns] (NaT onde não houve parse)
+    - finais: máscara de valores cuja classe é terminal mesmo sem parse
+      (no modo 'texto' esses valores voltam como texto original)
+    """
+    idx = uniq.index
+    datas = pd.Series(pd.NaT, index=idx, dtype="datetime64[ns]")
+    finais = pd.Series(False, index=idx)
+
+    # datetimes nativos: conversão direta
+    eh_dt = uniq.map(lambda v: isinstance(v, (pd.Timestamp, np.datetime64, _dt.datetime)))
+    if eh_dt.any():
+        datas.loc[eh_dt] = _to_datetime_ns(uniq[eh_dt])
+        finais |= eh_dt
+
+    s = uniq.astype(str).str.strip()
+    vazio = uniq.isna() | (s == "")
+    finais |= vazio
+    pend = ~finais
+    if not pend.any():
+        return datas, finais
+
+    s2 = s.str.replace("T", " ", regex=False).str.replace("Z", "", regex=False)
+    # o sufixo de fuso só é removido quando há hora: em "2025-02-05" o "-05" é o dia
+    tem_hora = s2.str.contains(r"\d:\d{2}", regex=True)
+    s2 = s2.where(~tem_hora, s2.str.replace(_RE_SUFIXO_TZ, "", regex=True)).str.strip()
+
+    # ISO (apenas no modo texto, como em _to_ddmmaa_text)
+    if modo == "texto":
+        iso = pend & s2.str.match(_RE_ISO)
+        if iso.any():
+            datas.loc[iso] = _to_datetime_ns(s2[iso], format="ISO8601")
+            falhou = iso & datas.isna()
+            for i in falhou[falhou].index:
+                datas.at[i] = _escalar(s2.at[i], dayfirst=False)
+            finais |= iso
+            pend &= ~iso
+
+    # Serial do Excel (5–6 dígitos)
+    excel = pend & s2.str.fullmatch(_RE_EXCEL)
+    if excel.any():
+        dias = pd.to_numeric(s2[excel], errors="coerce")
+        inteiro = dias.notna() & (dias % 1 == 0) & (dias < _EXCEL_MAX_DIAS)
+        fracao = dias.notna() & (dias % 1 != 0) & (dias < _EXCEL_MAX_DIAS_FRACAO)
+        # convertidos em separado: numa mesma chamada, um serial inteiro grande estoura as frações
+        if inteiro.any():
+            datas.loc[inteiro[inteiro].index] = EXCEL_BASE + pd.to_timedelta(dias[inteiro].astype("int64"), unit="D")
+        if fracao.any():
+            datas.loc[fracao[fracao].index] = EXCEL_BASE + pd.to_timedelta(dias[fracao], unit="D")
+        if modo == "texto":
+            # serial inválido segue para os formatos seguintes
+            finais |= excel & datas.notna()
+            pend &= ~(excel & datas.notna())
+        else:
+            finais |= excel
+            pend &= ~excel
+
+    # Epoch em milissegundos (13 dígitos)
+    ms = pend & s2.str.fullmatch(_RE_EPOCH_MS)
+    if ms.any():
+        datas.loc[ms] = _to_datetime_ns(pd.to_numeric(s2[ms]).astype("int64"), unit="ms")
+        finais |= ms
+        pend &= ~ms
+
+    # Epoch em segundos (10 dígitos)
+    seg = pend & s2.str.fullmatch(_RE_EPOCH_S)
+    if seg.any():
+        datas.loc[seg] = _to_datetime_ns(pd.to_numeric(s2[seg]).astype(float), unit="s")
+        finais |= seg
+        pend &= ~seg
+
+    # Formatos explícitos, na ordem de prioridade (dd/mm/aaaa, dd/mm/aa, aaaa-mm-dd)
+    for fmt in FORMATOS_EXPLICITOS:
+        if not pend.any():
+            break
+        conv = _to_datetime_ns(s2[pend], format=fmt)
+        ok = conv.notna()
+        if ok.any():
+            ok_idx = ok[ok].index
+            datas.loc[ok_idx] = conv[ok]
+            pend.loc[ok_idx] = False
+
+    # Fallback genérico dayfirst (por valor distinto)
+    for i in pend[pend].index:
+        datas.at[i] = _escalar(s2.at[i], dayfirst=True)
+
+    return datas, finais
+
+
+def _por_valores_distintos(series: pd.Series, modo: str):
+    series = pd.Series(series)
+    valores = series.to_numpy(dtype=object)
+    codes, uniq = pd.factorize(valores, use_na_sentinel=True)
+    uniq_s = pd.Series(uniq, dtype=object)
+    datas_u, _ = _motor(uniq_s, modo)
+    return series, codes, uniq_s, datas_u
+
+
+def parse_datas(series: pd.Series) -> pd.Series:
+    """
+    Converte a coluna para Timestamp (datetime64[ns]); inválidos/vazios viram NaT.
+    Equivale ao antigo _parse_dt_cmp (mesma ordem de classes e formatos).
+    """
+    series, codes, _, datas_u = _por_valores_distintos(series, "timestamp")
+    arr = datas_u.to_numpy(dtype="datetime64[ns]")
+    out = np.full(len(codes), np.datetime64("NaT"), dtype="datetime64[ns]")
+    ok = codes >= 0
+    out[ok] = arr[codes[ok]]
+    return pd.Series(out, index=series.index, name=series.name)
+
+
+def formatar_datas(series: pd.Series, fmt: str = "%d/%m/%Y") -> pd.Series:
+    """
+    Converte a coluna para texto 'DD/MM/AAAA'. Vazios/nulos viram None e
+    valores não reconhecidos voltam como o texto original (sem espaços nas pontas).
+    Equivale ao antigo _to_ddmmaa_text.
+    """
+    series, codes, uniq_s, datas_u = _por_valores_distintos(series, "texto")
+    texto = uniq_s.astype(str).str.strip()
+    vazio = uniq_s.isna() | (texto == "")
+    fmt_u = datas_u.dt.strftime(fmt)
+    res_u = fmt_u.where(datas_u.notna(), texto).astype(object)
+    res_u[vazio] = None
+    arr = res_u.to_numpy(dtype=object)
+    out = np.empty(len(codes), dtype=object)
+    out[:] = None
+    ok = codes >= 0
+    out[ok] = arr[codes[ok]]
+    return pd.Series(out, index=series.index, name=series.name, dtype="object")
@@ -0,0 +1,114 @@
+"""
+Módulo de Envio em Lotes (upload concorrente para o Google Sheets)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Cada lote recebe um deslocamento de linha fixo (linha_inicial + i * lote) e
+é escrito com values.update em uma faixa explícita, em vez de append_rows.
+Assim a ordem das linhas não depende da ordem de chegada das requisições,
+e vários lotes podem ficar em voo ao mesmo tempo: enquanto os primeiros
+estão na rede, a thread principal já serializa os próximos.
+
+A concorrência é limitada por max_concorrencia (variável de ambiente
+PIPELINE_ENVIO_CONCORRENCIA, padrão 4); com 1 o envio é sequencial.
+
+Funções:
+- garantir_linhas() - Aumenta a grade da worksheet se a escrita passar do fim
+- enviar_em_lotes() - Serializa e envia um DataFrame em lotes concorrentes
+"""
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from .escrita import rowcol_to_a1
+
+CONCORRENCIA_PADRAO = max(1, int(os.environ.get("PIPELINE_ENVIO_CONCORRENCIA", "4")))
+
+
+def garantir_linhas(sheet_obj, ultima_linha: int) -> None:
+    """values.update não cria linhas: amplia a grade uma única vez, se preciso."""
+    row_count = getattr(sheet_obj, "row_count", None)
+    if row_count is not None and ultima_linha > row_count:
+        sheet_obj.add_rows(ultima_linha - row_count)
+        logging.info(f"Grade da worksheet ampliada em {ultima_linha - row_count} linhas (até {ultima_linha}).")
+
+
+def _escrever(sheet_obj, linha: int, rows: List[List], value_input_option: str) -> None:
+    # com journal (WorksheetComJournal), o lote é registrado como acréscimo: reaplicação por protocolo
+    acrescentar = getattr(sheet_obj, "acrescentar_linhas", None)
+    if acrescentar is not None:
+        acrescentar(linha, rows, value_input_option)
+        return
+    sheet_obj.update(range_name=rowcol_to_a1(linha, 1), values=rows, value_input_option=value_input_option)
+
+
+def enviar_em_lotes(sheet_obj, df: pd.DataFrame, serializar: Callable[[pd.DataFrame], List[List]],
+                    linha_inicial: int, lote: int = 500, max_concorrencia: int = CONCORRENCIA_PADRAO,
+                    cabecalho: Optional[List] = None, snapshot=None,
+                    ao_falhar: Optional[Callable] = None,
+                    value_input_option: str = "USER_ENTERED") -> dict:
+    """
+    Envia df em lotes de `lote` linhas a partir de linha_inicial (1-based).
+
+    - serializar(chunk) -> lista de listas pronta para a API
+    - cabecalho: se informado (planilha vazia), é escrito antes na linha_inicial
+    - snapshot: recebe as linhas de cada lote concluído (na thread principal)
+    - ao_falhar(chunk, erro, primeiro, ultimo): chamado para cada lote que falhou
+
+    Retorna {"enviadas": n, "lotes_ok": n, "lotes_falhos": n}.
+    """
+    resultado = {"enviadas": 0, "lotes_ok": 0, "lotes_falhos": 0}
+    if df.empty:
+        return resultado
+
+    if cabecalho is not None:
+        _escrever(sheet_obj, linha_inicial, [list(cabecalho)], value_input_option)
+        if snapshot is not None:
+            snapshot.anexar_linhas([list(cabecalho)])
+        logging.info("Cabeçalho escrito na planilha tratada.")
+        linha_inicial += 1
+
+    garantir_linhas(sheet_obj, linha_inicial + len(df) - 1)
+
+    max_concorrencia = max(1, int(max_concorrencia))
+    em_voo = {}
+
+    def _concluir(fut):
+        i, chunk, linha, rows = em_voo.pop(fut)
+        primeiro, ultimo = i + 1, i + len(chunk)
+        try:
+            fut.result()
+        except Exception as e:
+            resultado["lotes_falhos"] += 1
+            logging.exception(f"Erro CRÍTICO ao enviar lote {primeiro}-{ultimo}: {e}")
+            if ao_falhar is not None:
+                ao_falhar(chunk, e, primeiro, ultimo)
+            return
+        resultado["lotes_ok"] += 1
+        resultado["enviadas"] += len(rows)
+        if snapshot is not None:
+            snapshot.escrever_linhas(linha, rows)
+        logging.info(f"Lote {primeiro}-{ultimo} enviado nas linhas {linha}-{linha + len(rows) - 1}.")
+
+    with ThreadPoolExecutor(max_workers=max_concorrencia, thread_name_prefix="envio") as pool:
+        for i in range(0, len(df), lote):
+            chunk = df.iloc[i:i + lote]
+            # serializa o próximo lote enquanto os anteriores estão em voo
+            rows = serializar(chunk)
+            linha = linha_inicial + i
+            # limite de concorrência: espera uma vaga antes de enviar mais um lote
+            while len(em_voo) >= max_concorrencia:
+                feitos, _ = wait(list(em_voo), return_when=FIRST_COMPLETED)
+                for fut in feitos:
+                    _concluir(fut)
+            fut = pool.submit(_escrever, sheet_obj, linha, rows, value_input_option)
+            em_voo[fut] = (i, chunk, linha, rows)
+        while em_voo:
+            feitos, _ = wait(list(em_voo), return_when=FIRST_COMPLETED)
+            for fut in feitos:
+                _concluir(fut)
+
+    return resultado
@@ -0,0 +1,180 @@
+"""
+Módulo de Escrita Esparsa no Google Sheets
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Em vez de reescrever colunas inteiras, o pipeline envia apenas as células
+alteradas. Células consecutivas da mesma coluna são agrupadas em faixas A1
+mínimas e todas as faixas vão em UMA única requisição values.batchUpdate
+(worksheet.batch_update do gspread).
+
+Funções:
+- rowcol_to_a1() - (linha, coluna) 1-based -> notação A1 (ex.: (2, 3) -> 'C2')
+- celulas_alteradas() - Diff entre valores atuais (texto do sheet) e novos
+- mesmo_valor() - Compara o texto do sheet com um valor novo (números sem depender do locale)
+- agrupar_faixas() - Agrupa células em faixas contíguas por coluna
+- escrever_celulas() - Envia as faixas em um único batchUpdate
+- indice_por_chave() - Mapa chave (protocolo) -> linha 1-based, construído uma vez
+- escrever_por_chave() - Escrita esparsa de (chave, valor) em uma coluna
+"""
+
+import logging
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def rowcol_to_a1(row: int, col: int) -> str:
+    """(linha, coluna) 1-based -> 'A1' (mesma saída de gspread.utils.rowcol_to_a1)."""
+    if row < 1 or col < 1:
+        raise ValueError(f"Linha/coluna inválida: ({row}, {col})")
+    letras = ""
+    while col:
+        col, resto = divmod(col - 1, 26)
+        letras = chr(65 + resto) + letras
+    return f"{letras}{row}"
+
+
+def _texto(valor) -> str:
+    """Como a célula aparece em get_all_values (None/NaN -> '')."""
+    if valor is None:
+        return ""
+    try:
+        if pd.isna(valor):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return str(valor)
+
+
+def _valor_json(valor):
+    """Valor serializável para a API (numpy -> Python, None/NaN -> '')."""
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and not np.isfinite(valor):
+        return ""
+    return valor
+
+
+def _numero(texto: str):
+    """Número de um texto como o Sheets exibe ('5,5', '1.234,5' no pt-BR ou '5.5'); None se não for."""
+    s = texto.strip().replace("\u00a0", "").replace(" ", "")
+    if "," in s:
+        s = s.replace(".", "").replace(",", ".")
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+def mesmo_valor(atual, novo) -> bool:
+    """
+    True se a célula (texto de get_all_values) já mostra `novo`. Números são
+    comparados pelo valor: o Sheets formata 5.5 como '5,5' no locale pt-BR.
+    """
+    antigo = _texto(atual)
+    if _texto(novo) == antigo:
+        return True
+    if isinstance(novo, (int, float, np.integer, np.floating)) and not isinstance(novo, (bool, np.bool_)):
+        n = _numero(antigo)
+        return n is not None and math.isfinite(float(novo)) and math.isclose(n, float(novo), rel_tol=1e-9, abs_tol=1e-9)
+    return False
+
+
+def celulas_alteradas(atuais: Sequence, novos: Sequence, col_idx: int,
+                      linha_inicial: int = 2) -> List[Tuple[int, int, object]]:
+    """
+    Compara os valores atuais da coluna (texto, como get_all_values) com os novos
+    e devolve [(linha, coluna, novo_valor)] apenas para as células diferentes
+    (números comparados pelo valor, ver mesmo_valor).
+    Posições além do fim de `novos` recebem "" (como na reescrita completa).
+    """
+    alteracoes = []
+    n = max(len(atuais), len(novos))
+    for i in range(n):
+        antigo = atuais[i] if i < len(atuais) else ""
+        novo = novos[i] if i < len(novos) else ""
+        if not mesmo_valor(antigo, novo):
+            alteracoes.append((linha_inicial + i, col_idx, novo))
+    return alteracoes
+
+
+def agrupar_faixas(updates: Iterable[Tuple[int, int, object]]) -> List[dict]:
+    """
+    Agrupa (linha, coluna, valor) em faixas contíguas por coluna, no formato
+    aceito por worksheet.batch_update: [{"range": "C5:C7", "values": [[..], [..], [..]]}].
+    Se a mesma célula aparecer mais de uma vez, vale a última ocorrência.
+    """
+    celulas = {}
+    for row, col, valor in updates:
+        celulas[(int(col), int(row))] = _valor_json(valor)
+    faixas = []
+    inicio = anterior = None
+    valores = []
+    for col, row in sorted(celulas):
+        if anterior is not None and col == anterior[0] and row == anterior[1] + 1:
+            valores.append([celulas[(col, row)]])
+        else:
+            if inicio is not None:
+                faixas.append(_faixa(inicio, anterior, valores))
+            inicio, valores = (col, row), [[celulas[(col, row)]]]
+        anterior = (col, row)
+    if inicio is not None:
+        faixas.append(_faixa(inicio, anterior, valores))
+    return faixas
+
+
+def _faixa(inicio, fim, valores) -> dict:
+    a1_ini = rowcol_to_a1(inicio[1], inicio[0])
+    a1_fim = rowcol_to_a1(fim[1], fim[0])
+    return {"range": a1_ini if a1_ini == a1_fim else f"{a1_ini}:{a1_fim}", "values": valores}
+
+
+def escrever_celulas(sheet_obj, updates: Iterable[Tuple[int, int, object]],
+                     value_input_option: str = "RAW") -> int:
+    """
+    Envia as células em um único values.batchUpdate. Retorna o nº de células escritas.
+    Exceções da API são propagadas para o chamador.
+    """
+    faixas = agrupar_faixas(updates)
+    if not faixas:
+        return 0
+    n_celulas = sum(len(f["values"]) for f in faixas)
+    sheet_obj.batch_update(faixas, value_input_option=value_input_option)
+    logging.info(f"batchUpdate: {n_celulas} células em {len(faixas)} faixas (1 requisição).")
+    return n_celulas
+
+
+def indice_por_chave(valores_coluna: Sequence, linha_inicial: int = 1) -> Dict[str, int]:
+    """
+    Mapa chave (texto sem espaços nas pontas) -> linha 1-based da primeira ocorrência.
+    valores_coluna: a coluna como em worksheet.col_values (incluindo o cabeçalho).
+    """
+    indice = {}
+    for i, v in enumerate(valores_coluna):
+        chave = _texto(v).strip()
+        if chave and chave not in indice:
+            indice[chave] = linha_inicial + i
+    return indice
+
+
+def escrever_por_chave(sheet_obj, indice: Dict[str, int], col_idx: int,
+                       pares: Iterable[Tuple[str, object]],
+                       value_input_option: str = "RAW") -> Tuple[List[Tuple[int, int, object]], List[str]]:
+    """
+    Escreve (chave, valor) na coluna col_idx, localizando a linha de cada chave em `indice`.
+    Linhas contíguas viram uma faixa e tudo vai em um único batchUpdate.
+    Retorna (células aplicadas [(linha, coluna, valor)], chaves ausentes no sheet).
+    """
+    updates, ausentes = [], []
+    for chave, valor in pares:
+        row_idx = indice.get(_texto(chave).strip())
+        if row_idx is None:
+            ausentes.append(chave)
+        else:
+            updates.append((row_idx, col_idx, valor))
+    escrever_celulas(sheet_obj, updates, value_input_option=value_input_option)
+    return updates, ausentes
@@ -0,0 +1,150 @@
+"""
+Módulo de Fingerprint de Linhas (execuções incrementais)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Cada protocolo da planilha bruta recebe um hash de 64 bits do conteúdo da
+linha (colunas normalizadas: texto sem espaços nas pontas), calculado em bloco
+com pd.util.hash_pandas_object. Os hashes são gravados em disco ao fim de cada
+execução bem-sucedida; na execução seguinte, cada protocolo é classificado em
+uma única passada como novo, alterado ou inalterado.
+
+Se o conjunto de colunas da bruta mudar, a assinatura do esquema (sha1 dos
+nomes das colunas) deixa de bater e todos os protocolos contam como alterados.
+
+Classes/Funções:
+- fingerprint_linhas() - Hash de 64 bits por linha (vetorizado)
+- fingerprint_por_protocolo() - Um hash por protocolo (última ocorrência vence)
+- RegistroFingerprints - Persistência dos hashes entre execuções
+- classificar_protocolos() - Classifica em 'novo' / 'alterado' / 'inalterado'
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from .cache_local import CACHE_DIR_PADRAO, _parquet_disponivel
+
+NOVO = "novo"
+ALTERADO = "alterado"
+INALTERADO = "inalterado"
+
+
+def _colunas_fingerprint(df: pd.DataFrame, ignorar: Iterable[str] = ()) -> list:
+    ignorar = set(ignorar)
+    return [c for c in df.columns if c not in ignorar]
+
+
+def assinatura_esquema(colunas: Iterable[str]) -> str:
+    """sha1 dos nomes das colunas (na ordem) usadas no fingerprint."""
+    return hashlib.sha1("\x1f".join(map(str, colunas)).encode("utf-8")).hexdigest()
+
+
+def fingerprint_linhas(df: pd.DataFrame, ignorar: Iterable[str] = ()) -> pd.Series:
+    """
+    Hash uint64 de cada linha sobre as colunas de df (exceto `ignorar`).
+    Os valores são comparados como texto sem espaços nas pontas, de modo que
+    12 e "12" ou "abc " e "abc" geram o mesmo hash.
+    """
+    colunas = _colunas_fingerprint(df, ignorar)
+    if df.empty or not colunas:
+        return pd.Series([], index=df.index, dtype="uint64")
+    texto = pd.DataFrame(
+        {c: df[c].astype(object).where(df[c].notna(), "").astype(str).str.strip() for c in colunas},
+        index=df.index,
+    )
+    return pd.util.hash_pandas_object(texto, index=False)
+
+
+def fingerprint_por_protocolo(df: pd.DataFrame, chave: str = "protocolo",
+                              ignorar: Iterable[str] = ()) -> pd.Series:
+    """Series protocolo (strip + upper) -> hash; duplicatas: vale a última ocorrência."""
+    if chave not in df.columns:
+        return pd.Series([], dtype="uint64")
+    hashes = fingerprint_linhas(df, ignorar=ignorar)
+    protocolos = df[chave].astype(str).str.strip().str.upper()
+    fp = pd.Series(hashes.to_numpy(), index=protocolos.to_numpy(), dtype="uint64")
+    fp = fp[~fp.index.duplicated(keep="last")]
+    fp.index.name = chave
+    return fp
+
+
+class RegistroFingerprints:
+    """Hashes por protocolo da última execução bem-sucedida (um arquivo por base)."""
+
+    def __init__(self, nome: str = "bruta", diretorio: str = CACHE_DIR_PADRAO, habilitado: bool = True):
+        self.nome = nome
+        self.diretorio = diretorio
+        self.habilitado = habilitado and os.environ.get("PIPELINE_INCREMENTAL", "1") != "0"
+        self.formato = "parquet" if _parquet_disponivel() else "pickle"
+
+    def _caminhos(self):
+        base = os.path.join(self.diretorio, f"fingerprints_{self.nome}")
+        ext = ".parquet" if self.formato == "parquet" else ".pkl"
+        return base + ext, base + ".meta.json"
+
+    def carregar(self, esquema: str) -> Optional[pd.Series]:
+        """Hashes anteriores, ou None se não houver registro compatível com o esquema."""
+        if not self.habilitado:
+            return None
+        arq_dados, arq_meta = self._caminhos()
+        try:
+            with open(arq_meta, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if meta.get("esquema") != esquema or meta.get("formato") != self.formato:
+            logging.info(f"Fingerprints '{self.nome}': esquema/formato mudou — todos os protocolos serão reprocessados.")
+            return None
+        try:
+            if self.formato == "parquet":
+                tab = pd.read_parquet(arq_dados)
+            else:
+                tab = pd.read_pickle(arq_dados)
+        except Exception as e:
+            logging.warning(f"Fingerprints '{self.nome}' ilegíveis: {e}. Todos os protocolos serão reprocessados.")
+            return None
+        return pd.Series(tab["hash"].to_numpy(dtype="uint64"), index=tab["protocolo"].astype(str).to_numpy())
+
+    def salvar(self, fp: pd.Series, esquema: str) -> None:
+        if not self.habilitado:
+            return
+        arq_dados, arq_meta = self._caminhos()
+        tab = pd.DataFrame({"protocolo": fp.index.astype(str), "hash": fp.to_numpy(dtype="uint64")})
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            tmp = arq_dados + ".tmp"
+            if self.formato == "parquet":
+                tab.to_parquet(tmp, index=False)
+            else:
+                tab.to_pickle(tmp)
+            os.replace(tmp, arq_dados)
+            with open(arq_meta + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"esquema": esquema, "formato": self.formato, "protocolos": len(tab)}, f)
+            os.replace(arq_meta + ".tmp", arq_meta)
+            logging.info(f"Fingerprints '{self.nome}' gravados: {len(tab)} protocolos.")
+        except Exception as e:
+            logging.warning(f"Falha ao gravar fingerprints '{self.nome}': {e}")
+
+
+def classificar_protocolos(atual: pd.Series, anterior: Optional[pd.Series]) -> pd.Series:
+    """
+    Compara os hashes atuais com os da execução anterior (ambos indexados por protocolo).
+    Sem registro anterior, todos os protocolos são 'novo'.
+    """
+    if anterior is None or anterior.empty:
+        return pd.Series(NOVO, index=atual.index, dtype=object)
+    # get_indexer evita o reindex (que passaria os uint64 por float e perderia bits)
+    anterior = anterior[~anterior.index.duplicated(keep="last")]
+    pos = anterior.index.get_indexer(atual.index)
+    existe = pos >= 0
+    hashes_antes = anterior.to_numpy(dtype="uint64")[pos[existe]]
+    classe = pd.Series(NOVO, index=atual.index, dtype=object)
+    iguais = existe.copy()
+    iguais[existe] = hashes_antes == atual.to_numpy(dtype="uint64")[existe]
+    classe[existe & ~iguais] = ALTERADO
+    classe[iguais] = INALTERADO
+    return classe
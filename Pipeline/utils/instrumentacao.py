@@ -0,0 +1,296 @@
+"""
+Módulo de Instrumentação por Etapa (tempo, memória, linhas e chamadas de API)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Cada etapa do pipeline é medida por um context manager (ou decorador):
+
+- tempo de parede (perf_counter) e de CPU do processo (process_time)
+- RSS atual e pico de RSS do processo (o delta do pico mostra quem "subiu a
+  régua" de memória); com PIPELINE_TRACEMALLOC=1, também o pico de
+  alocações Python/numpy da etapa (tracemalloc — mais lento, só para depurar)
+- linhas de entrada/saída (informadas pela etapa ou inferidas de DataFrames)
+- requisições e bytes do Sheets/Drive, pelo AgendadorAPI (diferença dos
+  contadores entre o início e o fim da etapa)
+
+Ao final, o relatório vai para um JSON ao lado do log
+(pipeline_tratamento.relatorio.json), para comparar execuções.
+
+Sem instrumentação ativa, etapa() e @medir_etapa não medem nada (custo zero
+em testes e benchmarks que não pedirem).
+
+Classes/Funções:
+- Instrumentacao - Coleta as etapas de uma execução e grava o relatório
+- RegistroEtapa - Medidas de uma etapa (linhas_entrada/linhas_saida ajustáveis)
+- ativar() / instrumentacao_ativa() - Instrumentação usada por etapa()/@medir_etapa
+- etapa() - Context manager de etapa na instrumentação ativa
+- medir_etapa() - Decorador equivalente
+- anotar_etapa() - Anexa um valor aos extras da etapa aberta mais interna
+- caminho_relatorio() - Caminho do JSON ao lado do arquivo de log
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_ATIVA = None
+_LOCK = threading.Lock()
+_MB = 1024 * 1024
+
+
+def _rss_pico_mb() -> Optional[float]:
+    """Pico de RSS do processo (ru_maxrss: KiB no Linux, bytes no macOS)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / _MB if sys.platform == "darwin" else pico / 1024
+
+
+def _rss_atual_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / _MB
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _n_linhas(obj) -> Optional[int]:
+    if obj is None or isinstance(obj, (str, bytes)):
+        return None
+    shape = getattr(obj, "shape", None)
+    if shape:
+        return int(shape[0])
+    return None
+
+
+def _numero(v: float):
+    return int(v) if float(v).is_integer() else round(v, 3)
+
+
+def _arred(v, casas=3):
+    return None if v is None else round(v, casas)
+
+
+class RegistroEtapa:
+    """Medidas de uma etapa. A etapa pode preencher linhas_entrada/linhas_saida e extras."""
+
+    def __init__(self, nome: str, linhas_entrada: Optional[int] = None):
+        self.nome = nome
+        self.linhas_entrada = linhas_entrada
+        self.linhas_saida = None
+        self.extras: Dict[str, object] = {}
+        self.erro = None
+        self.inicio = None
+        self.wall_s = None
+        self.cpu_s = None
+        self.rss_mb = None
+        self.rss_pico_mb = None
+        self.rss_pico_delta_mb = None
+        self.tracemalloc_pico_mb = None
+        self.api: Dict[str, Dict[str, int]] = {}
+
+    def como_dict(self) -> dict:
+        d = {
+            "etapa": self.nome,
+            "inicio": self.inicio,
+            "wall_s": _arred(self.wall_s),
+            "cpu_s": _arred(self.cpu_s),
+            "rss_mb": _arred(self.rss_mb, 1),
+            "rss_pico_mb": _arred(self.rss_pico_mb, 1),
+            "rss_pico_delta_mb": _arred(self.rss_pico_delta_mb, 1),
+            "tracemalloc_pico_mb": _arred(self.tracemalloc_pico_mb, 1),
+            "linhas_entrada": self.linhas_entrada,
+            "linhas_saida": self.linhas_saida,
+            "api": self.api,
+        }
+        if self.wall_s and self.linhas_entrada:
+            d["linhas_por_s"] = round(self.linhas_entrada / self.wall_s, 1)
+        if self.extras:
+            d["extras"] = self.extras
+        if self.erro:
+            d["erro"] = self.erro
+        return d
+
+
+class Instrumentacao:
+    """
+    Coleta as etapas de uma execução.
+    - agendador: AgendadorAPI cujos contadores (requisições/bytes) são atribuídos às etapas
+    - tracemalloc_ativo: None = PIPELINE_TRACEMALLOC=1
+    """
+
+    def __init__(self, agendador=None, tracemalloc_ativo: Optional[bool] = None):
+        self.agendador = agendador
+        if tracemalloc_ativo is None:
+            tracemalloc_ativo = os.environ.get("PIPELINE_TRACEMALLOC", "0") == "1"
+        self.tracemalloc_ativo = tracemalloc_ativo
+        self.etapas: List[RegistroEtapa] = []
+        self._abertas: List[list] = []  # [registro, pico tracemalloc visto]
+        self._inicio_wall = time.perf_counter()
+        self._inicio_cpu = time.process_time()
+        self._inicio = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    # ------------------------------------------------------------------
+    # Medição
+    # ------------------------------------------------------------------
+    def _contadores_api(self) -> Dict[str, Dict[str, float]]:
+        if self.agendador is None:
+            return {}
+        return self.agendador.totais()
+
+    def _propagar_pico_tracemalloc(self) -> None:
+        """O pico do tracemalloc é global: repassa às etapas abertas antes de zerá-lo."""
+        _, pico = tracemalloc.get_traced_memory()
+        for aberta in self._abertas:
+            aberta[1] = max(aberta[1], pico)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def etapa(self, nome: str, linhas_entrada: Optional[int] = None):
+        reg = RegistroEtapa(nome, linhas_entrada)
+        reg.inicio = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        api_ini = self._contadores_api()
+        pico_ini = _rss_pico_mb()
+        if self.tracemalloc_ativo:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._propagar_pico_tracemalloc()
+            base_tm = tracemalloc.get_traced_memory()[0]
+        aberta = [reg, 0]
+        self._abertas.append(aberta)
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield reg
+        except BaseException as e:
+            reg.erro = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            reg.wall_s = time.perf_counter() - t0
+            reg.cpu_s = time.process_time() - c0
+            if self.tracemalloc_ativo and tracemalloc.is_tracing():
+                self._propagar_pico_tracemalloc()
+                reg.tracemalloc_pico_mb = max(0, aberta[1] - base_tm) / _MB
+            self._abertas.remove(aberta)
+            reg.rss_mb = _rss_atual_mb()
+            reg.rss_pico_mb = _rss_pico_mb()
+            if pico_ini is not None and reg.rss_pico_mb is not None:
+                reg.rss_pico_delta_mb = reg.rss_pico_mb - pico_ini
+            api_fim = self._contadores_api()
+            for tipo, campos in api_fim.items():
+                ini = api_ini.get(tipo, {})
+                delta = {k: _numero(v - ini.get(k, 0)) for k, v in campos.items() if v - ini.get(k, 0)}
+                if delta:
+                    reg.api[tipo] = delta
+            with _LOCK:
+                self.etapas.append(reg)
+            logging.info(f"⏱️ Etapa '{nome}': {reg.wall_s:.2f}s (CPU {reg.cpu_s:.2f}s) | "
+                         f"linhas {reg.linhas_entrada}→{reg.linhas_saida} | API {reg.api or '-'}")
+
+    # ------------------------------------------------------------------
+    # Relatório
+    # ------------------------------------------------------------------
+    def relatorio(self) -> dict:
+        rel = {
+            "inicio": self._inicio,
+            "duracao_s": round(time.perf_counter() - self._inicio_wall, 3),
+            "cpu_s": round(time.process_time() - self._inicio_cpu, 3),
+            "rss_pico_mb": _arred(_rss_pico_mb(), 1),
+            "tracemalloc": self.tracemalloc_ativo,
+            "etapas": [e.como_dict() for e in self.etapas],
+        }
+        if self.agendador is not None:
+            rel["api"] = self.agendador.relatorio()
+        return rel
+
+    def salvar(self, caminho: str) -> str:
+        """Grava o relatório em JSON (escrita atômica). Retorna o caminho."""
+        rel = self.relatorio()
+        tmp = f"{caminho}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(rel, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp, caminho)
+        logging.info(f"Relatório de execução gravado em '{caminho}' ({len(rel['etapas'])} etapas, {rel['duracao_s']}s).")
+        return caminho
+
+    def registrar_resumo(self) -> None:
+        """Imprime/loga uma linha por etapa (tempo, CPU, pico de memória, linhas, requisições)."""
+        print("⏱️ Tempo por etapa:")
+        for e in self.etapas:
+            reqs = sum(c.get("requisicoes", 0) for c in e.api.values())
+            pico = f"{e.rss_pico_mb:.0f}MB" if e.rss_pico_mb is not None else "-"
+            linha = (f"   - {e.nome}: {e.wall_s:.2f}s (CPU {e.cpu_s:.2f}s) | pico RSS {pico} | "
+                     f"linhas {e.linhas_entrada if e.linhas_entrada is not None else '-'}→"
+                     f"{e.linhas_saida if e.linhas_saida is not None else '-'} | requisições {reqs}")
+            print(linha)
+            logging.info(linha.strip())
+
+
+# ----------------------------------------------------------------------
+# Instrumentação ativa (usada por etapa()/@medir_etapa)
+# ----------------------------------------------------------------------
+def ativar(instr: Optional[Instrumentacao]) -> Optional[Instrumentacao]:
+    """Define a instrumentação ativa (None desativa). Retorna a anterior."""
+    global _ATIVA
+    anterior, _ATIVA = _ATIVA, instr
+    return anterior
+
+
+def instrumentacao_ativa() -> Optional[Instrumentacao]:
+    return _ATIVA
+
+
+@contextmanager
+def etapa(nome: str, linhas_entrada: Optional[int] = None):
+    """Mede o bloco na instrumentação ativa; sem ela, entrega um registro que não é guardado."""
+    instr = _ATIVA
+    if instr is None:
+        yield RegistroEtapa(nome, linhas_entrada)
+        return
+    with instr.etapa(nome, linhas_entrada) as reg:
+        yield reg
+
+
+def medir_etapa(nome: Optional[str] = None) -> Callable:
+    """
+    Decorador: mede a função como uma etapa. Linhas de entrada/saída são inferidas
+    do primeiro argumento e do retorno quando forem DataFrames/Series.
+    """
+    def decorador(func):
+        rotulo = nome or func.__name__
+
+        @functools.wraps(func)
+        def envolvida(*args, **kwargs):
+            if _ATIVA is None:
+                return func(*args, **kwargs)
+            with etapa(rotulo, _n_linhas(args[0]) if args else None) as reg:
+                resultado = func(*args, **kwargs)
+                reg.linhas_saida = _n_linhas(resultado)
+                return resultado
+        return envolvida
+    return decorador
+
+
+def anotar_etapa(chave: str, valor) -> None:
+    """Guarda valor em extras[chave] da etapa aberta mais interna (sem instrumentação ativa, não faz nada)."""
+    instr = _ATIVA
+    if instr is None or not instr._abertas:
+        return
+    instr._abertas[-1][0].extras[chave] = valor
+
+
+def caminho_relatorio(arquivo_log: str) -> str:
+    """pipeline_tratamento.log -> pipeline_tratamento.relatorio.json (mesmo diretório)."""
+    base, _ = os.path.splitext(arquivo_log)
+    return f"{base}.relatorio.json"
@@ -0,0 +1,385 @@
+"""
+Módulo de Journal de Escritas (write-ahead log das mutações no Google Sheets)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Toda escrita em uma worksheet envolvida pelo journal é gravada em disco
+(faixas A1 + valores) ANTES de ir para a API, e marcada como confirmada
+depois. Se o lote falhar (ou o processo morrer no meio), a intenção fica
+pendente e é reaplicada no início da próxima execução — sem baixar e
+comparar a planilha inteira de novo.
+
+As escritas são sempre em faixas explícitas (values.update/batchUpdate),
+portanto reaplicar uma entrada já aplicada não muda nada: o efeito final é
+de exatamente uma vez. append_rows (não idempotente) não é registrado.
+
+Os lotes de linhas novas (acrescentar_linhas, usado por enviar_em_lotes) são
+marcados como acréscimo e reaplicados por protocolo: uma linha só é escrita
+se a linha de destino estiver vazia e o protocolo ainda não estiver na aba
+(a execução que falhou pode já ter reenviado o lote mais abaixo). As linhas
+de acréscimo que ficam vazias (protocolo já presente, ou entrada descartada
+por idade) são removidas da aba, para não deixar buracos na tratada — desde
+que nenhuma entrada daquela aba continue pendente (as faixas dela mudariam).
+Como a reaplicação roda antes da coleta de protocolos, o que não foi
+reaplicado é reenviado normalmente pela execução.
+
+Formato: JSON Lines em <PIPELINE_CACHE_DIR>/journal_escritas.jsonl
+- {"id", "ts", "planilha", "aba", "faixas", "value_input_option", "ultima_linha"[, "acrescimo": true]}
+- {"id", "ok": true}  (confirmação)
+
+PIPELINE_JOURNAL=0 desliga o journal; PIPELINE_JOURNAL_MAX_HORAS (padrão 72)
+descarta intenções antigas demais para serem reaplicadas com segurança.
+
+Classes/Funções:
+- JournalEscritas - Journal em disco (registrar, confirmar, reaplicar, compactar)
+- WorksheetComJournal - Worksheet cujo update/batch_update/update_cell/acrescentar_linhas passa pelo journal
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .cache_local import CACHE_DIR_PADRAO
+from .envio import garantir_linhas
+from .escrita import rowcol_to_a1
+from .normalizacao import normalizar_nome_coluna
+
+_RE_LINHA = re.compile(r"[A-Za-z]+(\d+)")
+
+
+def _linha_inicial(faixa: dict) -> int:
+    m = _RE_LINHA.search(str(faixa.get("range", "")).split("!")[-1])
+    return int(m.group(1)) if m else 1
+
+
+def _ultima_linha(faixas: List[dict]) -> int:
+    ultima = 0
+    for f in faixas:
+        ultima = max(ultima, _linha_inicial(f) + max(len(f.get("values") or []), 1) - 1)
+    return ultima
+
+
+def _vazia(row) -> bool:
+    return not any(str(v).strip() for v in (row or []) if v is not None)
+
+
+def _intervalos(linhas) -> List[tuple]:
+    """Linhas (números) -> [(inicio, fim)] contíguos, do fim para o começo."""
+    out = []
+    for r in sorted(linhas, reverse=True):
+        if out and out[-1][0] == r + 1:
+            out[-1] = (r, out[-1][1])
+        else:
+            out.append((r, r))
+    return out
+
+
+class _EstadoAba:
+    """Valores da aba (lidos uma vez) para reaplicar acréscimos por protocolo."""
+
+    def __init__(self, ws):
+        self.valores: List[list] = [list(r) for r in ws.get_all_values()]
+        self.col = None
+        self.protocolos = set()
+        self.lacunas = set()
+        if self.valores:
+            self._definir_cabecalho(self.valores[0])
+            if self.col is not None:
+                self.protocolos = {str(r[self.col]).strip() for r in self.valores[1:] if self.col < len(r)}
+                self.protocolos.discard("")
+
+    def _definir_cabecalho(self, cabecalho) -> None:
+        for j, c in enumerate(cabecalho):
+            if normalizar_nome_coluna(str(c)) == "protocolo":
+                self.col = j
+                return
+
+    def linha(self, r: int) -> list:
+        return self.valores[r - 1] if r <= len(self.valores) else []
+
+    def protocolo(self, row) -> str:
+        if self.col is None or self.col >= len(row) or row[self.col] is None:
+            return ""
+        return str(row[self.col]).strip()
+
+    def escrever(self, r: int, row) -> None:
+        while len(self.valores) < r:
+            self.valores.append([])
+        self.valores[r - 1] = ["" if v is None else v for v in row]
+        if r == 1 and self.col is None:
+            self._definir_cabecalho(row)
+        elif self.protocolo(row):
+            self.protocolos.add(self.protocolo(row))
+
+    def ultima_com_dados(self) -> int:
+        n = len(self.valores)
+        while n and _vazia(self.valores[n - 1]):
+            n -= 1
+        return n
+
+
+def _json(valor):
+    # None é mantido: na API, null deixa a célula como está (diferente de "")
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+
+def _faixas_json(faixas) -> List[dict]:
+    return [{"range": f["range"], "values": [[_json(v) for v in row] for row in f["values"]]}
+            for f in faixas]
+
+
+class JournalEscritas:
+    """Journal write-ahead das escritas no Sheets (um arquivo JSON Lines)."""
+
+    def __init__(self, diretorio: str = CACHE_DIR_PADRAO, nome: str = "journal_escritas.jsonl",
+                 habilitado: bool = True, max_horas: Optional[float] = None):
+        self.caminho = os.path.join(diretorio, nome)
+        self.habilitado = habilitado and os.environ.get("PIPELINE_JOURNAL", "1") != "0"
+        self.max_horas = max_horas if max_horas is not None else float(os.environ.get("PIPELINE_JOURNAL_MAX_HORAS", "72"))
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Escrita no arquivo
+    # ------------------------------------------------------------------
+    def _gravar(self, registro: dict) -> None:
+        linha = json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+            with open(self.caminho, "a", encoding="utf-8") as f:
+                f.write(linha)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def registrar(self, planilha: str, aba: int, faixas: List[dict],
+                  value_input_option: Optional[str] = None, acrescimo: bool = False) -> Optional[str]:
+        """
+        Grava a intenção de escrita (antes do envio). Retorna o id da entrada.
+        acrescimo=True marca linhas novas (reaplicadas por protocolo).
+        """
+        if not self.habilitado:
+            return None
+        faixas = _faixas_json(faixas)
+        entrada = {
+            "id": uuid.uuid4().hex,
+            "ts": time.time(),
+            "planilha": planilha,
+            "aba": aba,
+            "faixas": faixas,
+            "value_input_option": value_input_option,
+            "ultima_linha": _ultima_linha(faixas),
+        }
+        if acrescimo:
+            entrada["acrescimo"] = True
+        self._gravar(entrada)
+        return entrada["id"]
+
+    def confirmar(self, id_entrada: Optional[str]) -> None:
+        """Marca a entrada como aplicada (depois da resposta OK da API)."""
+        if self.habilitado and id_entrada:
+            self._gravar({"id": id_entrada, "ok": True})
+
+    # ------------------------------------------------------------------
+    # Leitura / reaplicação
+    # ------------------------------------------------------------------
+    def pendentes(self) -> List[dict]:
+        """Intenções sem confirmação, na ordem em que foram registradas."""
+        if not self.habilitado or not os.path.exists(self.caminho):
+            return []
+        entradas: Dict[str, dict] = {}
+        with open(self.caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    reg = json.loads(linha)
+                except json.JSONDecodeError:
+                    # última linha truncada (queda no meio da gravação): intenção nunca enviada
+                    continue
+                if reg.get("ok"):
+                    entradas.pop(reg.get("id"), None)
+                elif "faixas" in reg:
+                    entradas[reg["id"]] = reg
+        return list(entradas.values())
+
+    def compactar(self, manter: Optional[List[dict]] = None) -> None:
+        """Reescreve o arquivo só com as entradas ainda pendentes."""
+        if not self.habilitado or not os.path.exists(self.caminho):
+            return
+        manter = self.pendentes() if manter is None else manter
+        with self._lock:
+            if not manter:
+                os.remove(self.caminho)
+                return
+            tmp = self.caminho + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for reg in manter:
+                    f.write(json.dumps(reg, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.caminho)
+
+    def _reaplicar_acrescimo(self, ws, estado: _EstadoAba, reg: dict) -> int:
+        """Escreve só as linhas de destino vazias cujo protocolo não está na aba. Retorna quantas."""
+        escrever, puladas = [], []
+        for faixa in reg["faixas"]:
+            inicio = _linha_inicial(faixa)
+            for i, row in enumerate(faixa.get("values") or []):
+                r = inicio + i
+                if not _vazia(estado.linha(r)):
+                    continue  # já aplicada (queda antes da confirmação) ou ocupada por outra execução
+                if estado.protocolo(row) in estado.protocolos:
+                    puladas.append(r)  # protocolo reenviado em outra linha
+                else:
+                    escrever.append((r, row))
+        if escrever:
+            faixas = []
+            for r, row in sorted(escrever, key=lambda x: x[0]):
+                if faixas and faixas[-1][0] + len(faixas[-1][1]) == r:
+                    faixas[-1][1].append(row)
+                else:
+                    faixas.append((r, [row]))
+            garantir_linhas(ws, max(r for r, _ in escrever))
+            ws.batch_update([{"range": rowcol_to_a1(r, 1), "values": rows} for r, rows in faixas],
+                            value_input_option=reg.get("value_input_option"))
+            for r, row in escrever:
+                estado.escrever(r, row)
+        estado.lacunas.update(puladas)
+        return len(escrever)
+
+    def _remover_lacunas(self, ws, estado: _EstadoAba) -> int:
+        """Remove as linhas de acréscimo que ficaram vazias no meio dos dados."""
+        fim = estado.ultima_com_dados()
+        lacunas = [r for r in estado.lacunas if r < fim and _vazia(estado.linha(r))]
+        for inicio, ultimo in _intervalos(lacunas):
+            ws.delete_rows(inicio, ultimo)
+            del estado.valores[inicio - 1:ultimo]
+        return len(lacunas)
+
+    def reaplicar(self, gspread_client) -> dict:
+        """
+        Reaplica as intenções pendentes (início da execução), na ordem original.
+        Entradas mais antigas que max_horas são descartadas; as que falharem
+        continuam pendentes para a próxima execução. Acréscimos são
+        reaplicados por protocolo e as lacunas que deixam são removidas.
+        """
+        resultado = {"reaplicadas": 0, "descartadas": 0, "falhas": 0, "linhas_puladas": 0, "lacunas_removidas": 0}
+        pendentes = self.pendentes()
+        if not pendentes:
+            return resultado
+        logging.info(f"Journal: {len(pendentes)} escrita(s) pendente(s) de execução anterior.")
+        print(f"🧾 Journal: reaplicando {len(pendentes)} escrita(s) pendente(s)...")
+
+        limite = time.time() - self.max_horas * 3600
+        abas = {}
+        estados: Dict[tuple, _EstadoAba] = {}
+        restantes = []
+        for reg in pendentes:
+            chave = (reg["planilha"], reg["aba"])
+            expirada = reg.get("ts", 0) < limite
+            try:
+                if expirada and not reg.get("acrescimo"):
+                    resultado["descartadas"] += 1
+                    logging.warning(f"Journal: entrada {reg['id']} descartada (mais antiga que {self.max_horas}h): {[f['range'] for f in reg['faixas']][:5]}")
+                    continue
+                if chave not in abas:
+                    abas[chave] = gspread_client.open_by_key(reg["planilha"]).get_worksheet_by_id(reg["aba"])
+                ws = abas[chave]
+                if reg.get("acrescimo"):
+                    if chave not in estados:
+                        estados[chave] = _EstadoAba(ws)
+                    estado = estados[chave]
+                    if expirada:
+                        # não reaplica: as linhas vazias viram lacunas e o protocolo é reenviado pela execução
+                        resultado["descartadas"] += 1
+                        logging.warning(f"Journal: acréscimo {reg['id']} descartado (mais antigo que {self.max_horas}h): {[f['range'] for f in reg['faixas']][:5]}")
+                        for faixa in reg["faixas"]:
+                            inicio = _linha_inicial(faixa)
+                            estado.lacunas.update(range(inicio, inicio + len(faixa.get("values") or [])))
+                        continue
+                    escritas = self._reaplicar_acrescimo(ws, estado, reg)
+                    resultado["linhas_puladas"] += sum(len(f.get("values") or []) for f in reg["faixas"]) - escritas
+                else:
+                    garantir_linhas(ws, reg.get("ultima_linha", 0))
+                    ws.batch_update(reg["faixas"], value_input_option=reg.get("value_input_option"))
+                resultado["reaplicadas"] += 1
+            except Exception as e:
+                resultado["falhas"] += 1
+                restantes.append(reg)
+                logging.error(f"Journal: falha ao reaplicar a entrada {reg['id']}: {e}")
+
+        # remover linhas desloca as faixas: só nas abas sem nenhuma entrada ainda pendente
+        pendentes_abas = {(reg["planilha"], reg["aba"]) for reg in restantes}
+        for chave, estado in estados.items():
+            if not estado.lacunas:
+                continue
+            if chave in pendentes_abas:
+                logging.warning(f"Journal: {len(estado.lacunas)} linha(s) vazia(s) de acréscimo mantidas na aba {chave[1]} (há entradas pendentes).")
+                continue
+            try:
+                resultado["lacunas_removidas"] += self._remover_lacunas(abas[chave], estado)
+            except Exception as e:
+                logging.error(f"Journal: falha ao remover as linhas vazias da aba {chave[1]}: {e}")
+        self.compactar(restantes)
+        logging.info(f"Journal: {resultado}")
+        print(f"🧾 Journal: {resultado['reaplicadas']} reaplicada(s), {resultado['descartadas']} descartada(s), "
+              f"{resultado['falhas']} falha(s), {resultado['lacunas_removidas']} linha(s) vazia(s) removida(s).")
+        return resultado
+
+    def envolver(self, worksheet) -> "WorksheetComJournal":
+        """Devolve a worksheet com as escritas passando pelo journal."""
+        return WorksheetComJournal(worksheet, self)
+
+
+class WorksheetComJournal:
+    """
+    Encapsula uma worksheet do gspread: update, batch_update, update_cell e
+    acrescentar_linhas registram a intenção no journal antes do envio e confirmam depois.
+    Todo o resto (leituras, add_rows, row_count...) vai direto à worksheet.
+    """
+
+    def __init__(self, worksheet, journal: JournalEscritas):
+        self._ws = worksheet
+        self._journal = journal
+
+    def __getattr__(self, nome):
+        return getattr(self._ws, nome)
+
+    def _com_journal(self, faixas, value_input_option, enviar, acrescimo=False):
+        id_entrada = self._journal.registrar(self._ws.spreadsheet.id, self._ws.id, faixas, value_input_option,
+                                             acrescimo=acrescimo)
+        resposta = enviar()
+        self._journal.confirmar(id_entrada)
+        return resposta
+
+    def update(self, values=None, range_name=None, **kwargs):
+        faixas = [{"range": range_name or "A1", "values": values}]
+        return self._com_journal(faixas, kwargs.get("value_input_option"),
+                                 lambda: self._ws.update(values=values, range_name=range_name, **kwargs))
+
+    def batch_update(self, data, **kwargs):
+        data = list(data)
+        return self._com_journal(data, kwargs.get("value_input_option"),
+                                 lambda: self._ws.batch_update(data, **kwargs))
+
+    def update_cell(self, row, col, value):
+        faixas = [{"range": rowcol_to_a1(row, col), "values": [[value]]}]
+        # gspread envia update_cell como USER_ENTERED
+        return self._com_journal(faixas, "USER_ENTERED", lambda: self._ws.update_cell(row, col, value))
+
+    def acrescentar_linhas(self, linha, rows, value_input_option=None):
+        """Linhas novas a partir de `linha` (values.update), registradas como acréscimo."""
+        range_name = rowcol_to_a1(linha, 1)
+        faixas = [{"range": range_name, "values": rows}]
+        return self._com_journal(faixas, value_input_option,
+                                 lambda: self._ws.update(range_name=range_name, values=rows,
+                                                         value_input_option=value_input_option),
+                                 acrescimo=True)
@@ -0,0 +1,134 @@
+"""
+Módulo de Mapeamento Compilado de Temas (tema -> órgão / ouvidoria)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Uma célula de 'tema' pode trazer vários temas separados por , ; | /. O
+mapeamento antigo dividia cada célula com str.replace, canonizava cada
+fragmento (_canon_txt) e consultava o dicionário, linha a linha. Aqui o
+dicionário é compilado uma vez numa tabela de chaves canônicas e a coluna é
+resolvida em bloco:
+
+1. a coluna é fatorada — só os temas distintos ainda não vistos são resolvidos;
+2. os distintos são divididos nos separadores (str.split + explode) e os
+   fragmentos canonizados com canon_series;
+3. um único merge contra a tabela de chaves resolve todos os fragmentos;
+4. o resultado é reagregado por tema ("todos": valores distintos na ordem,
+   unidos por " | "; "primeiro": valor do primeiro fragmento reconhecido).
+
+O resultado de cada tema distinto fica em cache no mapeador, então o custo
+cresce com o número de temas distintos, não com linhas × fragmentos.
+
+Classes/Funções:
+- MapeadorTemas - Mapeador compilado (mapear() em coluna, mapear_valor() por célula)
+"""
+
+import re
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .normalizacao import canon_series
+from .vetorizacao import fatorar
+
+SEPARADORES_TEMA = (",", ";", "|", "/")
+
+_FALTA = object()
+
+
+class MapeadorTemas:
+    """
+    Mapeia células de tema (com vários temas por célula) para valores de um dicionário.
+
+    - mapa: {tema: valor}; as chaves são comparadas canonizadas (_canon_txt)
+    - modo "todos": valores de todos os fragmentos reconhecidos, sem repetição,
+      na ordem em que aparecem, unidos por `juntar` (vazios descartados);
+      nenhum reconhecido -> `padrao`
+    - modo "primeiro": valor do primeiro fragmento reconhecido (mesmo vazio);
+      nenhum reconhecido -> `padrao`
+    - célula sem nenhum fragmento não vazio: a célula inteira (aparada) é o fragmento
+    - limite_cache: quantos temas distintos guardar (o cache é esvaziado ao passar disso)
+    """
+
+    def __init__(self, mapa: Mapping[str, str], modo: str = "todos", padrao: Optional[str] = None,
+                 separadores: Iterable[str] = SEPARADORES_TEMA, juntar: str = " | ",
+                 limite_cache: int = 100_000):
+        if modo not in ("todos", "primeiro"):
+            raise ValueError(f"Modo de mapeamento inválido: {modo!r} (use 'todos' ou 'primeiro').")
+        self.modo = modo
+        self.padrao = padrao
+        self.juntar = juntar
+        self.limite_cache = limite_cache
+        self._re_separadores = re.compile("|".join(re.escape(s) for s in separadores))
+        # chave canônica -> valor; chaves que canonizam igual: vale a última (como no dict original)
+        chaves = list(mapa.keys())
+        tabela = pd.DataFrame({"chave": canon_series(pd.Series(chaves, dtype=object)),
+                               "valor": pd.Series(list(mapa.values()), dtype=object)})
+        self._tabela = tabela.drop_duplicates("chave", keep="last").reset_index(drop=True)
+        self._cache: Dict[str, object] = {}
+
+    def __len__(self):
+        return len(self._tabela)
+
+    def limpar_cache(self) -> None:
+        self._cache.clear()
+
+    def _resolver(self, textos: np.ndarray) -> np.ndarray:
+        """Resolve um lote de temas (strings) em bloco: split/explode, canonização, merge, reagregação."""
+        temas = pd.Series(textos, dtype=object)
+        fragmentos = temas.str.replace(self._re_separadores, ",", regex=True).str.split(",").explode()
+        fragmentos = fragmentos.str.strip()
+        fragmentos = fragmentos[fragmentos != ""]
+        # temas sem nenhum fragmento: a célula inteira aparada (pode ser "", que não casa com nada)
+        sem_partes = np.setdiff1d(np.arange(len(temas)), fragmentos.index.to_numpy())
+        if len(sem_partes):
+            fragmentos = pd.concat([fragmentos, temas.iloc[sem_partes].str.strip()])
+
+        partes = pd.DataFrame({"tema": fragmentos.index.to_numpy(),
+                               "chave": canon_series(fragmentos).to_numpy()})
+        casados = partes.merge(self._tabela, on="chave", how="left", sort=False).dropna(subset=["valor"])
+
+        if self.modo == "primeiro":
+            casados = casados.drop_duplicates("tema", keep="first")
+            valores = casados.set_index("tema")["valor"]
+        else:
+            casados = casados.assign(valor=casados["valor"].astype(str).str.strip())
+            casados = casados[casados["valor"] != ""].drop_duplicates(["tema", "valor"])
+            valores = casados.groupby("tema", sort=False)["valor"].agg(self.juntar.join)
+
+        resultado = np.full(len(temas), self.padrao, dtype=object)
+        resultado[valores.index.to_numpy(dtype=np.intp)] = valores.to_numpy(dtype=object)
+        return resultado
+
+    def mapear(self, series: pd.Series) -> pd.Series:
+        """
+        Mapeia a coluna inteira (resultado dtype object, mesmo índice).
+        Nulos são tratados como tema vazio; demais valores, por str(valor).
+        """
+        s = pd.Series(series)
+        codigos, unicos = fatorar(s)
+        textos = np.empty(len(unicos), dtype=object)
+        for k, u in enumerate(unicos):
+            textos[k] = u if isinstance(u, str) else ("" if pd.isna(u) else str(u))
+
+        # o resultado é montado antes de mexer no cache: um esvaziamento não perde o que já foi lido
+        res = np.empty(len(textos), dtype=object)
+        pendentes = []
+        for k, t in enumerate(textos):
+            r = self._cache.get(t, _FALTA)
+            if r is _FALTA:
+                pendentes.append(k)
+            else:
+                res[k] = r
+        if pendentes:
+            novos_textos = textos[pendentes]
+            novos = self._resolver(novos_textos)
+            if len(self._cache) + len(pendentes) > self.limite_cache:
+                self._cache.clear()
+            self._cache.update(zip(novos_textos, novos))
+            res[pendentes] = novos
+        return pd.Series(res[codigos], index=s.index, name=s.name, dtype=object)
+
+    def mapear_valor(self, celula) -> Optional[str]:
+        """Versão por célula (mesmo resultado e mesmo cache de mapear())."""
+        return self.mapear(pd.Series([celula], dtype=object)).iat[0]
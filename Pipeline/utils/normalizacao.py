@@ -1,48 +1,124 @@
 """
 Módulo compartilhado de Normalização de Dados
-Utilizado por Pipeline/main.py e .github/workflows/main.py
+Utilizado pelo pacote Pipeline/tratamento (Pipeline/main.py e .github/workflows/main.py)
+
+A remoção de acentos usa tabelas de tradução (str.translate) pré-calculadas
+para todo o Latin-1/Latin Extended e marcas combinantes, onde estão todos os caracteres do
+português. Só textos com caracteres fora dessa faixa caem no caminho lento
+(unicodedata), de modo que o resultado é idêntico ao da decomposição
+NFD/NFKD + remoção das marcas combinantes.
 
 Funções:
 - normalizar_nome_coluna() - Normaliza nomes de colunas
 - _clean_whitespace() - Limpa espaços extras
 - _canon_txt() - Canoniza texto (remove acentos, lowercase)
 - _canon_txt_preserve_case() - Canoniza preservando case
+- remover_acentos() - Remove acentos de uma string (tabela de tradução)
+- remover_acentos_series() - Remove acentos de uma coluna inteira (.str)
+- canon_series() - Versão em coluna de _canon_txt/_canon_txt_preserve_case
 """
 
 import re
 import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# faixa coberta pelas tabelas: ASCII, Latin-1, Latin Extended-A/B, IPA e marcas combinantes
+_FAIXA_TABELA = 0x370
+_RE_FORA_TABELA = re.compile(r"[^\x00-\u036f]")
+
+
+def _sem_marcas_nfd(s: str) -> str:
+    s = unicodedata.normalize('NFD', s)
+    return ''.join(ch for ch in s if unicodedata.category(ch) != 'Mn')
+
+
+def _sem_marcas_nfkd(s: str) -> str:
+    s = unicodedata.normalize('NFKD', s)
+    return ''.join(ch for ch in s if not unicodedata.combining(ch))
+
+
+def _construir_tabela(remover) -> dict:
+    tabela = {}
+    for cp in range(0x80, _FAIXA_TABELA):
+        ch = chr(cp)
+        sem = remover(ch)
+        if sem != ch:
+            tabela[cp] = sem
+    return tabela
+
+
+# NFD: "á" -> "a", "ç" -> "c" (mantém "ª", "º", "ß"...)
+_TABELA_NFD = _construir_tabela(_sem_marcas_nfd)
+# NFKD: além dos acentos, decompõe compatibilidades ("ª" -> "a", "²" -> "2", NBSP -> espaço)
+_TABELA_NFKD = _construir_tabela(_sem_marcas_nfkd)
+
+
+def remover_acentos(s: str, compat: bool = False) -> str:
+    """
+    Remove acentos/marcas combinantes de uma string.
+    compat=False equivale a NFD + remoção de categoria 'Mn';
+    compat=True equivale a NFKD + remoção de unicodedata.combining.
+    """
+    if s.isascii():
+        return s
+    if _RE_FORA_TABELA.search(s) is not None:
+        return _sem_marcas_nfkd(s) if compat else _sem_marcas_nfd(s)
+    return s.translate(_TABELA_NFKD if compat else _TABELA_NFD)
+
+
+def remover_acentos_series(series: pd.Series, compat: bool = False) -> pd.Series:
+    """
+    Versão em coluna de remover_acentos (espera valores string).
+    A tradução roda via .str.translate; só as células com caracteres fora da
+    faixa das tabelas passam pelo caminho lento.
+    """
+    s = pd.Series(series)
+    out = s.str.translate(_TABELA_NFKD if compat else _TABELA_NFD)
+    fora = s.str.contains(_RE_FORA_TABELA, na=False)
+    if fora.any():
+        lento = _sem_marcas_nfkd if compat else _sem_marcas_nfd
+        out = out.astype(object)
+        out.loc[fora] = s[fora].map(lento)
+    return out
+
 
+def canon_series(series: pd.Series, preservar_case: bool = False, compat: bool = False) -> pd.Series:
+    """
+    Aplica _canon_txt (ou _canon_txt_preserve_case, com preservar_case=True)
+    à coluna inteira com operações .str, sem chamada Python por célula.
+    """
+    s = pd.Series(series)
+    valores = s.to_numpy(dtype=object)
+    eh_none = np.equal(valores, None)
+    # str() de cada célula (NaN -> "nan", como em _canon_txt); None é tratado à parte
+    txt = pd.Series(valores.astype(str), index=s.index, dtype=object).str.strip()
+    txt = remover_acentos_series(txt, compat=compat)
+    if not preservar_case:
+        txt = txt.str.lower()
+    txt = txt.str.replace(r"\s+", " ", regex=True)
+    txt = txt.where(~eh_none, "")
+    return txt.astype(object)
 
+
+@lru_cache(maxsize=4096)
 def normalizar_nome_coluna(col: str) -> str:
     """
-    Normaliza nome de coluna:
-    - Remove acentos
-    - Substitui espaços/caracteres especiais por underscore
+    Normaliza nome de coluna (definição única, usada pelo pipeline e pelos utilitários):
+    - Remove acentos e compatibilidades ("Nº" -> "no"); o que não vira ASCII é descartado
     - Converte para minúsculas
+    - Substitui espaços/caracteres especiais por underscore (sem duplicados nem nas pontas)
+
+    Cabeçalhos se repetem a cada leitura/sync, então o resultado fica em cache.
     """
     if col is None:
         return ""
-    
-    # Converter para string
-    col = str(col).strip()
-    
-    # Remover acentos
-    nfd = unicodedata.normalize('NFD', col)
-    col = ''.join(ch for ch in nfd if unicodedata.category(ch) != 'Mn')
-    
-    # Substituir espaços e caracteres especiais por underscore
-    col = re.sub(r'[^a-zA-Z0-9]', '_', col)
-    
-    # Remover underscores duplicados
-    col = re.sub(r'_+', '_', col)
-    
-    # Remover underscores no início e fim
-    col = col.strip('_')
-    
-    # Converter para minúsculas
+    col = remover_acentos(str(col), compat=True).encode("ASCII", "ignore").decode("utf-8")
     col = col.lower()
-    
-    return col
+    col = re.sub(r"[^a-z0-9]+", "_", col)
+    return re.sub(r"_+", "_", col).strip("_")
 
 
 def _clean_whitespace(v) -> str:
@@ -61,15 +137,14 @@ def _canon_txt(v) -> str:
     """
     Canonização de texto: converte para string, remove acentos,
     converte para lowercase e limpa espaços.
-    
+
     Usado para campos que serão comparados/agrupados.
     """
     if v is None or str(v).strip() == "":
         return ""
     s = str(v).strip()
     # Remove acentos
-    s = unicodedata.normalize('NFD', s)
-    s = ''.join(ch for ch in s if unicodedata.category(ch) != 'Mn')
+    s = remover_acentos(s)
     # Lowercase
     s = s.lower()
     # Limpa espaços extras
@@ -81,16 +156,14 @@ def _canon_txt_preserve_case(v) -> str:
     """
     Canoniza texto (remove acentos, limpa espaços),
     MAS PRESERVA A CAPITALIZAÇÃO.
-    
+
     Útil para nomes próprios, endereços, etc.
     """
     if v is None or str(v).strip() == "":
         return ""
     s = str(v).strip()
     # Remove acentos
-    s = unicodedata.normalize('NFD', s)
-    s = ''.join(ch for ch in s if unicodedata.category(ch) != 'Mn')
+    s = remover_acentos(s)
     # Limpa espaços extras
     s = re.sub(r'\s+', ' ', s)
     return s
-
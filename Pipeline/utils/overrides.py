@@ -0,0 +1,91 @@
+"""
+Módulo de Overrides Manuais (correções pontuais na planilha tratada)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Correções manuais ficam em um arquivo local (CSV com colunas
+protocolo, coluna, valor) em vez de blocos de código "PATCH TEMPORÁRIO".
+Os overrides são aplicados sobre o snapshot da tratada já em memória e
+todas as células alteradas vão em um único batchUpdate — sem novo
+download, sem backup completo e sem update_cell por protocolo.
+
+Classes/Funções:
+- carregar_overrides() - Lê o arquivo de overrides (CSV)
+- aplicar_overrides() - Aplica os overrides no snapshot e no Sheets (1 requisição)
+"""
+
+import io
+import logging
+import os
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from .escrita import _texto, escrever_celulas
+
+OVERRIDES_PADRAO = os.environ.get(
+    "PIPELINE_OVERRIDES",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "overrides.csv"),
+)
+COLUNAS_OVERRIDE = ["protocolo", "coluna", "valor"]
+
+
+def carregar_overrides(caminho: str = OVERRIDES_PADRAO) -> pd.DataFrame:
+    """
+    Lê o CSV de overrides (protocolo, coluna, valor), tudo como texto.
+    Linhas em branco ou começando com '#' são ignoradas ('#' no meio de um valor
+    é mantido, ex.: "Nº #123"). Arquivo ausente -> vazio.
+    """
+    if not caminho or not os.path.exists(caminho):
+        return pd.DataFrame(columns=COLUNAS_OVERRIDE)
+    with open(caminho, encoding="utf-8-sig") as f:
+        linhas = [l for l in f if not l.lstrip().startswith("#")]
+    ov = pd.read_csv(io.StringIO("".join(linhas)), dtype=str, keep_default_na=False, skip_blank_lines=True)
+    ov.columns = [str(c).strip().lower() for c in ov.columns]
+    faltando = [c for c in COLUNAS_OVERRIDE if c not in ov.columns]
+    if faltando:
+        raise ValueError(f"Arquivo de overrides '{caminho}' sem as colunas {faltando}.")
+    ov = ov[COLUNAS_OVERRIDE].apply(lambda s: s.str.strip())
+    ov["protocolo"] = ov["protocolo"].str.upper()
+    ov = ov[ov["protocolo"] != ""]
+    # mesmo protocolo/coluna repetido: vale a última linha do arquivo
+    return ov.drop_duplicates(subset=["protocolo", "coluna"], keep="last").reset_index(drop=True)
+
+
+def aplicar_overrides(snapshot, overrides: pd.DataFrame, sheet_obj=None,
+                      value_input_option: str = "USER_ENTERED") -> Tuple[int, int, int]:
+    """
+    Aplica os overrides no snapshot (em memória) e, se sheet_obj for informado,
+    escreve as células que mudaram em um único batchUpdate.
+    Retorna (escritas, já_corretas, ausentes).
+    """
+    if overrides is None or overrides.empty:
+        return 0, 0, 0
+
+    indice = snapshot.indice_protocolos("protocolo")
+    updates, ausentes, iguais = [], [], 0
+    colunas_ausentes = set()
+    for prot, coluna, valor in overrides[COLUNAS_OVERRIDE].itertuples(index=False, name=None):
+        col_idx = snapshot.indice_coluna(coluna)
+        if col_idx is None:
+            colunas_ausentes.add(coluna)
+            ausentes.append(prot)
+            continue
+        row_idx = indice.get(prot)
+        if row_idx is None:
+            ausentes.append(prot)
+            continue
+        atual = snapshot.rows[row_idx - 2][col_idx - 1] if col_idx - 1 < len(snapshot.rows[row_idx - 2]) else ""
+        if _texto(atual) == valor:
+            iguais += 1
+            continue
+        updates.append((row_idx, col_idx, valor))
+
+    if colunas_ausentes:
+        logging.warning(f"Overrides: colunas não encontradas na planilha: {sorted(colunas_ausentes)}")
+    if ausentes:
+        logging.warning(f"Overrides: {len(ausentes)} protocolo(s) não encontrado(s). Exemplos: {ausentes[:10]}")
+
+    if updates and sheet_obj is not None:
+        escrever_celulas(sheet_obj, updates, value_input_option=value_input_option)
+    snapshot.atualizar_celulas(updates)
+    return len(updates), iguais, len(ausentes)
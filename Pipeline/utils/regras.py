@@ -0,0 +1,290 @@
+"""
+Módulo de Regras Declarativas de Tratamento
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Cada tratamento de coluna é declarado como uma Regra (coluna, predicado,
+transformação, ordem). O planejador agrupa as regras por coluna e cada
+coluna é processada em uma única passada:
+
+- a coluna é lida uma vez, passa por todas as regras dela em memória e é
+  gravada de volta no DataFrame uma vez;
+- regras escalares consecutivas (por valor distinto) são fundidas: a coluna é
+  fatorada uma vez, cada regra roda sobre os valores distintos e o resultado é
+  espalhado de volta uma vez só;
+- visões derivadas (texto, aparado, casefold, minúsculo — utils/visoes.py)
+  são calculadas uma vez por versão da coluna e compartilhadas entre
+  predicados e transformações.
+
+Uma regra que lê outras colunas declara-as em `usa`; o planejador só funde a
+regra na passada da coluna quando isso não muda o que ela (ou as regras entre
+elas) enxergam. O resultado é o mesmo da execução sequencial pela ordem.
+
+Cada regra entra no relatório com tempo e linhas alteradas; uma regra que
+falha é registrada e ignorada (a coluna fica como estava antes dela).
+
+Classes/Funções:
+- Regra - Declaração de uma regra de tratamento
+- ContextoRegras - Acesso às colunas e visões compartilhadas durante a execução
+- planejar() - Agrupa as regras em passadas por coluna
+- executar_regras() - Executa o plano e devolve (DataFrame, relatório por regra)
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .vetorizacao import fatorar
+from .visoes import visoes_de
+
+
+class Regra:
+    """
+    Uma regra de tratamento de coluna.
+
+    - nome: rótulo no relatório e nos logs (ex.: "7.1 assunto")
+    - coluna: coluna escrita pela regra (criada se não existir e `requer` permitir)
+    - transformar(serie, ctx): transformação vetorizada; devolve a nova série
+      (ou um escalar) para as linhas selecionadas
+    - escalar(valor): alternativa a transformar — função por valor distinto;
+      regras escalares consecutivas da mesma coluna rodam numa só fatoração
+    - predicado(serie, ctx): máscara das linhas a transformar (None = todas);
+      só para regras vetorizadas
+    - ordem: posição da regra na sequência lógica do tratamento
+    - usa: outras colunas lidas pela regra
+    - requer: colunas que precisam existir para a regra rodar (padrão: coluna + usa)
+    - como_texto: aplica astype(str) na coluna antes da regra escalar
+    - em_lote: a regra escalar recebe de uma vez a série dos valores distintos e
+      devolve os novos valores na mesma ordem (ex.: CapitalizadorPT.aplicar)
+    """
+
+    def __init__(self, nome: str, coluna: str, transformar: Optional[Callable] = None,
+                 escalar: Optional[Callable] = None, predicado: Optional[Callable] = None,
+                 ordem: float = 0, usa: Iterable[str] = (), requer: Optional[Iterable[str]] = None,
+                 como_texto: bool = False, em_lote: bool = False):
+        if (transformar is None) == (escalar is None):
+            raise ValueError(f"Regra '{nome}': informe transformar OU escalar.")
+        if escalar is not None and predicado is not None:
+            raise ValueError(f"Regra '{nome}': predicado só vale para regras vetorizadas.")
+        self.nome = nome
+        self.coluna = coluna
+        self.transformar = transformar
+        self.escalar = escalar
+        self.predicado = predicado
+        self.ordem = ordem
+        self.usa = tuple(usa)
+        self.requer = tuple(requer) if requer is not None else (coluna, *self.usa)
+        self.como_texto = como_texto
+        self.em_lote = em_lote
+        if em_lote and escalar is None:
+            raise ValueError(f"Regra '{nome}': em_lote só vale para regras escalares.")
+
+    def __repr__(self):
+        return f"Regra({self.nome!r}, {self.coluna!r})"
+
+
+class ContextoRegras:
+    """
+    Estado visível às regras durante a execução.
+    - coluna(nome): valor atual da coluna (inclusive a que está em processamento)
+    - visao(nome, tipo): visão derivada (utils/visoes.py), calculada uma vez por
+      versão da coluna — inclusive da série em processamento
+    - mascara: máscara do predicado da regra em execução (None = todas as linhas)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.mascara: Optional[np.ndarray] = None
+        self.visoes = visoes_de(df)
+        self._atuais: Dict[str, pd.Series] = {}
+
+    def tem(self, coluna: str) -> bool:
+        return coluna in self._atuais or coluna in self.df.columns
+
+    def coluna(self, coluna: str) -> pd.Series:
+        if coluna in self._atuais:
+            return self._atuais[coluna]
+        return self.df[coluna]
+
+    def visao(self, coluna: str, tipo: str = "aparado") -> pd.Series:
+        return self.visoes.obter(coluna, tipo, self.coluna(coluna))
+
+    def _gravar(self, coluna: str) -> None:
+        """Devolve a coluna processada ao DataFrame (uma atribuição por passada)."""
+        self.df[coluna] = self._atuais.pop(coluna)
+
+
+# ----------------------------------------------------------------------
+# Planejamento
+# ----------------------------------------------------------------------
+def _conflita(regra: Regra, outra: Regra) -> bool:
+    """regra não pode passar à frente de outra: uma lê o que a outra escreve."""
+    return outra.coluna in regra.usa or regra.coluna in outra.usa
+
+
+def planejar(regras: Sequence[Regra]) -> List[Tuple[str, List[List[Regra]]]]:
+    """
+    Agrupa as regras (ordenadas por `ordem`) em passadas por coluna.
+
+    Cada passada é (coluna, grupos); um grupo é uma regra vetorizada ou uma
+    sequência de regras escalares fundidas. Uma regra entra na última passada
+    da sua coluna se nenhuma regra das passadas seguintes conflitar com ela;
+    caso contrário, abre uma nova passada.
+    """
+    ordenadas = sorted(enumerate(regras), key=lambda p: (p[1].ordem, p[0]))
+    passadas: List[Tuple[str, List[Regra]]] = []
+    for _, regra in ordenadas:
+        alvo = None
+        for i in range(len(passadas) - 1, -1, -1):
+            if passadas[i][0] == regra.coluna:
+                alvo = i
+                break
+        if alvo is not None and not any(
+            _conflita(regra, outra) for _, seguintes in passadas[alvo + 1:] for outra in seguintes
+        ):
+            passadas[alvo][1].append(regra)
+        else:
+            passadas.append((regra.coluna, [regra]))
+
+    plano = []
+    for coluna, lista in passadas:
+        grupos: List[List[Regra]] = []
+        for regra in lista:
+            if regra.escalar is not None and grupos and grupos[-1][-1].escalar is not None:
+                grupos[-1].append(regra)
+            else:
+                grupos.append([regra])
+        plano.append((coluna, grupos))
+    return plano
+
+
+# ----------------------------------------------------------------------
+# Execução
+# ----------------------------------------------------------------------
+def _alteradas(antes: np.ndarray, depois: np.ndarray) -> np.ndarray:
+    """Máscara dos valores que mudaram (nulo -> nulo não conta)."""
+    nulo_a, nulo_d = pd.isna(antes), pd.isna(depois)
+    mudou = nulo_a != nulo_d
+    ambos = ~nulo_a & ~nulo_d
+    if ambos.any():
+        mudou[ambos] = (antes[ambos] != depois[ambos]).astype(bool)
+    return mudou
+
+
+def _registro(regra: Regra, passada: int, segundos: float, afetadas: int, erro: Optional[str] = None) -> dict:
+    r = {
+        "regra": regra.nome,
+        "coluna": regra.coluna,
+        "passada": passada,
+        "segundos": round(segundos, 4),
+        "linhas_afetadas": int(afetadas),
+    }
+    if erro:
+        r["erro"] = erro
+    return r
+
+
+def _executar_vetorizada(regra: Regra, serie: pd.Series, ctx: ContextoRegras) -> Tuple[pd.Series, int]:
+    if regra.predicado is None:
+        ctx.mascara = None
+        nova = regra.transformar(serie, ctx)
+        if not isinstance(nova, pd.Series):
+            nova = pd.Series(nova, index=serie.index, name=serie.name, dtype=object)
+        afetadas = _alteradas(serie.to_numpy(dtype=object), nova.to_numpy(dtype=object)).sum()
+        return nova, afetadas
+
+    mascara = np.asarray(regra.predicado(serie, ctx), dtype=bool)
+    if not mascara.any():
+        return serie, 0
+    ctx.mascara = mascara
+    nova = serie.copy()
+    nova.loc[mascara] = regra.transformar(serie[mascara], ctx)
+    afetadas = _alteradas(serie[mascara].to_numpy(dtype=object), nova[mascara].to_numpy(dtype=object)).sum()
+    return nova, afetadas
+
+
+def _executar_escalares(grupo: List[Regra], serie: pd.Series, passada: int,
+                        relatorio: List[dict]) -> pd.Series:
+    """Regras escalares fundidas: uma fatoração, cada regra sobre os distintos, um espalhamento."""
+    t0 = time.perf_counter()
+    codigos, atuais = fatorar(serie)
+    contagem = np.bincount(codigos, minlength=len(atuais))
+    sobra = time.perf_counter() - t0  # fatoração: contabilizada na primeira regra
+
+    for regra in grupo:
+        t0 = time.perf_counter()
+        try:
+            entrada = atuais
+            if regra.como_texto:
+                entrada = pd.Series(atuais, dtype=object).astype(str).to_numpy(dtype=object)
+            if regra.em_lote:
+                novos = pd.Series(regra.escalar(pd.Series(entrada, dtype=object)), dtype=object).to_numpy(dtype=object)
+            else:
+                novos = np.empty(len(entrada), dtype=object)
+                for k, v in enumerate(entrada):
+                    novos[k] = regra.escalar(v)
+            afetadas = contagem[_alteradas(atuais, novos)].sum()
+            atuais = novos
+            erro = None
+        except Exception as e:
+            logging.error(f"Erro na regra '{regra.nome}' ({regra.coluna}): {e}", exc_info=True)
+            afetadas, erro = 0, f"{type(e).__name__}: {e}"
+        relatorio.append(_registro(regra, passada, time.perf_counter() - t0 + sobra, afetadas, erro))
+        sobra = 0.0
+
+    t0 = time.perf_counter()
+    nova = pd.Series(atuais[codigos], index=serie.index, name=serie.name, dtype=object)
+    relatorio[-1]["segundos"] = round(relatorio[-1]["segundos"] + time.perf_counter() - t0, 4)
+    return nova
+
+
+def executar_regras(df: pd.DataFrame, regras: Sequence[Regra]) -> Tuple[pd.DataFrame, List[dict]]:
+    """
+    Aplica as regras ao DataFrame (alterado no lugar e devolvido) e devolve o
+    relatório: uma entrada por regra executada, com passada, segundos e
+    linhas_afetadas (e erro, se falhou). Regras sem as colunas de `requer` são puladas.
+    """
+    ctx = ContextoRegras(df)
+    relatorio: List[dict] = []
+    for passada, (coluna, grupos) in enumerate(planejar(regras)):
+        tocada = False
+        for grupo in grupos:
+            ativas = [r for r in grupo if all(ctx.tem(c) for c in r.requer)]
+            for r in grupo:
+                if r not in ativas:
+                    logging.debug(f"Regra '{r.nome}' ignorada: colunas ausentes ({r.requer}).")
+            if not ativas:
+                continue
+            if coluna in ctx._atuais:
+                serie = ctx._atuais[coluna]
+            elif coluna in df.columns:
+                serie = df[coluna]
+            else:
+                serie = pd.Series(None, index=df.index, name=coluna, dtype=object)
+
+            if ativas[0].escalar is not None:
+                nova = _executar_escalares(ativas, serie, passada, relatorio)
+            else:
+                regra = ativas[0]
+                t0 = time.perf_counter()
+                try:
+                    nova, afetadas = _executar_vetorizada(regra, serie, ctx)
+                    erro = None
+                except Exception as e:
+                    logging.error(f"Erro na regra '{regra.nome}' ({coluna}): {e}", exc_info=True)
+                    nova, afetadas, erro = serie, 0, f"{type(e).__name__}: {e}"
+                finally:
+                    ctx.mascara = None
+                relatorio.append(_registro(regra, passada, time.perf_counter() - t0, afetadas, erro))
+            ctx._atuais[coluna] = nova
+            tocada = True
+        if tocada:
+            ctx._gravar(coluna)
+    ctx.visoes.podar()  # descarta as visões de versões intermediárias (libera memória)
+
+    for r in relatorio:
+        logging.info(f"Regra '{r['regra']}' ({r['coluna']}): {r['linhas_afetadas']} linhas alteradas "
+                     f"em {r['segundos']:.3f}s" + (f" — ERRO {r['erro']}" if "erro" in r else ""))
+    return df, relatorio
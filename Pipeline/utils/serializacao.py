@@ -0,0 +1,141 @@
+"""
+Módulo de Serialização para o Google Sheets
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Converte um DataFrame no payload lista-de-listas da API coluna a coluna,
+pelo dtype, em vez de linha a linha (iterrows + conversor por célula):
+
+- datetime64        -> 'DD/MM/AAAA' via dt.strftime (NaT -> None)
+- inteiros/booleanos -> int
+- floats            -> int se inteiro e finito, float se finito, senão None
+- texto (object)    -> str sem espaços nas pontas; vazio/nulo -> None
+- demais misturas   -> celula_para_sheets por valor distinto
+
+O resultado é idêntico ao do antigo _cell_for_sheets do Pipeline/main.py.
+
+Funções:
+- celula_para_sheets() - Conversão escalar (referência/fallback)
+- serializar_coluna() - Converte uma coluna em um array object
+- serializar_para_sheets() - DataFrame -> lista de listas (payload da API)
+"""
+
+import datetime as _dt
+import re
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from .vetorizacao import aplicar_em_unicos
+
+FORMATO_DATA = "%d/%m/%Y"
+# maior inteiro exatamente representável pelo caminho int64
+_LIMITE_INT64 = float(2 ** 63)
+# diretivas de hora: com elas não dá para agrupar por dia
+_RE_HORA = re.compile(r"%[HIMSfpzZcXT]")
+
+
+def celula_para_sheets(v, fmt: str = FORMATO_DATA):
+    """Converte uma célula para um tipo primitivo aceito pela API (None para vazio)."""
+    if v is None:
+        return None
+    try:
+        if pd.isna(v):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if isinstance(v, (pd.Timestamp, np.datetime64)):
+        ts = pd.to_datetime(v, errors="coerce")
+        return None if pd.isna(ts) else ts.strftime(fmt)
+    if isinstance(v, (_dt.datetime, _dt.date)):
+        try:
+            return v.strftime(fmt)
+        except ValueError:
+            return None
+    # bool é subclasse de int: vira 0/1, como no conversor original
+    if isinstance(v, (np.integer, int)):
+        return int(v)
+    if isinstance(v, (np.floating, float)):
+        if not np.isfinite(v):
+            return None
+        if float(v).is_integer():
+            return int(round(v))
+        return float(v)
+    if isinstance(v, np.bool_):
+        return bool(v)
+    s = str(v).strip()
+    return s if s != "" else None
+
+
+def _serializar_float(arr: np.ndarray) -> np.ndarray:
+    arr = arr.astype("float64", copy=False)
+    out = np.full(len(arr), None, dtype=object)
+    finito = np.isfinite(arr)
+    inteiro = finito & (np.floor(arr) == arr)
+    cabe = inteiro & (np.abs(arr) < _LIMITE_INT64)
+    if cabe.any():
+        out[cabe] = arr[cabe].astype(np.int64).tolist()
+    grande = inteiro & ~cabe
+    if grande.any():
+        out[grande] = [int(x) for x in arr[grande]]
+    fracao = finito & ~inteiro
+    if fracao.any():
+        out[fracao] = arr[fracao].tolist()
+    return out
+
+
+def _serializar_datas(serie: pd.Series, fmt: str) -> np.ndarray:
+    # strftime é caro por elemento: formata uma vez por dia distinto e espalha
+    if isinstance(serie.dtype, pd.DatetimeTZDtype):
+        serie = serie.dt.tz_localize(None)  # hora local, como Timestamp.strftime
+    dias = serie.to_numpy()
+    if not _RE_HORA.search(fmt):
+        dias = dias.astype("datetime64[D]")
+    nulos = np.isnat(dias)
+    out = np.full(len(dias), None, dtype=object)
+    if (~nulos).any():
+        unicos, inverso = np.unique(dias[~nulos], return_inverse=True)
+        textos = pd.Series(pd.DatetimeIndex(unicos)).dt.strftime(fmt).to_numpy(dtype=object)
+        out[~nulos] = textos[inverso.ravel()]
+    return out
+
+
+def serializar_coluna(serie: pd.Series, fmt: str = FORMATO_DATA) -> np.ndarray:
+    """Converte uma coluna inteira para um array object de primitivos (None para vazio)."""
+    n = len(serie)
+    dtype = serie.dtype
+
+    if isinstance(dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(dtype):
+        return _serializar_datas(serie, fmt)
+
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in "iub":
+            out = np.empty(n, dtype=object)
+            out[:] = serie.to_numpy().astype(np.int64).tolist()
+            return out
+        if dtype.kind == "f":
+            return _serializar_float(serie.to_numpy())
+
+    valores = serie.to_numpy(dtype=object)
+    nulos = pd.isna(valores)
+    eh_str = np.fromiter((isinstance(v, str) for v in valores), dtype=bool, count=n)
+    if (eh_str | nulos).all():
+        # caminho rápido: só texto (e nulos)
+        txt = pd.Series(valores, dtype=object).where(~nulos, "").str.strip()
+        return txt.where(txt != "", None).to_numpy(dtype=object)
+
+    # tipos mistos: conversor escalar uma vez por valor distinto
+    return aplicar_em_unicos(pd.Series(valores, dtype=object), lambda v: celula_para_sheets(v, fmt)).to_numpy(dtype=object)
+
+
+def serializar_para_sheets(df: pd.DataFrame, fmt: str = FORMATO_DATA) -> List[List]:
+    """DataFrame -> lista de listas (linhas) pronta para values.update/append_rows."""
+    if df.shape[0] == 0:
+        return []
+    if df.shape[1] == 0:
+        return [[] for _ in range(df.shape[0])]
+    colunas = [serializar_coluna(df.iloc[:, j], fmt) for j in range(df.shape[1])]
+    matriz = np.empty((df.shape[0], df.shape[1]), dtype=object)
+    for j, col in enumerate(colunas):
+        matriz[:, j] = col
+    return matriz.tolist()
@@ -0,0 +1,222 @@
+"""
+Módulo de Snapshot de Planilhas (Google Sheets)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Cada worksheet é baixada UMA única vez por execução. O snapshot guarda
+junto o cabeçalho original, os valores brutos (como get_all_values) e o
+DataFrame normalizado (equivalente a get_all_records + normalizar_nome_coluna).
+Toda escrita feita pelo pipeline é refletida em memória, de modo que as
+etapas seguintes leem do snapshot em vez de chamar a API novamente.
+
+Classes/Funções:
+- SheetSnapshot - Foto em memória de uma worksheet
+- _numericise() - Conversão de célula equivalente à do gspread.get_all_records
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .normalizacao import normalizar_nome_coluna
+
+
+def _numericise(value, default_blank=""):
+    """
+    Converte uma célula textual como o gspread faz em get_all_records:
+    tenta int, depois float; vazio vira default_blank; o resto é mantido.
+    """
+    if not isinstance(value, str):
+        return value
+    if "_" in value:
+        return value
+    if value == "":
+        return default_blank
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+class SheetSnapshot:
+    """
+    Foto em memória de uma worksheet do Google Sheets.
+
+    - header: cabeçalho original (linha 1)
+    - rows: linhas de dados como lista de listas (strings, como get_all_values)
+    - df: DataFrame com colunas normalizadas (construído sob demanda)
+    """
+
+    def __init__(self, worksheet, values: List[List], nome: str = "",
+                 normalizador: Callable[[str], str] = normalizar_nome_coluna):
+        self.worksheet = worksheet
+        self.nome = nome or getattr(worksheet, "title", "") or "worksheet"
+        self.normalizador = normalizador
+        values = [list(r) for r in (values or [])]
+        self.header: List[str] = [str(h) for h in values[0]] if values else []
+        largura = len(self.header)
+        self.rows: List[List] = [self._ajustar_largura(r, largura) for r in values[1:]]
+        self._df: Optional[pd.DataFrame] = None
+        self.leituras_api = 0
+        self.modified_time: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Construção
+    # ------------------------------------------------------------------
+    @classmethod
+    def carregar(cls, worksheet, nome: str = "", **kwargs) -> "SheetSnapshot":
+        """Baixa a worksheet inteira (uma única chamada get_all_values)."""
+        values = worksheet.get_all_values()
+        snap = cls(worksheet, values, nome=nome, **kwargs)
+        snap.leituras_api = 1
+        logging.info(f"Snapshot '{snap.nome}' carregado: {len(snap.rows)} linhas x {len(snap.header)} colunas.")
+        return snap
+
+    @staticmethod
+    def _ajustar_largura(row: List, largura: int) -> List:
+        if len(row) < largura:
+            return list(row) + [""] * (largura - len(row))
+        if largura and len(row) > largura:
+            return list(row[:largura])
+        return list(row)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    @property
+    def values(self) -> List[List]:
+        """Equivalente a worksheet.get_all_values() (cabeçalho + linhas)."""
+        if not self.header and not self.rows:
+            return []
+        return [list(self.header)] + self.rows
+
+    @property
+    def n_linhas(self) -> int:
+        """Número de linhas da planilha, incluindo o cabeçalho."""
+        return len(self.values)
+
+    @property
+    def colunas(self) -> List[str]:
+        return [self.normalizador(h) for h in self.header]
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        DataFrame normalizado (equivalente a get_all_records + normalização de
+        nomes de coluna). É cacheado; use .copy() antes de modificar.
+        """
+        if self._df is None:
+            self._df = self._construir_df()
+        return self._df
+
+    def _construir_df(self) -> pd.DataFrame:
+        if not self.header:
+            return pd.DataFrame()
+        df = pd.DataFrame(self.rows, columns=self.colunas, dtype=object)
+        # numericise por valor distinto (mesma semântica do get_all_records)
+        for col in df.columns:
+            serie = df[col]
+            if isinstance(serie, pd.DataFrame):
+                continue
+            uniq = pd.unique(serie.to_numpy(dtype=object))
+            mapa = {u: _numericise(u) for u in uniq}
+            df[col] = pd.Series([mapa[v] for v in serie.to_numpy(dtype=object)], index=df.index, dtype=object)
+        return df
+
+    def indice_coluna(self, col: str) -> Optional[int]:
+        """Índice 1-based da coluna no sheet (nome exato ou normalizado)."""
+        if col in self.header:
+            return self.header.index(col) + 1
+        alvo = self.normalizador(col)
+        colunas = self.colunas
+        if alvo in colunas:
+            return colunas.index(alvo) + 1
+        return None
+
+    def valores_coluna(self, col_idx: int) -> List:
+        """Equivalente a worksheet.col_values(col_idx) (inclui cabeçalho)."""
+        return [r[col_idx - 1] if col_idx - 1 < len(r) else "" for r in self.values]
+
+    def indice_protocolos(self, col: str = "protocolo") -> Dict[str, int]:
+        """Mapa protocolo normalizado (strip + upper) -> linha 1-based no sheet."""
+        col_idx = self.indice_coluna(col)
+        if col_idx is None:
+            return {}
+        indice = {}
+        for i, r in enumerate(self.rows):
+            chave = str(r[col_idx - 1]).strip().upper()
+            if chave and chave not in indice:
+                indice[chave] = i + 2
+        return indice
+
+    # ------------------------------------------------------------------
+    # Escrita (reflete em memória o que foi enviado ao sheet)
+    # ------------------------------------------------------------------
+    def atualizar_celulas(self, updates) -> None:
+        """updates: iterável de (linha 1-based, coluna 1-based, valor)."""
+        for row_idx, col_idx, valor in updates:
+            self._set(row_idx, col_idx, valor)
+
+    def atualizar_coluna(self, col_idx: int, valores: List, linha_inicial: int = 2) -> None:
+        """Reflete um update de coluna contínua a partir de linha_inicial."""
+        for offset, valor in enumerate(valores):
+            if isinstance(valor, (list, tuple)):
+                valor = valor[0] if valor else ""
+            self._set(linha_inicial + offset, col_idx, valor)
+
+    def anexar_linhas(self, rows: List[List]) -> None:
+        """Reflete um append_rows (a primeira linha vira header se o sheet estiver vazio)."""
+        rows = [list(r) for r in rows]
+        if not rows:
+            return
+        if not self.header:
+            self.header = ["" if h is None else str(h) for h in rows[0]]
+            rows = rows[1:]
+        largura = len(self.header)
+        for r in rows:
+            self.rows.append(self._ajustar_largura([self._celula(v) for v in r], largura))
+        self._df = None
+
+    def escrever_linhas(self, linha_inicial: int, rows: List[List]) -> None:
+        """Reflete a escrita de linhas inteiras a partir de linha_inicial (1-based, >= 2)."""
+        largura = len(self.header)
+        for offset, r in enumerate(rows):
+            pos = linha_inicial - 2 + offset
+            while len(self.rows) <= pos:
+                self.rows.append([""] * largura)
+            self.rows[pos] = self._ajustar_largura([self._celula(v) for v in r], largura)
+        if rows:
+            self._df = None
+
+    @staticmethod
+    def _celula(valor) -> str:
+        if valor is None:
+            return ""
+        try:
+            if pd.isna(valor):
+                return ""
+        except (TypeError, ValueError):
+            pass
+        return str(valor)
+
+    def _set(self, row_idx: int, col_idx: int, valor) -> None:
+        if row_idx == 1:
+            while len(self.header) < col_idx:
+                self.header.append("")
+            self.header[col_idx - 1] = self._celula(valor)
+            self._df = None
+            return
+        pos = row_idx - 2
+        while len(self.rows) <= pos:
+            self.rows.append([""] * len(self.header))
+            self._df = None
+        row = self.rows[pos]
+        while len(row) < col_idx:
+            row.append("")
+        texto = self._celula(valor)
+        row[col_idx - 1] = texto
+        if self._df is not None and col_idx - 1 < len(self._df.columns) and pos < len(self._df):
+            self._df.iat[pos, col_idx - 1] = _numericise(texto)
@@ -0,0 +1,222 @@
+"""
+Módulo de Sincronização de Colunas (BRUTA -> TRATADA)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Motor genérico e vetorizado: bruta e tratada são alinhadas por protocolo com
+um hash join (pd.Index.get_indexer), os conversores rodam uma vez por valor
+distinto e a nova coluna sai em tempo linear, na ordem das linhas da tratada.
+
+Regras (as mesmas dos antigos sync_* do Pipeline/main.py):
+- protocolo presente na bruta (e aceito pelo padrão/alvo): recebe o valor da
+  bruta (última ocorrência), passado pelo conversor
+- caso contrário: mantém o valor atual da tratada (primeira ocorrência do
+  protocolo), passado pelo conversor apenas se converter_mantidos=True
+- da_bruta=False: a coluna não vem da bruta — todas as linhas mantêm o valor
+  da tratada, passado pelos conversores (normaliza linhas existentes sem
+  reprocessá-las)
+
+Para sincronizar uma nova coluna basta declarar um ColunaSincronizada.
+
+Classes/Funções:
+- ColunaSincronizada - Declaração de uma coluna sincronizada
+- calcular_coluna() - Calcula a nova coluna (sem I/O)
+- sincronizar_coluna() - Calcula, atualiza o DataFrame e escreve no Sheets
+  (somente as células alteradas, via utils/escrita.py)
+"""
+
+import logging
+import re
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .escrita import celulas_alteradas, escrever_celulas
+from .normalizacao import normalizar_nome_coluna
+from .vetorizacao import aplicar_em_unicos
+
+
+class ColunaSincronizada:
+    """
+    Declaração de uma coluna sincronizada da bruta para a tratada.
+
+    - coluna: nome (normalizado) da coluna nas duas bases
+    - conversor: função escalar aplicada ao valor vindo da bruta
+    - conversor_coluna: função vetorizada (Series -> Series), aplicada depois do conversor
+    - converter_mantidos: aplica os conversores também aos valores mantidos da tratada
+    - padrao_protocolo: regex; protocolos que não batem mantêm o valor da tratada
+    - backup_prefixo: se informado, salva a coluna antiga da tratada em CSV antes do sync
+    - da_bruta: False = só normaliza a coluna da tratada (nada vem da bruta; implica converter_mantidos)
+    """
+
+    def __init__(self, coluna: str, conversor: Optional[Callable] = None,
+                 converter_mantidos: bool = False, padrao_protocolo: Optional[str] = None,
+                 backup_prefixo: Optional[str] = None, conversor_coluna: Optional[Callable] = None,
+                 da_bruta: bool = True):
+        self.coluna = coluna
+        self.conversor = conversor
+        self.conversor_coluna = conversor_coluna
+        self.converter_mantidos = converter_mantidos or not da_bruta
+        self.padrao_protocolo = padrao_protocolo
+        self.backup_prefixo = backup_prefixo
+        self.da_bruta = da_bruta
+
+    def __repr__(self):
+        return f"ColunaSincronizada({self.coluna!r})"
+
+
+def _chaves(series: pd.Series) -> pd.Series:
+    return series.astype(str).str.strip().str.upper()
+
+
+def _converter(valores: pd.Series, spec: ColunaSincronizada) -> pd.Series:
+    if spec.conversor is not None:
+        valores = aplicar_em_unicos(valores, spec.conversor)
+    if spec.conversor_coluna is not None:
+        valores = pd.Series(spec.conversor_coluna(valores), index=valores.index, dtype=object)
+    return valores
+
+
+def calcular_coluna(df_bruta: pd.DataFrame, df_tratada: pd.DataFrame, spec: ColunaSincronizada,
+                    protocolo_col: str = "protocolo",
+                    protocolos_alvo: Optional[Iterable[str]] = None) -> List:
+    """
+    Devolve a nova coluna (lista, na ordem das linhas de df_tratada).
+    protocolos_alvo: se informado, só esses protocolos recebem o valor da bruta.
+    """
+    col = spec.coluna
+    chaves_t = _chaves(df_tratada[protocolo_col])
+    n = len(chaves_t)
+
+    da_bruta = np.zeros(n, dtype=bool)
+    if spec.da_bruta:
+        # lado bruta: protocolo -> valor (última ocorrência vence, como em set_index().to_dict())
+        chaves_b = _chaves(df_bruta[protocolo_col])
+        valores_b = df_bruta[col]
+        if protocolos_alvo is not None:
+            no_alvo = chaves_b.isin(set(protocolos_alvo))
+            chaves_b, valores_b = chaves_b[no_alvo], valores_b[no_alvo]
+        ultima = ~chaves_b.duplicated(keep="last")
+        idx_b = pd.Index(chaves_b[ultima].to_numpy())
+        vals_b = valores_b[ultima].to_numpy(dtype=object)
+
+        # hash join tratada -> bruta
+        pos_b = idx_b.get_indexer(chaves_t.to_numpy())
+        da_bruta = pos_b >= 0
+        if spec.padrao_protocolo is not None:
+            da_bruta &= chaves_t.str.match(spec.padrao_protocolo, flags=re.IGNORECASE).to_numpy(dtype=bool)
+
+    out = np.empty(n, dtype=object)
+
+    # valores vindos da bruta (conversor por valor distinto)
+    if da_bruta.any():
+        brutos = _converter(pd.Series(vals_b[pos_b[da_bruta]], dtype=object), spec)
+        out[da_bruta] = brutos.to_numpy(dtype=object)
+
+    # valores mantidos da tratada (primeira ocorrência do protocolo)
+    mantidos = ~da_bruta
+    if mantidos.any():
+        if col in df_tratada.columns:
+            primeira = ~chaves_t.duplicated(keep="first")
+            idx_t = pd.Index(chaves_t[primeira].to_numpy())
+            vals_t = df_tratada[col][primeira].to_numpy(dtype=object)
+            atuais = pd.Series(vals_t[idx_t.get_indexer(chaves_t[mantidos].to_numpy())], dtype=object)
+        else:
+            atuais = pd.Series([""] * int(mantidos.sum()), dtype=object)
+        if spec.converter_mantidos:
+            atuais = _converter(atuais, spec)
+        out[mantidos] = atuais.to_numpy(dtype=object)
+
+    return out.tolist()
+
+
+def _localizar_coluna(header: List[str], coluna: str, normalizador: Callable[[str], str]) -> Optional[int]:
+    """Índice 1-based da coluna no header (nome exato ou normalizado)."""
+    if coluna in header:
+        return header.index(coluna) + 1
+    header_norm = [normalizador(h) for h in header]
+    alvo = normalizador(coluna)
+    if alvo in header_norm:
+        return header_norm.index(alvo) + 1
+    return None
+
+
+def sincronizar_coluna(df_bruta: pd.DataFrame, df_tratada: pd.DataFrame, spec: ColunaSincronizada,
+                       sheet_obj=None, snapshot=None, protocolo_col: str = "protocolo",
+                       protocolos_alvo: Optional[Iterable[str]] = None,
+                       normalizador: Callable[[str], str] = normalizar_nome_coluna,
+                       falhas: Optional[list] = None) -> pd.DataFrame:
+    """
+    Sincroniza spec.coluna da bruta para a tratada: atualiza df_tratada em memória
+    e envia ao sheet_obj apenas as células alteradas, em um único batchUpdate
+    (refletindo no snapshot, se houver).
+    Falhas de escrita são registradas em `falhas` (nome da coluna) e logadas.
+    """
+    col = spec.coluna
+    if df_bruta is None or df_bruta.empty:
+        logging.info(f"df_bruta vazio — nada a sincronizar para {col}.")
+        return df_tratada
+    if df_tratada is None or df_tratada.empty:
+        logging.info("df_tratada vazio — nada a sincronizar (sheet pode estar vazio).")
+        return df_tratada
+    if protocolo_col not in df_bruta.columns or protocolo_col not in df_tratada.columns:
+        logging.warning(f"Coluna '{protocolo_col}' ausente em bruta ou tratada — abortando sync {col}.")
+        return df_tratada
+    if spec.da_bruta and col not in df_bruta.columns:
+        logging.warning(f"Coluna '{col}' ausente na bruta — abortando sync.")
+        if falhas is not None:
+            falhas.append(col)
+        return df_tratada
+    if not spec.da_bruta and col not in df_tratada.columns:
+        logging.warning(f"Coluna '{col}' ausente na tratada — nada a normalizar.")
+        return df_tratada
+
+    # Backup local da coluna antiga da tratada (CSV)
+    if spec.backup_prefixo:
+        try:
+            backup_series = df_tratada.get(col, pd.Series([""] * len(df_tratada)))
+            timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+            backup_fn = f"{spec.backup_prefixo}_{timestamp}.csv"
+            backup_series.to_csv(backup_fn, index=False, header=[col], encoding="utf-8-sig")
+            logging.info(f"Backup da coluna '{col}' (tratada) salvo em: {backup_fn}")
+        except Exception as e:
+            logging.warning(f"Falha ao salvar backup local da coluna '{col}': {e}")
+
+    new_col_values = calcular_coluna(df_bruta, df_tratada, spec, protocolo_col, protocolos_alvo)
+
+    # Atualiza df_tratada em memória (mesma ordem das linhas)
+    df_tratada[col] = new_col_values
+
+    if sheet_obj is None:
+        return df_tratada
+
+    # --- ESCRITA NO GOOGLE SHEETS (apenas as células alteradas da coluna) ---
+    try:
+        all_vals = snapshot.values if snapshot is not None else sheet_obj.get_all_values()
+        if not all_vals:
+            logging.warning(f"Aba tratada sem valores (get_all_values retornou vazio). Não será possível atualizar a coluna {col} via API.")
+            return df_tratada
+
+        n_rows = len(all_vals)
+        col_idx = _localizar_coluna(all_vals[0], col, normalizador)
+        if col_idx is None:
+            logging.warning(f"Coluna '{col}' não encontrada no header da sheet — abortando update em sheet.")
+            return df_tratada
+
+        # diff por posição (linhas 2..n_rows do sheet x df_tratada): só as células alteradas são enviadas
+        atuais = [r[col_idx - 1] if col_idx - 1 < len(r) else "" for r in all_vals[1:]]
+        alteracoes = celulas_alteradas(atuais, new_col_values[:n_rows - 1], col_idx)
+        if not alteracoes:
+            logging.info(f"Coluna '{col}' já sincronizada — nenhuma célula alterada.")
+            return df_tratada
+
+        escrever_celulas(sheet_obj, alteracoes)
+        if snapshot is not None:
+            snapshot.atualizar_celulas(alteracoes)
+        logging.info(f"Coluna '{col}' sincronizada da bruta para tratada — {len(alteracoes)} de {n_rows - 1} células alteradas.")
+    except Exception as e:
+        logging.exception(f"Erro ao atualizar a coluna '{col}' na planilha tratada: {e}")
+        if falhas is not None:
+            falhas.append(col)
+
+    return df_tratada
@@ -0,0 +1,107 @@
+"""
+Módulo de Vetorização por Valores Distintos
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Colunas como tema, assunto, unidade_cadastro, responsavel, orgaos, canal e
+status_demanda têm poucas centenas de valores distintos em dezenas de
+milhares de linhas. Em vez de chamar o normalizador escalar em cada linha
+(.apply/.map), a coluna é fatorada, a função roda UMA vez por valor distinto
+e o resultado é espalhado de volta para as linhas.
+
+Funções:
+- fatorar() - Códigos + valores distintos da coluna (mesma chave de aplicar_em_unicos)
+- aplicar_em_unicos() - Aplica uma função escalar por valor distinto e espalha
+- compor() - Compõe normalizadores escalares (aplicados da esquerda p/ direita)
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+def fatorar(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fatora a coluna em (códigos, valores distintos), com a mesma chave de
+    aplicar_em_unicos: unicos[codigos] reconstrói a coluna (dtype object).
+
+    - Strings são fatoradas em bloco (pd.factorize).
+    - Demais valores (números, datas) são agrupados por (tipo, valor), para que
+      1, 1.0 e True não colapsem no mesmo valor distinto.
+    - Nulos (None/NaN/NaT/NA) são agrupados por tipo, preservando a semântica
+      de cada normalizador para None e para NaN.
+    - Valores não-hashable viram um distinto por ocorrência.
+    """
+    s = pd.Series(series)
+    valores = s.to_numpy(dtype=object)
+    if isinstance(s.dtype, pd.StringDtype):
+        # coluna de texto: todo não-nulo é str e os nulos são um só valor — fatoração direta
+        codigos, uniq = pd.factorize(valores)
+        codigos = codigos.astype(np.intp, copy=False)
+        nulos = codigos < 0
+        distintos = np.empty(len(uniq) + bool(nulos.any()), dtype=object)
+        distintos[:len(uniq)] = uniq
+        if nulos.any():
+            distintos[-1] = valores[nulos][0]
+            codigos[nulos] = len(uniq)
+        return codigos, distintos
+
+    n = len(valores)
+    codigos = np.empty(n, dtype=np.intp)
+    unicos: List[object] = []
+    if n:
+        nulos = pd.isna(valores)
+        eh_str = np.fromiter((isinstance(v, str) for v in valores), dtype=bool, count=n)
+
+        # strings: fatoração em C
+        pos = np.flatnonzero(eh_str)
+        if len(pos):
+            codes, uniq = pd.factorize(valores[pos])
+            codigos[pos] = codes
+            unicos.extend(uniq)
+
+        # demais valores (inclusive nulos): dicionário por tipo/valor
+        vistos = {}
+        for p in np.flatnonzero(~eh_str):
+            v = valores[p]
+            chave = (type(v), repr(v)) if nulos[p] else (type(v), v)
+            try:
+                k = vistos.get(chave)
+            except TypeError:  # valor não-hashable
+                k, chave = None, None
+            if k is None:
+                k = len(unicos)
+                unicos.append(v)
+                if chave is not None:
+                    vistos[chave] = k
+            codigos[p] = k
+
+    distintos = np.empty(len(unicos), dtype=object)
+    for k, v in enumerate(unicos):
+        distintos[k] = v
+    return codigos, distintos
+
+
+def aplicar_em_unicos(series: pd.Series, func: Callable, dtype: Optional[str] = None) -> pd.Series:
+    """
+    Equivalente a series.apply(func), mas func roda uma vez por valor distinto
+    (chave de fatorar(): strings em bloco, demais valores por tipo/valor).
+    """
+    s = pd.Series(series)
+    codigos, unicos = fatorar(s)
+    res = np.empty(len(unicos), dtype=object)
+    for k, u in enumerate(unicos):
+        res[k] = func(u)
+
+    resultado = pd.Series(res[codigos], index=s.index, name=s.name, dtype=object)
+    if dtype is not None:
+        resultado = resultado.astype(dtype)
+    return resultado
+
+
+def compor(*funcs: Callable) -> Callable:
+    """compor(f, g)(v) == g(f(v)) — útil para encadear normalizadores em aplicar_em_unicos."""
+    def _composta(v):
+        for f in funcs:
+            v = f(v)
+        return v
+    return _composta
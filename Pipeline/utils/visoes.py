@@ -0,0 +1,185 @@
+"""
+Módulo de Visões Derivadas por DataFrame (cache de astype/strip/casefold)
+Utilizado por Pipeline/main.py e .github/workflows/main.py
+
+Tratamentos e checagens de QA recalculam as mesmas visões de uma coluna
+(astype(str), .str.strip(), .str.casefold(), .str.lower(), sem acentos e a
+máscara de vazios). Aqui cada DataFrame ganha um cache: a visão é calculada
+na primeira vez e reaproveitada enquanto a coluna for a mesma.
+
+"A mesma coluna" = mesma versão: a chave guarda o buffer de dados da coluna
+(endereço, strides, tamanho, dtype) e o índice. Com Copy-on-Write, reatribuir
+a coluna (df[col] = ...) ou alterá-la no lugar (df.loc[...] = ...) sempre
+troca o buffer, então a visão antiga deixa de valer sozinha — sem invalidação
+manual. A entrada guarda uma referência à série de origem, o que impede que o
+buffer seja reaproveitado por outra coluna enquanto a visão existir.
+
+Classes/Funções:
+- VisoesDataFrame - Cache de visões de um DataFrame
+- visoes_de() - Cache associado ao DataFrame (criado na primeira chamada)
+- VAZIOS - Tokens considerados vazios/não informados pela máscara 'vazio'
+"""
+
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .normalizacao import canon_series, remover_acentos_series
+
+VAZIOS = ("", "nan", "none", "n/a", "não informado")
+
+_REGISTRO: Dict[int, "VisoesDataFrame"] = {}
+_LOCK = threading.Lock()
+
+
+def _assinatura(serie: pd.Series) -> Tuple:
+    """Identifica a versão dos dados da série (buffer numpy ou array imutável do pyarrow)."""
+    arr = serie.array
+    base = getattr(arr, "_ndarray", None)
+    if isinstance(base, np.ndarray):
+        return (base.__array_interface__["data"][0], base.strides, len(base), str(serie.dtype))
+    return (id(getattr(arr, "_pa_array", arr)), len(serie), str(serie.dtype))
+
+
+def _texto(v, coluna, serie):
+    return serie.astype(str)
+
+
+def _aparado(v, coluna, serie):
+    return v.obter(coluna, "texto", serie).str.strip()
+
+
+def _casefold(v, coluna, serie):
+    return v.obter(coluna, "aparado", serie).str.casefold()
+
+
+def _minusculo(v, coluna, serie):
+    return v.obter(coluna, "aparado", serie).str.lower()
+
+
+def _sem_acento(v, coluna, serie):
+    return remover_acentos_series(v.obter(coluna, "aparado", serie))
+
+
+def _canonico(v, coluna, serie):
+    return canon_series(serie)
+
+
+def _vazio(v, coluna, serie, tokens=VAZIOS):
+    return v.obter(coluna, "aparado", serie).isin(list(tokens))
+
+
+TIPOS: Dict[str, Callable] = {
+    "texto": _texto,            # astype(str)
+    "aparado": _aparado,        # astype(str).str.strip()
+    "casefold": _casefold,      # ... .str.casefold()
+    "minusculo": _minusculo,    # ... .str.lower()
+    "sem_acento": _sem_acento,  # aparado sem acentos (preserva a caixa)
+    "canonico": _canonico,      # canon_series (= _canon_txt por célula)
+    "vazio": _vazio,            # aparado.isin(tokens) — padrão VAZIOS
+}
+
+
+class VisoesDataFrame:
+    """
+    Cache de visões derivadas das colunas de um DataFrame.
+
+    - obter(coluna, tipo, serie=None, *args): visão de TIPOS; `serie` permite
+      pedir a visão de uma versão da coluna que ainda não está no DataFrame
+      (ex.: a série em processamento no motor de regras)
+    - atalhos: texto(), aparado(), casefold(), minusculo(), sem_acento(),
+      canonico(), vazio(tokens=VAZIOS)
+    - acertos / calculos: quantas visões vieram do cache / foram calculadas
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = weakref.ref(df)
+        self._cache: Dict[Tuple, Tuple[Tuple, pd.Series, pd.Series]] = {}
+        self.acertos = 0
+        self.calculos = 0
+
+    def _coluna(self, coluna: str) -> pd.Series:
+        df = self._df()
+        if df is None:
+            raise ReferenceError("DataFrame do cache de visões não existe mais.")
+        return df[coluna]
+
+    def obter(self, coluna: str, tipo: str, serie: Optional[pd.Series] = None, *args) -> pd.Series:
+        if serie is None:
+            serie = self._coluna(coluna)
+        chave = (coluna, tipo, args)
+        assinatura = _assinatura(serie)
+        entrada = self._cache.get(chave)
+        if entrada is not None and entrada[0] == assinatura and (
+            entrada[1].index is serie.index or entrada[1].index.equals(serie.index)
+        ):
+            self.acertos += 1
+            return entrada[2]
+        valor = TIPOS[tipo](self, coluna, serie, *args)
+        self._cache[chave] = (assinatura, serie, valor)
+        self.calculos += 1
+        return valor
+
+    def texto(self, coluna: str) -> pd.Series:
+        return self.obter(coluna, "texto")
+
+    def aparado(self, coluna: str) -> pd.Series:
+        return self.obter(coluna, "aparado")
+
+    def casefold(self, coluna: str) -> pd.Series:
+        return self.obter(coluna, "casefold")
+
+    def minusculo(self, coluna: str) -> pd.Series:
+        return self.obter(coluna, "minusculo")
+
+    def sem_acento(self, coluna: str) -> pd.Series:
+        return self.obter(coluna, "sem_acento")
+
+    def canonico(self, coluna: str) -> pd.Series:
+        return self.obter(coluna, "canonico")
+
+    def vazio(self, coluna: str, tokens: Iterable[str] = VAZIOS) -> pd.Series:
+        tokens = tuple(tokens)
+        if tokens == VAZIOS:
+            return self.obter(coluna, "vazio")
+        return self.obter(coluna, "vazio", None, tokens)
+
+    def invalidar(self, coluna: Optional[str] = None) -> None:
+        """Descarta as visões da coluna (ou todas). Normalmente desnecessário: a versão é verificada."""
+        if coluna is None:
+            self._cache.clear()
+        else:
+            for chave in [k for k in self._cache if k[0] == coluna]:
+                del self._cache[chave]
+
+    def podar(self) -> None:
+        """Descarta visões de versões que não são mais a coluna atual do DataFrame (libera memória)."""
+        df = self._df()
+        for chave, (assinatura, serie, _) in list(self._cache.items()):
+            coluna = chave[0]
+            if df is None or coluna not in df.columns or _assinatura(df[coluna]) != assinatura \
+                    or not df.index.equals(serie.index):
+                del self._cache[chave]
+
+    def herdar(self, outra: "VisoesDataFrame") -> "VisoesDataFrame":
+        """
+        Copia as visões de outro DataFrame (ex.: antes de um reindex/recorte que
+        compartilha as colunas); as que não valerem aqui são recalculadas.
+        """
+        for chave, entrada in outra._cache.items():
+            self._cache.setdefault(chave, entrada)
+        return self
+
+
+def visoes_de(df: pd.DataFrame) -> VisoesDataFrame:
+    """Cache de visões do DataFrame (um por objeto; some junto com o DataFrame)."""
+    chave = id(df)
+    with _LOCK:
+        cache = _REGISTRO.get(chave)
+        if cache is None or cache._df() is not df:
+            cache = _REGISTRO[chave] = VisoesDataFrame(df)
+            weakref.finalize(df, _REGISTRO.pop, chave, None)
+    return cache